@@ -75,6 +75,7 @@ if _CORE_DEPENDENCIES_OK:
         # Import updated segyio-based modules
         from production_segy_tools import (
             production_segy_parser,
+            SegyioFusedAnalyzer,
             SegyioValidator,
             MemoryMonitor,
             ProgressReporter,
@@ -110,6 +111,7 @@ if _CORE_DEPENDENCIES_OK:
             'production_segy_parser',
             'production_segy_qc',
             'production_segy_analysis',
+            'SegyioFusedAnalyzer',
 
             # Classification
             'SurveyClassifier',
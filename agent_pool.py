@@ -0,0 +1,238 @@
+"""
+agent_pool.py - Pre-warmed agent pool for the QA server
+
+Creating an agent rebuilds the MCP tool catalog and the agent executor, which
+takes seconds. AgentPool keeps a few agents created ahead of time so /new
+hands one out immediately, refills the warm set in the background, and
+evicts agents of the QA server's registry:
+
+- idle agents whose last use ('tl') is older than the idle TTL
+- least recently used agents when the agent count or process memory cap is
+  exceeded (agents with a running job are never evicted)
+
+Eviction is two-phase, as in the original cleaner: an evicted agent is first
+marked killed (so /ask answers "was killed" instead of racing the removal)
+and deleted from the registry on the next maintain pass.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WARM_AGENTS = int(os.getenv("QA_WARM_AGENTS", "2"))
+DEFAULT_MAX_AGENTS = int(os.getenv("QA_MAX_AGENTS", "32"))
+DEFAULT_IDLE_TTL_SECONDS = int(os.getenv("QA_AGENT_IDLE_TTL", str(3 * 60)))
+# 0 disables the memory cap
+DEFAULT_MAX_MEMORY_MB = float(os.getenv("QA_AGENT_MAX_MEMORY_MB", "0"))
+
+# Creation latencies kept for the stats endpoint
+LATENCY_WINDOW = 100
+
+
+class AgentPool:
+    """Warm agent pool and eviction policy for a QA server agent registry"""
+
+    def __init__(self, create_agent_fn: Callable[[], Any], agents: Dict[str, Dict[str, Any]],
+                 warm_size: int = DEFAULT_WARM_AGENTS, max_agents: int = DEFAULT_MAX_AGENTS,
+                 idle_ttl_seconds: float = DEFAULT_IDLE_TTL_SECONDS,
+                 max_memory_mb: float = DEFAULT_MAX_MEMORY_MB,
+                 is_busy: Optional[Callable[[str], bool]] = None):
+        self.create_agent_fn = create_agent_fn
+        # The server's registry: agentid -> dict(t0, tl, agent, killed)
+        self.agents = agents
+        self.warm_size = max(0, warm_size)
+        self.max_agents = max(1, max_agents)
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_memory_mb = max_memory_mb
+        self.is_busy = is_busy or (lambda agent_id: False)
+
+        self._warm = deque()
+        self._lock = threading.Lock()
+        self._refill_lock = threading.Lock()
+        self._creation_seconds = deque(maxlen=LATENCY_WINDOW)
+        self._counters = {
+            "created": 0,
+            "creation_failures": 0,
+            "warm_hits": 0,
+            "cold_starts": 0,
+            "evicted_idle": 0,
+            "removed": 0,
+            "evicted_capacity": 0,
+            "evicted_memory": 0
+        }
+
+    def start(self):
+        """Pre-create the warm agents in the background"""
+        self._schedule_refill()
+
+    def acquire(self, agent_id: str) -> Optional[Any]:
+        """Register a new agent under agent_id, warm if possible; None if creation fails"""
+        with self._lock:
+            agent = self._warm.popleft() if self._warm else None
+            self._counters["warm_hits" if agent is not None else "cold_starts"] += 1
+
+        if agent is None:
+            agent = self._create()
+            if agent is None:
+                return None
+
+        # Make room before registering, so the cap holds for the new agent too
+        self._evict_lru(self._live_count() + 1 - self.max_agents, "evicted_capacity")
+
+        now = datetime.now()
+        self.agents[agent_id] = dict(t0=now, tl=now, agent=agent, killed=0)
+        self._schedule_refill()
+        return agent
+
+    def maintain(self):
+        """Delete agents marked killed, mark idle ones, enforce the memory cap, top up the warm set"""
+        now = datetime.now()
+        for agent_id in list(self.agents):
+            agent_data = self.agents.get(agent_id)
+            if agent_data is None:
+                continue
+            if agent_data['killed'] == 1:
+                self._delete(agent_id)
+            elif ((now - agent_data['tl']).total_seconds() > self.idle_ttl_seconds
+                  and not self.is_busy(agent_id)):
+                self._mark_killed(agent_id, "evicted_idle")
+
+        self._enforce_memory_cap()
+        self._schedule_refill()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._creation_seconds)
+            warm = len(self._warm)
+            counters = dict(self._counters)
+
+        active = [agent_id for agent_id, data in list(self.agents.items()) if data['killed'] == 0]
+        creation = {"samples": len(latencies)}
+        if latencies:
+            creation.update({
+                "mean_seconds": round(sum(latencies) / len(latencies), 3),
+                "p50_seconds": round(latencies[len(latencies) // 2], 3),
+                "max_seconds": round(latencies[-1], 3)
+            })
+
+        return {
+            "warm_agents": warm,
+            "warm_target": self.warm_size,
+            "active_agents": len(active),
+            "busy_agents": sum(1 for agent_id in active if self.is_busy(agent_id)),
+            "max_agents": self.max_agents,
+            "idle_ttl_seconds": self.idle_ttl_seconds,
+            "max_memory_mb": self.max_memory_mb,
+            "process_memory_mb": round(_process_memory_mb(), 1),
+            "creation_latency": creation,
+            **counters
+        }
+
+    def _create(self) -> Optional[Any]:
+        start_time = time.time()
+        try:
+            agent = self.create_agent_fn()
+        except Exception as e:
+            logger.error(f"Agent creation failed: {e}")
+            agent = None
+        elapsed = time.time() - start_time
+
+        with self._lock:
+            if agent is None:
+                self._counters["creation_failures"] += 1
+            else:
+                self._counters["created"] += 1
+                self._creation_seconds.append(elapsed)
+        return agent
+
+    def _schedule_refill(self):
+        with self._lock:
+            needed = len(self._warm) < self.warm_size
+        if needed and not self._refill_lock.locked():
+            threading.Thread(target=self._refill, name="agent-pool-refill", daemon=True).start()
+
+    def _refill(self):
+        # One refill thread at a time; agents are created sequentially
+        if not self._refill_lock.acquire(blocking=False):
+            return
+        try:
+            while True:
+                with self._lock:
+                    if len(self._warm) >= self.warm_size:
+                        return
+                if self._live_count() + len(self._warm) >= self.max_agents or self._over_memory_cap():
+                    return
+                agent = self._create()
+                if agent is None:
+                    return
+                with self._lock:
+                    self._warm.append(agent)
+        finally:
+            self._refill_lock.release()
+
+    def _enforce_memory_cap(self):
+        if not self._over_memory_cap():
+            return
+
+        # Warm agents go first, then the least recently used active ones
+        with self._lock:
+            dropped = len(self._warm)
+            self._warm.clear()
+            self._counters["evicted_memory"] += dropped
+
+        # Marking frees nothing until the next pass deletes the agent, so mark
+        # one agent per pass and re-check the memory then
+        if dropped == 0 and not self._evict_lru(1, "evicted_memory"):
+            logger.warning(f"Agent memory cap {self.max_memory_mb}MB exceeded "
+                           f"with no idle agent left to evict")
+
+    def _evict_lru(self, count: int, reason: str) -> int:
+        """Evict up to count idle agents, least recently used first"""
+        if count <= 0:
+            return 0
+        candidates = sorted(
+            (data['tl'], agent_id) for agent_id, data in list(self.agents.items())
+            if data['killed'] == 0 and not self.is_busy(agent_id)
+        )
+        evicted = 0
+        for _, agent_id in candidates[:count]:
+            self._mark_killed(agent_id, reason)
+            evicted += 1
+        return evicted
+
+    def _mark_killed(self, agent_id: str, reason: str):
+        """First eviction phase: the agent stays registered but is no longer served"""
+        agent_data = self.agents.get(agent_id)
+        if agent_data is None or agent_data['killed'] == 1:
+            return
+        agent_data['killed'] = 1
+        with self._lock:
+            self._counters[reason] += 1
+        logger.info(f"Agent {agent_id} {reason.replace('_', ' ')}")
+
+    def _delete(self, agent_id: str):
+        """Second eviction phase: drop an agent marked killed on an earlier pass"""
+        agent_data = self.agents.pop(agent_id, None)
+        if agent_data is None:
+            return
+        agent_data.pop('agent', None)
+        with self._lock:
+            self._counters["removed"] += 1
+
+    def _live_count(self) -> int:
+        return sum(1 for data in list(self.agents.values()) if data['killed'] == 0)
+
+    def _over_memory_cap(self) -> bool:
+        return self.max_memory_mb > 0 and _process_memory_mb() > self.max_memory_mb
+
+
+def _process_memory_mb() -> float:
+    return psutil.Process().memory_info().rss / 1024 / 1024
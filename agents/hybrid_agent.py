@@ -3,6 +3,7 @@ Hybrid Agent Factory
 Creates hybrid agents that combine LangChain and direct MCP access
 """
 
+import time
 import logging
 import json
 from typing import Optional, Dict, Any, List
@@ -19,6 +20,8 @@ from python_a2a.langchain import to_langchain_agent, to_langchain_tool
 
 from config.settings import AgentConfig
 from servers.mcp_server import MCPClient
+from monitoring.latency_metrics import record_latency
+from utils.tracing import span, traced
 
 # GLOBAL TOOL DEFINITIONS - moved out of the class
 TOOL_DEFINITIONS = {
@@ -77,6 +80,7 @@ class HybridAgent:
             "errors": 0
         }
 
+    @traced("HybridAgent.run")
     def run(self, query: str) -> str:
         """
         Process a query using the hybrid approach
@@ -91,18 +95,24 @@ class HybridAgent:
         self.logger.debug(f"Processing query: {query[:100]}...")
 
         # Step 1: Try direct command processing first
+        start_time = time.time()
         try:
-            direct_result = self.command_processor(query)
+            with span("HybridAgent.direct_command"):
+                direct_result = self.command_processor(query)
             if direct_result:
                 self.stats["direct_commands"] += 1
+                record_latency("agent", "direct_command", time.time() - start_time)
                 self.logger.debug("Query handled by direct command processor")
                 return direct_result
         except Exception as e:
             self.logger.debug(f"Direct command processing failed: {str(e)}")
 
         # Step 2: Use ReAct agent
+        start_time = time.time()
         try:
-            result = self.agent_executor.invoke({"input": query})
+            with span("HybridAgent.react_agent"):
+                result = self.agent_executor.invoke({"input": query})
+            record_latency("agent", "react_agent", time.time() - start_time)
 
             # Handle ReAct agent response structure
             if isinstance(result, dict):
@@ -118,6 +128,7 @@ class HybridAgent:
             return formatted_output
 
         except Exception as e:
+            record_latency("agent", "react_agent", time.time() - start_time, success=False)
             self.logger.warning(f"ReAct agent processing failed: {str(e)}")
             return self._try_fallback_handlers(query, str(e))
 
@@ -234,6 +245,7 @@ class HybridAgent:
 
         return chr(10).join(output)
 
+    @traced("HybridAgent.fallback_handlers")
     def _try_fallback_handlers(self, query: str, original_error: str) -> str:
         """Enhanced fallback handler with better error parsing"""
         query_lower = query.lower()
@@ -358,7 +370,10 @@ class HybridAgentFactory:
                                 return f"Error: No input provided for {tool_name}"
 
                             # Call MCP tool
+                            start_time = time.time()
                             result = mcp_client.call_tool(tool_name, input_text)
+                            record_latency("tool", tool_name, time.time() - start_time,
+                                           success=not (isinstance(result, dict) and "error" in result))
 
                             # Handle response
                             if isinstance(result, dict):
@@ -8,6 +8,7 @@ import logging
 from typing import Dict, Any
 
 from config.settings import Config
+from utils.tracing import traced
 from .hybrid_agent import HybridAgent
 
 
@@ -32,6 +33,7 @@ class MetaAgent:
         self.query_count = 0
         self.last_query_time = None
 
+    @traced("MetaAgent.run")
     def run(self, query: str) -> str:
         """
         Enhanced run method with meta-agent features
@@ -0,0 +1,398 @@
+"""
+benchmark_suite.py - Performance benchmarks for the analysis engines
+
+Runs the SEG-Y and LAS engines against a deterministic synthetic dataset
+(synthetic_data.py) and reports, per benchmark:
+
+- wall time of the first (cold) run and the median of the warm repeats
+- peak RSS of the process running the benchmark
+- bytes read from files during the cold run and per warm run
+
+Every benchmark runs in its own child process, so peak RSS and bytes read
+belong to that benchmark alone. Header indexes, LAS stores and caches are
+written under the work directory, never into the working tree. Results are
+saved as JSON in benchmark_results/ and two runs can be compared:
+
+    python benchmark_suite.py --size small --repeats 3
+    python benchmark_suite.py --compare benchmark_results/a.json benchmark_results/b.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import importlib
+import statistics
+import contextlib
+import multiprocessing
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import psutil
+
+from synthetic_data import SIZE_PRESETS, generate_dataset
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORK_DIR = os.getenv("BENCHMARK_WORK_DIR", "./benchmark_data")
+DEFAULT_RESULTS_DIR = os.getenv("BENCHMARK_RESULTS_DIR", "./benchmark_results")
+DEFAULT_REPEATS = 3
+DEFAULT_TIMEOUT = 1800  # seconds per benchmark
+
+# Relative change reported as a regression/improvement by compare_results
+COMPARE_THRESHOLD = 0.10
+
+
+# ------------------------------------------------------------------ benchmarks
+# Each benchmark takes the dataset manifest's files and the work directory.
+# Engine modules are imported inside the functions so they load in the child
+# process after the cache locations have been set; ENGINE_MODULES are
+# imported before the clock starts so cold runs do not include imports.
+
+ENGINE_MODULES = {
+    "segy_parser": "production_segy_tools",
+    "survey_classifier": "survey_classifier",
+    "segy_qc": "production_segy_analysis_qc",
+    "survey_polygon": "production_segy_tools",
+    "load_las": "robust_las_parser",
+    "evaluate_formation": "formation_evaluation",
+    "correlate_wells": "well_correlation"
+}
+
+
+def _check_result(result):
+    """Raise if an engine result (dict, JSON string or {"text": JSON} tool payload) reports an error"""
+    payload = result
+    if isinstance(payload, dict) and isinstance(payload.get("text"), str):
+        payload = payload["text"]
+    if isinstance(payload, str):
+        try:
+            payload = json.loads(payload)
+        except ValueError:
+            raise RuntimeError(f"Result is not JSON: {payload[:200]}")
+
+    if not isinstance(payload, dict) or not payload:
+        raise RuntimeError(f"Unexpected result: {str(payload)[:200]}")
+    if payload.get("error"):
+        raise RuntimeError(payload["error"])
+    if payload.get("success") is False:
+        raise RuntimeError("Engine reported success=False")
+    return result
+
+
+def _segy_parser(kind):
+    def run(files, work_dir):
+        from production_segy_tools import production_segy_parser
+        _check_result(production_segy_parser(file_path=files[kind], data_dir=os.path.dirname(files[kind])))
+    return run
+
+
+def _survey_classifier(kind):
+    def run(files, work_dir):
+        from survey_classifier import SegyioSurveyClassifier
+        _check_result(SegyioSurveyClassifier().classify_survey(files[kind]))
+    return run
+
+
+def _segy_qc(kind):
+    def run(files, work_dir):
+        from production_segy_analysis_qc import production_segy_qc
+        _check_result(production_segy_qc(file_path=files[kind], data_dir=os.path.dirname(files[kind])))
+    return run
+
+
+def _survey_polygon(kind):
+    def run(files, work_dir):
+        from production_segy_tools import SurveyPolygonExtractor
+        _check_result(SurveyPolygonExtractor().extract_survey_polygon(files[kind]))
+    return run
+
+
+def _load_las(use_store):
+    def run(files, work_dir):
+        from robust_las_parser import load_las_file
+        for path in files["wells"]:
+            las, error = load_las_file(path, use_cache=False, use_store=use_store)
+            if error:
+                raise RuntimeError(error)
+    return run
+
+
+def _evaluate_formation(files, work_dir):
+    from formation_evaluation import evaluate_formation
+    for path in files["wells"]:
+        result = evaluate_formation(path)
+        if "error" in result:
+            raise RuntimeError(result["error"])
+
+
+def _correlate_wells(files, work_dir):
+    from well_correlation import correlate_wells
+    result = correlate_wells(files["wells"], marker_curve="GR")
+    if "error" in result:
+        raise RuntimeError(result["error"])
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    "segy_parser.poststack_3d": _segy_parser("poststack_3d"),
+    "segy_parser.line_2d": _segy_parser("line_2d"),
+    "segy_parser.shot_gathers": _segy_parser("shot_gathers"),
+    "segy_parser.prestack_3d": _segy_parser("prestack_3d"),
+    "survey_classifier.poststack_3d": _survey_classifier("poststack_3d"),
+    "survey_classifier.line_2d": _survey_classifier("line_2d"),
+    "survey_classifier.shot_gathers": _survey_classifier("shot_gathers"),
+    "survey_classifier.prestack_3d": _survey_classifier("prestack_3d"),
+    "segy_qc.poststack_3d": _segy_qc("poststack_3d"),
+    "segy_qc.prestack_3d": _segy_qc("prestack_3d"),
+    "survey_polygon.poststack_3d": _survey_polygon("poststack_3d"),
+    "survey_polygon.line_2d": _survey_polygon("line_2d"),
+    "load_las.text": _load_las(use_store=False),
+    "load_las.store": _load_las(use_store=True),
+    "evaluate_formation": _evaluate_formation,
+    "correlate_wells": _correlate_wells
+}
+
+
+# -------------------------------------------------------------------- running
+
+def _bytes_read(process: psutil.Process) -> Optional[int]:
+    """Bytes read by the process so far (page cache hits included), if the OS reports it"""
+    try:
+        counters = process.io_counters()
+    except (AttributeError, psutil.Error):
+        return None
+    return getattr(counters, "read_chars", None) or counters.read_bytes
+
+
+def _peak_rss_mb(process: psutil.Process) -> float:
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    return round(process.memory_info().peak_wset / (1024 * 1024), 1)
+
+
+def _cache_environment(work_dir: str) -> Dict[str, str]:
+    """Point every on-disk cache of the engines into the work directory"""
+    cache_dir = os.path.join(work_dir, "caches")
+    return {
+        "SEGY_HEADER_INDEX_DIR": os.path.join(cache_dir, "segy_header_index"),
+        "LAS_STORE_DIR": os.path.join(cache_dir, "las_store"),
+        "SURVEY_CLASSIFICATION_CACHE": os.path.join(cache_dir, "segy_classification_cache.json"),
+        "TOOL_CACHE_DIR": os.path.join(cache_dir, "tool_result_cache"),
+        "TRACING_ENABLED": "false"
+    }
+
+
+def _run_in_child(name: str, files: Dict[str, Any], work_dir: str, repeats: int, connection):
+    """Child process body: run one benchmark and send its measurements back"""
+    os.environ.update(_cache_environment(work_dir))
+    logging.disable(logging.WARNING)
+    process = psutil.Process()
+    result: Dict[str, Any] = {"runs_seconds": [], "bytes_read": []}
+
+    try:
+        importlib.import_module(ENGINE_MODULES[name.split(".")[0]])
+        # Engines print progress and debug lines; keep the report readable
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for _ in range(repeats):
+                before = _bytes_read(process)
+                start = time.perf_counter()
+                BENCHMARKS[name](files, work_dir)
+                result["runs_seconds"].append(time.perf_counter() - start)
+                after = _bytes_read(process)
+                result["bytes_read"].append(after - before if before is not None else None)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["peak_rss_mb"] = _peak_rss_mb(process)
+    connection.send(result)
+    connection.close()
+
+
+def run_benchmark(name: str, files: Dict[str, Any], work_dir: str, repeats: int = DEFAULT_REPEATS,
+                  timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+    """
+    Run one benchmark in a fresh child process
+
+    Returns:
+        dict: cold/warm timings, peak RSS and bytes read (or error)
+    """
+    # spawn: the child starts from a clean interpreter, so imports and peak
+    # RSS are not inherited from this process
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    child = context.Process(target=_run_in_child, args=(name, files, work_dir, repeats, sender))
+    child.start()
+    sender.close()
+
+    raw = receiver.recv() if receiver.poll(timeout) else {"error": f"timed out after {timeout}s"}
+    child.join(10)
+    if child.is_alive():
+        child.kill()
+        child.join()
+
+    runs = raw.get("runs_seconds", [])
+    bytes_read = raw.get("bytes_read", [])
+    result: Dict[str, Any] = {
+        "repeats": len(runs),
+        "cold_seconds": round(runs[0], 4) if runs else None,
+        "warm_median_seconds": round(statistics.median(runs[1:]), 4) if len(runs) > 1 else None,
+        "runs_seconds": [round(r, 4) for r in runs],
+        "peak_rss_mb": raw.get("peak_rss_mb"),
+        "cold_bytes_read": bytes_read[0] if bytes_read else None,
+        "warm_bytes_read": bytes_read[-1] if len(bytes_read) > 1 else None
+    }
+    if "error" in raw:
+        result["error"] = raw["error"]
+    return result
+
+
+def run_suite(size: str = "small", seed: int = 0, repeats: int = DEFAULT_REPEATS,
+              only: Optional[List[str]] = None, work_dir: str = DEFAULT_WORK_DIR,
+              fresh_caches: bool = True) -> Dict[str, Any]:
+    """
+    Generate (or reuse) the dataset and run the selected benchmarks
+
+    Args:
+        size: Dataset size preset (see synthetic_data.SIZE_PRESETS)
+        seed: Dataset seed
+        repeats: Runs per benchmark; the first is reported as cold
+        only: Benchmark name prefixes to run (default all)
+        work_dir: Directory for the dataset and engine caches
+        fresh_caches: Remove engine caches first so cold runs are really cold
+    """
+    dataset_dir = os.path.join(work_dir, f"{size}-seed{seed}")
+    generation_start = time.perf_counter()
+    manifest = generate_dataset(dataset_dir, size=size, seed=seed)
+    generation_seconds = time.perf_counter() - generation_start
+
+    if fresh_caches:
+        shutil.rmtree(os.path.join(dataset_dir, "caches"), ignore_errors=True)
+
+    names = [n for n in BENCHMARKS if not only or any(n.startswith(prefix) for prefix in only)]
+    results = {}
+    for name in names:
+        logger.info(f"Running {name}")
+        results[name] = run_benchmark(name, manifest["files"], dataset_dir, repeats)
+        print(_format_line(name, results[name]), flush=True)
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "dataset": {
+            "size": size,
+            "seed": seed,
+            "generator_version": manifest["generator_version"],
+            "settings": manifest["settings"],
+            "generation_seconds": round(generation_seconds, 2)
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "memory_gb": round(psutil.virtual_memory().total / 1024 ** 3, 1)
+        },
+        "benchmarks": results
+    }
+
+
+def save_results(results: Dict[str, Any], results_dir: str = DEFAULT_RESULTS_DIR) -> str:
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(results_dir, f"benchmark_{results['dataset']['size']}_{stamp}.json")
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+# -------------------------------------------------------------------- reports
+
+def _format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "n/a"
+    return f"{value / (1024 * 1024):.1f}MB"
+
+
+def _format_line(name: str, result: Dict[str, Any]) -> str:
+    if "error" in result:
+        return f"{name:<34} ERROR {result['error']}"
+    warm = result["warm_median_seconds"]
+    return (f"{name:<34} cold {result['cold_seconds']:>8.3f}s  "
+            f"warm {warm if warm is not None else float('nan'):>8.3f}s  "
+            f"rss {result['peak_rss_mb']:>7.1f}MB  "
+            f"read {_format_bytes(result['cold_bytes_read'])}/{_format_bytes(result['warm_bytes_read'])}")
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = COMPARE_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Per-benchmark relative change of cold time, warm time and peak RSS
+
+    Returns:
+        list: one row per benchmark present in both runs, with a status of
+        'regression', 'improvement' or 'unchanged' (by warm time, else cold time)
+    """
+    rows = []
+    for name, new in current.get("benchmarks", {}).items():
+        old = baseline.get("benchmarks", {}).get(name)
+        if old is None or "error" in old or "error" in new:
+            continue
+        row = {"benchmark": name}
+        for metric in ("cold_seconds", "warm_median_seconds", "peak_rss_mb"):
+            if old.get(metric) and new.get(metric) is not None:
+                row[metric] = {"baseline": old[metric], "current": new[metric],
+                               "change": round((new[metric] - old[metric]) / old[metric], 4)}
+        key = "warm_median_seconds" if "warm_median_seconds" in row else "cold_seconds"
+        change = row.get(key, {}).get("change", 0.0)
+        row["status"] = "regression" if change > threshold else "improvement" if change < -threshold \
+            else "unchanged"
+        rows.append(row)
+    return rows
+
+
+def _print_comparison(rows: List[Dict[str, Any]]):
+    for row in rows:
+        parts = [f"{row['benchmark']:<34} {row['status']:<12}"]
+        for metric, label in (("cold_seconds", "cold"), ("warm_median_seconds", "warm"), ("peak_rss_mb", "rss")):
+            if metric in row:
+                parts.append(f"{label} {row[metric]['change'] * 100:+6.1f}%")
+        print("  ".join(parts))
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Benchmark the SEG-Y and LAS analysis engines on synthetic data")
+    parser.add_argument("--size", choices=sorted(SIZE_PRESETS), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--only", nargs="+", metavar="PREFIX", help="benchmark name prefixes to run")
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR)
+    parser.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+    parser.add_argument("--keep-caches", action="store_true", help="do not clear engine caches before running")
+    parser.add_argument("--list", action="store_true", help="list benchmark names")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="compare two result files")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+    elif args.compare:
+        with open(args.compare[0]) as f:
+            baseline_results = json.load(f)
+        with open(args.compare[1]) as f:
+            current_results = json.load(f)
+        _print_comparison(compare_results(baseline_results, current_results))
+    else:
+        suite_results = run_suite(args.size, args.seed, max(1, args.repeats), args.only, args.work_dir,
+                                  fresh_caches=not args.keep_caches)
+        print(f"Results saved to {save_results(suite_results, args.results_dir)}")
@@ -17,12 +17,17 @@ def _is_expired(agent):
 class Cleaner:
     def __init__(self, app_server):
         self.agents = app_server.agents
+        self.pool = getattr(app_server, 'pool', None)
         self.stopped = False
     def __main_loop(self):
         while not self.stopped:
             time.sleep(1)
             if uniform(0.0, 1.0) < 0.05:
                 print("Cleaner running")
+            if self.pool is not None:
+                # Pool applies idle TTL, killed-agent cleanup and memory cap
+                self.pool.maintain()
+                continue
             to_be_killed = []
             for a in self.agents:
                 agent = self.agents[a]
@@ -13,9 +13,11 @@ from typing import Optional
 
 from config.settings import Config
 from agents.meta_agent import MetaAgent
+from cli.qa_log import get_qa_log_writer, flush_qa_logs
 
 
-def save_qa_interaction(question: str, answer: str, log_format: str = "csv", log_dir: str = "./logs"):
+def save_qa_interaction(question: str, answer: str, log_format: str = "csv", log_dir: str = "./logs",
+                        async_writes: bool = True):
     """
     Save a question and answer interaction to a log file
 
@@ -24,6 +26,8 @@ def save_qa_interaction(question: str, answer: str, log_format: str = "csv", log
         answer: The system's answer
         log_format: Format to save in ('csv', 'json', or 'text')
         log_dir: Directory to save logs in
+        async_writes: For 'json', queue the entry to the background writer
+            instead of appending it synchronously
 
     Returns:
         str: Path to the saved log file
@@ -48,31 +52,10 @@ def save_qa_interaction(question: str, answer: str, log_format: str = "csv", log
                 writer.writerow(["Timestamp", "Question", "Answer"])
             writer.writerow([timestamp, question, answer])
 
-    elif log_format.lower() == "json":
-        # Use a daily JSON file with an array of interactions
-        log_file = log_path / f"qa_log_{date_only}.json"
-
-        # Load existing data if file exists
-        if log_file.exists():
-            try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    log_data = json.load(f)
-            except json.JSONDecodeError:
-                # Handle corrupted file
-                log_data = []
-        else:
-            log_data = []
-
-        # Add new interaction
-        log_data.append({
-            "timestamp": timestamp,
-            "question": question,
-            "answer": answer
-        })
-
-        # Write updated data
-        with open(log_file, 'w', encoding='utf-8') as f:
-            json.dump(log_data, f, indent=2, ensure_ascii=False)
+    elif log_format.lower() in ("json", "jsonl"):
+        # Append-only daily JSONL file (one interaction per line), see cli/qa_log.py
+        writer = get_qa_log_writer(log_dir, async_writes=async_writes)
+        log_file = writer.write(question, answer)
 
     else:  # Default to text format
         # Use a daily text file
@@ -359,7 +342,8 @@ class InteractiveShell:
                     user_input,
                     response,
                     log_format=self.config.logging.format,
-                    log_dir=self.config.logging.directory
+                    log_dir=self.config.logging.directory,
+                    async_writes=self.config.logging.async_writes
                 )
                 self.logger.debug(f"Interaction saved to {log_file}")
             except Exception as log_error:
@@ -382,7 +366,8 @@ class InteractiveShell:
                     user_input,
                     f"Error: {error_msg}",
                     log_format=self.config.logging.format,
-                    log_dir=self.config.logging.directory
+                    log_dir=self.config.logging.directory,
+                    async_writes=self.config.logging.async_writes
                 )
             except Exception:
                 pass  # Don't let logging errors break the shell
@@ -390,6 +375,7 @@ class InteractiveShell:
     def _print_goodbye(self):
         """Print goodbye message"""
         session_time = time.time() - self.session_start
+        flush_qa_logs()
 
         print("\n" + "=" * 60)
         print("GOODBYE!")
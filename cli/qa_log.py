@@ -0,0 +1,342 @@
+"""
+qa_log.py - Append-only JSONL log of Q&A interactions
+
+Each interaction is one JSON line in qa_log_<date>.jsonl. QALogWriter takes
+entries from a queue on the caller's thread and writes them from a
+background thread in batches (every batch_size entries or flush_interval
+seconds, whichever comes first), so logging costs the response path only a
+queue put. Files rotate per day and by size:
+
+    qa_log_2024-05-01.jsonl, qa_log_2024-05-01.1.jsonl, ...
+
+With async_writes=False every entry is appended synchronously instead.
+read_qa_logs streams entries back (including legacy qa_log_<date>.json
+arrays) with date and text filters.
+"""
+
+import os
+import re
+import json
+import time
+import queue
+import atexit
+import logging
+import datetime
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # per file before rotating, 0 = no size rotation
+DEFAULT_MAX_QUEUE = 10000
+
+_FILE_PATTERN = re.compile(r"^qa_log_(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.(jsonl|json)$")
+
+_STOP = object()
+
+
+class QALogWriter:
+    """Queue-fed, batched JSONL writer for one log directory"""
+
+    def __init__(self, log_dir: str = "./logs", async_writes: bool = True,
+                 batch_size: int = DEFAULT_BATCH_SIZE, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_queue: int = DEFAULT_MAX_QUEUE):
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.async_writes = async_writes
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+
+        # date -> (part, size) of the file currently written for that day (writer only)
+        self._files: Dict[str, List[int]] = {}
+        self._write_lock = threading.Lock()
+        # Held only briefly, never across disk I/O, so callers of write() never
+        # wait on the writer: guards the published part per day and the counters
+        self._state_lock = threading.Lock()
+        self._parts: Dict[str, int] = {}
+        self._counters = {"written": 0, "batches": 0, "dropped": 0, "write_errors": 0}
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        if async_writes:
+            self._thread = threading.Thread(target=self._run, name="qa-log-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def write(self, question: str, answer: str, **extra) -> str:
+        """Log one interaction; returns the path of the file it goes to"""
+        now = datetime.datetime.now()
+        entry = {"timestamp": now.strftime("%Y-%m-%d %H:%M:%S"), "question": question, "answer": answer}
+        entry.update(extra)
+        date = now.strftime("%Y-%m-%d")
+
+        if not self.async_writes or self._thread is None:
+            self._write_batch([(date, entry)])
+            return str(self.current_path(date))
+
+        try:
+            self._queue.put_nowait((date, entry))
+        except queue.Full:
+            # Never block the caller on a stalled disk
+            with self._state_lock:
+                self._counters["dropped"] += 1
+            logger.warning("Q&A log queue full, interaction dropped")
+        return str(self.current_path(date))
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait until every queued entry is on disk"""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        """Flush and stop the background thread"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout=10)
+        self._thread = None
+
+    def current_path(self, date: Optional[str] = None) -> Path:
+        """File entries of a day currently go to (does not wait for the writer)"""
+        date = date or datetime.datetime.now().strftime("%Y-%m-%d")
+        with self._state_lock:
+            part = self._parts.get(date)
+        if part is None:
+            # Day not written yet by this writer: newest part on disk
+            part = self._newest_part(date)
+        return self._path(date, part)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._state_lock:
+            counters = dict(self._counters)
+        return {
+            "log_dir": str(self.log_dir),
+            "async_writes": self.async_writes,
+            "queued": self._queue.qsize(),
+            **counters
+        }
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch, events, stop = [], [], False
+            deadline = None
+
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    events.append(item)
+                else:
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+
+                if stop or events or len(batch) >= self.batch_size:
+                    break
+                timeout = deadline - time.monotonic() if deadline else None
+                if timeout is not None and timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+            if stop:
+                # Drain whatever was queued before close()
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, threading.Event):
+                        events.append(item)
+                    elif item is not _STOP:
+                        batch.append(item)
+
+            if batch:
+                self._write_batch(batch)
+            for event in events:
+                event.set()
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[tuple]):
+        """Append entries to their day's file, rotating by size"""
+        with self._write_lock:
+            by_date: Dict[str, List[str]] = {}
+            for date, entry in batch:
+                by_date.setdefault(date, []).append(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+            for date, lines in by_date.items():
+                state = self._file_state(date)
+                chunk: List[str] = []
+                chunk_bytes = 0
+                for line in lines:
+                    size = len(line.encode("utf-8"))
+                    if self.max_bytes and state[1] + chunk_bytes + size > self.max_bytes \
+                            and state[1] + chunk_bytes > 0:
+                        self._append(date, state, chunk, chunk_bytes)
+                        state[0] += 1
+                        state[1] = 0
+                        self._publish_part(date, state[0])
+                        chunk, chunk_bytes = [], 0
+                    chunk.append(line)
+                    chunk_bytes += size
+                self._append(date, state, chunk, chunk_bytes)
+
+            with self._state_lock:
+                self._counters["batches"] += 1
+
+    def _append(self, date: str, state: List[int], lines: List[str], size: int):
+        if not lines:
+            return
+        try:
+            with open(self._path(date, state[0]), "a", encoding="utf-8") as f:
+                f.writelines(lines)
+            state[1] += size
+            with self._state_lock:
+                self._counters["written"] += len(lines)
+        except OSError as e:
+            with self._state_lock:
+                self._counters["write_errors"] += 1
+            logger.warning(f"Failed to write Q&A log: {e}")
+
+    def _file_state(self, date: str) -> List[int]:
+        """[part, size] of the newest file of a day, found on disk the first time"""
+        state = self._files.get(date)
+        if state is None:
+            part = self._newest_part(date)
+            path = self._path(date, part)
+            state = [part, path.stat().st_size if path.exists() else 0]
+            self._files = {d: s for d, s in self._files.items() if d >= date}
+            self._files[date] = state
+            self._publish_part(date, part)
+        return state
+
+    def _publish_part(self, date: str, part: int):
+        with self._state_lock:
+            self._parts = {d: p for d, p in self._parts.items() if d >= date}
+            self._parts[date] = part
+
+    def _newest_part(self, date: str) -> int:
+        part = 0
+        for path in self.log_dir.glob(f"qa_log_{date}*.jsonl"):
+            match = _FILE_PATTERN.match(path.name)
+            if match and match.group(1) == date:
+                part = max(part, int(match.group(2) or 0))
+        return part
+
+    def _path(self, date: str, part: int) -> Path:
+        suffix = f".{part}" if part else ""
+        return self.log_dir / f"qa_log_{date}{suffix}.jsonl"
+
+
+_writers: Dict[str, QALogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_qa_log_writer(log_dir: str = "./logs", async_writes: bool = True, **kwargs) -> QALogWriter:
+    """Process-wide writer of a log directory (created on first use)"""
+    key = f"{os.path.abspath(log_dir)}|{async_writes}"
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = QALogWriter(log_dir, async_writes=async_writes, **kwargs)
+            _writers[key] = writer
+        return writer
+
+
+def flush_qa_logs():
+    """Flush every process-wide writer"""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush(timeout=10)
+
+
+def read_qa_logs(log_dir: str = "./logs", start_date: Optional[str] = None, end_date: Optional[str] = None,
+                 contains: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream logged interactions in chronological file order
+
+    Args:
+        log_dir: Log directory
+        start_date: First day to include (YYYY-MM-DD)
+        end_date: Last day to include (YYYY-MM-DD)
+        contains: Case-insensitive text the question or answer must contain
+        limit: Maximum number of entries
+
+    Yields:
+        dict: timestamp, question, answer (plus any extra fields)
+    """
+    files = []
+    for path in Path(log_dir).glob("qa_log_*.json*"):
+        match = _FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        date = match.group(1)
+        if (start_date and date < start_date) or (end_date and date > end_date):
+            continue
+        # Legacy JSON arrays of a day sort before its JSONL parts
+        part = -1 if match.group(3) == "json" else int(match.group(2) or 0)
+        files.append((date, part, path))
+
+    needle = contains.lower() if contains else None
+    count = 0
+    for _, part, path in sorted(files):
+        entries = _read_legacy_json(path) if part < 0 else _read_jsonl(path)
+        for entry in entries:
+            if needle and needle not in str(entry.get("question", "")).lower() \
+                    and needle not in str(entry.get("answer", "")).lower():
+                continue
+            yield entry
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+
+def _read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # A torn last line from a crash should not hide the rest of the log
+                logger.warning(f"Skipping malformed line {line_number} in {path.name}")
+
+
+def _read_legacy_json(path: Path) -> Iterator[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Could not read {path.name}: {e}")
+        return
+    for entry in data if isinstance(data, list) else []:
+        yield entry
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Stream and filter Q&A interaction logs")
+    parser.add_argument("--log-dir", default=os.getenv("LOG_DIR", "./logs"))
+    parser.add_argument("--since", help="first day (YYYY-MM-DD)")
+    parser.add_argument("--until", help="last day (YYYY-MM-DD)")
+    parser.add_argument("--contains", help="text in question or answer")
+    parser.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    for entry in read_qa_logs(args.log_dir, args.since, args.until, args.contains, args.limit):
+        print(json.dumps(entry, ensure_ascii=False))
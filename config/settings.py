@@ -8,6 +8,8 @@ from dataclasses import dataclass, field
 from typing import List, Optional
 from pathlib import Path
 
+from tools.result_cache import DEFAULT_CACHE_DIR as DEFAULT_TOOL_CACHE_DIR
+
 
 @dataclass
 class A2AConfig:
@@ -30,6 +32,9 @@ class MCPConfig:
     port: int = 7000
     host: str = "localhost"
     timeout: int = 30
+    connect_timeout: float = 5.0
+    pool_size: int = 10  # keep-alive connections per MCP server
+    max_batch_calls: int = 32
 
     @property
     def url(self) -> str:
@@ -55,14 +60,16 @@ class MonitoringConfig:
     metrics_retention_days: int = 30
     performance_tracking: bool = True
     dashboard_enabled: bool = True
+    metrics_capacity: int = 10000  # Most recent queries kept for exact window statistics
 
 
 @dataclass
 class LoggingConfig:
     """Logging Configuration"""
     level: str = "INFO"
-    format: str = "csv"  # csv, json, text
+    format: str = "csv"  # csv, json (JSONL), text
     directory: str = "./logs"
+    async_writes: bool = True  # Write JSON Q&A logs from a background thread
 
     def __post_init__(self):
         # Ensure log directory exists
@@ -75,6 +82,11 @@ class DataConfig:
     data_dir: str = "./data"
     file_extensions: List[str] = field(default_factory=lambda: [".las", ".LAS", ".sgy", ".segy", ".SGY", ".SEGY"])
     max_files_batch: int = 50
+    las_cache_mb: float = 512  # Memory budget of the parsed-LAS cache
+    tool_cache_enabled: bool = True  # Memoize deterministic MCP tool results
+    tool_cache_dir: str = DEFAULT_TOOL_CACHE_DIR
+    tool_cache_memory_mb: float = 128
+    tool_cache_disk_mb: float = 1024
 
     def __post_init__(self):
         # Ensure data directory exists
@@ -115,10 +127,14 @@ def load_config() -> Config:
 
     Environment Variables:
     - DATA_DIR: Data directory path
+    - LAS_CACHE_MB: Memory budget of the parsed-LAS cache
+    - TOOL_CACHE_ENABLED / TOOL_CACHE_DIR / TOOL_CACHE_MEMORY_MB / TOOL_CACHE_DISK_MB: tool result cache
     - A2A_PORT: A2A server port
     - MCP_PORT: MCP server port
+    - MCP_POOL_SIZE / MCP_TIMEOUT / MCP_CONNECT_TIMEOUT: MCP client connection pool
     - OPENAI_MODEL: OpenAI model name
     - LOG_LEVEL: Logging level
+    - LOG_FORMAT / LOG_DIR / LOG_ASYNC: Q&A interaction log
     - DEBUG: Enable debug mode
     """
 
@@ -126,7 +142,12 @@ def load_config() -> Config:
     config = Config(
         # Data configuration
         data=DataConfig(
-            data_dir=os.getenv("DATA_DIR", "./data")
+            data_dir=os.getenv("DATA_DIR", "./data"),
+            las_cache_mb=float(os.getenv("LAS_CACHE_MB", "512")),
+            tool_cache_enabled=os.getenv("TOOL_CACHE_ENABLED", "true").lower() == "true",
+            tool_cache_dir=DEFAULT_TOOL_CACHE_DIR,
+            tool_cache_memory_mb=float(os.getenv("TOOL_CACHE_MEMORY_MB", "128")),
+            tool_cache_disk_mb=float(os.getenv("TOOL_CACHE_DISK_MB", "1024"))
         ),
 
         # A2A configuration
@@ -141,7 +162,11 @@ def load_config() -> Config:
         # MCP configuration
         mcp=MCPConfig(
             port=int(os.getenv("MCP_PORT", "7000")),
-            host=os.getenv("MCP_HOST", "localhost")
+            host=os.getenv("MCP_HOST", "localhost"),
+            timeout=int(os.getenv("MCP_TIMEOUT", "30")),
+            connect_timeout=float(os.getenv("MCP_CONNECT_TIMEOUT", "5.0")),
+            pool_size=int(os.getenv("MCP_POOL_SIZE", "10")),
+            max_batch_calls=int(os.getenv("MCP_MAX_BATCH_CALLS", "32"))
         ),
 
         # Agent configuration
@@ -161,7 +186,8 @@ def load_config() -> Config:
         logging=LoggingConfig(
             level=os.getenv("LOG_LEVEL", "INFO"),
             format=os.getenv("LOG_FORMAT", "csv"),
-            directory=os.getenv("LOG_DIR", "./logs")
+            directory=os.getenv("LOG_DIR", "./logs"),
+            async_writes=os.getenv("LOG_ASYNC", "true").lower() == "true"
         ),
 
         # Feature flags
@@ -0,0 +1,179 @@
+"""
+dtw_engine.py - Banded, vectorized Dynamic Time Warping for log curve matching
+
+This module replaces the pure-Python double loop DTW used by well correlation.
+The accumulated cost matrix is filled one anti-diagonal (wavefront) at a time
+with NumPy, so every cell of a diagonal - and every candidate of a batch - is
+computed in a single vectorized step. Only three diagonals are kept in memory.
+
+Features:
+- Sakoe-Chiba band constraint (|i - j| <= window)
+- Early abandoning once no warping path can stay under a distance threshold
+- Batched scoring of one reference sequence against many candidates, or of
+  many (reference, candidate) pairs in one sweep
+"""
+
+import math
+import numpy as np
+from typing import Optional, Sequence, Union
+
+
+def dtw_distance(x, y, window: Optional[int] = None,
+                 max_distance: Optional[float] = None) -> float:
+    """
+    DTW distance between two sequences using absolute difference cost
+
+    Args:
+        x: First sequence
+        y: Second sequence
+        window: Sakoe-Chiba band half-width in samples (None = unconstrained)
+        max_distance: Abandon and return inf once the distance must exceed this
+
+    Returns:
+        float: DTW distance between sequences (inf if abandoned or unreachable)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    thresholds = None if max_distance is None else np.array([max_distance], dtype=np.float64)
+    return float(_wavefront_dtw(x[np.newaxis, :], y[np.newaxis, :], window, thresholds)[0])
+
+
+def dtw_distances(reference, candidates: Sequence, window: Optional[int] = None,
+                  max_distances: Union[float, Sequence[float], None] = None) -> np.ndarray:
+    """
+    Batched DTW: score one reference sequence against all candidate sequences
+
+    Candidates of equal length are stacked and computed in one wavefront sweep.
+
+    Args:
+        reference: Reference sequence
+        candidates: Candidate sequences (lengths may differ)
+        window: Sakoe-Chiba band half-width in samples (None = unconstrained)
+        max_distances: Early-abandon threshold, scalar or one per candidate
+
+    Returns:
+        np.ndarray: DTW distance per candidate (inf where abandoned)
+    """
+    return dtw_distances_paired([reference] * len(candidates), candidates,
+                                window=window, max_distances=max_distances)
+
+
+def dtw_distances_paired(references: Sequence, candidates: Sequence, window: Optional[int] = None,
+                         max_distances: Union[float, Sequence[float], None] = None) -> np.ndarray:
+    """
+    Batched DTW over (reference, candidate) pairs
+
+    Pairs with the same reference and candidate lengths are stacked and
+    computed in one wavefront sweep, so scoring many short segments costs a
+    handful of NumPy passes instead of one Python loop per pair.
+
+    Args:
+        references: Reference sequence of each pair
+        candidates: Candidate sequence of each pair
+        window: Sakoe-Chiba band half-width in samples (None = unconstrained)
+        max_distances: Early-abandon threshold, scalar or one per pair
+
+    Returns:
+        np.ndarray: DTW distance per pair (inf where abandoned)
+    """
+    if len(references) != len(candidates):
+        raise ValueError("references and candidates must have the same number of sequences")
+
+    distances = np.full(len(candidates), np.inf)
+    if len(candidates) == 0:
+        return distances
+
+    if max_distances is None:
+        thresholds = None
+    else:
+        thresholds = np.broadcast_to(np.asarray(max_distances, dtype=np.float64),
+                                     (len(candidates),))
+
+    # Group pairs by shape so each group is one rectangular batch
+    groups = {}
+    for idx, (reference, candidate) in enumerate(zip(references, candidates)):
+        groups.setdefault((len(reference), len(candidate)), []).append(idx)
+
+    for (n, m), indices in groups.items():
+        x_batch = np.array([np.asarray(references[i], dtype=np.float64) for i in indices])
+        y_batch = np.array([np.asarray(candidates[i], dtype=np.float64) for i in indices])
+        group_thresholds = None if thresholds is None else thresholds[indices]
+        distances[indices] = _wavefront_dtw(x_batch.reshape(len(indices), n),
+                                            y_batch.reshape(len(indices), m),
+                                            window, group_thresholds)
+
+    return distances
+
+
+def max_distance_for_confidence(best_confidence: float, length: int, depth_score: float,
+                                similarity_weight: float = 0.7, depth_weight: float = 0.3) -> float:
+    """
+    Largest DTW distance that can still beat best_confidence in correlate_segments scoring
+
+    confidence = similarity_weight * max(0, 1 - distance / length) + depth_weight * depth_score
+
+    Returns inf when the candidate cannot be ruled out by its distance alone.
+    """
+    floor_confidence = depth_weight * depth_score
+    if length <= 0 or floor_confidence > best_confidence:
+        # Even a zero similarity would win, so never abandon
+        return np.inf
+
+    limit = length * (1.0 - (best_confidence - floor_confidence) / similarity_weight)
+    # Keep a small margin so rounding never abandons a tie-breaking candidate
+    return max(limit, 0.0) * (1.0 + 1e-9) + 1e-12
+
+
+def _wavefront_dtw(x_batch: np.ndarray, y_batch: np.ndarray, window: Optional[int],
+                   thresholds: Optional[np.ndarray]) -> np.ndarray:
+    """Anti-diagonal DTW of each row of x_batch (K x n) against the same row of y_batch (K x m)"""
+    k_count, n = x_batch.shape
+    m = y_batch.shape[1]
+
+    if n == 0 or m == 0:
+        return np.full(k_count, 0.0 if n == m else np.inf)
+
+    if window is not None:
+        # The band must at least reach the corner of a rectangular matrix
+        window = max(int(window), abs(n - m))
+
+    # diag_*[:, i] holds D[i, d - i] for anti-diagonal d = i + j
+    diag_prev2 = np.full((k_count, n + 1), np.inf)
+    diag_prev1 = np.full((k_count, n + 1), np.inf)
+    diag_cur = np.empty((k_count, n + 1))
+    diag_prev2[:, 0] = 0.0  # D[0, 0]
+
+    abandoned = np.zeros(k_count, dtype=bool)
+
+    for d in range(2, n + m + 1):
+        diag_cur.fill(np.inf)
+
+        lo = max(1, d - m)
+        hi = min(n, d - 1)
+        if window is not None:
+            # |i - j| = |2i - d| <= window
+            lo = max(lo, math.ceil((d - window) / 2))
+            hi = min(hi, (d + window) // 2)
+
+        if lo <= hi:
+            i = np.arange(lo, hi + 1)
+            cost = np.abs(x_batch[:, i - 1] - y_batch[:, d - i - 1])
+            diag_cur[:, i] = cost + np.minimum(
+                np.minimum(diag_prev1[:, i - 1],   # insertion
+                           diag_prev1[:, i]),      # deletion
+                diag_prev2[:, i - 1]               # match
+            )
+
+        if thresholds is not None:
+            # Every warping path crosses one of two consecutive anti-diagonals,
+            # so their minimum is a lower bound on the final distance
+            lower_bound = np.minimum(diag_cur.min(axis=1), diag_prev1.min(axis=1))
+            abandoned |= lower_bound > thresholds
+            if abandoned.all():
+                break
+
+        diag_prev2, diag_prev1, diag_cur = diag_prev1, diag_cur, diag_prev2
+
+    distances = diag_prev1[:, n].copy()
+    distances[abandoned] = np.inf
+    return distances
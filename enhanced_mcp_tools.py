@@ -17,6 +17,9 @@ from robust_las_parser import (
     perform_quality_check
 )
 
+# Worker processes per correlation search run by a tool call
+CORRELATION_MAX_WORKERS = int(os.getenv("CORRELATION_MAX_WORKERS", "4"))
+
 
 # Define custom JSON encoder for NumPy types
 class NumpyJSONEncoder(json.JSONEncoder):
@@ -792,11 +795,12 @@ def enhanced_formation_evaluation(file_path=None, data_dir="./data", llm_agent=N
             - max_files: Maximum number of files to process when selection_mode="all"
             - file_paths: List of specific file paths to process
             - file_indices: List of indices to select from matched files
+            - max_workers: Worker processes for multi-well evaluation (default: CPU count)
 
     Returns:
         dict: Tool response with JSON text
     """
-    from formation_evaluation import evaluate_formation, create_formation_evaluation_summary
+    from formation_evaluation import evaluate_formation, evaluate_formations, create_formation_evaluation_summary
 
     try:
         # Extract parameters
@@ -805,6 +809,7 @@ def enhanced_formation_evaluation(file_path=None, data_dir="./data", llm_agent=N
         max_files = int(kwargs.pop('max_files', 5))
         file_paths = kwargs.pop('file_paths', None)  # Specific paths to use
         file_indices = kwargs.pop('file_indices', None)  # Indices to select from matches
+        max_workers = kwargs.pop('max_workers', None)  # Processes for multi-well evaluation
 
         # Handle keyword arguments
         if 'input' in kwargs:
@@ -819,6 +824,8 @@ def enhanced_formation_evaluation(file_path=None, data_dir="./data", llm_agent=N
                         selection_mode = input_data['selection_mode']
                     if 'max_files' in input_data:
                         max_files = int(input_data['max_files'])
+                    if 'max_workers' in input_data:
+                        max_workers = int(input_data['max_workers'])
                     if 'file_paths' in input_data:
                         file_paths = input_data['file_paths']
                     if 'file_indices' in input_data:
@@ -995,64 +1002,38 @@ def enhanced_formation_evaluation(file_path=None, data_dir="./data", llm_agent=N
                 "evaluations": []
             }
 
-            # Process each file
-            for file_path in selected_files:
-                try:
-                    las, error = load_las_file(file_path)
-
-                    if error:
-                        multi_file_results["evaluations"].append({
-                            "file": os.path.basename(file_path),
-                            "error": error
-                        })
-                        continue
-
-                    # Extract parameters from kwargs
-                    gr_curve = kwargs.get('gr_curve', "GR")
-                    density_curve = kwargs.get('density_curve', "RHOB")
-                    resistivity_curve = kwargs.get('resistivity_curve', "RT")
-                    neutron_curve = kwargs.get('neutron_curve', "NPHI")
-                    rw = float(kwargs.get('rw', 0.1))
-                    vsh_cutoff = float(kwargs.get('vsh_cutoff', 0.5))
-                    porosity_cutoff = float(kwargs.get('porosity_cutoff', 0.1))
-                    sw_cutoff = float(kwargs.get('sw_cutoff', 0.7))
-
-                    # Perform formation evaluation
-                    result = evaluate_formation(
-                        las,
-                        gr_curve=gr_curve,
-                        density_curve=density_curve,
-                        resistivity_curve=resistivity_curve,
-                        neutron_curve=neutron_curve,
-                        rw=rw,
-                        vsh_cutoff=vsh_cutoff,
-                        porosity_cutoff=porosity_cutoff,
-                        sw_cutoff=sw_cutoff
-                    )
-
-                    # Create summary
-                    summary = create_formation_evaluation_summary(result)
-
-                    # Add essential info to results
-                    file_result = {
-                        "file": os.path.basename(file_path),
-                        "well_name": result.get("well_name", "Unknown"),
-                        "depth_range": result.get("depth_range", [0, 0]),
-                        "formation_properties": result.get("formation_properties", {}),
-                        "pay_summary": {
-                            "net_pay": result.get("pay_summary", {}).get("net_pay", 0),
-                            "num_zones": result.get("pay_summary", {}).get("num_zones", 0)
-                        },
-                        "text_summary": summary
-                    }
-
-                    multi_file_results["evaluations"].append(file_result)
+            # Evaluate the wells across a process pool; results stream back as wells finish
+            params = {
+                "gr_curve": kwargs.get('gr_curve', "GR"),
+                "density_curve": kwargs.get('density_curve', "RHOB"),
+                "resistivity_curve": kwargs.get('resistivity_curve', "RT"),
+                "neutron_curve": kwargs.get('neutron_curve', "NPHI"),
+                "rw": float(kwargs.get('rw', 0.1)),
+                "vsh_cutoff": float(kwargs.get('vsh_cutoff', 0.5)),
+                "porosity_cutoff": float(kwargs.get('porosity_cutoff', 0.1)),
+                "sw_cutoff": float(kwargs.get('sw_cutoff', 0.7))
+            }
+            evaluations = {}
+            for result in evaluate_formations(selected_files, max_workers=max_workers, **params):
+                file_name = os.path.basename(result["file"])
+                if "error" in result:
+                    evaluations[result["file"]] = {"file": file_name, "error": result["error"]}
+                    continue
+
+                evaluations[result["file"]] = {
+                    "file": file_name,
+                    "well_name": result.get("well_name", "Unknown"),
+                    "depth_range": result.get("depth_range", [0, 0]),
+                    "formation_properties": result.get("formation_properties", {}),
+                    "pay_summary": {
+                        "net_pay": result.get("pay_summary", {}).get("net_pay", 0),
+                        "num_zones": result.get("pay_summary", {}).get("num_zones", 0)
+                    },
+                    "text_summary": create_formation_evaluation_summary(result)
+                }
 
-                except Exception as e:
-                    multi_file_results["evaluations"].append({
-                        "file": os.path.basename(file_path),
-                        "error": str(e)
-                    })
+            # Report wells in the order they were selected
+            multi_file_results["evaluations"] = [evaluations[f] for f in selected_files]
 
             # Add aggregated statistics
             valid_evaluations = [e for e in multi_file_results["evaluations"] if "error" not in e]
@@ -1503,21 +1484,13 @@ def enhanced_well_correlation_with_qc(well_list=None, marker_curve="GR", data_di
 
 def try_multiple_curves_and_params(well_files):
     """Try correlation with multiple curves and parameters"""
-    from robust_las_parser import load_las_file
-    from well_correlation import correlate_wells
+    from well_correlation import CorrelationSession
 
-    # Find common curves
-    common_curves = None
-    for file_path in well_files:
-        las, error = load_las_file(file_path)
-        if error:
-            continue
+    # Wells are loaded once and shared by every curve/parameter combination
+    session = CorrelationSession(well_files)
 
-        file_curves = set(las.get_curve_names())
-        if common_curves is None:
-            common_curves = file_curves
-        else:
-            common_curves = common_curves.intersection(file_curves)
+    # Find common curves
+    common_curves = session.common_curves()
 
     if not common_curves:
         return {"error": "No common curves found across wells"}
@@ -1527,7 +1500,7 @@ def try_multiple_curves_and_params(well_files):
     test_curves = [curve for curve in priority_curves if curve in common_curves]
 
     # Add other curves
-    for curve in common_curves:
+    for curve in sorted(common_curves):
         if curve not in test_curves and not curve.upper().startswith(('DEPT', 'DEPTH')):
             test_curves.append(curve)
 
@@ -1539,34 +1512,13 @@ def try_multiple_curves_and_params(well_files):
         {"depth_tolerance": 20.0, "prominence": 0.25, "min_distance": 12},
     ]
 
-    best_result = None
-    best_score = 0
-
-    for curve in test_curves:
-        for params in param_sets:
-            try:
-                result = correlate_wells(
-                    well_files,
-                    marker_curve=curve,
-                    **params
-                )
-
-                if "error" not in result and result.get("formation_count", 0) > 0:
-                    # Calculate score
-                    formation_count = result["formation_count"]
-                    avg_confidence = sum(
-                        top.get("confidence", 0) for top in result.get("formation_tops", [])
-                    ) / formation_count
-                    score = formation_count * avg_confidence
-
-                    if score > best_score:
-                        best_score = score
-                        best_result = result
-                        best_result["best_curve"] = curve
-                        best_result["best_params"] = params
+    search = session.search(test_curves, param_sets, max_workers=CORRELATION_MAX_WORKERS)
 
-            except Exception as e:
-                continue
+    best_result = search["best"]
+    if best_result:
+        best_result["best_curve"] = search["best_curve"]
+        best_result["best_params"] = search["best_params"]
+        best_result["score_table"] = search["score_table"]
 
     return best_result
 
@@ -7,17 +7,38 @@ from well log data, including:
 - Effective porosity
 - Water saturation
 - Pay zone identification
+- Cutoff sensitivity sweeps (net-pay P90/P50/P10 distributions)
 """
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, List, Any, Iterator, Optional, Union, Tuple
 import os
 import json
+import logging
 import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Import the robust LAS parser (adjust path if needed)
 from robust_las_parser import load_las_file, RobustLASFile
+from utils.tracing import span, traced
+
+logger = logging.getLogger(__name__)
+
+# Thinnest interval reported as a pay zone (depth units)
+MIN_PAY_THICKNESS = 0.5
+
+# Cutoff-sensitivity parameters and their evaluate_formation defaults (the base case)
+SENSITIVITY_BASE_CASE = {"vsh_cutoff": 0.5, "porosity_cutoff": 0.1, "sw_cutoff": 0.7, "rw": 0.1}
+# Monte Carlo ranges (low, high) sampled when no grid or ranges are given
+DEFAULT_SENSITIVITY_RANGES = {
+    "vsh_cutoff": (0.3, 0.6),
+    "porosity_cutoff": (0.06, 0.14),
+    "sw_cutoff": (0.5, 0.8),
+    "rw": (0.05, 0.2)
+}
+# Scenario x sample elements evaluated per broadcast chunk (bounds sweep memory)
+SENSITIVITY_CHUNK_ELEMENTS = 4_000_000
 
 
 class NumpyJSONEncoder(json.JSONEncoder):
@@ -223,82 +244,119 @@ def identify_pay_zones(depth: np.ndarray,
     if not (len(depth) == len(vshale) == len(porosity) == len(sw)):
         raise ValueError("All arrays must have the same length")
 
-    # Create pay flag array (1 for pay, 0 for non-pay)
-    pay_flag = np.zeros_like(depth)
-    valid_mask = ~np.isnan(vshale) & ~np.isnan(porosity) & ~np.isnan(sw)
-
-    # Apply cutoffs
-    pay_conditions = (
-            (vshale[valid_mask] <= vsh_cutoff) &
-            (porosity[valid_mask] >= porosity_cutoff) &
-            (sw[valid_mask] <= sw_cutoff)
-    )
-
-    # Set pay flag
-    pay_flag[valid_mask] = np.where(pay_conditions, 1, 0)
-
-    # Find pay zone boundaries
-    pay_zones = []
-    in_pay_zone = False
-    start_idx = None
-
-    for i in range(len(pay_flag)):
-        if pay_flag[i] == 1 and not in_pay_zone:
-            # Start of new pay zone
-            in_pay_zone = True
-            start_idx = i
-        elif pay_flag[i] == 0 and in_pay_zone:
-            # End of pay zone
-            in_pay_zone = False
-            end_idx = i - 1
-
-            # Calculate zone properties
-            zone_depth = depth[start_idx:end_idx + 1]
-            zone_vsh = vshale[start_idx:end_idx + 1]
-            zone_porosity = porosity[start_idx:end_idx + 1]
-            zone_sw = sw[start_idx:end_idx + 1]
-
-            # Only include zones with minimum thickness (e.g., 0.5m)
-            thickness = zone_depth[-1] - zone_depth[0]
-            if thickness >= 0.5:  # Minimum 0.5m thickness
-                pay_zones.append({
-                    "start_depth": float(zone_depth[0]),
-                    "end_depth": float(zone_depth[-1]),
-                    "thickness": float(thickness),
-                    "avg_vshale": float(np.mean(zone_vsh)),
-                    "avg_porosity": float(np.mean(zone_porosity)),
-                    "avg_sw": float(np.mean(zone_sw)),
-                    "hc_saturation": float(1 - np.mean(zone_sw)),  # Hydrocarbon saturation
-                    "net_pay": float(thickness)
-                })
-
-    # Handle case where file ends while still in pay zone
-    if in_pay_zone:
-        end_idx = len(pay_flag) - 1
-
-        # Calculate zone properties
-        zone_depth = depth[start_idx:end_idx + 1]
-        zone_vsh = vshale[start_idx:end_idx + 1]
-        zone_porosity = porosity[start_idx:end_idx + 1]
-        zone_sw = sw[start_idx:end_idx + 1]
-
-        # Only include zones with minimum thickness (e.g., 0.5m)
-        thickness = zone_depth[-1] - zone_depth[0]
-        if thickness >= 0.5:  # Minimum 0.5m thickness
-            pay_zones.append({
-                "start_depth": float(zone_depth[0]),
-                "end_depth": float(zone_depth[-1]),
-                "thickness": float(thickness),
-                "avg_vshale": float(np.mean(zone_vsh)),
-                "avg_porosity": float(np.mean(zone_porosity)),
-                "avg_sw": float(np.mean(zone_sw)),
-                "hc_saturation": float(1 - np.mean(zone_sw)),  # Hydrocarbon saturation
-                "net_pay": float(thickness)
-            })
-
-    return pay_zones
+    depth = np.asarray(depth, dtype=np.float64)
+
+    # Pay flag: valid samples passing every cutoff (NaN comparisons are False)
+    with np.errstate(invalid="ignore"):
+        pay_flag = (vshale <= vsh_cutoff) & (porosity >= porosity_cutoff) & (sw <= sw_cutoff)
+    pay_flag &= ~np.isnan(vshale) & ~np.isnan(porosity) & ~np.isnan(sw)
+
+    # Run-length boundaries: zone i covers samples [starts[i], ends[i])
+    edges = np.diff(np.concatenate(([0], pay_flag.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) == 0:
+        return []
+
+    # Only include zones with minimum thickness
+    thickness = depth[ends - 1] - depth[starts]
+    keep = thickness >= MIN_PAY_THICKNESS
+    if not keep.any():
+        return []
+
+    # Per-zone sums over [start, end) in one reduceat; the odd slots are the gaps between zones
+    bounds = np.column_stack((starts, ends)).ravel()
+    counts = ends - starts
+
+    def zone_means(values):
+        padded = np.append(np.asarray(values, dtype=np.float64), 0.0)
+        return np.add.reduceat(padded, bounds)[::2] / counts
+
+    avg_vsh = zone_means(vshale)
+    avg_porosity = zone_means(porosity)
+    avg_sw = zone_means(sw)
+
+    return [
+        {
+            "start_depth": float(depth[start]),
+            "end_depth": float(depth[end - 1]),
+            "thickness": float(zone_thickness),
+            "avg_vshale": float(vsh),
+            "avg_porosity": float(phi),
+            "avg_sw": float(zone_sw),
+            "hc_saturation": float(1 - zone_sw),  # Hydrocarbon saturation
+            "net_pay": float(zone_thickness)
+        }
+        for start, end, zone_thickness, vsh, phi, zone_sw
+        in zip(starts[keep], ends[keep], thickness[keep], avg_vsh[keep], avg_porosity[keep], avg_sw[keep])
+    ]
+
+
+def _petrophysics_curves(las_file: Union[str, RobustLASFile],
+                         gr_curve: str, density_curve: str, resistivity_curve: str, neutron_curve: str,
+                         matrix_density: float, fluid_density: float) -> Dict[str, Any]:
+    """
+    Load a well and compute the cutoff-independent curves (Vshale, effective porosity)
+
+    Shared by evaluate_formation and cutoff_sensitivity. Returns an error dict
+    if the file cannot be loaded or required curves are missing.
+    """
+    # Load LAS file if string path is provided
+    if isinstance(las_file, str):
+        with span("formation.load_las"):
+            las, error = load_las_file(las_file)
+        if error:
+            return {"error": error}
+    else:
+        las = las_file
+
+    # Check for required curves
+    required_curves = [gr_curve, density_curve, resistivity_curve]
+    missing_curves = [curve for curve in required_curves if not las.curve_exists(curve)]
+
+    if missing_curves:
+        return {
+            "error": f"Missing required curves: {', '.join(missing_curves)}",
+            "available_curves": las.get_curve_names()
+        }
+
+    # Extract curve data
+    depth = las.index
+    gr_data = las.get_curve_data(gr_curve)
+    density_data = las.get_curve_data(density_curve)
+
+    # Extract neutron data if available
+    neutron_data = None
+    if neutron_curve and las.curve_exists(neutron_curve):
+        neutron_data = las.get_curve_data(neutron_curve)
+
+    with span("formation.petrophysics", samples=len(depth)):
+        vshale = estimate_vshale(gr_data)
+        density_porosity = calculate_porosity(density_data, matrix_density, fluid_density)
+
+        # Use density porosity as total porosity, or average with neutron if available
+        if neutron_data is not None:
+            # For limestone scale (typical neutron log), convert neutron values if needed
+            # Assuming neutron values are already in fraction, not percentage
+            neutron_porosity = np.clip(neutron_data, 0, 0.5)
+            # Calculate total porosity as average of density and neutron
+            total_porosity = (density_porosity + neutron_porosity) / 2
+        else:
+            total_porosity = density_porosity
+
+        effective_porosity = calculate_effective_porosity(total_porosity, vshale)
+
+    return {
+        "las": las,
+        "depth": depth,
+        "vshale": vshale,
+        "effective_porosity": effective_porosity,
+        "resistivity": las.get_curve_data(resistivity_curve),
+        "neutron": neutron_data
+    }
 
 
+@traced("evaluate_formation")
 def evaluate_formation(las_file: Union[str, RobustLASFile],
                        gr_curve: str = "GR",
                        density_curve: str = "RHOB",
@@ -329,60 +387,22 @@ def evaluate_formation(las_file: Union[str, RobustLASFile],
     Returns:
         Dict: Evaluation results including Vshale, porosity, water saturation, and pay zones
     """
-    # Load LAS file if string path is provided
-    if isinstance(las_file, str):
-        las, error = load_las_file(las_file)
-        if error:
-            return {"error": error}
-    else:
-        las = las_file
-
-    # Extract depth and curves
-    depth = las.index
-
-    # Check for required curves
-    required_curves = [gr_curve, density_curve, resistivity_curve]
-    missing_curves = [curve for curve in required_curves if not las.curve_exists(curve)]
-
-    if missing_curves:
-        return {
-            "error": f"Missing required curves: {', '.join(missing_curves)}",
-            "available_curves": las.get_curve_names()
-        }
-
-    # Extract curve data
-    gr_data = las.get_curve_data(gr_curve)
-    density_data = las.get_curve_data(density_curve)
-    resistivity_data = las.get_curve_data(resistivity_curve)
-
-    # Extract neutron data if available
-    neutron_data = None
-    if neutron_curve and las.curve_exists(neutron_curve):
-        neutron_data = las.get_curve_data(neutron_curve)
-
-    # Perform calculations
-    vshale = estimate_vshale(gr_data)
-    density_porosity = calculate_porosity(density_data, matrix_density, fluid_density)
-
-    # Use density porosity as total porosity, or average with neutron if available
-    if neutron_data is not None:
-        # For limestone scale (typical neutron log), convert neutron values if needed
-        # Assuming neutron values are already in fraction, not percentage
-        neutron_porosity = np.clip(neutron_data, 0, 0.5)
-        # Calculate total porosity as average of density and neutron
-        total_porosity = (density_porosity + neutron_porosity) / 2
-    else:
-        total_porosity = density_porosity
+    curves = _petrophysics_curves(las_file, gr_curve, density_curve, resistivity_curve, neutron_curve,
+                                  matrix_density, fluid_density)
+    if "error" in curves:
+        return curves
+    las, depth = curves["las"], curves["depth"]
+    vshale, effective_porosity = curves["vshale"], curves["effective_porosity"]
+    neutron_data = curves["neutron"]
 
-    # Calculate effective porosity and water saturation
-    effective_porosity = calculate_effective_porosity(total_porosity, vshale)
-    sw = calculate_water_saturation(resistivity_data, effective_porosity, rw)
+    sw = calculate_water_saturation(curves["resistivity"], effective_porosity, rw)
 
     # Identify potential pay zones
-    pay_zones = identify_pay_zones(
-        depth, vshale, effective_porosity, sw,
-        vsh_cutoff, porosity_cutoff, sw_cutoff
-    )
+    with span("formation.pay_zones"):
+        pay_zones = identify_pay_zones(
+            depth, vshale, effective_porosity, sw,
+            vsh_cutoff, porosity_cutoff, sw_cutoff
+        )
 
     # Calculate net pay
     net_pay = sum(zone["thickness"] for zone in pay_zones)
@@ -427,12 +447,371 @@ def evaluate_formation(las_file: Union[str, RobustLASFile],
             "num_zones": len(pay_zones),
             "zones": pay_zones
         },
-        "evaluation_quality": "Good" if not missing_curves else "Limited"
+        # Missing required curves return early, so a completed evaluation is always "Good"
+        "evaluation_quality": "Good"
     }
 
     return result
 
 
+def _run_well(func, las_file: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a per-well analysis for _map_wells (runs in a worker process)"""
+    try:
+        result = func(las_file, **params)
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+    result["file"] = las_file
+    return result
+
+
+def _map_wells(func, las_files: List[str], params: Dict[str, Any],
+               max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Apply a module-level per-well function across a process pool, yielding in completion order"""
+    workers = min(max_workers or os.cpu_count() or 1, len(las_files))
+
+    if workers > 1:
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            future_to_file = {executor.submit(_run_well, func, path, params): path for path in las_files}
+        except (OSError, NotImplementedError) as e:
+            logger.warning(f"Process pool unavailable, evaluating in-process: {e}")
+        else:
+            try:
+                for future in as_completed(future_to_file):
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        yield {"error": f"{type(e).__name__}: {e}", "file": future_to_file[future]}
+            finally:
+                # A consumer that stops early cancels the queued wells; wells already
+                # running are finished before the pool shuts down
+                executor.shutdown(wait=True, cancel_futures=True)
+            return
+
+    for path in las_files:
+        yield _run_well(func, path, params)
+
+
+def evaluate_formations(las_files: List[str], max_workers: Optional[int] = None,
+                        **params) -> Iterator[Dict[str, Any]]:
+    """
+    Evaluate many wells, yielding each result as soon as it finishes
+
+    Wells are spread across a process pool (max_workers=1 evaluates
+    in-process). Results arrive in completion order; each carries its input
+    path under "file", and failures are yielded as {"error": ..., "file": ...}.
+
+    Args:
+        las_files: LAS file paths
+        max_workers: Worker processes (default: CPU count)
+        **params: evaluate_formation keyword arguments (curves, cutoffs, rw, ...)
+
+    Yields:
+        Dict: evaluate_formation result of one well
+    """
+    yield from _map_wells(evaluate_formation, las_files, params, max_workers)
+
+
+def screen_net_pay(las_files: List[str], max_workers: Optional[int] = None, **params) -> Dict[str, Any]:
+    """
+    Field-wide net-pay screen: one compact row per well, best wells first
+
+    Args:
+        las_files: LAS file paths
+        max_workers: Worker processes (default: CPU count)
+        **params: evaluate_formation keyword arguments
+
+    Returns:
+        Dict: wells (sorted by net pay), failures, and field totals
+    """
+    wells, failures = [], []
+    for result in evaluate_formations(las_files, max_workers=max_workers, **params):
+        if "error" in result:
+            failures.append({"file": result["file"], "error": result["error"]})
+            continue
+        properties = result["formation_properties"]
+        wells.append({
+            "file": result["file"],
+            "well_name": result["well_name"],
+            "net_pay": result["pay_summary"]["net_pay"],
+            "num_zones": result["pay_summary"]["num_zones"],
+            "avg_porosity": properties["avg_porosity"],
+            "avg_sw": properties["avg_sw"]
+        })
+
+    wells.sort(key=lambda well: (-well["net_pay"], well["file"]))
+    total_net_pay = sum(well["net_pay"] for well in wells)
+    return {
+        "wells": wells,
+        "failures": failures,
+        "field_summary": {
+            "wells_evaluated": len(wells),
+            "wells_failed": len(failures),
+            "wells_with_pay": sum(1 for well in wells if well["net_pay"] > 0),
+            "total_net_pay": total_net_pay,
+            "avg_net_pay": total_net_pay / len(wells) if wells else 0.0
+        }
+    }
+
+
+def sensitivity_scenarios(grid: Optional[Dict[str, List[float]]] = None,
+                          monte_carlo: Optional[Dict[str, Tuple[float, ...]]] = None,
+                          n_samples: int = 1000, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Scenario table for cutoff_sensitivity: one equal-length array per parameter
+
+    Args:
+        grid: Parameter -> values; every combination is a scenario
+        monte_carlo: Parameter -> (low, high) uniform or (low, mode, high)
+            triangular range (default: DEFAULT_SENSITIVITY_RANGES when no grid)
+        n_samples: Monte Carlo draws
+        seed: Random seed (the same seed gives every well the same scenarios)
+
+    Parameters not listed keep their SENSITIVITY_BASE_CASE value. Raises
+    ValueError for unknown parameters, empty grid values or n_samples < 1.
+    """
+    if grid and monte_carlo:
+        raise ValueError("Give either a grid or Monte Carlo ranges, not both")
+    unknown = sorted(set(grid or monte_carlo or {}) - set(SENSITIVITY_BASE_CASE))
+    if unknown:
+        raise ValueError(f"Unknown sensitivity parameters: {', '.join(unknown)} "
+                         f"(expected {', '.join(SENSITIVITY_BASE_CASE)})")
+
+    table = {}
+    if grid:
+        names = list(grid)
+        axes = [np.asarray(grid[name], dtype=np.float64).ravel() for name in names]
+        empty = [name for name, values in zip(names, axes) if len(values) == 0]
+        if empty:
+            raise ValueError(f"Grid values are empty for: {', '.join(empty)}")
+        mesh = np.meshgrid(*axes, indexing="ij")
+        table = {name: values.ravel() for name, values in zip(names, mesh)}
+        count = mesh[0].size
+    else:
+        if n_samples < 1:
+            raise ValueError(f"n_samples must be at least 1, got {n_samples}")
+        ranges = monte_carlo or DEFAULT_SENSITIVITY_RANGES
+        rng = np.random.default_rng(seed)
+        count = n_samples
+        # Fixed parameter order keeps the draws reproducible for a seed
+        for name in SENSITIVITY_BASE_CASE:
+            if name not in ranges:
+                continue
+            bounds = tuple(float(bound) for bound in ranges[name])
+            if len(bounds) == 2:
+                table[name] = rng.uniform(bounds[0], bounds[1], count)
+            elif len(bounds) == 3:
+                table[name] = rng.triangular(bounds[0], bounds[1], bounds[2], count)
+            else:
+                raise ValueError(f"Range for {name} must be (low, high) or (low, mode, high)")
+
+    for name, value in SENSITIVITY_BASE_CASE.items():
+        table.setdefault(name, np.full(count, value, dtype=np.float64))
+    return table
+
+
+def _scenario_net_pay(depth: np.ndarray, vshale: np.ndarray, porosity: np.ndarray,
+                      unit_sw: np.ndarray, scenarios: Dict[str, np.ndarray],
+                      n: float = 2.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Net pay and zone count of every scenario
+
+    Scenarios are broadcast against the samples in chunks; each row applies
+    the identify_pay_zones cutoffs and minimum-thickness rule.
+    """
+    count, samples = len(scenarios["rw"]), len(depth)
+    net_pay = np.zeros(count)
+    num_zones = np.zeros(count, dtype=np.int64)
+
+    # min(unit_sw * rw**(1/n), 1) <= sw_cutoff  <=>  unit_sw <= sw_cutoff / rw**(1/n)
+    # (any valid sample passes a cutoff of 1 or more; NaN never does)
+    with np.errstate(divide="ignore"):
+        sw_limit = np.where(scenarios["sw_cutoff"] >= 1, np.inf,
+                            scenarios["sw_cutoff"] / scenarios["rw"] ** (1 / n))
+
+    chunk = max(1, SENSITIVITY_CHUNK_ELEMENTS // max(samples, 1))
+    padded = np.zeros((min(chunk, count), samples + 2), dtype=bool)
+
+    for first in range(0, count, chunk):
+        rows = slice(first, min(first + chunk, count))
+        size = rows.stop - rows.start
+
+        # NaN samples compare False, so they never count as pay
+        with np.errstate(invalid="ignore"):
+            padded[:size, 1:-1] = (vshale <= scenarios["vsh_cutoff"][rows, None]) \
+                & (porosity >= scenarios["porosity_cutoff"][rows, None]) \
+                & (unit_sw <= sw_limit[rows, None])
+
+        # Transitions alternate start, end within each zero-padded row;
+        # zone i of a row covers samples [starts[i], ends[i])
+        transitions = np.flatnonzero(padded[:size, 1:] != padded[:size, :-1])
+        scenario, column = np.divmod(transitions, samples + 1)
+        scenario, starts, ends = scenario[0::2], column[0::2], column[1::2]
+
+        thickness = depth[ends - 1] - depth[starts]
+        keep = thickness >= MIN_PAY_THICKNESS
+        net_pay[rows] = np.bincount(scenario[keep], weights=thickness[keep], minlength=size)
+        num_zones[rows] = np.bincount(scenario[keep], minlength=size)
+
+    return net_pay, num_zones
+
+
+def _distribution(values: np.ndarray) -> Dict[str, float]:
+    """P90/P50/P10 summary; P90 is the low case (exceeded in 90% of scenarios)"""
+    p90, p50, p10 = np.percentile(values, [10, 50, 90])
+    return {
+        "p90": float(p90),
+        "p50": float(p50),
+        "p10": float(p10),
+        "mean": float(np.mean(values)),
+        "min": float(np.min(values)),
+        "max": float(np.max(values))
+    }
+
+
+@traced("cutoff_sensitivity")
+def cutoff_sensitivity(las_file: Union[str, RobustLASFile],
+                       grid: Optional[Dict[str, List[float]]] = None,
+                       monte_carlo: Optional[Dict[str, Tuple[float, ...]]] = None,
+                       n_samples: int = 1000,
+                       seed: int = 0,
+                       gr_curve: str = "GR",
+                       density_curve: str = "RHOB",
+                       resistivity_curve: str = "RT",
+                       neutron_curve: str = "NPHI",
+                       matrix_density: float = 2.65,
+                       fluid_density: float = 1.0,
+                       return_scenarios: bool = False) -> Dict[str, Any]:
+    """
+    Net-pay sensitivity of one well to the pay cutoffs and Rw
+
+    Vshale, porosity and the Rw-independent part of Archie's equation are
+    computed once; every scenario of the grid or Monte Carlo sample (see
+    sensitivity_scenarios) is then evaluated by broadcasting, so a
+    1,000-scenario sweep costs about as much as a few evaluate_formation calls.
+    Each scenario's net pay matches evaluate_formation with the same values.
+
+    Args:
+        las_file: Path to LAS file or RobustLASFile object
+        grid: Parameter -> values (vsh_cutoff, porosity_cutoff, sw_cutoff, rw)
+        monte_carlo: Parameter -> (low, high) or (low, mode, high) ranges
+        n_samples: Monte Carlo scenarios
+        seed: Monte Carlo random seed
+        gr_curve, density_curve, resistivity_curve, neutron_curve,
+        matrix_density, fluid_density: As for evaluate_formation
+        return_scenarios: Include every scenario's parameters and net pay
+
+    Returns:
+        Dict: net-pay and zone-count distributions (P90 low / P50 / P10 high case),
+        probability of pay, base case, and the correlation of net pay with each
+        varied parameter
+    """
+    try:
+        scenarios = sensitivity_scenarios(grid, monte_carlo, n_samples, seed)
+    except ValueError as e:
+        return {"error": str(e)}
+    # Base case rides along as the last scenario
+    scenarios = {name: np.append(values, SENSITIVITY_BASE_CASE[name]) for name, values in scenarios.items()}
+
+    curves = _petrophysics_curves(las_file, gr_curve, density_curve, resistivity_curve, neutron_curve,
+                                  matrix_density, fluid_density)
+    if "error" in curves:
+        return curves
+    las = curves["las"]
+    depth = np.asarray(curves["depth"], dtype=np.float64)
+    vshale, porosity = curves["vshale"], curves["effective_porosity"]
+    resistivity = curves["resistivity"]
+
+    # Archie with Rw factored out (a=1, m=2, n=2 as in evaluate_formation):
+    # Sw(rw) = min(unit_sw * rw**(1/n), 1)
+    unit_sw = np.full(len(depth), np.nan)
+    valid = ~np.isnan(resistivity) & ~np.isnan(porosity) & (porosity > 0) & (resistivity > 0)
+    unit_sw[valid] = np.sqrt(1.0 / np.power(porosity[valid], 2.0) / resistivity[valid])
+
+    with span("formation.sensitivity", scenarios=len(scenarios["rw"]), samples=len(depth)):
+        net_pay, num_zones = _scenario_net_pay(depth, vshale, porosity, unit_sw, scenarios)
+
+    base_net_pay, base_zones = net_pay[-1], num_zones[-1]
+    scenarios = {name: values[:-1] for name, values in scenarios.items()}
+    net_pay, num_zones = net_pay[:-1], num_zones[:-1]
+
+    correlation = {}
+    for name, values in scenarios.items():
+        if np.ptp(values) > 0 and np.ptp(net_pay) > 0:
+            correlation[name] = float(np.corrcoef(values, net_pay)[0, 1])
+
+    result = {
+        "well_name": las.well_info.get("WELL", "Unknown"),
+        "depth_range": list(las.get_depth_range()),
+        "method": "grid" if grid else "monte_carlo",
+        "scenario_count": int(len(net_pay)),
+        "curves_used": {
+            "gamma_ray": gr_curve,
+            "density": density_curve,
+            "resistivity": resistivity_curve,
+            "neutron": neutron_curve if curves["neutron"] is not None else None
+        },
+        "parameter_ranges": {
+            name: {"min": float(values.min()), "max": float(values.max())}
+            for name, values in scenarios.items()
+        },
+        "net_pay": _distribution(net_pay),
+        "num_zones": _distribution(num_zones),
+        "probability_of_pay": float(np.mean(net_pay > 0)),
+        "base_case": {**SENSITIVITY_BASE_CASE, "net_pay": float(base_net_pay), "num_zones": int(base_zones)},
+        "net_pay_correlation": correlation
+    }
+    if return_scenarios:
+        result["scenarios"] = {**scenarios, "net_pay": net_pay, "num_zones": num_zones}
+    return result
+
+
+def screen_cutoff_sensitivity(las_files: List[str], max_workers: Optional[int] = None,
+                              **params) -> Dict[str, Any]:
+    """
+    Net-pay distributions for many wells, highest P50 first
+
+    Every well is swept over the same scenarios (same grid, or same seed), so
+    the field distribution sums the wells' net pay scenario by scenario.
+
+    Args:
+        las_files: LAS file paths
+        max_workers: Worker processes (default: CPU count)
+        **params: cutoff_sensitivity keyword arguments (grid, monte_carlo, curves, ...)
+
+    Returns:
+        Dict: wells (net-pay P90/P50/P10 per well), failures, and the field distribution
+    """
+    params["return_scenarios"] = True
+    wells, failures = [], []
+    field_net_pay = None
+    for result in _map_wells(cutoff_sensitivity, las_files, params, max_workers):
+        if "error" in result:
+            failures.append({"file": result["file"], "error": result["error"]})
+            continue
+        well_net_pay = result["scenarios"]["net_pay"]
+        field_net_pay = well_net_pay if field_net_pay is None else field_net_pay + well_net_pay
+        wells.append({
+            "file": result["file"],
+            "well_name": result["well_name"],
+            "net_pay": result["net_pay"],
+            "probability_of_pay": result["probability_of_pay"],
+            "base_case_net_pay": result["base_case"]["net_pay"]
+        })
+
+    wells.sort(key=lambda well: (-well["net_pay"]["p50"], well["file"]))
+    return {
+        "wells": wells,
+        "failures": failures,
+        "field_summary": {
+            "wells_evaluated": len(wells),
+            "wells_failed": len(failures),
+            "scenario_count": int(len(field_net_pay)) if field_net_pay is not None else 0,
+            "net_pay": _distribution(field_net_pay) if field_net_pay is not None else None
+        }
+    }
+
+
 # Additional function to create a summarized report for non-technical users
 def create_formation_evaluation_summary(evaluation_result: Dict[str, Any]) -> str:
     """
@@ -498,9 +877,14 @@ if __name__ == "__main__":
     import sys
 
     if len(sys.argv) < 2:
-        print("Usage: python formation_evaluation.py <las_file>")
+        print("Usage: python formation_evaluation.py <las_file> [<las_file> ...]")
         sys.exit(1)
 
+    if len(sys.argv) > 2:
+        # Several wells: field-wide net-pay screen
+        print(json.dumps(screen_net_pay(sys.argv[1:]), indent=2, cls=NumpyJSONEncoder))
+        sys.exit(0)
+
     las_file = sys.argv[1]
     print(f"Evaluating formation for: {las_file}")
 
@@ -0,0 +1,199 @@
+"""
+las_binary_store.py - Columnar binary store for parsed well logs
+
+Each LAS file is converted once into two sidecar files:
+
+- <name>.<hash>.wlog.bin  - curve-major block, one contiguous float array per curve
+- <name>.<hash>.wlog.json - header with well_info, version, curve units and
+                            descriptions, DataFrame layout and the source
+                            file fingerprint
+
+RobustLASFile opens the block through np.memmap, so repeat loads skip text
+parsing entirely. The text LAS file stays the source of truth: the store is
+keyed by absolute path, size and mtime, and is regenerated whenever the LAS
+file changes.
+"""
+
+import os
+import sys
+import glob
+import json
+import hashlib
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+
+from utils.file_cache import cache_path, file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes so stale stores are regenerated
+STORE_VERSION = 1
+
+# Under the shared cache directory unless LAS_STORE_DIR is set; empty string disables the store
+DEFAULT_STORE_DIR = os.getenv("LAS_STORE_DIR", cache_path("las_store"))
+
+SUPPORTED_DTYPES = ("float64", "float32")
+
+
+def write_store(file_path: str, curves: List[Dict[str, Any]], header: Dict[str, Any],
+                store_dir: str = DEFAULT_STORE_DIR, dtype: str = "float64") -> bool:
+    """
+    Write curve arrays and header of a parsed LAS file to the store
+
+    Args:
+        file_path: Source LAS file
+        curves: Curve dicts with mnemonic, unit, descr and data
+        header: JSON-serializable header fields (well_info, version, layout...)
+        store_dir: Store directory
+        dtype: float64 or float32 curve storage
+
+    Returns:
+        bool: True if the store was written
+    """
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported store dtype: {dtype}")
+    if not curves:
+        return False
+
+    try:
+        arrays = [np.asarray(curve["data"]) for curve in curves]
+        n_rows = len(arrays[0])
+        if n_rows == 0 or any(len(a) != n_rows or not np.issubdtype(a.dtype, np.number) for a in arrays):
+            return False
+
+        os.makedirs(store_dir, exist_ok=True)
+        block_path, header_path = _store_paths(file_path, store_dir)
+
+        # Curve-major: each curve is one contiguous array in the block
+        tmp_block = f"{block_path}.{os.getpid()}.tmp"
+        block = np.memmap(tmp_block, dtype=dtype, mode="w+", shape=(len(arrays), n_rows))
+        for i, values in enumerate(arrays):
+            block[i] = values
+        block.flush()
+        del block
+        os.replace(tmp_block, block_path)
+
+        store_header = dict(header)
+        store_header.update({
+            "store_version": STORE_VERSION,
+            "source": _source_fingerprint(file_path),
+            "dtype": dtype,
+            "n_rows": n_rows,
+            "curves": [{"mnemonic": c["mnemonic"], "unit": c.get("unit", "unknown"),
+                        "descr": c.get("descr", c["mnemonic"])} for c in curves]
+        })
+
+        # The header is written last and marks the store as complete
+        tmp_header = f"{header_path}.{os.getpid()}.tmp"
+        with open(tmp_header, "w") as fh:
+            json.dump(store_header, fh, default=_json_default)
+        os.replace(tmp_header, header_path)
+        return True
+
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not write binary well-log store for {file_path}: {e}")
+        return False
+
+
+def open_store(file_path: str, store_dir: str = DEFAULT_STORE_DIR) -> Optional[Tuple[Dict[str, Any], np.ndarray]]:
+    """
+    Open the store of a LAS file memory-mapped
+
+    Returns:
+        (header, block) with block shaped (curves x rows), or None if the
+        store is missing or older than the LAS file
+    """
+    block_path, header_path = _store_paths(file_path, store_dir)
+    if not (os.path.isfile(block_path) and os.path.isfile(header_path)):
+        return None
+
+    try:
+        with open(header_path) as fh:
+            header = json.load(fh)
+
+        if header.get("store_version") != STORE_VERSION or \
+                header.get("source") != _source_fingerprint(file_path):
+            logger.info(f"Binary well-log store for {os.path.basename(file_path)} is stale")
+            return None
+
+        shape = (len(header["curves"]), header["n_rows"])
+        block = np.memmap(block_path, dtype=header["dtype"], mode="r", shape=shape)
+        return header, block
+
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Could not open binary well-log store for {file_path}: {e}")
+        return None
+
+
+def is_store_current(file_path: str, store_dir: str = DEFAULT_STORE_DIR) -> bool:
+    """True if the store exists and matches the LAS file on disk"""
+    _, header_path = _store_paths(file_path, store_dir)
+    try:
+        with open(header_path) as fh:
+            header = json.load(fh)
+    except (OSError, ValueError):
+        return False
+    return (header.get("store_version") == STORE_VERSION and
+            header.get("source") == _source_fingerprint(file_path))
+
+
+def convert_las_directory(data_dir: str, store_dir: str = DEFAULT_STORE_DIR,
+                          force: bool = False) -> Dict[str, Any]:
+    """
+    Ingest every LAS file of a directory into the store
+
+    Files whose store is already current are skipped unless force is set.
+
+    Returns:
+        dict: converted / skipped / failed file lists
+    """
+    from robust_las_parser import load_las_file, write_las_store
+
+    summary = {"converted": [], "skipped": [], "failed": []}
+    files = sorted(set(glob.glob(os.path.join(data_dir, "*.las")) +
+                       glob.glob(os.path.join(data_dir, "*.LAS"))))
+
+    for file_path in files:
+        if not force and is_store_current(file_path, store_dir):
+            summary["skipped"].append(file_path)
+            continue
+
+        las, error = load_las_file(file_path, use_cache=False, use_store=False)
+        if las is not None and write_las_store(las, file_path, store_dir):
+            summary["converted"].append(file_path)
+        else:
+            summary["failed"].append({"file": file_path, "error": error or "curves could not be stored"})
+
+    logger.info(f"Binary well-log store: {len(summary['converted'])} converted, "
+                f"{len(summary['skipped'])} current, {len(summary['failed'])} failed")
+    return summary
+
+
+def _json_default(obj):
+    """Keep NumPy header values (lasio parses numeric header fields) as numbers"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+
+def _source_fingerprint(file_path: str) -> Optional[Dict[str, Any]]:
+    fingerprint = file_fingerprint(file_path)
+    if fingerprint is None:
+        return None
+    return {"file_path": os.path.abspath(file_path), **fingerprint}
+
+
+def _store_paths(file_path: str, store_dir: str) -> Tuple[str, str]:
+    file_path = os.path.abspath(file_path)
+    digest = hashlib.sha1(file_path.encode("utf-8")).hexdigest()[:16]
+    stem = f"{os.path.basename(file_path)}.{digest}"
+    return (os.path.join(store_dir, f"{stem}.wlog.bin"),
+            os.path.join(store_dir, f"{stem}.wlog.json"))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else os.getenv("DATA_DIR", "./data")
+    result = convert_las_directory(data_dir, force="--force" in sys.argv)
+    print(json.dumps({k: len(v) for k, v in result.items()}, indent=2))
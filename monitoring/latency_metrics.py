@@ -0,0 +1,178 @@
+"""
+Latency Metrics
+Fixed-memory building blocks for production monitoring
+
+- RingBuffer: fixed-capacity NumPy-backed buffer of the most recent samples
+- LatencyHistogram: HDR-style log-linear histogram of durations; constant
+  memory, mergeable, percentiles within ~3% relative error
+- LatencyRegistry: per-tool and per-agent histograms and call/error counts,
+  shared process-wide through get_latency_registry()
+"""
+
+import threading
+from typing import Dict, Any, Optional, Sequence
+
+import numpy as np
+
+# Histogram resolution: 2**SUB_BUCKET_BITS linear sub-buckets per power of two
+SUB_BUCKET_BITS = 5
+# Durations are recorded in microseconds, up to 2**36 us (~19 hours)
+MAX_TRACKABLE_US = 2 ** 36
+
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+
+class RingBuffer:
+    """Fixed-capacity buffer keeping the most recent values"""
+
+    def __init__(self, capacity: int, dtype=np.float64):
+        self.capacity = max(1, capacity)
+        self._data = np.zeros(self.capacity, dtype=dtype)
+        self._next = 0
+        self._size = 0
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def values(self) -> np.ndarray:
+        """Copy of the stored values, oldest first"""
+        if self._size < self.capacity:
+            return self._data[:self._size].copy()
+        return np.concatenate((self._data[self._next:], self._data[:self._next]))
+
+    def clear(self):
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def _bucket_index(value_us: int) -> int:
+    sub_buckets = 1 << SUB_BUCKET_BITS
+    if value_us < 2 * sub_buckets:
+        return value_us
+    shift = value_us.bit_length() - (SUB_BUCKET_BITS + 1)
+    return shift * sub_buckets + (value_us >> shift)
+
+
+def _bucket_bounds(index: int):
+    """[low, high) in microseconds of a bucket"""
+    sub_buckets = 1 << SUB_BUCKET_BITS
+    if index < 2 * sub_buckets:
+        return index, index + 1
+    shift = index // sub_buckets - 1
+    mantissa = index - shift * sub_buckets
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+BUCKET_COUNT = _bucket_index(MAX_TRACKABLE_US) + 1
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram (constant memory, mergeable)"""
+
+    def __init__(self):
+        self.counts = np.zeros(BUCKET_COUNT, dtype=np.int64)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.min_seconds = float("inf")
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float):
+        seconds = max(0.0, seconds)
+        value_us = min(int(seconds * 1e6), MAX_TRACKABLE_US)
+        self.counts[_bucket_index(value_us)] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        self.min_seconds = min(self.min_seconds, seconds)
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        self.counts += other.counts
+        self.count += other.count
+        self.total_seconds += other.total_seconds
+        self.min_seconds = min(self.min_seconds, other.min_seconds)
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+        return self
+
+    def percentile(self, q: float) -> float:
+        """Approximate q-th percentile in seconds (bucket midpoint)"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(np.ceil(q / 100.0 * self.count)))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        low, high = _bucket_bounds(index)
+        value = (low + high) / 2 / 1e6
+        return min(max(value, self.min_seconds), self.max_seconds)
+
+    def to_dict(self, percentiles: Sequence[int] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        summary = {
+            "count": self.count,
+            "mean_seconds": round(self.total_seconds / self.count, 4) if self.count else 0.0,
+            "min_seconds": round(self.min_seconds, 4) if self.count else 0.0,
+            "max_seconds": round(self.max_seconds, 4)
+        }
+        for q in percentiles:
+            summary[f"p{q}_seconds"] = round(self.percentile(q), 4)
+        return summary
+
+
+class LatencyRegistry:
+    """Latency histograms and error counts keyed by category ('tool', 'agent') and name"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[tuple, Dict[str, Any]] = {}
+
+    def record(self, category: str, name: str, seconds: float, success: bool = True):
+        with self._lock:
+            entry = self._entries.get((category, name))
+            if entry is None:
+                entry = {"histogram": LatencyHistogram(), "errors": 0}
+                self._entries[(category, name)] = entry
+            entry["histogram"].record(seconds)
+            if not success:
+                entry["errors"] += 1
+
+    def summary(self, category: str, percentiles: Sequence[int] = DEFAULT_PERCENTILES) -> Dict[str, Dict[str, Any]]:
+        """Per-name latency percentiles and error rates of a category"""
+        with self._lock:
+            entries = [(name, entry["histogram"], entry["errors"])
+                       for (entry_category, name), entry in self._entries.items()
+                       if entry_category == category]
+            result = {}
+            for name, histogram, errors in sorted(entries):
+                stats = histogram.to_dict(percentiles)
+                stats["errors"] = errors
+                stats["error_rate_percent"] = round(errors / histogram.count * 100, 2) if histogram.count else 0
+                result[name] = stats
+            return result
+
+    def merged(self, category: str) -> LatencyHistogram:
+        """One histogram over every name of a category"""
+        merged = LatencyHistogram()
+        with self._lock:
+            for (entry_category, _), entry in self._entries.items():
+                if entry_category == category:
+                    merged.merge(entry["histogram"])
+        return merged
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_registry = LatencyRegistry()
+
+
+def get_latency_registry() -> LatencyRegistry:
+    """Process-wide registry fed by agents and tool clients"""
+    return _registry
+
+
+def record_latency(category: str, name: str, seconds: float, success: bool = True,
+                   registry: Optional[LatencyRegistry] = None):
+    (registry or _registry).record(category, name, seconds, success)
@@ -8,9 +8,13 @@ import json
 import threading
 import datetime
 import logging
+import itertools
+from collections import deque
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+import numpy as np
+
 # Optional system monitoring
 try:
     import psutil
@@ -21,6 +25,11 @@ except ImportError:
 
 from config.settings import MonitoringConfig
 from agents.meta_agent import MetaAgent
+from monitoring.latency_metrics import RingBuffer, LatencyHistogram, get_latency_registry
+
+# Bounded history of non-query records (system metrics, health checks, errors)
+HISTORY_CAPACITY = 2000
+ERROR_LOG_CAPACITY = 1000
 
 
 class ProductionMonitor:
@@ -46,10 +55,21 @@ class ProductionMonitor:
         self._monitor_thread: Optional[threading.Thread] = None
         self._start_time = time.time()
 
-        # Metrics storage
-        self.metrics_history: List[Dict[str, Any]] = []
-        self.error_log: List[Dict[str, Any]] = []
-        self.health_history: List[Dict[str, Any]] = []
+        # Metrics storage (bounded; oldest records drop out first)
+        self.metrics_history: deque = deque(maxlen=HISTORY_CAPACITY)
+        self.error_log: deque = deque(maxlen=ERROR_LOG_CAPACITY)
+        self.health_history: deque = deque(maxlen=HISTORY_CAPACITY)
+
+        # Query metrics: ring buffers of the most recent queries plus lifetime
+        # counters and a latency histogram, all in fixed memory
+        self._metrics_lock = threading.Lock()
+        self.query_latency = RingBuffer(config.metrics_capacity, dtype=np.float32)
+        self.query_success = RingBuffer(config.metrics_capacity, dtype=np.bool_)
+        self.query_latency_histogram = LatencyHistogram()
+        self.total_queries = 0
+        self.successful_queries = 0
+        self.latency_registry = get_latency_registry()
+        self._cycles = 0
 
         # Performance tracking
         self.performance_wrapper = None
@@ -149,7 +169,8 @@ class ProductionMonitor:
                     self._cleanup_old_metrics()
 
                     # Save metrics snapshot
-                    if len(self.metrics_history) % 10 == 0:  # Every 10 cycles
+                    self._cycles += 1
+                    if self._cycles % 10 == 0:  # Every 10 cycles
                         self._save_metrics_snapshot()
 
                 except Exception as e:
@@ -287,17 +308,15 @@ class ProductionMonitor:
     def _log_query_metrics(self, query: str, response_time: float, success: bool, error: Optional[str]):
         """Log query performance metrics"""
         try:
-            metrics = {
-                "timestamp": datetime.datetime.now().isoformat(),
-                "type": "query_metrics",
-                "query_length": len(query),
-                "response_time": round(response_time, 3),
-                "success": success
-            }
+            with self._metrics_lock:
+                self.query_latency.append(response_time)
+                self.query_success.append(success)
+                self.query_latency_histogram.record(response_time)
+                self.total_queries += 1
+                if success:
+                    self.successful_queries += 1
 
             if error:
-                metrics["error"] = error
-
                 # Also log to error log
                 error_entry = {
                     "timestamp": datetime.datetime.now().isoformat(),
@@ -307,8 +326,6 @@ class ProductionMonitor:
                 }
                 self.error_log.append(error_entry)
 
-            self.metrics_history.append(metrics)
-
         except Exception as e:
             self.logger.warning(f"Query metrics logging failed: {e}")
 
@@ -318,23 +335,10 @@ class ProductionMonitor:
             cutoff_time = datetime.datetime.now() - datetime.timedelta(days=self.config.metrics_retention_days)
             cutoff_iso = cutoff_time.isoformat()
 
-            # Clean metrics history
-            self.metrics_history = [
-                m for m in self.metrics_history
-                if m.get("timestamp", "") > cutoff_iso
-            ]
-
-            # Clean health history
-            self.health_history = [
-                h for h in self.health_history
-                if h.get("timestamp", "") > cutoff_iso
-            ]
-
-            # Clean error log
-            self.error_log = [
-                e for e in self.error_log
-                if e.get("timestamp", "") > cutoff_iso
-            ]
+            # Records are appended in time order, so expired ones are at the left
+            for history in (self.metrics_history, self.health_history, self.error_log):
+                while history and history[0].get("timestamp", "") <= cutoff_iso:
+                    history.popleft()
 
         except Exception as e:
             self.logger.warning(f"Metrics cleanup failed: {e}")
@@ -348,9 +352,10 @@ class ProductionMonitor:
                 "metrics_count": len(self.metrics_history),
                 "health_checks_count": len(self.health_history),
                 "errors_count": len(self.error_log),
-                "recent_metrics": self.metrics_history[-10:] if self.metrics_history else [],
-                "recent_health": self.health_history[-5:] if self.health_history else [],
-                "recent_errors": self.error_log[-10:] if self.error_log else []
+                "recent_metrics": _tail(self.metrics_history, 10),
+                "recent_health": _tail(self.health_history, 5),
+                "recent_errors": _tail(self.error_log, 10),
+                "query_latency": self.query_latency_histogram.to_dict()
             }
 
             # Save to monitoring directory
@@ -370,9 +375,10 @@ class ProductionMonitor:
         """Generate dashboard data for monitoring UI"""
         try:
             # Calculate summary statistics
-            total_queries = len([m for m in self.metrics_history if m.get("type") == "query_metrics"])
-            successful_queries = len([m for m in self.metrics_history
-                                      if m.get("type") == "query_metrics" and m.get("success", False)])
+            with self._metrics_lock:
+                total_queries = self.total_queries
+                successful_queries = self.successful_queries
+                latency = self.query_latency_histogram.to_dict()
 
             # Get latest system metrics
             latest_system = next((m for m in reversed(self.metrics_history)
@@ -389,7 +395,12 @@ class ProductionMonitor:
                     "monitoring_active": self.is_running(),
                     "total_queries": total_queries,
                     "success_rate": round((successful_queries / total_queries * 100), 2) if total_queries > 0 else 0,
-                    "recent_errors": len(self.error_log[-24:])  # Last 24 errors
+                    "recent_errors": len(_tail(self.error_log, 24))  # Last 24 errors
+                },
+                "latency": {
+                    "queries": latency,
+                    "tools": self.latency_registry.summary("tool"),
+                    "agents": self.latency_registry.summary("agent")
                 },
                 "system_metrics": {
                     "cpu_percent": latest_system.get("cpu_percent", "N/A"),
@@ -398,7 +409,7 @@ class ProductionMonitor:
                     "active_threads": latest_system.get("active_threads", "N/A")
                 },
                 "server_health": latest_health.get("servers", {}),
-                "recent_errors": self.error_log[-5:],  # Last 5 errors
+                "recent_errors": _tail(self.error_log, 5),  # Last 5 errors
                 "metrics_retention": {
                     "total_metrics": len(self.metrics_history),
                     "retention_days": self.config.metrics_retention_days,
@@ -415,48 +426,51 @@ class ProductionMonitor:
     def get_performance_report(self) -> Dict[str, Any]:
         """Generate detailed performance report"""
         try:
-            query_metrics = [m for m in self.metrics_history if m.get("type") == "query_metrics"]
-
-            if not query_metrics:
+            with self._metrics_lock:
+                total_queries = self.total_queries
+                successful = self.successful_queries
+                histogram = self.query_latency_histogram.to_dict((50, 90, 95, 99))
+                # Exact statistics over the most recent queries
+                recent_times = self.query_latency.values()
+                recent_success = self.query_success.values()
+
+            if total_queries == 0:
                 return {"note": "No query metrics available"}
 
-            # Calculate performance statistics
-            response_times = [m["response_time"] for m in query_metrics if "response_time" in m]
-
-            if response_times:
-                avg_response_time = sum(response_times) / len(response_times)
-                min_response_time = min(response_times)
-                max_response_time = max(response_times)
-
-                # Calculate percentiles
-                sorted_times = sorted(response_times)
-                p50 = sorted_times[len(sorted_times) // 2]
-                p95 = sorted_times[int(len(sorted_times) * 0.95)]
-            else:
-                avg_response_time = min_response_time = max_response_time = p50 = p95 = 0
-
-            # Success/failure analysis
-            successful = len([m for m in query_metrics if m.get("success", False)])
-            failed = len(query_metrics) - successful
+            recent = {"queries": int(len(recent_times))}
+            if len(recent_times):
+                p50, p90, p99 = np.percentile(recent_times, [50, 90, 99])
+                recent.update({
+                    "average_seconds": round(float(recent_times.mean()), 3),
+                    "p50_seconds": round(float(p50), 3),
+                    "p90_seconds": round(float(p90), 3),
+                    "p99_seconds": round(float(p99), 3),
+                    "success_rate_percent": round(float(recent_success.mean()) * 100, 2)
+                })
 
             report = {
                 "timestamp": datetime.datetime.now().isoformat(),
                 "query_performance": {
-                    "total_queries": len(query_metrics),
+                    "total_queries": total_queries,
                     "successful_queries": successful,
-                    "failed_queries": failed,
-                    "success_rate_percent": round((successful / len(query_metrics) * 100), 2) if query_metrics else 0
+                    "failed_queries": total_queries - successful,
+                    "success_rate_percent": round((successful / total_queries * 100), 2)
                 },
                 "response_times": {
-                    "average_seconds": round(avg_response_time, 3),
-                    "min_seconds": round(min_response_time, 3),
-                    "max_seconds": round(max_response_time, 3),
-                    "p50_seconds": round(p50, 3),
-                    "p95_seconds": round(p95, 3)
+                    "average_seconds": histogram["mean_seconds"],
+                    "min_seconds": histogram["min_seconds"],
+                    "max_seconds": histogram["max_seconds"],
+                    "p50_seconds": histogram["p50_seconds"],
+                    "p90_seconds": histogram["p90_seconds"],
+                    "p95_seconds": histogram["p95_seconds"],
+                    "p99_seconds": histogram["p99_seconds"]
                 },
+                "recent_window": recent,
+                "tool_latency": self.latency_registry.summary("tool"),
+                "agent_latency": self.latency_registry.summary("agent"),
                 "error_analysis": {
                     "total_errors": len(self.error_log),
-                    "recent_errors": len(self.error_log[-24:]),
+                    "recent_errors": len(_tail(self.error_log, 24)),
                     "common_errors": self._analyze_common_errors()
                 },
                 "monitoring_info": {
@@ -477,7 +491,7 @@ class ProductionMonitor:
         try:
             error_counts = {}
 
-            for error_entry in self.error_log[-100:]:  # Last 100 errors
+            for error_entry in _tail(self.error_log, 100):  # Last 100 errors
                 error_msg = error_entry.get("error", "").lower()
 
                 # Categorize errors
@@ -509,6 +523,11 @@ class ProductionMonitor:
             return []
 
 
+def _tail(records: deque, n: int) -> List[Dict[str, Any]]:
+    """Last n records of a deque as a list"""
+    return list(itertools.islice(records, max(0, len(records) - n), None))
+
+
 if __name__ == "__main__":
     # Test production monitor
     from config.settings import MonitoringConfig
@@ -17,7 +17,6 @@ import math
 import time
 import logging
 from typing import Dict, Any, List, Tuple, Optional
-from scipy import stats
 import segyio
 from enum import Enum
 
@@ -26,6 +25,9 @@ from production_segy_tools import (
     NumpyJSONEncoder, ProgressReporter, MemoryMonitor,
     find_segy_file, find_template_file
 )
+from segy_header_index import get_header_index
+from segy_streaming_stats import StreamingStats, accumulate_traces, uniform_trace_slice
+from utils.tracing import StageSpans, traced
 
 logger = logging.getLogger(__name__)
 
@@ -140,93 +142,94 @@ class SegyioQualityAnalyzer:
             logger.warning(f"Survey type detection failed: {e}")
             return SurveyType.UNKNOWN
 
-    def analyze_amplitude_distribution_segyio(self, file_path: str, max_traces: int = 50) -> Dict[str, Any]:
-        """Analyze amplitude distribution using segyio with memory efficiency"""
+    def analyze_amplitude_distribution_segyio(self, file_path: str, max_traces: int = 50,
+                                              full_scan: bool = False) -> Dict[str, Any]:
+        """Analyze amplitude distribution using streaming statistics over whole traces
+
+        Traces are sampled uniformly across the entire file (or all traces when
+        full_scan is set) and folded block by block into a StreamingStats
+        accumulator, so memory stays constant regardless of survey size.
+        """
         try:
             with segyio.open(file_path, ignore_geometry=True) as f:
-                # Sample traces efficiently
                 total_traces = f.tracecount
-                sample_size = min(max_traces, total_traces)
-                step = max(1, total_traces // sample_size)
-
-                amplitudes = []
-                zero_counts = []
-
-                for i in range(0, total_traces, step):
-                    if len(amplitudes) > 100000:  # Prevent memory explosion
-                        break
-
-                    try:
-                        trace_data = f.trace[i]
-                        amplitudes.extend(trace_data[::4])  # Subsample trace data
-                        zero_counts.append(np.sum(trace_data == 0))
-                    except Exception as e:
-                        logger.debug(f"Error reading trace {i}: {e}")
-                        continue
+                trace_slice = uniform_trace_slice(total_traces, None if full_scan else max_traces)
+
+                start_time = time.time()
+                amp_stats = StreamingStats()
+                try:
+                    accumulate_traces(f, trace_slice, amp_stats)
+                except Exception as e:
+                    logger.debug(f"Block read failed, falling back to per-trace reads: {e}")
+                    amp_stats = StreamingStats()
+                    for i in range(*trace_slice.indices(total_traces)):
+                        try:
+                            amp_stats.update(f.trace[i])
+                        except Exception as trace_error:
+                            logger.debug(f"Error reading trace {i}: {trace_error}")
 
-                if not amplitudes:
+                if amp_stats.total_values == 0:
                     return {"error": "No amplitude data could be extracted"}
-
-                # Convert to numpy array for analysis
-                amplitude_array = np.array(amplitudes)
-
-                # Remove NaN and infinite values
-                clean_data = amplitude_array[np.isfinite(amplitude_array)]
-
-                if len(clean_data) == 0:
+                if amp_stats.count == 0:
                     return {"error": "No valid amplitude data found"}
 
                 # Basic statistics
                 stats_dict = {
-                    "count": len(clean_data),
-                    "min": float(np.min(clean_data)),
-                    "max": float(np.max(clean_data)),
-                    "mean": float(np.mean(clean_data)),
-                    "median": float(np.median(clean_data)),
-                    "std_dev": float(np.std(clean_data)),
-                    "rms": float(np.sqrt(np.mean(clean_data**2))),
-                    "traces_sampled": sample_size,
+                    "count": amp_stats.count,
+                    "min": amp_stats.min,
+                    "max": amp_stats.max,
+                    "mean": amp_stats.mean,
+                    "median": amp_stats.percentile(50),
+                    "std_dev": amp_stats.std,
+                    "rms": amp_stats.rms,
+                    "traces_sampled": amp_stats.traces,
                     "total_traces": total_traces
                 }
 
-                # Percentiles
+                # Percentiles (histogram estimate)
                 percentiles = [1, 5, 10, 25, 75, 90, 95, 99]
                 stats_dict["percentiles"] = {
-                    f"p{p}": float(np.percentile(clean_data, p)) for p in percentiles
+                    f"p{p}": float(v) for p, v in zip(percentiles, amp_stats.percentile(percentiles))
                 }
 
                 # Distribution characteristics
-                if len(clean_data) > 10:
-                    try:
-                        stats_dict["skewness"] = float(stats.skew(clean_data))
-                        stats_dict["kurtosis"] = float(stats.kurtosis(clean_data))
-                    except:
-                        logger.warning("Could not calculate skewness/kurtosis")
+                if amp_stats.count > 10:
+                    stats_dict["skewness"] = amp_stats.skewness
+                    stats_dict["kurtosis"] = amp_stats.kurtosis
 
                 # Dynamic range (improved calculation)
-                max_abs = np.max(np.abs(clean_data))
-                noise_estimate = np.std(clean_data) + 1e-10  # Avoid division by zero
+                max_abs = max(abs(amp_stats.min), abs(amp_stats.max))
+                noise_estimate = amp_stats.std + 1e-10  # Avoid division by zero
 
                 if max_abs > 0 and noise_estimate > 0:
                     stats_dict["dynamic_range_db"] = float(20 * np.log10(max_abs / noise_estimate))
-                    stats_dict["signal_to_noise"] = float(np.mean(np.abs(clean_data)) / noise_estimate)
+                    stats_dict["signal_to_noise"] = float(amp_stats.mean_abs / noise_estimate)
                 else:
                     stats_dict["dynamic_range_db"] = 0.0
                     stats_dict["signal_to_noise"] = 0.0
 
                 # Zero percentage calculation
-                total_samples = len(amplitude_array)
-                zero_percentage = float(np.sum(amplitude_array == 0) / total_samples * 100) if total_samples > 0 else 0
+                zero_percentage = amp_stats.zero_percentage
                 stats_dict["zero_percentage"] = zero_percentage
 
                 # Data quality indicators
                 stats_dict["data_quality"] = {
                     "zero_percentage": zero_percentage,
-                    "constant_value_detected": len(np.unique(clean_data)) < 10,
+                    "constant_value_detected": len(amp_stats.distinct_values) < 10,
                     "reasonable_range": abs(stats_dict["max"]) < 1e6 and abs(stats_dict["min"]) < 1e6,
                     "has_variation": stats_dict["std_dev"] > 1e-10,
-                    "nan_count": int(np.sum(np.isnan(amplitude_array))),
-                    "inf_count": int(np.sum(np.isinf(amplitude_array)))
+                    "nan_count": amp_stats.nan_count,
+                    "inf_count": amp_stats.inf_count
+                }
+
+                start, stop, step = trace_slice.indices(total_traces)
+                stats_dict["sampling"] = {
+                    "method": "full_scan" if step == 1 and stop == total_traces else "uniform_stride",
+                    "trace_step": step,
+                    "samples_per_trace": len(f.samples),
+                    "values_scanned": amp_stats.total_values,
+                    "percentile_method": f"histogram_{amp_stats.histogram_bins}_bins",
+                    "scan_time_seconds": round(time.time() - start_time, 4)
                 }
 
                 return stats_dict
@@ -237,120 +240,92 @@ class SegyioQualityAnalyzer:
             return {"error": f"Amplitude analysis failed: {str(e)}"}
 
     def analyze_survey_geometry_segyio(self, file_path: str, max_traces: int = 1000) -> Dict[str, Any]:
-        """Analyze survey geometry using segyio"""
+        """Analyze survey geometry from the persistent trace-header index"""
         try:
-            with segyio.open(file_path, ignore_geometry=True) as f:
-                bin_header = f.bin
-
-                geometry_info = {
-                    "total_traces": f.tracecount,
-                    "samples_per_trace": bin_header[segyio.BinField.Samples],
-                    "sample_interval_us": bin_header[segyio.BinField.Interval],
-                    "sample_interval_ms": bin_header[segyio.BinField.Interval] / 1000,
-                    "format_code": bin_header[segyio.BinField.Format],
-                    "analysis_traces": min(max_traces, f.tracecount)
-                }
+            header_index = get_header_index(file_path)
+            total_traces = header_index.tracecount
 
-                # Sample trace headers for geometry analysis
-                sample_size = min(max_traces, f.tracecount)
-                step = max(1, f.tracecount // sample_size)
+            geometry_info = {
+                "total_traces": total_traces,
+                "samples_per_trace": header_index.samples_per_trace,
+                "sample_interval_us": header_index.sample_interval_us,
+                "sample_interval_ms": header_index.sample_interval_us / 1000,
+                "format_code": header_index.format_code,
+                "analysis_traces": min(max_traces, total_traces)
+            }
 
-                coordinates = []
-                inlines = []
-                crosslines = []
-                cdps = []
-                elevations = []
+            # Sample trace headers for geometry analysis
+            sample_size = min(max_traces, total_traces)
+            sampled = slice(0, None, max(1, total_traces // max(1, sample_size)))
+
+            x_all = header_index.column("CDP_X", sampled)
+            y_all = header_index.column("CDP_Y", sampled)
+            has_coordinates = (x_all != 0) | (y_all != 0)
+            x_coords = x_all[has_coordinates]
+            y_coords = y_all[has_coordinates]
+
+            inlines = header_index.column("INLINE_3D", sampled)
+            crosslines = header_index.column("CROSSLINE_3D", sampled)
+            cdps = header_index.column("CDP", sampled)
+            elevations = header_index.column("ReceiverGroupElevation", sampled)
+            inlines, crosslines = inlines[inlines != 0], crosslines[crosslines != 0]
+            cdps, elevations = cdps[cdps != 0], elevations[elevations != 0]
+
+            # Analyze collected data
+            if x_coords.size:
+                geometry_info["coordinate_analysis"] = {
+                    "coordinate_count": int(x_coords.size),
+                    "x_range": [int(x_coords.min()), int(x_coords.max())],
+                    "y_range": [int(y_coords.min()), int(y_coords.max())],
+                    "x_span": int(x_coords.max() - x_coords.min()),
+                    "y_span": int(y_coords.max() - y_coords.min())
+                }
 
-                for i in range(0, f.tracecount, step):
-                    if len(coordinates) > max_traces:
-                        break
+                # PCA analysis for survey type
+                if x_coords.size > 2:
+                    coords_array = np.column_stack((x_coords, y_coords)).astype(np.float64)
+                    coords_centered = coords_array - np.mean(coords_array, axis=0)
 
                     try:
-                        header = f.header[i]
-
-                        # Extract coordinates
-                        x = header[segyio.TraceField.CDP_X]
-                        y = header[segyio.TraceField.CDP_Y]
-                        if x != 0 or y != 0:
-                            coordinates.append((x, y))
-
-                        # Extract positioning info
-                        inline = header[segyio.TraceField.INLINE_3D]
-                        xline = header[segyio.TraceField.CROSSLINE_3D]
-                        cdp = header[segyio.TraceField.CDP]
-                        elev = header[segyio.TraceField.ReceiverGroupElevation]
-
-                        if inline != 0:
-                            inlines.append(inline)
-                        if xline != 0:
-                            crosslines.append(xline)
-                        if cdp != 0:
-                            cdps.append(cdp)
-                        if elev != 0:
-                            elevations.append(elev)
-
+                        cov_matrix = np.cov(coords_centered.T)
+                        eigenvalues = np.linalg.eigvals(cov_matrix)
+                        eigenvalues = np.sort(eigenvalues)[::-1]
+
+                        total_variance = np.sum(eigenvalues)
+                        if total_variance > 0:
+                            major_var = eigenvalues[0] / total_variance
+                            minor_var = eigenvalues[1] / total_variance if len(eigenvalues) > 1 else 0
+
+                            geometry_info["coordinate_analysis"]["pca"] = {
+                                "major_variance": float(major_var),
+                                "minor_variance": float(minor_var),
+                                "geometry_type": "2D_line" if major_var > 0.999 else "3D_areal"
+                            }
                     except Exception as e:
-                        logger.debug(f"Error reading header {i}: {e}")
-                        continue
-
-                # Analyze collected data
-                if coordinates:
-                    x_coords = [c[0] for c in coordinates]
-                    y_coords = [c[1] for c in coordinates]
-
-                    geometry_info["coordinate_analysis"] = {
-                        "coordinate_count": len(coordinates),
-                        "x_range": [min(x_coords), max(x_coords)],
-                        "y_range": [min(y_coords), max(y_coords)],
-                        "x_span": max(x_coords) - min(x_coords),
-                        "y_span": max(y_coords) - min(y_coords)
-                    }
-
-                    # PCA analysis for survey type
-                    if len(coordinates) > 2:
-                        coords_array = np.array(coordinates)
-                        coords_centered = coords_array - np.mean(coords_array, axis=0)
+                        logger.debug(f"PCA analysis failed: {e}")
+
+            # Grid analysis
+            if inlines.size and crosslines.size:
+                geometry_info["grid_analysis"] = {
+                    "inline_count": int(np.unique(inlines).size),
+                    "crossline_count": int(np.unique(crosslines).size),
+                    "inline_range": [int(inlines.min()), int(inlines.max())],
+                    "crossline_range": [int(crosslines.min()), int(crosslines.max())]
+                }
 
-                        try:
-                            cov_matrix = np.cov(coords_centered.T)
-                            eigenvalues = np.linalg.eigvals(cov_matrix)
-                            eigenvalues = np.sort(eigenvalues)[::-1]
-
-                            total_variance = np.sum(eigenvalues)
-                            if total_variance > 0:
-                                major_var = eigenvalues[0] / total_variance
-                                minor_var = eigenvalues[1] / total_variance if len(eigenvalues) > 1 else 0
-
-                                geometry_info["coordinate_analysis"]["pca"] = {
-                                    "major_variance": float(major_var),
-                                    "minor_variance": float(minor_var),
-                                    "geometry_type": "2D_line" if major_var > 0.999 else "3D_areal"
-                                }
-                        except Exception as e:
-                            logger.debug(f"PCA analysis failed: {e}")
-
-                # Grid analysis
-                if inlines and crosslines:
-                    geometry_info["grid_analysis"] = {
-                        "inline_count": len(set(inlines)),
-                        "crossline_count": len(set(crosslines)),
-                        "inline_range": [min(inlines), max(inlines)],
-                        "crossline_range": [min(crosslines), max(crosslines)]
-                    }
-
-                if cdps:
-                    geometry_info["cdp_analysis"] = {
-                        "cdp_count": len(set(cdps)),
-                        "cdp_range": [min(cdps), max(cdps)]
-                    }
-
-                if elevations:
-                    geometry_info["elevation_analysis"] = {
-                        "elevation_range": [min(elevations), max(elevations)],
-                        "elevation_variation": max(elevations) - min(elevations)
-                    }
-
-                return geometry_info
+            if cdps.size:
+                geometry_info["cdp_analysis"] = {
+                    "cdp_count": int(np.unique(cdps).size),
+                    "cdp_range": [int(cdps.min()), int(cdps.max())]
+                }
+
+            if elevations.size:
+                geometry_info["elevation_analysis"] = {
+                    "elevation_range": [int(elevations.min()), int(elevations.max())],
+                    "elevation_variation": int(elevations.max() - elevations.min())
+                }
+
+            return geometry_info
 
         except segyio.exceptions.InvalidError:
             return {"error": "Invalid SEG-Y format"}
@@ -710,6 +685,7 @@ def production_segy_analysis(file_path=None, template_path=None, analysis_type="
             "details": error_details
         })}
 
+@traced("production_segy_qc")
 def production_segy_qc(file_path=None, template_path=None, data_dir="./data",
                       template_dir="./templates", **kwargs):
     """
@@ -717,6 +693,7 @@ def production_segy_qc(file_path=None, template_path=None, data_dir="./data",
     """
     operation_start = time.time()
     analyzer = SegyioQualityAnalyzer()
+    stages = StageSpans("segy_qc")
 
     try:
         # Handle JSON input
@@ -774,6 +751,7 @@ def production_segy_qc(file_path=None, template_path=None, data_dir="./data",
 
         # 1. File structure validation using segyio
         progress.update(1, "Validating file structure...")
+        stages.next("file_structure")
         try:
             with segyio.open(full_file_path, ignore_geometry=True) as f:
                 bin_header = f.bin
@@ -852,6 +830,7 @@ def production_segy_qc(file_path=None, template_path=None, data_dir="./data",
 
         # 2. Survey type detection and geometry validation
         progress.update(1, "Analyzing survey geometry...")
+        stages.next("geometry")
         try:
             survey_type = analyzer.detect_survey_type_for_qc(full_file_path)
             qc_results["validation_results"]["survey_type"] = survey_type.value
@@ -918,6 +897,7 @@ def production_segy_qc(file_path=None, template_path=None, data_dir="./data",
 
         # 3. Amplitude analysis and data quality
         progress.update(1, "Analyzing amplitude data...")
+        stages.next("amplitudes")
         try:
             amplitude_analysis = analyzer.analyze_amplitude_distribution_segyio(full_file_path, 100)
             qc_results["validation_results"]["amplitude_analysis"] = amplitude_analysis
@@ -990,6 +970,7 @@ def production_segy_qc(file_path=None, template_path=None, data_dir="./data",
 
         # 4. Overall quality assessment using calibrated thresholds
         progress.update(1, "Performing quality assessment...")
+        stages.next("quality_assessment")
         try:
             # Get survey type and data for quality assessment
             survey_type = SurveyType(qc_results["validation_results"].get("survey_type", "unknown"))
@@ -1012,6 +993,7 @@ def production_segy_qc(file_path=None, template_path=None, data_dir="./data",
 
         # 5. Template checks (simplified for segyio)
         progress.update(1, "Finalizing assessment...")
+        stages.next("finalize")
         qc_results["template_checks"].append({
             "severity": "info",
             "category": "template",
@@ -1061,12 +1043,14 @@ def production_segy_qc(file_path=None, template_path=None, data_dir="./data",
             "qc_engine": "segyio-based with calibrated thresholds"
         }
 
+        stages.close()
         progress.finish()
         logger.info(f"segyio-based SEG-Y QC completed in {processing_time:.1f}s - Rating: {overall_rating}")
 
         return {"text": json.dumps(qc_results, cls=NumpyJSONEncoder)}
 
     except Exception as e:
+        stages.close()
         processing_time = time.time() - operation_start
         error_details = traceback.format_exc()
         logger.error(f"SEG-Y QC failed: {str(e)}")
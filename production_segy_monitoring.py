@@ -18,10 +18,137 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import sqlite3
+import atexit
 import schedule
 
 logger = logging.getLogger(__name__)
 
+# Buffered monitoring writes and retention
+DEFAULT_FLUSH_INTERVAL = 2.0  # seconds
+DEFAULT_BATCH_SIZE = 200  # rows
+DEFAULT_RAW_RETENTION_DAYS = 7
+DEFAULT_MINUTE_RETENTION_DAYS = 2
+DEFAULT_HOUR_RETENTION_DAYS = 90  # day rollups are kept indefinitely
+DEFAULT_ROLLUP_INTERVAL = 60.0  # seconds
+
+INSERT_STATEMENTS = {
+    "system_metrics": '''
+        INSERT INTO system_metrics (
+            timestamp, memory_usage_mb, memory_percentage, cpu_percentage,
+            disk_usage_gb, disk_percentage, active_processes,
+            files_processed_today, files_failed_today, average_processing_speed_mb_s,
+            total_data_processed_gb, error_rate_percentage, critical_errors, warnings
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''',
+    "error_log": '''
+        INSERT INTO error_log (timestamp, severity, component, message, details)
+        VALUES (?, ?, ?, ?, ?)
+    ''',
+    "processing_log": '''
+        INSERT INTO processing_log (
+            timestamp, operation, file_name, file_size_mb,
+            processing_time_seconds, status, error_message
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    '''
+}
+
+# Bucket = ISO timestamp prefix of this length
+ROLLUP_LEVELS = (("minute", 16), ("hour", 13), ("day", 10))
+
+# Per source: raw-to-minute select, rollup-to-coarser select, upsert adding into existing buckets.
+# Selects take (rolled_until, current_bucket) or (previous_resolution, rolled_until, current_bucket)
+ROLLUP_SOURCES = {
+    "processing": {
+        "table": "processing_log",
+        "rollup_table": "processing_rollup",
+        "from_raw": '''
+            SELECT substr(timestamp, 1, {length}) AS b, operation,
+                   COUNT(CASE WHEN status = 'success' THEN 1 END),
+                   COUNT(CASE WHEN status = 'error' THEN 1 END),
+                   COALESCE(SUM(CASE WHEN status = 'success' THEN file_size_mb END), 0),
+                   COALESCE(SUM(processing_time_seconds), 0),
+                   COALESCE(SUM(CASE WHEN status = 'success' AND processing_time_seconds > 0
+                                THEN file_size_mb / processing_time_seconds END), 0),
+                   COUNT(CASE WHEN status = 'success' AND processing_time_seconds > 0 THEN 1 END)
+            FROM processing_log WHERE timestamp >= ? AND substr(timestamp, 1, {length}) < ?
+            GROUP BY b, operation
+        ''',
+        "from_rollup": '''
+            SELECT substr(bucket, 1, {length}) AS b, operation, SUM(files_success), SUM(files_failed),
+                   SUM(total_size_mb), SUM(total_processing_seconds), SUM(speed_sum), SUM(speed_count)
+            FROM processing_rollup WHERE resolution = ? AND bucket >= ? AND substr(bucket, 1, {length}) < ?
+            GROUP BY b, operation
+        ''',
+        "upsert": '''
+            INSERT INTO processing_rollup (resolution, bucket, operation, files_success, files_failed,
+                                           total_size_mb, total_processing_seconds, speed_sum, speed_count)
+            SELECT ?, * FROM ({select}) WHERE true
+            ON CONFLICT (resolution, bucket, operation) DO UPDATE SET
+                files_success = files_success + excluded.files_success,
+                files_failed = files_failed + excluded.files_failed,
+                total_size_mb = total_size_mb + excluded.total_size_mb,
+                total_processing_seconds = total_processing_seconds + excluded.total_processing_seconds,
+                speed_sum = speed_sum + excluded.speed_sum,
+                speed_count = speed_count + excluded.speed_count
+        '''
+    },
+    "system_metrics": {
+        "table": "system_metrics",
+        "rollup_table": "system_metrics_rollup",
+        "from_raw": '''
+            SELECT substr(timestamp, 1, {length}) AS b, COUNT(*),
+                   COALESCE(SUM(memory_percentage), 0), COALESCE(MAX(memory_percentage), 0),
+                   COALESCE(SUM(cpu_percentage), 0), COALESCE(MAX(cpu_percentage), 0),
+                   COALESCE(SUM(disk_percentage), 0), COALESCE(MAX(disk_percentage), 0)
+            FROM system_metrics WHERE timestamp >= ? AND substr(timestamp, 1, {length}) < ?
+            GROUP BY b
+        ''',
+        "from_rollup": '''
+            SELECT substr(bucket, 1, {length}) AS b, SUM(samples),
+                   SUM(memory_percentage_sum), MAX(memory_percentage_max),
+                   SUM(cpu_percentage_sum), MAX(cpu_percentage_max),
+                   SUM(disk_percentage_sum), MAX(disk_percentage_max)
+            FROM system_metrics_rollup WHERE resolution = ? AND bucket >= ? AND substr(bucket, 1, {length}) < ?
+            GROUP BY b
+        ''',
+        "upsert": '''
+            INSERT INTO system_metrics_rollup (resolution, bucket, samples,
+                                               memory_percentage_sum, memory_percentage_max,
+                                               cpu_percentage_sum, cpu_percentage_max,
+                                               disk_percentage_sum, disk_percentage_max)
+            SELECT ?, * FROM ({select}) WHERE true
+            ON CONFLICT (resolution, bucket) DO UPDATE SET
+                samples = samples + excluded.samples,
+                memory_percentage_sum = memory_percentage_sum + excluded.memory_percentage_sum,
+                memory_percentage_max = MAX(memory_percentage_max, excluded.memory_percentage_max),
+                cpu_percentage_sum = cpu_percentage_sum + excluded.cpu_percentage_sum,
+                cpu_percentage_max = MAX(cpu_percentage_max, excluded.cpu_percentage_max),
+                disk_percentage_sum = disk_percentage_sum + excluded.disk_percentage_sum,
+                disk_percentage_max = MAX(disk_percentage_max, excluded.disk_percentage_max)
+        '''
+    },
+    "errors": {
+        "table": "error_log",
+        "rollup_table": "error_rollup",
+        "from_raw": '''
+            SELECT substr(timestamp, 1, {length}) AS b, severity, component, COUNT(*)
+            FROM error_log WHERE timestamp >= ? AND substr(timestamp, 1, {length}) < ?
+            GROUP BY b, severity, component
+        ''',
+        "from_rollup": '''
+            SELECT substr(bucket, 1, {length}) AS b, severity, component, SUM(error_count)
+            FROM error_rollup WHERE resolution = ? AND bucket >= ? AND substr(bucket, 1, {length}) < ?
+            GROUP BY b, severity, component
+        ''',
+        "upsert": '''
+            INSERT INTO error_rollup (resolution, bucket, severity, component, error_count)
+            SELECT ?, * FROM ({select}) WHERE true
+            ON CONFLICT (resolution, bucket, severity, component) DO UPDATE SET
+                error_count = error_count + excluded.error_count
+        '''
+    }
+}
+
 @dataclass
 class SystemHealthMetrics:
     """System health metrics for monitoring"""
@@ -48,12 +175,42 @@ class SystemHealthMetrics:
         return asdict(self)
 
 class SEGYSystemMonitor:
-    """Production system monitoring for SEG-Y processing"""
-    
-    def __init__(self, db_path: str = "./monitoring/segy_metrics.db"):
+    """Production system monitoring for SEG-Y processing
+
+    Metrics, errors and processing results go through one persistent WAL-mode
+    connection. Rows are buffered and committed in batches by a background
+    writer (every flush_interval seconds or batch_size rows), so logging a
+    processed file no longer costs a synchronous commit. Raw rows are rolled
+    up into per-minute, per-hour and per-day aggregates and expire after
+    raw_retention_days; minute and hour rollups have their own retention.
+    """
+
+    def __init__(self, db_path: str = "./monitoring/segy_metrics.db",
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, batch_size: int = DEFAULT_BATCH_SIZE,
+                 raw_retention_days: float = DEFAULT_RAW_RETENTION_DAYS,
+                 minute_retention_days: float = DEFAULT_MINUTE_RETENTION_DAYS,
+                 hour_retention_days: float = DEFAULT_HOUR_RETENTION_DAYS,
+                 rollup_interval: float = DEFAULT_ROLLUP_INTERVAL):
         self.db_path = db_path
         self.monitoring_active = False
         self.monitor_thread = None
+
+        # Buffered writer; flush_interval <= 0 commits every row synchronously
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.raw_retention_days = max(1.0, raw_retention_days)
+        self.minute_retention_days = minute_retention_days
+        self.hour_retention_days = hour_retention_days
+        self.rollup_interval = rollup_interval
+
+        self._db_lock = threading.RLock()
+        self._buffer_lock = threading.Lock()
+        self._buffer: Dict[str, List[tuple]] = {}
+        self._buffered_rows = 0
+        self._flush_requested = threading.Event()
+        self._writer_thread = None
+        self._closed = False
+        self._last_rollup = 0.0
         
         # Performance thresholds
         self.thresholds = {
@@ -68,14 +225,21 @@ class SEGYSystemMonitor:
             "processing_speed_min": 5.0   # MB/s minimum
         }
         
+        self._conn = None
         self._initialize_database()
         
     def _initialize_database(self):
         """Initialize SQLite database for metrics storage"""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+
+        # Autocommit mode; batches use explicit transactions
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self._db_lock:
+            cursor = self._conn.cursor()
             
             # Create metrics table
             cursor.execute('''
@@ -124,8 +288,226 @@ class SEGYSystemMonitor:
                     error_message TEXT
                 )
             ''')
-            
-            conn.commit()
+
+            # Rollups keep sums and counts so they aggregate further without loss
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS processing_rollup (
+                    resolution TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    operation TEXT NOT NULL,
+                    files_success INTEGER DEFAULT 0,
+                    files_failed INTEGER DEFAULT 0,
+                    total_size_mb REAL DEFAULT 0,
+                    total_processing_seconds REAL DEFAULT 0,
+                    speed_sum REAL DEFAULT 0,
+                    speed_count INTEGER DEFAULT 0,
+                    PRIMARY KEY (resolution, bucket, operation)
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS system_metrics_rollup (
+                    resolution TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    samples INTEGER DEFAULT 0,
+                    memory_percentage_sum REAL DEFAULT 0,
+                    memory_percentage_max REAL DEFAULT 0,
+                    cpu_percentage_sum REAL DEFAULT 0,
+                    cpu_percentage_max REAL DEFAULT 0,
+                    disk_percentage_sum REAL DEFAULT 0,
+                    disk_percentage_max REAL DEFAULT 0,
+                    PRIMARY KEY (resolution, bucket)
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS error_rollup (
+                    resolution TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    severity TEXT NOT NULL,
+                    component TEXT NOT NULL,
+                    error_count INTEGER DEFAULT 0,
+                    PRIMARY KEY (resolution, bucket, severity, component)
+                )
+            ''')
+            # Per source/resolution: everything before this bucket is rolled up
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS rollup_state (
+                    source TEXT NOT NULL,
+                    resolution TEXT NOT NULL,
+                    rolled_until TEXT NOT NULL,
+                    PRIMARY KEY (source, resolution)
+                )
+            ''')
+
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_system_metrics_timestamp ON system_metrics (timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_error_log_timestamp ON error_log (timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_error_log_resolved ON error_log (resolved, timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_processing_log_timestamp ON processing_log (timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_processing_log_status ON processing_log (status, timestamp)")
+
+    # ------------------------------------------------------------ buffered writer
+
+    def _write_row(self, table: str, row: tuple):
+        """Queue a row for the batched writer (or write it now in synchronous mode)"""
+        if self.flush_interval <= 0 or self._closed:
+            self._commit_rows({table: [row]})
+            return
+
+        with self._buffer_lock:
+            self._buffer.setdefault(table, []).append(row)
+            self._buffered_rows += 1
+            full = self._buffered_rows >= self.batch_size
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(target=self._writer_loop, name="segy-metrics-writer",
+                                                       daemon=True)
+                self._writer_thread.start()
+                atexit.register(self.close)
+        if full:
+            self._flush_requested.set()
+
+    def _writer_loop(self):
+        while not self._closed:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            self.flush()
+            if self.rollup_interval > 0 and time.time() - self._last_rollup >= self.rollup_interval:
+                self.run_rollups()
+
+    def flush(self):
+        """Commit every buffered row in one transaction"""
+        with self._buffer_lock:
+            batch, self._buffer = self._buffer, {}
+            self._buffered_rows = 0
+        if batch:
+            self._commit_rows(batch)
+
+    def _commit_rows(self, batch: Dict[str, List[tuple]]):
+        try:
+            with self._db_lock:
+                self._conn.execute("BEGIN")
+                try:
+                    for table, rows in batch.items():
+                        self._conn.executemany(INSERT_STATEMENTS[table], rows)
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        except Exception as e:
+            logger.error(f"Error writing monitoring rows: {str(e)}")
+
+    def close(self):
+        """Flush buffered rows and stop the writer"""
+        if self._closed:
+            return
+        self._closed = True
+        self._flush_requested.set()
+        if self._writer_thread is not None and self._writer_thread is not threading.current_thread():
+            self._writer_thread.join(timeout=10)
+        self.flush()
+
+    # ------------------------------------------------------------------- rollups
+
+    def run_rollups(self) -> Dict[str, int]:
+        """Aggregate completed minutes/hours/days and apply retention"""
+        self._last_rollup = time.time()
+        self.flush()
+        # Leave room for rows still buffered by other writers of the same database
+        now = datetime.now() - timedelta(seconds=2 * max(self.flush_interval, 0))
+        current = {
+            "minute": now.strftime("%Y-%m-%dT%H:%M"),
+            "hour": now.strftime("%Y-%m-%dT%H"),
+            "day": now.strftime("%Y-%m-%d")
+        }
+        deleted = {}
+        try:
+            with self._db_lock:
+                # IMMEDIATE serializes rollups of concurrent monitors on the same file
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for source, spec in ROLLUP_SOURCES.items():
+                        previous = None
+                        for resolution, length in ROLLUP_LEVELS:
+                            self._rollup_level(source, spec, resolution, length, previous, current[resolution])
+                            previous = resolution
+
+                    deleted = self._apply_retention(now)
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        except Exception as e:
+            logger.error(f"Error rolling up monitoring data: {str(e)}")
+        return deleted
+
+    def _rollup_level(self, source: str, spec: Dict[str, Any], resolution: str, length: int,
+                      previous: Optional[str], current_bucket: str):
+        """Fold rows of the level below into completed buckets of this resolution"""
+        row = self._conn.execute("SELECT rolled_until FROM rollup_state WHERE source = ? AND resolution = ?",
+                                 (source, resolution)).fetchone()
+        rolled_until = row[0] if row else ""
+
+        if previous is None:
+            # Raw rows: bucket from the ISO timestamp
+            select = spec["from_raw"].format(length=length)
+            params = (rolled_until, current_bucket)
+        else:
+            select = spec["from_rollup"].format(length=length)
+            params = (previous, rolled_until, current_bucket)
+
+        self._conn.execute(spec["upsert"].format(select=select), (resolution,) + params)
+        self._conn.execute('''
+            INSERT INTO rollup_state (source, resolution, rolled_until) VALUES (?, ?, ?)
+            ON CONFLICT (source, resolution) DO UPDATE SET rolled_until = excluded.rolled_until
+        ''', (source, resolution, current_bucket))
+
+    def _apply_retention(self, now: datetime) -> Dict[str, int]:
+        raw_cutoff = (now - timedelta(days=self.raw_retention_days)).isoformat()
+        deleted = {}
+        # Only rows already folded into minute rollups may expire
+        for source, spec in ROLLUP_SOURCES.items():
+            row = self._conn.execute("SELECT rolled_until FROM rollup_state WHERE source = ? AND resolution = 'minute'",
+                                     (source,)).fetchone()
+            cutoff = min(raw_cutoff, row[0]) if row else ""
+            deleted[spec["table"]] = self._conn.execute(
+                f"DELETE FROM {spec['table']} WHERE timestamp < ?", (cutoff,)).rowcount
+
+        for resolution, days in (("minute", self.minute_retention_days), ("hour", self.hour_retention_days)):
+            if days is None or days <= 0:
+                continue
+            cutoff = (now - timedelta(days=days)).isoformat()
+            for source, spec in ROLLUP_SOURCES.items():
+                deleted[f"{spec['rollup_table']}_{resolution}"] = self._conn.execute(
+                    f"DELETE FROM {spec['rollup_table']} WHERE resolution = ? AND bucket < ?",
+                    (resolution, cutoff)).rowcount
+        return deleted
+
+    def get_rollups(self, source: str = "processing", resolution: str = "hour",
+                    since: Optional[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Aggregated history of a source ('processing', 'system_metrics', 'errors')
+
+        Args:
+            source: Rolled-up table
+            resolution: 'minute', 'hour' or 'day'
+            since: First bucket to return (ISO prefix, e.g. '2024-05-01')
+            limit: Maximum rows, most recent first
+        """
+        if source not in ROLLUP_SOURCES or resolution not in dict(ROLLUP_LEVELS):
+            raise ValueError(f"Unknown rollup {source}/{resolution}")
+        self.run_rollups()
+        table = ROLLUP_SOURCES[source]["rollup_table"]
+        with self._db_lock:
+            cursor = self._conn.execute(
+                f"SELECT * FROM {table} WHERE resolution = ? AND bucket >= ? ORDER BY bucket DESC LIMIT ?",
+                (resolution, since or "", limit))
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def compact(self):
+        """Checkpoint the WAL and reclaim free pages"""
+        self.flush()
+        with self._db_lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("VACUUM")
             
     def collect_system_metrics(self) -> SystemHealthMetrics:
         """Collect current system health metrics"""
@@ -140,9 +522,12 @@ class SEGYSystemMonitor:
             
             # SEG-Y specific metrics from database
             today = datetime.now().strftime('%Y-%m-%d')
-            
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            tomorrow = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+
+            # Buffered rows count towards today's figures
+            self.flush()
+            with self._db_lock:
+                cursor = self._conn.cursor()
                 
                 # Get today's processing stats
                 cursor.execute('''
@@ -152,8 +537,8 @@ class SEGYSystemMonitor:
                         AVG(CASE WHEN status = 'success' THEN file_size_mb/processing_time_seconds END) as avg_speed,
                         SUM(CASE WHEN status = 'success' THEN file_size_mb END) as total_gb
                     FROM processing_log 
-                    WHERE date(timestamp) = ?
-                ''', (today,))
+                    WHERE timestamp >= ? AND timestamp < ?
+                ''', (today, tomorrow))
                 
                 result = cursor.fetchone()
                 files_processed = result[0] or 0
@@ -171,8 +556,8 @@ class SEGYSystemMonitor:
                         COUNT(CASE WHEN severity = 'ERROR' THEN 1 END) as critical,
                         COUNT(CASE WHEN severity = 'WARNING' THEN 1 END) as warnings
                     FROM error_log 
-                    WHERE date(timestamp) = ? AND resolved = FALSE
-                ''', (today,))
+                    WHERE resolved = FALSE AND timestamp >= ? AND timestamp < ?
+                ''', (today, tomorrow))
                 
                 error_result = cursor.fetchone()
                 critical_errors = error_result[0] or 0
@@ -210,23 +595,13 @@ class SEGYSystemMonitor:
     def store_metrics(self, metrics: SystemHealthMetrics):
         """Store metrics in database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO system_metrics (
-                        timestamp, memory_usage_mb, memory_percentage, cpu_percentage,
-                        disk_usage_gb, disk_percentage, active_processes,
-                        files_processed_today, files_failed_today, average_processing_speed_mb_s,
-                        total_data_processed_gb, error_rate_percentage, critical_errors, warnings
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    metrics.timestamp, metrics.memory_usage_mb, metrics.memory_percentage,
-                    metrics.cpu_percentage, metrics.disk_usage_gb, metrics.disk_percentage,
-                    metrics.active_processes, metrics.files_processed_today, metrics.files_failed_today,
-                    metrics.average_processing_speed_mb_s, metrics.total_data_processed_gb,
-                    metrics.error_rate_percentage, metrics.critical_errors, metrics.warnings
-                ))
-                conn.commit()
+            self._write_row("system_metrics", (
+                metrics.timestamp, metrics.memory_usage_mb, metrics.memory_percentage,
+                metrics.cpu_percentage, metrics.disk_usage_gb, metrics.disk_percentage,
+                metrics.active_processes, metrics.files_processed_today, metrics.files_failed_today,
+                metrics.average_processing_speed_mb_s, metrics.total_data_processed_gb,
+                metrics.error_rate_percentage, metrics.critical_errors, metrics.warnings
+            ))
         except Exception as e:
             logger.error(f"Error storing metrics: {str(e)}")
             
@@ -322,13 +697,7 @@ class SEGYSystemMonitor:
     def log_error(self, severity: str, component: str, message: str, details: str = None):
         """Log an error to the monitoring system"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO error_log (timestamp, severity, component, message, details)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (datetime.now().isoformat(), severity, component, message, details))
-                conn.commit()
+            self._write_row("error_log", (datetime.now().isoformat(), severity, component, message, details))
         except Exception as e:
             logger.error(f"Error logging to monitoring database: {str(e)}")
             
@@ -336,18 +705,10 @@ class SEGYSystemMonitor:
                              processing_time: float, status: str, error_message: str = None):
         """Log processing result for monitoring"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO processing_log (
-                        timestamp, operation, file_name, file_size_mb, 
-                        processing_time_seconds, status, error_message
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    datetime.now().isoformat(), operation, file_name, file_size_mb,
-                    processing_time, status, error_message
-                ))
-                conn.commit()
+            self._write_row("processing_log", (
+                datetime.now().isoformat(), operation, file_name, file_size_mb,
+                processing_time, status, error_message
+            ))
         except Exception as e:
             logger.error(f"Error logging processing result: {str(e)}")
             
@@ -432,6 +793,7 @@ class SEGYSystemMonitor:
         self.monitoring_active = False
         if self.monitor_thread:
             self.monitor_thread.join(timeout=10)
+        self.flush()
         logger.info("System monitoring stopped")
 
 class SEGYDeploymentManager:
@@ -753,7 +1115,10 @@ def deploy_production_segy_system(config_dir: str = "./config", data_dir: str =
 def get_production_system_status() -> Dict[str, Any]:
     """Get current production system status"""
     monitor = SEGYSystemMonitor()
-    return monitor.get_system_status()
+    try:
+        return monitor.get_system_status()
+    finally:
+        monitor.close()
 
 def start_production_monitoring(interval_seconds: int = 300):
     """Start production system monitoring"""
@@ -782,12 +1147,13 @@ def schedule_maintenance_tasks():
                     except Exception as e:
                         logger.error(f"Failed to clean log file {log_file}: {e}")
 
-        # Compact monitoring database
+        # Roll up, expire raw rows and compact the monitoring database
         try:
             monitor = SEGYSystemMonitor()
-            with sqlite3.connect(monitor.db_path) as conn:
-                conn.execute("VACUUM")
-                logger.info("Compacted monitoring database")
+            deleted = monitor.run_rollups()
+            monitor.compact()
+            monitor.close()
+            logger.info(f"Compacted monitoring database (expired rows: {deleted})")
         except Exception as e:
             logger.error(f"Failed to compact database: {e}")
 
@@ -13,7 +13,7 @@ import time
 import logging
 import glob
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from typing import Dict, List, Any, Optional, Union, Tuple, Callable
 from pathlib import Path
 import yaml
@@ -37,6 +37,8 @@ class SEGYProcessingConfig:
     # File processing settings
     max_concurrent_files: int = 4
     max_memory_gb: float = 8.0
+    execution_mode: str = "thread"  # thread, process
+    worker_max_memory_gb: float = 0.0  # Per process worker; 0 splits max_memory_gb across workers
     timeout_seconds: int = 3600  # 1 hour default timeout
     
     # Analysis settings
@@ -302,7 +304,12 @@ class SEGYSurveyProcessor:
                 "results": []
             }
             
-        logger.info(f"Starting parallel {operation} of {len(file_paths)} files")
+        execution_mode = self.config.execution_mode
+        if execution_mode not in ("thread", "process"):
+            logger.warning(f"Unknown execution mode '{execution_mode}', using threads")
+            execution_mode = "thread"
+            
+        logger.info(f"Starting parallel {operation} of {len(file_paths)} files ({execution_mode} pool)")
         
         # Progress reporting
         progress = ProgressReporter(len(file_paths), f"Processing {operation}")
@@ -311,43 +318,34 @@ class SEGYSurveyProcessor:
         results = []
         completed_files = 0
         failed_files = 0
+        cancelled_files = 0
         
         # Memory monitoring
         memory_check_time = time.time()
         
-        def process_with_progress(file_path):
-            """Wrapper function for processing with progress updates"""
-            result = self.process_single_file(file_path, template_path, operation)
-            
-            nonlocal completed_files, failed_files, memory_check_time
-            
-            if result["status"] == "success":
-                completed_files += 1
-            else:
-                failed_files += 1
-                
-            # Update progress
-            progress.update(1, f"Completed: {completed_files}, Failed: {failed_files}")
-            
-            # Periodic memory check
-            current_time = time.time()
-            if current_time - memory_check_time > self.config.memory_check_interval:
-                if not self.memory_monitor.check_memory_limit():
-                    logger.warning("Memory usage high, suggesting garbage collection")
-                    self.memory_monitor.suggest_gc()
-                memory_check_time = current_time
-                
-            return result
-            
+        # Largest files first: idle workers pull the next biggest file, so
+        # one large straggler does not start last
+        ordered_files = sorted(file_paths, key=_file_size_or_zero, reverse=True)
+        
         # Process files in parallel
         max_workers = min(self.config.max_concurrent_files, len(file_paths))
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if execution_mode == "process":
+            worker_memory_gb = self.config.worker_max_memory_gb or (self.config.max_memory_gb / max_workers)
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+            submit = lambda file_path: executor.submit(
+                _process_file_in_worker, self.config.to_dict(), file_path, template_path,
+                operation, worker_memory_gb
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            submit = lambda file_path: executor.submit(
+                self.process_single_file, file_path, template_path, operation
+            )
+            
+        with executor:
             # Submit all tasks
-            future_to_file = {
-                executor.submit(process_with_progress, file_path): file_path
-                for file_path in file_paths
-            }
+            future_to_file = {submit(file_path): file_path for file_path in ordered_files}
             
             # Collect results as they complete
             for future in as_completed(future_to_file):
@@ -357,15 +355,11 @@ class SEGYSurveyProcessor:
                     result = future.result(timeout=self.config.timeout_seconds)
                     results.append(result)
                     
-                    # Check error threshold
-                    if (failed_files / len(file_paths)) > self.config.error_threshold:
-                        logger.error(f"Error threshold exceeded ({failed_files}/{len(file_paths)})")
-                        if not self.config.continue_on_error:
-                            # Cancel remaining tasks
-                            for remaining_future in future_to_file:
-                                remaining_future.cancel()
-                            break
-                            
+                    if result["status"] == "success":
+                        completed_files += 1
+                    else:
+                        failed_files += 1
+                        
                 except Exception as e:
                     logger.error(f"Task failed for {file_path}: {str(e)}")
                     results.append({
@@ -376,14 +370,37 @@ class SEGYSurveyProcessor:
                     })
                     failed_files += 1
                     
+                # Update progress
+                progress.update(1, f"Completed: {completed_files}, Failed: {failed_files}")
+                
+                # Periodic memory check
+                current_time = time.time()
+                if current_time - memory_check_time > self.config.memory_check_interval:
+                    if not self.memory_monitor.check_memory_limit():
+                        logger.warning("Memory usage high, suggesting garbage collection")
+                        self.memory_monitor.suggest_gc()
+                    memory_check_time = current_time
+                    
+                # Check error threshold
+                if (failed_files / len(file_paths)) > self.config.error_threshold:
+                    logger.error(f"Error threshold exceeded ({failed_files}/{len(file_paths)})")
+                    if not self.config.continue_on_error:
+                        # Cancel remaining tasks (queued work in worker processes too)
+                        cancelled_files = sum(1 for remaining_future in future_to_file
+                                              if remaining_future.cancel())
+                        break
+                        
         progress.finish()
         
         return {
             "status": "completed",
             "operation": operation,
+            "execution_mode": execution_mode,
+            "max_workers": max_workers,
             "total_files": len(file_paths),
             "successful_files": completed_files,
             "failed_files": failed_files,
+            "cancelled_files": cancelled_files,
             "success_rate": round((completed_files / len(file_paths)) * 100, 1),
             "results": results
         }
@@ -493,6 +510,56 @@ class SEGYSurveyProcessor:
             
         return summary
 
+def _file_size_or_zero(file_path: str) -> int:
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+# One processor per worker process, rebuilt only when the configuration changes
+_worker_processor: Optional[Tuple[str, SEGYSurveyProcessor]] = None
+
+
+def _process_file_in_worker(config_dict: Dict[str, Any], file_path: str, template_path: str,
+                            operation: str, max_memory_gb: float) -> Dict[str, Any]:
+    """
+    Process pool entry point: process one file and return a plain result dict
+
+    Nothing is shared with the parent; the result is pickled back. Before each
+    file the worker checks its own RSS against max_memory_gb with MemoryMonitor
+    and refuses the file if garbage collection cannot bring it under the cap.
+    """
+    global _worker_processor
+
+    config_key = json.dumps(config_dict, sort_keys=True)
+    if _worker_processor is None or _worker_processor[0] != config_key:
+        _worker_processor = (config_key, SEGYSurveyProcessor(SEGYProcessingConfig.from_dict(config_dict)))
+    processor = _worker_processor[1]
+
+    worker_monitor = MemoryMonitor(max_memory_gb)
+    if not worker_monitor.check_memory_limit():
+        worker_monitor.suggest_gc()
+        if not worker_monitor.check_memory_limit():
+            return {
+                "status": "error",
+                "file": os.path.basename(file_path),
+                "operation": operation,
+                "processing_time": 0,
+                "error": (f"Worker memory cap exceeded: {worker_monitor.get_memory_usage_mb():.0f}MB "
+                          f"used, cap {max_memory_gb * 1024:.0f}MB"),
+                "worker_pid": os.getpid()
+            }
+
+    result = processor.process_single_file(file_path, template_path, operation)
+    result["worker_pid"] = os.getpid()
+    result["worker_memory_mb"] = round(worker_monitor.get_memory_usage_mb(), 1)
+
+    # Release memory held from this file before the worker picks up the next one
+    worker_monitor.suggest_gc()
+    return result
+
+
 def production_segy_survey_analysis(file_pattern=None, data_dir="./data", 
                                    template_dir="./templates", 
                                    config_path=None, **kwargs):
@@ -22,11 +22,20 @@ import numpy as np
 from enum import Enum
 from datetime import datetime
 import re
+import sqlite3
 import hashlib
 from dataclasses import dataclass
 from scipy.signal import hilbert
-from scipy.spatial import ConvexHull
-from collections import Counter
+from segy_header_index import (
+    get_header_index, find_header_index, apply_coordinate_scalar,
+    TRACE_HEADER_BYTES, TEXT_AND_BINARY_HEADER_BYTES, EXTENDED_HEADER_BYTES
+)
+from segy_streaming_stats import StreamingStats, read_trace_blocks
+from survey_outline import (
+    DEFAULT_MAX_SCAN_TRACES, QhullError, concave_outline, convex_outline, is_linear, line_outline,
+    polygon_area, principal_extent, scan_coordinates, simplify_ring
+)
+from utils.tracing import record_span, traced
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -388,71 +397,16 @@ class SegyioValidator:
 
     def validate_file_structure(self, file_path: str) -> Dict[str, Any]:
         """Validate basic SEG-Y file structure using segyio"""
-        results = {
-            "file_accessible": False,
-            "file_size_reasonable": False,
-            "has_segy_headers": False,
-            "binary_header_valid": False,
-            "issues": [],
-            "warnings": []
-        }
+        results = self.new_validation_results()
 
         try:
-            # Check file accessibility
-            if not os.path.isfile(file_path):
-                results["issues"].append(f"File not found: {file_path}")
+            if not self.validate_file_access(file_path, results):
                 return results
 
-            results["file_accessible"] = True
-
-            # Check file size
-            file_size = os.path.getsize(file_path)
-            if file_size < 3600:  # Minimum for headers
-                results["issues"].append(f"File too small ({file_size} bytes) - missing headers")
-                return results
-            elif file_size > 50 * 1024**3:  # 50GB warning
-                results["warnings"].append(f"Very large file ({file_size/1024**3:.1f}GB) - processing may be slow")
-
-            results["file_size_reasonable"] = True
-
             # Use segyio to validate SEG-Y structure
             try:
                 with segyio.open(file_path, ignore_geometry=True) as f:
-                    results["has_segy_headers"] = True
-                    results["binary_header_valid"] = True
-
-                    # Extract header information
-                    bin_header = f.bin
-                    sample_rate = bin_header[segyio.BinField.Interval]
-                    num_samples = bin_header[segyio.BinField.Samples]
-                    format_code = bin_header[segyio.BinField.Format]
-
-                    # Validate sample rate (stored as microseconds)
-                    if sample_rate <= 0 or sample_rate > 100000:
-                        results["issues"].append(f"Invalid sample rate: {sample_rate} microseconds")
-                    elif sample_rate < 1000 or sample_rate > 10000:
-                        results["warnings"].append(f"Unusual sample rate: {sample_rate/1000:.1f}ms")
-
-                    # Validate number of samples
-                    if num_samples <= 0 or num_samples > 50000:
-                        results["issues"].append(f"Invalid number of samples: {num_samples}")
-                    elif num_samples > 10000:
-                        results["warnings"].append(f"High sample count: {num_samples}")
-
-                    # Validate format code
-                    if format_code not in self.VALID_FORMAT_CODES:
-                        results["warnings"].append(f"Non-standard format code: {format_code}")
-                    else:
-                        results["format_description"] = self.VALID_FORMAT_CODES[format_code]
-
-                    results["header_info"] = {
-                        "sample_rate_us": sample_rate,
-                        "sample_rate_ms": sample_rate / 1000,
-                        "num_samples": num_samples,
-                        "format_code": format_code,
-                        "trace_length_ms": (sample_rate * num_samples) / 1000,
-                        "trace_count": f.tracecount
-                    }
+                    self.validate_open_file(f, results)
 
             except segyio.exceptions.InvalidError:
                 results["issues"].append("Invalid SEG-Y format - file structure corrupted")
@@ -464,13 +418,82 @@ class SegyioValidator:
 
         return results
 
+    @staticmethod
+    def new_validation_results() -> Dict[str, Any]:
+        return {
+            "file_accessible": False,
+            "file_size_reasonable": False,
+            "has_segy_headers": False,
+            "binary_header_valid": False,
+            "issues": [],
+            "warnings": []
+        }
+
+    def validate_file_access(self, file_path: str, results: Dict[str, Any]) -> bool:
+        """Check the file exists and is large enough to hold SEG-Y headers"""
+        # Check file accessibility
+        if not os.path.isfile(file_path):
+            results["issues"].append(f"File not found: {file_path}")
+            return False
+
+        results["file_accessible"] = True
+
+        # Check file size
+        file_size = os.path.getsize(file_path)
+        if file_size < 3600:  # Minimum for headers
+            results["issues"].append(f"File too small ({file_size} bytes) - missing headers")
+            return False
+        elif file_size > 50 * 1024**3:  # 50GB warning
+            results["warnings"].append(f"Very large file ({file_size/1024**3:.1f}GB) - processing may be slow")
+
+        results["file_size_reasonable"] = True
+        return True
+
+    def validate_open_file(self, f, results: Dict[str, Any]):
+        """Validate the binary header of an already opened segyio file"""
+        results["has_segy_headers"] = True
+        results["binary_header_valid"] = True
+
+        # Extract header information
+        bin_header = f.bin
+        sample_rate = bin_header[segyio.BinField.Interval]
+        num_samples = bin_header[segyio.BinField.Samples]
+        format_code = bin_header[segyio.BinField.Format]
+
+        # Validate sample rate (stored as microseconds)
+        if sample_rate <= 0 or sample_rate > 100000:
+            results["issues"].append(f"Invalid sample rate: {sample_rate} microseconds")
+        elif sample_rate < 1000 or sample_rate > 10000:
+            results["warnings"].append(f"Unusual sample rate: {sample_rate/1000:.1f}ms")
+
+        # Validate number of samples
+        if num_samples <= 0 or num_samples > 50000:
+            results["issues"].append(f"Invalid number of samples: {num_samples}")
+        elif num_samples > 10000:
+            results["warnings"].append(f"High sample count: {num_samples}")
+
+        # Validate format code
+        if format_code not in self.VALID_FORMAT_CODES:
+            results["warnings"].append(f"Non-standard format code: {format_code}")
+        else:
+            results["format_description"] = self.VALID_FORMAT_CODES[format_code]
+
+        results["header_info"] = {
+            "sample_rate_us": sample_rate,
+            "sample_rate_ms": sample_rate / 1000,
+            "num_samples": num_samples,
+            "format_code": format_code,
+            "trace_length_ms": (sample_rate * num_samples) / 1000,
+            "trace_count": f.tracecount
+        }
+
 class SegyioSurveyClassifier:
     """Intelligent survey type classification using segyio"""
 
     def __init__(self):
         self.classification_cache = {}
 
-    def classify_survey_type(self, file_path: str) -> Tuple[SurveyType, Dict[str, Any]]:
+    def classify_survey_type(self, file_path: str, header_index=None) -> Tuple[SurveyType, Dict[str, Any]]:
         """Classify survey type using segyio header analysis"""
 
         if file_path in self.classification_cache:
@@ -484,80 +507,69 @@ class SegyioSurveyClassifier:
         }
 
         try:
-            with segyio.open(file_path, ignore_geometry=True) as f:
-                # Sample headers for analysis (limit to reasonable amount)
-                sample_size = min(100, f.tracecount)
-                step = max(1, f.tracecount // sample_size)
-
-                cdps = set()
-                inlines = set()
-                crosslines = set()
-                shot_points = set()
-                field_records = set()
-
-                for i in range(0, f.tracecount, step):
-                    if len(cdps) > 1000:  # Prevent memory issues
-                        break
-
-                    header = f.header[i]
-                    cdps.add(header[segyio.TraceField.CDP])
-                    inlines.add(header[segyio.TraceField.INLINE_3D])
-                    crosslines.add(header[segyio.TraceField.CROSSLINE_3D])
-                    shot_points.add(header[segyio.TraceField.TRACE_SEQUENCE_FILE])
-                    field_records.add(header[segyio.TraceField.FieldRecord])
-
-                # Remove zero values for meaningful analysis
-                unique_cdps = len(cdps - {0})
-                unique_inlines = len(inlines - {0})
-                unique_crosslines = len(crosslines - {0})
-                unique_shots = len(shot_points - {0})
-                unique_field_records = len(field_records - {0})
-
-                classification_info["geometry_stats"] = {
-                    "unique_cdps": unique_cdps,
-                    "unique_inlines": unique_inlines,
-                    "unique_crosslines": unique_crosslines,
-                    "unique_shots": unique_shots,
-                    "unique_field_records": unique_field_records,
-                    "total_traces": f.tracecount,
-                    "traces_sampled": min(sample_size, f.tracecount)
-                }
+            if header_index is None:
+                header_index = get_header_index(file_path)
+
+            # Sample headers for analysis (limit to reasonable amount)
+            total_traces = header_index.tracecount
+            sample_size = min(100, total_traces)
+            sampled = slice(0, None, max(1, total_traces // sample_size))
+
+            # Remove zero values for meaningful analysis
+            def unique_count(name):
+                return int(np.unique(_nonzero(header_index.column(name, sampled))).size)
+
+            unique_cdps = unique_count("CDP")
+            unique_inlines = unique_count("INLINE_3D")
+            unique_crosslines = unique_count("CROSSLINE_3D")
+            unique_shots = unique_count("TRACE_SEQUENCE_FILE")
+            unique_field_records = unique_count("FieldRecord")
+
+            classification_info["geometry_stats"] = {
+                "unique_cdps": unique_cdps,
+                "unique_inlines": unique_inlines,
+                "unique_crosslines": unique_crosslines,
+                "unique_shots": unique_shots,
+                "unique_field_records": unique_field_records,
+                "total_traces": total_traces,
+                "traces_sampled": min(sample_size, total_traces)
+            }
 
-                # Classification logic based on header analysis
-                if unique_field_records > unique_cdps and unique_cdps <= 10:
-                    survey_type = SurveyType.SHOT_GATHER
-                    classification_info["confidence"] = "high" if unique_field_records > 5 else "medium"
-                    classification_info["reasoning"] = f"High field record variation ({unique_field_records}) with low CDP variation ({unique_cdps}) suggests shot gather data"
-
-                elif unique_inlines > 5 and unique_crosslines > 5:
-                    survey_type = SurveyType.MIGRATED_3D
-                    classification_info["confidence"] = "high"
-                    classification_info["reasoning"] = f"Grid organization with {unique_inlines} inlines and {unique_crosslines} crosslines indicates 3D migrated volume"
-
-                elif unique_cdps > unique_shots and unique_inlines <= 2:
-                    if unique_cdps > 100:
-                        survey_type = SurveyType.MIGRATED_2D
-                        classification_info["confidence"] = "medium"
-                        classification_info["reasoning"] = f"High CDP count ({unique_cdps}) with linear organization suggests 2D migrated line"
-                    else:
-                        survey_type = SurveyType.CDP_STACK
-                        classification_info["confidence"] = "medium"
-                        classification_info["reasoning"] = f"Moderate CDP organization ({unique_cdps}) suggests CDP stack"
-
-                elif unique_cdps > 20:
+            # Classification logic based on header analysis
+            if unique_field_records > unique_cdps and unique_cdps <= 10:
+                survey_type = SurveyType.SHOT_GATHER
+                classification_info["confidence"] = "high" if unique_field_records > 5 else "medium"
+                classification_info["reasoning"] = f"High field record variation ({unique_field_records}) with low CDP variation ({unique_cdps}) suggests shot gather data"
+
+            elif unique_inlines > 5 and unique_crosslines > 5:
+                survey_type = SurveyType.MIGRATED_3D
+                classification_info["confidence"] = "high"
+                classification_info["reasoning"] = f"Grid organization with {unique_inlines} inlines and {unique_crosslines} crosslines indicates 3D migrated volume"
+
+            elif unique_cdps > unique_shots and unique_inlines <= 2:
+                if unique_cdps > 100:
+                    survey_type = SurveyType.MIGRATED_2D
+                    classification_info["confidence"] = "medium"
+                    classification_info["reasoning"] = f"High CDP count ({unique_cdps}) with linear organization suggests 2D migrated line"
+                else:
                     survey_type = SurveyType.CDP_STACK
-                    classification_info["confidence"] = "low"
-                    classification_info["reasoning"] = f"CDP organization detected ({unique_cdps}) but unclear geometry"
+                    classification_info["confidence"] = "medium"
+                    classification_info["reasoning"] = f"Moderate CDP organization ({unique_cdps}) suggests CDP stack"
 
-                else:
-                    survey_type = SurveyType.UNKNOWN
-                    classification_info["confidence"] = "low"
-                    classification_info["reasoning"] = f"Unclear organization pattern - CDPs:{unique_cdps}, Shots:{unique_shots}, IL:{unique_inlines}, XL:{unique_crosslines}"
+            elif unique_cdps > 20:
+                survey_type = SurveyType.CDP_STACK
+                classification_info["confidence"] = "low"
+                classification_info["reasoning"] = f"CDP organization detected ({unique_cdps}) but unclear geometry"
 
-                # Cache result
-                result = (survey_type, classification_info)
-                self.classification_cache[file_path] = result
-                return result
+            else:
+                survey_type = SurveyType.UNKNOWN
+                classification_info["confidence"] = "low"
+                classification_info["reasoning"] = f"Unclear organization pattern - CDPs:{unique_cdps}, Shots:{unique_shots}, IL:{unique_inlines}, XL:{unique_crosslines}"
+
+            # Cache result
+            result = (survey_type, classification_info)
+            self.classification_cache[file_path] = result
+            return result
 
         except Exception as e:
             classification_info["issues"].append(f"Classification error: {str(e)}")
@@ -603,8 +615,19 @@ class SegyioQualityAnalyzer:
 
     def analyze_quality(self, file_path: str, survey_type: SurveyType) -> Tuple[QualityRating, Dict[str, Any]]:
         """Analyze data quality using segyio"""
+        try:
+            with segyio.open(file_path, ignore_geometry=True) as f:
+                # Sample traces for quality analysis (avoid memory issues)
+                trace_block = read_trace_block(f, quality_sample_slice(f.tracecount, len(f.samples)))
+                return self.analyze_quality_block(trace_block, f.tracecount, len(f.samples), survey_type)
+
+        except Exception as e:
+            quality_metrics = self._new_quality_metrics(survey_type)
+            quality_metrics["issues"].append(f"Quality analysis error: {str(e)}")
+            return QualityRating.INVALID, quality_metrics
 
-        quality_metrics = {
+    def _new_quality_metrics(self, survey_type: SurveyType) -> Dict[str, Any]:
+        return {
             "survey_type": survey_type.value,
             "thresholds_used": self.quality_thresholds[survey_type]["description"],
             "amplitude_stats": {},
@@ -613,109 +636,126 @@ class SegyioQualityAnalyzer:
             "warnings": []
         }
 
+    def analyze_quality_block(self, trace_block: np.ndarray, tracecount: int, n_samples: int,
+                              survey_type: SurveyType) -> Tuple[QualityRating, Dict[str, Any]]:
+        """Analyze data quality from a (traces x samples) block selected by quality_sample_slice"""
+
+        quality_metrics = self._new_quality_metrics(survey_type)
+
         try:
-            with segyio.open(file_path, ignore_geometry=True) as f:
-                # Sample traces for quality analysis (avoid memory issues)
-                max_traces_to_sample = min(50, f.tracecount)
-                trace_step = max(1, f.tracecount // max_traces_to_sample)
+            max_traces_to_sample = min(QUALITY_SAMPLE_TRACES, tracecount)
+            amplitudes = trace_block.ravel()
+            zero_counts = np.sum(trace_block == 0, axis=1)
+
+            # Calculate comprehensive metrics
+            quality_metrics["amplitude_stats"] = {
+                'min': float(np.min(amplitudes)),
+                'max': float(np.max(amplitudes)),
+                'mean': float(np.mean(amplitudes)),
+                'std': float(np.std(amplitudes)),
+                'zero_percentage': float(np.mean(zero_counts) / n_samples * 100)
+            }
 
-                amplitudes = []
-                zero_counts = []
+            # Data integrity checks
+            nan_count = int(np.sum(np.isnan(amplitudes)))
+            inf_count = int(np.sum(np.isinf(amplitudes)))
 
-                for i in range(0, f.tracecount, trace_step):
-                    if len(amplitudes) > 100000:  # Prevent memory explosion
-                        break
+            quality_metrics["signal_metrics"] = {
+                'nan_count': nan_count,
+                'inf_count': inf_count,
+                'traces_sampled': max_traces_to_sample,
+                'total_traces': tracecount,
+                'sample_percentage': round((max_traces_to_sample / tracecount) * 100, 1)
+            }
 
-                    trace_data = f.trace[i]
-                    amplitudes.extend(trace_data)
-                    zero_counts.append(np.sum(trace_data == 0))
+            # Dynamic range calculation (more robust)
+            max_amplitude = np.max(np.abs(amplitudes))
+            noise_estimate = np.std(amplitudes) + 1e-10  # Avoid division by zero
+            dynamic_range = 20 * np.log10(max_amplitude / noise_estimate)
 
-                amplitudes = np.array(amplitudes)
+            quality_metrics["signal_metrics"]["dynamic_range_db"] = float(dynamic_range)
+            quality_metrics["signal_metrics"]["signal_to_noise"] = float(
+                np.mean(np.abs(amplitudes)) / noise_estimate
+            )
 
-                # Calculate comprehensive metrics
-                quality_metrics["amplitude_stats"] = {
-                    'min': float(np.min(amplitudes)),
-                    'max': float(np.max(amplitudes)),
-                    'mean': float(np.mean(amplitudes)),
-                    'std': float(np.std(amplitudes)),
-                    'zero_percentage': float(np.mean(zero_counts) / len(f.samples) * 100)
-                }
+            # Apply survey-specific quality assessment
+            thresholds = self.quality_thresholds[survey_type]
+            issues = []
+            warnings = []
+
+            # Check data integrity
+            if nan_count > 0:
+                issues.append(f"Contains {nan_count} NaN values")
+            if inf_count > 0:
+                issues.append(f"Contains {inf_count} infinite values")
+
+            # Apply calibrated thresholds
+            if dynamic_range < thresholds['min_dynamic_range']:
+                if survey_type == SurveyType.SHOT_GATHER:
+                    # More lenient for shot gathers
+                    warnings.append(f"Dynamic range {dynamic_range:.1f}dB below typical {thresholds['min_dynamic_range']}dB for {thresholds['description']}")
+                else:
+                    issues.append(f"Low dynamic range: {dynamic_range:.1f}dB (expected >{thresholds['min_dynamic_range']}dB for {thresholds['description']})")
 
-                # Data integrity checks
-                nan_count = int(np.sum(np.isnan(amplitudes)))
-                inf_count = int(np.sum(np.isinf(amplitudes)))
+            zero_percentage = quality_metrics["amplitude_stats"]["zero_percentage"]
+            if zero_percentage > thresholds['max_zero_percent']:
+                if survey_type in [SurveyType.SHOT_GATHER, SurveyType.CDP_STACK]:
+                    # Expected for raw/early processing data
+                    warnings.append(f"High zero percentage: {zero_percentage:.1f}% (normal for {thresholds['description']} due to muting)")
+                else:
+                    issues.append(f"High zero percentage: {zero_percentage:.1f}% (expected <{thresholds['max_zero_percent']}% for {thresholds['description']})")
 
-                quality_metrics["signal_metrics"] = {
-                    'nan_count': nan_count,
-                    'inf_count': inf_count,
-                    'traces_sampled': max_traces_to_sample,
-                    'total_traces': f.tracecount,
-                    'sample_percentage': round((max_traces_to_sample / f.tracecount) * 100, 1)
-                }
+            if tracecount < thresholds['min_traces']:
+                warnings.append(f"Low trace count: {tracecount} (expected >{thresholds['min_traces']} for {thresholds['description']})")
 
-                # Dynamic range calculation (more robust)
-                max_amplitude = np.max(np.abs(amplitudes))
-                noise_estimate = np.std(amplitudes) + 1e-10  # Avoid division by zero
-                dynamic_range = 20 * np.log10(max_amplitude / noise_estimate)
+            quality_metrics["issues"] = issues
+            quality_metrics["warnings"] = warnings
 
-                quality_metrics["signal_metrics"]["dynamic_range_db"] = float(dynamic_range)
-                quality_metrics["signal_metrics"]["signal_to_noise"] = float(
-                    np.mean(np.abs(amplitudes)) / noise_estimate
-                )
+            # Determine overall quality rating
+            critical_issues = len([i for i in issues if "NaN" in i or "infinite" in i])
 
-                # Apply survey-specific quality assessment
-                thresholds = self.quality_thresholds[survey_type]
-                issues = []
-                warnings = []
-
-                # Check data integrity
-                if nan_count > 0:
-                    issues.append(f"Contains {nan_count} NaN values")
-                if inf_count > 0:
-                    issues.append(f"Contains {inf_count} infinite values")
-
-                # Apply calibrated thresholds
-                if dynamic_range < thresholds['min_dynamic_range']:
-                    if survey_type == SurveyType.SHOT_GATHER:
-                        # More lenient for shot gathers
-                        warnings.append(f"Dynamic range {dynamic_range:.1f}dB below typical {thresholds['min_dynamic_range']}dB for {thresholds['description']}")
-                    else:
-                        issues.append(f"Low dynamic range: {dynamic_range:.1f}dB (expected >{thresholds['min_dynamic_range']}dB for {thresholds['description']})")
-
-                zero_percentage = quality_metrics["amplitude_stats"]["zero_percentage"]
-                if zero_percentage > thresholds['max_zero_percent']:
-                    if survey_type in [SurveyType.SHOT_GATHER, SurveyType.CDP_STACK]:
-                        # Expected for raw/early processing data
-                        warnings.append(f"High zero percentage: {zero_percentage:.1f}% (normal for {thresholds['description']} due to muting)")
-                    else:
-                        issues.append(f"High zero percentage: {zero_percentage:.1f}% (expected <{thresholds['max_zero_percent']}% for {thresholds['description']})")
-
-                if f.tracecount < thresholds['min_traces']:
-                    warnings.append(f"Low trace count: {f.tracecount} (expected >{thresholds['min_traces']} for {thresholds['description']})")
-
-                quality_metrics["issues"] = issues
-                quality_metrics["warnings"] = warnings
-
-                # Determine overall quality rating
-                critical_issues = len([i for i in issues if "NaN" in i or "infinite" in i])
-
-                if critical_issues > 0:
-                    quality_rating = QualityRating.INVALID
-                elif len(issues) == 0 and dynamic_range > (thresholds['min_dynamic_range'] + 10):
-                    quality_rating = QualityRating.EXCELLENT
-                elif len(issues) <= 1 and dynamic_range >= thresholds['min_dynamic_range']:
-                    quality_rating = QualityRating.GOOD
-                elif len(issues) <= 2 or dynamic_range >= (thresholds['min_dynamic_range'] - 5):
-                    quality_rating = QualityRating.FAIR
-                else:
-                    quality_rating = QualityRating.POOR
+            if critical_issues > 0:
+                quality_rating = QualityRating.INVALID
+            elif len(issues) == 0 and dynamic_range > (thresholds['min_dynamic_range'] + 10):
+                quality_rating = QualityRating.EXCELLENT
+            elif len(issues) <= 1 and dynamic_range >= thresholds['min_dynamic_range']:
+                quality_rating = QualityRating.GOOD
+            elif len(issues) <= 2 or dynamic_range >= (thresholds['min_dynamic_range'] - 5):
+                quality_rating = QualityRating.FAIR
+            else:
+                quality_rating = QualityRating.POOR
 
-                return quality_rating, quality_metrics
+            return quality_rating, quality_metrics
 
         except Exception as e:
             quality_metrics["issues"].append(f"Quality analysis error: {str(e)}")
             return QualityRating.INVALID, quality_metrics
 
+
+# Quality analysis samples up to this many evenly strided traces...
+QUALITY_SAMPLE_TRACES = 50
+# ...and stops adding traces once this many amplitudes have been collected
+QUALITY_SAMPLE_AMPLITUDES = 100000
+
+
+def quality_sample_slice(tracecount: int, n_samples: int) -> slice:
+    """Evenly strided trace selection read for quality analysis"""
+    if tracecount <= 0:
+        return slice(0, 0, 1)
+
+    step = max(1, tracecount // min(QUALITY_SAMPLE_TRACES, tracecount))
+    n_traces = len(range(0, tracecount, step))
+    if n_samples > 0:
+        n_traces = min(n_traces, QUALITY_SAMPLE_AMPLITUDES // n_samples + 1)
+    return slice(0, min(tracecount, n_traces * step), step)
+
+
+def read_trace_block(f, traces: slice) -> np.ndarray:
+    """Read the selected traces of an open segyio file as one (traces x samples) array"""
+    if len(range(*traces.indices(f.tracecount))) == 0:
+        return np.empty((0, len(f.samples)), dtype=np.float32)
+    return np.atleast_2d(np.asarray(f.trace.raw[traces]))
+
 def get_segyio_version():
     """Safely get segyio version with fallback"""
     try:
@@ -740,33 +780,23 @@ def get_segyio_version():
 # Use this function instead of segyio.__version__
 segyio_version = get_segyio_version()
 
-def create_intelligent_template(file_path: str) -> Dict[str, int]:
+# Template field name -> (header index column, standard byte position)
+TEMPLATE_FIELDS = {
+    "CDP": ("CDP", 21),
+    "ILINE": ("INLINE_3D", 189),
+    "XLINE": ("CROSSLINE_3D", 193),
+    "SP": ("FieldRecord", 9),   # Alternative position
+    "SX": ("SourceX", 73),
+    "SY": ("SourceY", 77),
+}
+
+
+def create_intelligent_template(file_path: str, header_index=None) -> Dict[str, int]:
     """Create intelligent template using segyio header analysis"""
     try:
-        with segyio.open(file_path, ignore_geometry=True) as f:
-            # Sample headers to detect field positions
-            sample_size = min(20, f.tracecount)
-            detected_fields = {}
-
-            for i in range(sample_size):
-                header = f.header[i]
-
-                # Check standard positions for non-zero values
-                if header[segyio.TraceField.CDP] != 0:
-                    detected_fields["CDP"] = 21  # Standard position
-                if header[segyio.TraceField.INLINE_3D] != 0:
-                    detected_fields["ILINE"] = 189  # Standard position
-                if header[segyio.TraceField.CROSSLINE_3D] != 0:
-                    detected_fields["XLINE"] = 193  # Standard position
-                if header[segyio.TraceField.FieldRecord] != 0:
-                    detected_fields["SP"] = 9   # Alternative position
-                if header[segyio.TraceField.SourceX] != 0:
-                    detected_fields["SX"] = 73  # Standard position
-                if header[segyio.TraceField.SourceY] != 0:
-                    detected_fields["SY"] = 77  # Standard position
-
-            logger.info(f"Detected fields: {', '.join(detected_fields.keys())}")
-            return detected_fields
+        if header_index is None:
+            header_index = get_header_index(file_path)
+        return detect_template_fields(header_index)
 
     except Exception as e:
         logger.warning(f"Template detection failed: {e}, using standard positions")
@@ -775,6 +805,26 @@ def create_intelligent_template(file_path: str) -> Dict[str, int]:
             "SX": 73, "SY": 77, "XY_SCALAR": 71
         }
 
+
+def detect_template_fields(header_index) -> Dict[str, int]:
+    """Detect populated standard header positions from the first traces of the index"""
+    # Sample headers to detect field positions
+    sampled = slice(0, min(20, header_index.tracecount))
+    detected_fields = {}
+
+    # Check standard positions for non-zero values
+    for field_name, (column, position) in TEMPLATE_FIELDS.items():
+        if np.any(header_index.column(column, sampled) != 0):
+            detected_fields[field_name] = position
+
+    logger.info(f"Detected fields: {', '.join(detected_fields.keys())}")
+    return detected_fields
+
+def _nonzero(values: np.ndarray) -> np.ndarray:
+    """Drop unset (zero) header values"""
+    return values[values != 0]
+
+@traced("production_segy_parser")
 def production_segy_parser(file_path=None, template_path=None, data_dir="./data",
                           template_dir="./templates", **kwargs):
     """
@@ -848,11 +898,12 @@ def production_segy_parser(file_path=None, template_path=None, data_dir="./data"
         logger.info(f"Starting SEG-Y parsing: {full_file_path}")
         logger.info(f"File size: {file_size_mb:.1f} MB, Memory available: {memory_monitor.get_available_memory_gb():.1f} GB")
 
-        progress.update(1, "Validating SEG-Y file structure...")
+        progress.update(1, "Running fused header/trace analysis pass...")
 
-        # Validate file structure using segyio
-        validator = SegyioValidator()
-        file_validation = validator.validate_file_structure(full_file_path)
+        # One pass over the file feeds validation, template detection,
+        # classification, quality and geometry
+        analysis = SegyioFusedAnalyzer().analyze(full_file_path)
+        file_validation = analysis["validation"]
 
         if file_validation["issues"]:
             return {"text": json.dumps({
@@ -861,212 +912,68 @@ def production_segy_parser(file_path=None, template_path=None, data_dir="./data"
                 "validation_details": file_validation
             })}
 
-        progress.update(1, "Creating intelligent template...")
-
-        # Create intelligent template using segyio
-        intelligent_template = create_intelligent_template(full_file_path)
+        intelligent_template = analysis["template"]
         logger.info("Intelligent template created successfully")
 
-        # Basic file analysis using segyio
-        progress.update(1, "Creating seismic file object...")
-
-        with segyio.open(full_file_path, ignore_geometry=True) as f:
-            progress.update(1, "Extracting basic file information...")
-
-            # Extract basic information using segyio
-            bin_header = f.bin
-
-            result = {
-                "file_processed": os.path.basename(full_file_path),
-                "file_path": full_file_path,
-                "file_size_mb": round(file_size_mb, 2),
-                "template_used": "intelligent_segyio_detection",
-                "parsing_method": "segyio_native",
-                "survey_type": dimension.upper(),
-                "primary_sorting": sort_key.upper(),
-                "stack_type": stack_type,
-                "processing_time_seconds": 0,  # Will be updated at end
-                "memory_usage_mb": round(memory_monitor.get_memory_usage_mb(), 1)
-            }
-
-            # Add file format information using segyio
-            try:
-                sample_interval = bin_header[segyio.BinField.Interval]
-                samples_per_trace = bin_header[segyio.BinField.Samples]
-                format_code = bin_header[segyio.BinField.Format]
-
-                # Format code descriptions
-                format_descriptions = {
-                    1: "32 BIT IBM FORMAT",
-                    2: "32 BIT INTEGER",
-                    3: "16 BIT INTEGER",
-                    5: "32 BIT IEEE FORMAT",
-                    8: "8 BIT INTEGER"
-                }
-
-                result.update({
-                    "file_revision": 1,  # Standard assumption
-                    "number_of_samples": samples_per_trace,
-                    "sample_rate_ms": sample_interval / 1000,
-                    "trace_length_ms": (sample_interval * samples_per_trace) / 1000,
-                    "sample_format": format_descriptions.get(format_code, f"FORMAT CODE {format_code}"),
-                    "bytes_per_trace": 240 + (samples_per_trace * (4 if format_code in [1,2,5] else 2)),
-                    "total_traces": f.tracecount,
-                    "xy_scalar": 1  # Default, would need trace analysis for actual value
-                })
-
-            except Exception as e:
-                logger.warning(f"Error extracting format information: {str(e)}")
-                result["format_warning"] = str(e)
-
-            progress.update(1, f"Analyzing geometry ({f.tracecount} traces)...")
+        progress.update(1, "Extracting basic file information...")
 
-            # Survey classification using segyio
-            classifier = SegyioSurveyClassifier()
-            detected_survey_type, classification_info = classifier.classify_survey_type(full_file_path)
-
-            result["detected_survey_type"] = detected_survey_type.value
-            result["classification_confidence"] = classification_info["confidence"]
-            result["classification_reasoning"] = classification_info["reasoning"]
-            result["geometry_stats"] = classification_info["geometry_stats"]
-
-            # Quality analysis using segyio
-            quality_analyzer = SegyioQualityAnalyzer()
-            quality_rating, quality_metrics = quality_analyzer.analyze_quality(full_file_path, detected_survey_type)
-
-            result["quality_rating"] = quality_rating.value
-            result["quality_analysis"] = quality_metrics
+        header_info = file_validation["header_info"]
+        result = {
+            "file_processed": os.path.basename(full_file_path),
+            "file_path": full_file_path,
+            "file_size_mb": round(file_size_mb, 2),
+            "template_used": "intelligent_segyio_detection",
+            "parsing_method": "segyio_native",
+            "survey_type": dimension.upper(),
+            "primary_sorting": sort_key.upper(),
+            "stack_type": stack_type,
+            "processing_time_seconds": 0,  # Will be updated at end
+            "memory_usage_mb": round(memory_monitor.get_memory_usage_mb(), 1)
+        }
 
-            # Geometry analysis based on detected survey type
-            try:
-                if detected_survey_type == SurveyType.MIGRATED_3D:
-                    # 3D geometry analysis
-                    inline_values = []
-                    xline_values = []
-                    x_coords = []
-                    y_coords = []
-
-                    # Sample geometry (limit for performance)
-                    sample_size = min(1000, f.tracecount)
-                    step = max(1, f.tracecount // sample_size)
-
-                    for i in range(0, f.tracecount, step):
-                        header = f.header[i]
-                        inline = header[segyio.TraceField.INLINE_3D]
-                        xline = header[segyio.TraceField.CROSSLINE_3D]
-                        x = header[segyio.TraceField.CDP_X]
-                        y = header[segyio.TraceField.CDP_Y]
-
-                        if inline != 0:
-                            inline_values.append(inline)
-                        if xline != 0:
-                            xline_values.append(xline)
-                        if x != 0:
-                            x_coords.append(x)
-                        if y != 0:
-                            y_coords.append(y)
-
-                    if inline_values and xline_values:
-                        result.update({
-                            "geometry_type": "3D_grid",
-                            "min_inline": min(inline_values),
-                            "max_inline": max(inline_values),
-                            "inline_count": len(set(inline_values)),
-                            "min_xline": min(xline_values),
-                            "max_xline": max(xline_values),
-                            "xline_count": len(set(xline_values))
-                        })
-
-                        if x_coords and y_coords:
-                            result["coordinate_range"] = {
-                                "min_x": min(x_coords),
-                                "max_x": max(x_coords),
-                                "min_y": min(y_coords),
-                                "max_y": max(y_coords)
-                            }
-
-                elif detected_survey_type in [SurveyType.MIGRATED_2D, SurveyType.CDP_STACK]:
-                    # 2D geometry analysis
-                    cdp_values = []
-                    shot_values = []
-                    x_coords = []
-                    y_coords = []
-
-                    sample_size = min(1000, f.tracecount)
-                    step = max(1, f.tracecount // sample_size)
-
-                    for i in range(0, f.tracecount, step):
-                        header = f.header[i]
-                        cdp = header[segyio.TraceField.CDP]
-                        shot = header[segyio.TraceField.TRACE_SEQUENCE_FILE]
-                        x = header[segyio.TraceField.CDP_X]
-                        y = header[segyio.TraceField.CDP_Y]
-
-                        if cdp != 0:
-                            cdp_values.append(cdp)
-                        if shot != 0:
-                            shot_values.append(shot)
-                        if x != 0:
-                            x_coords.append(x)
-                        if y != 0:
-                            y_coords.append(y)
-
-                    if cdp_values:
-                        result.update({
-                            "geometry_type": "2D_line",
-                            "min_cdp": min(cdp_values),
-                            "max_cdp": max(cdp_values),
-                            "cdp_count": len(set(cdp_values))
-                        })
-
-                    if shot_values:
-                        result.update({
-                            "min_shot_point": min(shot_values),
-                            "max_shot_point": max(shot_values),
-                            "shot_count": len(set(shot_values))
-                        })
-
-                    if x_coords and y_coords:
-                        result["coordinate_range"] = {
-                            "min_x": min(x_coords),
-                            "max_x": max(x_coords),
-                            "min_y": min(y_coords),
-                            "max_y": max(y_coords)
-                        }
+        # Add file format information using segyio
+        sample_interval = header_info["sample_rate_us"]
+        samples_per_trace = header_info["num_samples"]
+        format_code = header_info["format_code"]
+
+        # Format code descriptions
+        format_descriptions = {
+            1: "32 BIT IBM FORMAT",
+            2: "32 BIT INTEGER",
+            3: "16 BIT INTEGER",
+            5: "32 BIT IEEE FORMAT",
+            8: "8 BIT INTEGER"
+        }
 
-                        # Calculate line length
-                        line_length_m = math.sqrt((max(x_coords) - min(x_coords))**2 +
-                                                (max(y_coords) - min(y_coords))**2)
-                        result["line_length_km"] = round(line_length_m / 1000, 2)
+        result.update({
+            "file_revision": 1,  # Standard assumption
+            "number_of_samples": samples_per_trace,
+            "sample_rate_ms": sample_interval / 1000,
+            "trace_length_ms": (sample_interval * samples_per_trace) / 1000,
+            "sample_format": format_descriptions.get(format_code, f"FORMAT CODE {format_code}"),
+            "bytes_per_trace": 240 + (samples_per_trace * (4 if format_code in [1,2,5] else 2)),
+            "total_traces": header_info["trace_count"],
+            "xy_scalar": 1  # Default, would need trace analysis for actual value
+        })
 
-                elif detected_survey_type == SurveyType.SHOT_GATHER:
-                    # Shot gather analysis
-                    field_records = []
-                    offsets = []
+        progress.update(1, f"Analyzing geometry ({header_info['trace_count']} traces)...")
 
-                    sample_size = min(500, f.tracecount)
-                    step = max(1, f.tracecount // sample_size)
+        detected_survey_type = analysis["survey_type"]
+        classification_info = analysis["classification"]
 
-                    for i in range(0, f.tracecount, step):
-                        header = f.header[i]
-                        field_record = header[segyio.TraceField.FieldRecord]
-                        offset = header[segyio.TraceField.offset]
+        result["detected_survey_type"] = detected_survey_type.value
+        result["classification_confidence"] = classification_info["confidence"]
+        result["classification_reasoning"] = classification_info["reasoning"]
+        result["geometry_stats"] = classification_info["geometry_stats"]
 
-                        if field_record != 0:
-                            field_records.append(field_record)
-                        if offset != 0:
-                            offsets.append(offset)
+        result["quality_rating"] = analysis["quality_rating"].value
+        result["quality_analysis"] = analysis["quality_metrics"]
 
-                    result.update({
-                        "geometry_type": "shot_gather",
-                        "field_record_count": len(set(field_records)),
-                        "offset_range": [min(offsets), max(offsets)] if offsets else [0, 0]
-                    })
+        # Geometry analysis based on detected survey type
+        result.update(analysis["geometry"])
+        result["io_performance"] = analysis["performance"]
 
-            except Exception as e:
-                logger.warning(f"Geometry analysis failed: {str(e)}")
-                result["geometry_warning"] = f"Geometry analysis failed: {str(e)}"
-                result["geometry_type"] = "unknown"
+        progress.update(1, "Finalizing results...")
 
         # Add processing metadata
         result.update({
@@ -1109,6 +1016,218 @@ def production_segy_parser(file_path=None, template_path=None, data_dir="./data"
         })}
 
 
+def analyze_geometry_from_index(header_index, survey_type: SurveyType) -> Dict[str, Any]:
+    """Survey-type specific geometry summary answered from the header index"""
+    geometry = {}
+    tracecount = header_index.tracecount
+
+    if survey_type == SurveyType.MIGRATED_3D:
+        # 3D geometry analysis (sampled for parity with the classifier)
+        sample_size = min(1000, tracecount)
+        sampled = slice(0, None, max(1, tracecount // sample_size))
+
+        inline_values = _nonzero(header_index.column("INLINE_3D", sampled))
+        xline_values = _nonzero(header_index.column("CROSSLINE_3D", sampled))
+        x_coords = _nonzero(header_index.column("CDP_X", sampled))
+        y_coords = _nonzero(header_index.column("CDP_Y", sampled))
+
+        if inline_values.size and xline_values.size:
+            geometry.update({
+                "geometry_type": "3D_grid",
+                "min_inline": int(inline_values.min()),
+                "max_inline": int(inline_values.max()),
+                "inline_count": int(np.unique(inline_values).size),
+                "min_xline": int(xline_values.min()),
+                "max_xline": int(xline_values.max()),
+                "xline_count": int(np.unique(xline_values).size)
+            })
+
+            if x_coords.size and y_coords.size:
+                geometry["coordinate_range"] = {
+                    "min_x": int(x_coords.min()),
+                    "max_x": int(x_coords.max()),
+                    "min_y": int(y_coords.min()),
+                    "max_y": int(y_coords.max())
+                }
+
+    elif survey_type in [SurveyType.MIGRATED_2D, SurveyType.CDP_STACK]:
+        # 2D geometry analysis
+        sample_size = min(1000, tracecount)
+        sampled = slice(0, None, max(1, tracecount // sample_size))
+
+        cdp_values = _nonzero(header_index.column("CDP", sampled))
+        shot_values = _nonzero(header_index.column("TRACE_SEQUENCE_FILE", sampled))
+        x_coords = _nonzero(header_index.column("CDP_X", sampled))
+        y_coords = _nonzero(header_index.column("CDP_Y", sampled))
+
+        if cdp_values.size:
+            geometry.update({
+                "geometry_type": "2D_line",
+                "min_cdp": int(cdp_values.min()),
+                "max_cdp": int(cdp_values.max()),
+                "cdp_count": int(np.unique(cdp_values).size)
+            })
+
+        if shot_values.size:
+            geometry.update({
+                "min_shot_point": int(shot_values.min()),
+                "max_shot_point": int(shot_values.max()),
+                "shot_count": int(np.unique(shot_values).size)
+            })
+
+        if x_coords.size and y_coords.size:
+            geometry["coordinate_range"] = {
+                "min_x": int(x_coords.min()),
+                "max_x": int(x_coords.max()),
+                "min_y": int(y_coords.min()),
+                "max_y": int(y_coords.max())
+            }
+
+            # Calculate line length
+            line_length_m = math.sqrt(float(x_coords.max() - x_coords.min())**2 +
+                                      float(y_coords.max() - y_coords.min())**2)
+            geometry["line_length_km"] = round(line_length_m / 1000, 2)
+
+    elif survey_type == SurveyType.SHOT_GATHER:
+        # Shot gather analysis
+        sample_size = min(500, tracecount)
+        sampled = slice(0, None, max(1, tracecount // sample_size))
+
+        field_records = _nonzero(header_index.column("FieldRecord", sampled))
+        offsets = _nonzero(header_index.column("offset", sampled))
+
+        geometry.update({
+            "geometry_type": "shot_gather",
+            "field_record_count": int(np.unique(field_records).size),
+            "offset_range": [int(offsets.min()), int(offsets.max())] if offsets.size else [0, 0]
+        })
+
+    return geometry
+
+
+class SegyioFusedAnalyzer:
+    """
+    Single-pass SEG-Y analysis engine behind production_segy_parser
+
+    The file is opened once: the binary header is validated, the trace-header
+    pass is served by the persistent header index, and the quality trace sample
+    is read as one strided block. Template detection, classification, quality
+    and geometry all consume those shared buffers instead of re-reading the
+    file, and the engine reports wall time and bytes read per run.
+    """
+
+    def __init__(self, validator: Optional[SegyioValidator] = None,
+                 classifier: Optional[SegyioSurveyClassifier] = None,
+                 quality_analyzer: Optional[SegyioQualityAnalyzer] = None):
+        self.validator = validator or SegyioValidator()
+        self.classifier = classifier or SegyioSurveyClassifier()
+        self.quality_analyzer = quality_analyzer or SegyioQualityAnalyzer()
+
+    def analyze(self, file_path: str) -> Dict[str, Any]:
+        """Run validation, template detection, classification, quality and geometry in one pass"""
+        start_time = time.time()
+        stage_times = {}
+        io_stats = {"header_bytes_read": 0, "trace_bytes_read": 0, "traces_read": 0,
+                    "header_index_bytes_read": 0, "header_index_source": None}
+
+        analysis = {"validation": self.validator.new_validation_results()}
+
+        def finish():
+            analysis["performance"] = {
+                "wall_time_seconds": round(time.time() - start_time, 4),
+                "stage_times_seconds": {k: round(v, 4) for k, v in stage_times.items()},
+                "bytes_read": (io_stats["header_bytes_read"] + io_stats["trace_bytes_read"] +
+                               io_stats["header_index_bytes_read"]),
+                **io_stats
+            }
+            return analysis
+
+        def end_stage(name, stage_start, **attrs):
+            stage_end = time.time()
+            stage_times[name] = stage_end - stage_start
+            record_span(f"segy.{name}", stage_start, stage_end, **attrs)
+
+        # Stage 1: open once, validate headers and read the quality trace sample
+        stage_start = time.time()
+        validation = analysis["validation"]
+        try:
+            if not self.validator.validate_file_access(file_path, validation):
+                return finish()
+
+            with segyio.open(file_path, ignore_geometry=True) as f:
+                self.validator.validate_open_file(f, validation)
+                io_stats["header_bytes_read"] = (TEXT_AND_BINARY_HEADER_BYTES +
+                                                 EXTENDED_HEADER_BYTES * max(0, f.ext_headers))
+                if validation["issues"]:
+                    return finish()
+
+                n_samples = len(f.samples)
+                trace_block = read_trace_block(f, quality_sample_slice(f.tracecount, n_samples))
+                io_stats["traces_read"] = int(trace_block.shape[0])
+                io_stats["trace_bytes_read"] = int(trace_block.shape[0] *
+                                                   (TRACE_HEADER_BYTES + trace_block.itemsize * n_samples))
+
+        except segyio.exceptions.InvalidError:
+            validation["issues"].append("Invalid SEG-Y format - file structure corrupted")
+            return finish()
+        except Exception as e:
+            validation["issues"].append(f"Error reading SEG-Y headers: {str(e)}")
+            return finish()
+        finally:
+            end_stage("open_and_sample", stage_start, traces_read=io_stats["traces_read"],
+                      bytes_read=io_stats["header_bytes_read"] + io_stats["trace_bytes_read"])
+
+        tracecount = validation["header_info"]["trace_count"]
+
+        # Stage 2: trace-header pass (built once, then reused from the sidecar)
+        stage_start = time.time()
+        try:
+            header_index, index_source = get_header_index(file_path, with_source=True)
+            io_stats["header_index_source"] = index_source
+            if index_source == "built":
+                io_stats["header_index_bytes_read"] = tracecount * TRACE_HEADER_BYTES
+            elif index_source == "sidecar":
+                io_stats["header_index_bytes_read"] = int(header_index.headers.nbytes)
+        except Exception as e:
+            logger.warning(f"Header index unavailable for {file_path}: {e}")
+            header_index = None
+        end_stage("header_index", stage_start, source=io_stats["header_index_source"],
+                  bytes_read=io_stats["header_index_bytes_read"])
+
+        # Stage 3: consumers of the shared header and trace buffers
+        stage_start = time.time()
+        analysis["template"] = create_intelligent_template(file_path, header_index)
+        end_stage("template_detection", stage_start)
+
+        stage_start = time.time()
+        survey_type, classification_info = self.classifier.classify_survey_type(file_path, header_index)
+        analysis["survey_type"] = survey_type
+        analysis["classification"] = classification_info
+        end_stage("classification", stage_start)
+
+        stage_start = time.time()
+        quality_rating, quality_metrics = self.quality_analyzer.analyze_quality_block(
+            trace_block, tracecount, n_samples, survey_type)
+        analysis["quality_rating"] = quality_rating
+        analysis["quality_metrics"] = quality_metrics
+        end_stage("quality", stage_start)
+
+        stage_start = time.time()
+        try:
+            if header_index is None:
+                raise RuntimeError("trace-header index could not be built")
+            analysis["geometry"] = analyze_geometry_from_index(header_index, survey_type)
+        except Exception as e:
+            logger.warning(f"Geometry analysis failed: {str(e)}")
+            analysis["geometry"] = {
+                "geometry_warning": f"Geometry analysis failed: {str(e)}",
+                "geometry_type": "unknown"
+            }
+        end_stage("geometry", stage_start)
+
+        return finish()
+
+
 def find_segy_file(file_path: str, data_dir: str = "./data") -> str:
     """Enhanced SEG-Y file finder with comprehensive path resolution"""
 
@@ -1391,10 +1510,12 @@ def extract_complete_metadata(filepath: str, include_trace_sampling: bool,
             }
         }
 
-        # Trace header analysis (optional, can be performance intensive)
+        # Trace header analysis (optional, can be performance intensive); a few
+        # sampled headers are read directly rather than indexing the whole file
         if include_trace_sampling and f.tracecount > 0:
             metadata["trace_headers_analysis"] = extract_trace_metadata(
-                f, trace_sample_size, include_statistics
+                f, trace_sample_size, include_statistics,
+                header_index=find_header_index(filepath)
             )
 
         # Processing summary combining all headers
@@ -1744,8 +1865,12 @@ def interpret_coordinate_scalar(scalar_value) -> str:
 
 
 def extract_trace_metadata(segy_file, trace_sample_size: int,
-                           include_statistics: bool) -> Dict[str, Any]:
-    """Extract trace header information with sampling"""
+                           include_statistics: bool, header_index=None) -> Dict[str, Any]:
+    """Extract trace header information with sampling
+
+    When a SegyHeaderIndex is supplied, header words are taken from the index
+    instead of being read trace by trace from the open file.
+    """
 
     total_traces = segy_file.tracecount
 
@@ -1769,14 +1894,14 @@ def extract_trace_metadata(segy_file, trace_sample_size: int,
             "sampling_percentage": (len(sample_indices) / total_traces) * 100,
             "sampling_method": "systematic" if total_traces > sample_size else "complete"
         },
-        "spatial_analysis": analyze_spatial_distribution(segy_file, sample_indices),
+        "spatial_analysis": analyze_spatial_distribution(segy_file, sample_indices, header_index),
         "trace_characteristics": analyze_trace_characteristics(segy_file, sample_indices),
         "coordinate_analysis": None,
         "statistics": None
     }
 
     # Coordinate analysis
-    trace_data["coordinate_analysis"] = analyze_coordinates(segy_file, sample_indices)
+    trace_data["coordinate_analysis"] = analyze_coordinates(segy_file, sample_indices, header_index)
 
     # Statistical analysis (optional)
     if include_statistics:
@@ -1785,95 +1910,35 @@ def extract_trace_metadata(segy_file, trace_sample_size: int,
     return trace_data
 
 
-def analyze_spatial_distribution(segy_file, sample_indices: List[int]) -> Dict[str, Any]:
+def analyze_spatial_distribution(segy_file, sample_indices: List[int],
+                                 header_index=None) -> Dict[str, Any]:
     """Analyze spatial distribution of traces"""
 
-    spatial_info = {
-        "unique_cdps": set(),
-        "unique_inlines": set(),
-        "unique_crosslines": set(),
-        "unique_shots": set(),
-        "unique_receivers": set(),
-        "coordinate_ranges": {
-            "source_x": {"min": None, "max": None},
-            "source_y": {"min": None, "max": None},
-            "group_x": {"min": None, "max": None},
-            "group_y": {"min": None, "max": None}
-        }
-    }
+    if header_index is None:
+        header_index = _HeaderWalker(segy_file)
+    indices = np.asarray(sample_indices, dtype=np.int64)
 
-    source_x_values = []
-    source_y_values = []
-    group_x_values = []
-    group_y_values = []
+    def unique_nonzero(name):
+        return np.unique(_nonzero(header_index.column(name, indices)))
 
-    for idx in sample_indices:
-        try:
-            header = segy_file.header[idx]
-
-            # Collect spatial identifiers
-            cdp = header.get(segyio.TraceField.CDP)
-            if cdp:
-                spatial_info["unique_cdps"].add(cdp)
-
-            inline = header.get(segyio.TraceField.INLINE_3D)
-            if inline:
-                spatial_info["unique_inlines"].add(inline)
-
-            crossline = header.get(segyio.TraceField.CROSSLINE_3D)
-            if crossline:
-                spatial_info["unique_crosslines"].add(crossline)
-
-            shot = header.get(segyio.TraceField.FieldRecord)
-            if shot:
-                spatial_info["unique_shots"].add(shot)
-
-            # Collect coordinates
-            source_x = header.get(segyio.TraceField.SourceX)
-            if source_x:
-                source_x_values.append(source_x)
-
-            source_y = header.get(segyio.TraceField.SourceY)
-            if source_y:
-                source_y_values.append(source_y)
-
-            group_x = header.get(segyio.TraceField.GroupX)
-            if group_x:
-                group_x_values.append(group_x)
-
-            group_y = header.get(segyio.TraceField.GroupY)
-            if group_y:
-                group_y_values.append(group_y)
-
-        except Exception:
-            continue
+    spatial_info = {
+        "unique_cdps": unique_nonzero("CDP"),
+        "unique_inlines": unique_nonzero("INLINE_3D"),
+        "unique_crosslines": unique_nonzero("CROSSLINE_3D"),
+        "unique_shots": unique_nonzero("FieldRecord"),
+        "coordinate_ranges": {}
+    }
 
     # Calculate coordinate ranges
-    if source_x_values:
-        spatial_info["coordinate_ranges"]["source_x"] = {
-            "min": min(source_x_values),
-            "max": max(source_x_values)
-        }
-
-    if source_y_values:
-        spatial_info["coordinate_ranges"]["source_y"] = {
-            "min": min(source_y_values),
-            "max": max(source_y_values)
-        }
-
-    if group_x_values:
-        spatial_info["coordinate_ranges"]["group_x"] = {
-            "min": min(group_x_values),
-            "max": max(group_x_values)
-        }
-
-    if group_y_values:
-        spatial_info["coordinate_ranges"]["group_y"] = {
-            "min": min(group_y_values),
-            "max": max(group_y_values)
-        }
+    for range_key, name in (("source_x", "SourceX"), ("source_y", "SourceY"),
+                            ("group_x", "GroupX"), ("group_y", "GroupY")):
+        values = _nonzero(header_index.column(name, indices))
+        spatial_info["coordinate_ranges"][range_key] = (
+            {"min": int(values.min()), "max": int(values.max())} if values.size
+            else {"min": None, "max": None}
+        )
 
-    # Convert sets to counts for JSON serialization
+    # Convert unique values to counts for JSON serialization
     return {
         "unique_cdp_count": len(spatial_info["unique_cdps"]),
         "unique_inline_count": len(spatial_info["unique_inlines"]),
@@ -1884,6 +1949,23 @@ def analyze_spatial_distribution(segy_file, sample_indices: List[int]) -> Dict[s
     }
 
 
+class _HeaderWalker:
+    """Per-trace header reader exposing the SegyHeaderIndex column interface"""
+
+    def __init__(self, segy_file):
+        self.segy_file = segy_file
+
+    def column(self, name: str, indices) -> np.ndarray:
+        field = getattr(segyio.TraceField, name)
+        values = []
+        for idx in np.asarray(indices, dtype=np.int64):
+            try:
+                values.append(self.segy_file.header[int(idx)][field])
+            except Exception:
+                continue
+        return np.asarray(values, dtype=np.int64)
+
+
 def classify_survey_from_spatial(spatial_info) -> Dict[str, Any]:
     """Classify survey type based on spatial distribution"""
 
@@ -2121,7 +2203,7 @@ def analyze_trace_characteristics(segy_file, sample_indices: list) -> dict:
 
     return trace_stats
 
-def analyze_coordinates(segy_file, sample_indices: list) -> dict:
+def analyze_coordinates(segy_file, sample_indices: list, header_index=None) -> dict:
     """Analyze coordinate information from trace headers"""
     coordinate_analysis = {
         "coordinate_system_detected": False,
@@ -2130,89 +2212,73 @@ def analyze_coordinates(segy_file, sample_indices: list) -> dict:
         "coordinate_scaling_detected": False
     }
 
-    coordinates = {
-        "source_x": [],
-        "source_y": [],
-        "group_x": [],
-        "group_y": [],
-        "cdp_x": [],
-        "cdp_y": []
-    }
-
-    for idx in sample_indices[:min(100, len(sample_indices))]:  # Sample for performance
-        try:
-            header = segy_file.header[idx]
-
-            coord_fields = [
-                (segyio.TraceField.SourceX, "source_x"),
-                (segyio.TraceField.SourceY, "source_y"),
-                (segyio.TraceField.GroupX, "group_x"),
-                (segyio.TraceField.GroupY, "group_y"),
-                (segyio.TraceField.CDP_X, "cdp_x"),
-                (segyio.TraceField.CDP_Y, "cdp_y")
-            ]
-
-            for field, coord_type in coord_fields:
-                value = header.get(field)
-                if value is not None and value != 0:
-                    coordinates[coord_type].append(value)
-                    coordinate_analysis["coordinate_system_detected"] = True
-
-        except Exception:
-            continue
+    if header_index is None:
+        header_index = _HeaderWalker(segy_file)
+    indices = np.asarray(sample_indices[:min(100, len(sample_indices))], dtype=np.int64)  # Sample for performance
+
+    coord_fields = [
+        ("SourceX", "source_x"),
+        ("SourceY", "source_y"),
+        ("GroupX", "group_x"),
+        ("GroupY", "group_y"),
+        ("CDP_X", "cdp_x"),
+        ("CDP_Y", "cdp_y")
+    ]
 
-    # Calculate ranges for non-empty coordinate lists
-    for coord_type, values in coordinates.items():
-        if values:
+    # Calculate ranges for non-empty coordinate columns
+    for name, coord_type in coord_fields:
+        values = _nonzero(header_index.column(name, indices))
+        if values.size:
+            coordinate_analysis["coordinate_system_detected"] = True
             coordinate_analysis["coordinate_ranges"][coord_type] = {
-                "min": min(values),
-                "max": max(values),
-                "count": len(values)
+                "min": int(values.min()),
+                "max": int(values.max()),
+                "count": int(values.size)
             }
 
     return coordinate_analysis
 
-def calculate_trace_statistics(segy_file, sample_indices: list) -> dict:
-    """Calculate statistical information from trace data"""
+def calculate_trace_statistics(segy_file, sample_indices: list, max_traces: int = 20) -> dict:
+    """Calculate statistical information from trace data
+
+    Whole traces, spread evenly over sample_indices, are streamed into a
+    StreamingStats accumulator instead of decimated values from the first traces.
+    """
     statistics = {
         "amplitude_statistics": {},
         "data_quality_metrics": {},
         "trace_characteristics": {}
     }
 
-    amplitude_values = []
-    zero_counts = []
-
-    for idx in sample_indices[:min(20, len(sample_indices))]:  # Limit for performance
-        try:
-            trace = segy_file.trace[idx]
-
-            # Collect amplitude statistics
-            amplitude_values.extend(trace[::10])  # Sample every 10th value
+    if not sample_indices:
+        return statistics
 
-            # Count zeros
-            zero_count = np.sum(trace == 0)
-            zero_counts.append(zero_count / len(trace) * 100)
+    # Evenly spread over the sampled traces, not just the first ones
+    positions = np.linspace(0, len(sample_indices) - 1, min(max_traces, len(sample_indices)))
+    selected = [sample_indices[i] for i in np.unique(positions.round().astype(int))]
 
+    amp_stats = StreamingStats()
+    for idx in selected:
+        try:
+            amp_stats.update(segy_file.trace[idx])
         except Exception:
             continue
 
-    if amplitude_values:
-        amplitude_values = np.array(amplitude_values)
+    if amp_stats.count:
+        max_abs = max(abs(amp_stats.min), abs(amp_stats.max))
         statistics["amplitude_statistics"] = {
-            "min": float(np.min(amplitude_values)),
-            "max": float(np.max(amplitude_values)),
-            "mean": float(np.mean(amplitude_values)),
-            "std": float(np.std(amplitude_values)),
-            "dynamic_range_db": float(
-                20 * np.log10(np.max(np.abs(amplitude_values)) / (np.std(amplitude_values) + 1e-10)))
+            "min": amp_stats.min,
+            "max": amp_stats.max,
+            "mean": amp_stats.mean,
+            "std": amp_stats.std,
+            "dynamic_range_db": float(20 * np.log10(max_abs / (amp_stats.std + 1e-10))) if max_abs > 0 else 0.0
         }
 
-    if zero_counts:
+    if amp_stats.traces:
         statistics["data_quality_metrics"] = {
-            "average_zero_percentage": float(np.mean(zero_counts)),
-            "max_zero_percentage": float(np.max(zero_counts)),
-            "traces_analyzed": len(zero_counts)
+            "average_zero_percentage": amp_stats.trace_zero_percent_sum / amp_stats.traces,
+            "max_zero_percentage": amp_stats.trace_zero_percent_max,
+            "traces_analyzed": amp_stats.traces
         }
 
     return statistics
@@ -2356,45 +2422,48 @@ def assess_file_complexity(metadata: dict) -> str:
 import math
 import logging
 from typing import Dict, List, Tuple, Optional
-from collections import Counter
 import segyio
 
 
 class SurveyPolygonExtractor:
     """Extract geographic survey boundary polygons from SEG-Y coordinates - handles linear surveys"""
 
-    def __init__(self):
+    def __init__(self, hull_type: str = "convex", max_vertices: int = 100,
+                 alpha_radius: Optional[float] = None, return_format: str = "summary",
+                 max_scan_traces: int = DEFAULT_MAX_SCAN_TRACES):
+        """
+        Args:
+            hull_type: "convex" or "concave" (alpha shape) outline for areal surveys
+            max_vertices: Vertex budget of the "simplified" polygon
+            alpha_radius: Concave outline circumradius limit (default: from point spacing)
+            return_format: "summary", "simplified", or "full"
+            max_scan_traces: Traces read before switching to an even stride
+        """
         self.logger = logging.getLogger(__name__)
+        self.hull_type = hull_type
+        self.max_vertices = max_vertices
+        self.alpha_radius = alpha_radius
+        self.return_format = return_format
+        self.max_scan_traces = max_scan_traces
 
     def extract_survey_polygon(self, segy_file_path: str,
-                               coordinate_sample_rate: int = 10) -> Dict:
+                               coordinate_sample_rate: int = 1) -> Dict:
         """
-        Extract survey boundary polygon from trace coordinates with improved sampling
+        Extract survey boundary polygon from the coordinates of every trace
+
+        Args:
+            segy_file_path: Path to SEG-Y file
+            coordinate_sample_rate: Read every Nth trace (1 = all; files larger
+                than max_scan_traces are strided further)
         """
         self.logger.info(f"Extracting survey polygon from: {segy_file_path}")
 
         try:
-            with segyio.open(segy_file_path, ignore_geometry=True) as f:
-                coordinates = []
-                coordinate_info = {
-                    'scalars': [],
-                    'coordinate_units': 'unknown',
-                    'quality_flags': []
-                }
-
-                total_traces = len(f.header)
-
-                # IMPROVED: Use adaptive sampling to ensure we get full extent
-                coordinates = self._extract_coordinates_adaptive_sampling(f, total_traces)
-
-                # Extract coordinate info for the sampled traces
-                sample_indices = range(0, total_traces, coordinate_sample_rate)
-                for i in sample_indices[:100]:  # Limit to 100 samples for metadata
-                    header = f.header[i]
-                    scalar = header[segyio.TraceField.ElevationScalar]
-                    coordinate_info['scalars'].append(scalar)
-
-                return self._format_polygon_output(coordinates, coordinate_info)
+            header_index = get_header_index(segy_file_path)
+            scan = scan_coordinates(header_index, self.max_scan_traces, stride=coordinate_sample_rate)
+            self.logger.debug(f"Scanned {scan['traces_scanned']} of {header_index.tracecount} traces "
+                              f"(stride {scan['stride']})")
+            return self._format_polygon_output(scan)
 
         except Exception as e:
             self.logger.error(f"Survey polygon extraction failed: {str(e)}")
@@ -2404,357 +2473,165 @@ class SurveyPolygonExtractor:
                 'coordinate_quality': 'failed'
             }
 
-    def _extract_coordinates_adaptive_sampling(self, f, total_traces):
-        """
-        IMPROVED: Extract coordinates using adaptive sampling to ensure full extent capture
-
-        Strategy:
-        1. Always include first and last traces
-        2. Sample evenly across the middle
-        3. Add extra samples at potential extent points
-        """
-        coordinates = []
-
-        # Strategy 1: Always include boundary traces
-        boundary_indices = [0, total_traces - 1]
-
-        # Strategy 2: Regular sampling across the file
-        sample_rate = max(10, total_traces // 1000)  # Adaptive sample rate
-        regular_indices = list(range(0, total_traces, sample_rate))
-
-        # Strategy 3: Add some random samples for good measure
-        import random
-        random_indices = random.sample(range(total_traces), min(100, total_traces // 100))
-
-        # Combine all sampling strategies
-        all_indices = set(boundary_indices + regular_indices + random_indices)
-
-        self.logger.debug(f"Sampling {len(all_indices)} traces from {total_traces} total")
-
-        for i in sorted(all_indices):
-            header = f.header[i]
-
-            # Extract coordinates from trace header
-            x = header[segyio.TraceField.GroupX]
-            y = header[segyio.TraceField.GroupY]
-            scalar = header[segyio.TraceField.ElevationScalar]
-
-            # Skip zero coordinates
-            if x == 0 and y == 0:
-                continue
-
-            # Apply coordinate scalar
-            processed_x, processed_y = self._apply_coordinate_scalar(x, y, scalar)
-
-            if processed_x is not None and processed_y is not None:
-                coordinates.append((processed_x, processed_y))
-
-        # CRITICAL: Ensure we have the actual extent by checking first/last valid coordinates
-        coordinates = self._ensure_full_extent_capture(f, coordinates, total_traces)
-
-        return coordinates
-
-    def _ensure_full_extent_capture(self, f, coordinates, total_traces):
-        """
-        CRITICAL: Ensure we capture the true spatial extent of the survey
-
-        This addresses the issue where sampling might miss the actual line endpoints
-        """
-        if not coordinates:
-            return coordinates
-
-        # Find current extent
-        x_vals = [coord[0] for coord in coordinates]
-        current_min_x = min(x_vals)
-        current_max_x = max(x_vals)
-
-        # Check first and last 10% of traces to find true extent
-        check_ranges = [
-            range(0, min(total_traces // 10, 1000)),  # First 10%
-            range(max(0, total_traces - total_traces // 10), total_traces)  # Last 10%
-        ]
-
-        extent_coordinates = []
-
-        for trace_range in check_ranges:
-            for i in trace_range:
-                header = f.header[i]
-                x = header[segyio.TraceField.GroupX]
-                y = header[segyio.TraceField.GroupY]
-                scalar = header[segyio.TraceField.ElevationScalar]
-
-                if x == 0 and y == 0:
-                    continue
-
-                processed_x, processed_y = self._apply_coordinate_scalar(x, y, scalar)
-
-                if processed_x is not None and processed_y is not None:
-                    extent_coordinates.append((processed_x, processed_y))
-
-        # Add extent coordinates if they extend beyond current range
-        for coord in extent_coordinates:
-            x_coord = coord[0]
-            if x_coord < current_min_x or x_coord > current_max_x:
-                coordinates.append(coord)
-                self.logger.debug(f"Added extent coordinate: {coord}")
-
-        self.logger.info(f"Final coordinate count: {len(coordinates)} (including extent capture)")
-
-        return coordinates
-
     # ===================================================================
-    # NEW: LINEAR SURVEY DETECTION AND HANDLING
+    # LINEAR SURVEY DETECTION AND HANDLING
     # ===================================================================
 
-    def _detect_survey_geometry(self, coordinates):
+    def _detect_survey_geometry(self, points: np.ndarray) -> Dict:
         """
         Detect if the survey is linear (2D line) or areal (3D/polygon)
 
-        Returns:
-            dict: {
-                'type': 'linear', 'areal', or 'point',
-                'y_range': difference between min and max Y,
-                'x_range': difference between min and max X,
-                'is_2d_line': boolean
-            }
+        Lines are detected along their principal axis, so a 2D line at any
+        azimuth is linear when its width is under 1% of its length.
         """
-        if not coordinates or len(coordinates) < 2:
-            return {'type': 'point', 'y_range': 0, 'x_range': 0, 'is_2d_line': False}
+        if len(points) < 2:
+            return {'type': 'point', 'y_range': 0, 'x_range': 0, 'is_2d_line': False, 'extent': None}
 
-        x_vals = [coord[0] for coord in coordinates]
-        y_vals = [coord[1] for coord in coordinates]
+        x_range = float(np.ptp(points[:, 0]))
+        y_range = float(np.ptp(points[:, 1]))
+        extent = principal_extent(points)
 
-        x_range = max(x_vals) - min(x_vals)
-        y_range = max(y_vals) - min(y_vals)
-
-        # Determine if this is a linear survey (typical 2D seismic line)
-        # If Y range is very small compared to X range, it's likely a linear survey
-        if y_range == 0 or (x_range > 0 and y_range / x_range < 0.01):
+        if is_linear(extent):
             return {
                 'type': 'linear',
                 'y_range': y_range,
                 'x_range': x_range,
                 'is_2d_line': True,
-                'line_length_m': x_range,
-                'geometry_issue': 'linear_survey_detected'
-            }
-        elif y_range > 0 and x_range > 0:
-            return {
-                'type': 'areal',
-                'y_range': y_range,
-                'x_range': x_range,
-                'is_2d_line': False
+                'line_length_m': extent['length'],
+                'line_width_m': extent['width'],
+                'geometry_issue': 'linear_survey_detected',
+                'extent': extent
             }
+        elif extent['width'] > 0:
+            return {'type': 'areal', 'y_range': y_range, 'x_range': x_range, 'is_2d_line': False,
+                    'extent': extent}
         else:
-            return {
-                'type': 'point',
-                'y_range': y_range,
-                'x_range': x_range,
-                'is_2d_line': False
-            }
+            return {'type': 'point', 'y_range': y_range, 'x_range': x_range, 'is_2d_line': False,
+                    'extent': extent}
 
-    def _create_linear_survey_polygon(self, coordinates, buffer_width_m=100):
-        """
-        Create a polygon from a linear survey with accurate line length calculation
-        """
-        if len(coordinates) < 2:
-            return {
-                'polygon': coordinates,
-                'area_km2': 0.0,
-                'polygon_type': 'insufficient_points',
-                'geometry_type': 'linear_insufficient'
-            }
-
-        # IMPROVED: Sort coordinates by X to ensure proper line order
-        sorted_coords = sorted(coordinates, key=lambda c: c[0])
-
-        # IMPROVED: Calculate actual line length more accurately
-        # Method 1: Use true min/max from all coordinates
-        min_x = min(coord[0] for coord in coordinates)
-        max_x = max(coord[0] for coord in coordinates)
-
-        # Method 2: Calculate cumulative distance along the line (more accurate for curved lines)
-        total_distance = 0
-        if len(sorted_coords) > 1:
-            for i in range(len(sorted_coords) - 1):
-                dx = sorted_coords[i + 1][0] - sorted_coords[i][0]
-                dy = sorted_coords[i + 1][1] - sorted_coords[i][1]
-                total_distance += (dx ** 2 + dy ** 2) ** 0.5
-
-        # Use the longer of the two methods (handles both straight and curved lines)
-        straight_line_length = max_x - min_x
-        actual_line_length = max(straight_line_length, total_distance)
-
-        # Get the Y value (might be 0 or constant)
-        y_vals = [coord[1] for coord in coordinates]
-        y_center = sum(y_vals) / len(y_vals)  # Average Y value
-
-        # Create rectangular polygon with buffer
-        polygon_coords = [
-            (min_x, y_center - buffer_width_m),  # Bottom left
-            (max_x, y_center - buffer_width_m),  # Bottom right
-            (max_x, y_center + buffer_width_m),  # Top right
-            (min_x, y_center + buffer_width_m),  # Top left
-        ]
-
-        # Calculate area using the actual line length
-        length_m = actual_line_length
+    def _create_linear_survey_polygon(self, points: np.ndarray, extent: Dict, buffer_width_m=100):
+        """Buffered rectangle along the line, with cumulative line length"""
+        line = line_outline(points, buffer_width_m, extent)
+        length_m = line['length']
         width_m = 2 * buffer_width_m
-        area_m2 = length_m * width_m
-        area_km2 = area_m2 / 1_000_000.0
+        area_km2 = length_m * width_m / 1_000_000.0
 
         self.logger.info(f"Linear survey polygon: {length_m:.1f}m × {width_m:.1f}m = {area_km2:.6f} km²")
-        self.logger.debug(f"Coordinate extent: X[{min_x:.1f}, {max_x:.1f}], Y[{min(y_vals):.1f}, {max(y_vals):.1f}]")
 
         return {
-            'polygon': polygon_coords,
+            'polygon': line['ring'].tolist(),
             'area_km2': round(area_km2, 6),
             'polygon_type': 'linear_buffered',
             'geometry_type': 'linear_survey',
             'line_length_m': length_m,
             'buffer_width_m': buffer_width_m,
             'coordinate_system': 'local',
+            'calculation_method': 'planar_geometry',
+            'line_endpoints': [line['first_point'].tolist(), line['last_point'].tolist()],
             'calculation_details': {
-                'straight_line_length': straight_line_length,
-                'actual_line_length': actual_line_length,
-                'coordinate_count': len(coordinates),
-                'method_used': 'cumulative_distance' if actual_line_length > straight_line_length else 'straight_line'
+                'straight_line_length': line['straight_length'],
+                'actual_line_length': length_m,
+                'coordinate_count': len(points),
+                'method_used': 'cumulative_distance' if length_m > line['straight_length'] else 'straight_line'
             }
         }
 
-    def _calculate_polygon_area_projected(self, coordinates):
-        """
-        Calculate area for projected coordinates using shoelace formula
-        """
-        if len(coordinates) < 3:
-            return 0.0
-
-        # Ensure polygon is closed
-        if coordinates[0] != coordinates[-1]:
-            coordinates = coordinates + [coordinates[0]]
-
-        # Shoelace formula
-        area = 0.0
-        n = len(coordinates) - 1
-
-        for i in range(n):
-            x1, y1 = coordinates[i]
-            x2, y2 = coordinates[(i + 1) % n]
-            area += (x1 * y2 - x2 * y1)
-
-        area = abs(area) / 2.0
-        area_km2 = area / 1_000_000.0
-
-        return area_km2
-
     # ===================================================================
-    # IMPROVED POLYGON GENERATION WITH LINEAR SURVEY SUPPORT
+    # POLYGON GENERATION WITH LINEAR SURVEY SUPPORT
     # ===================================================================
 
-    def _generate_polygon(self, coordinates: List[Tuple[float, float]]) -> Dict:
-        """Generate polygon from coordinates with linear survey support"""
-        if len(coordinates) < 2:
+    def _generate_polygon(self, points: np.ndarray, geometry: Dict) -> Dict:
+        """Generate polygon from unique coordinates with linear survey support"""
+        if len(points) < 2:
             return {
-                'polygon': coordinates,
+                'polygon': points.tolist(),
                 'area_km2': 0.0,
                 'polygon_type': 'insufficient_points',
                 'coordinate_system': 'unknown',
                 'calculation_method': 'none'
             }
 
-        # First, detect the survey geometry
-        geometry = self._detect_survey_geometry(coordinates)
-
-        self.logger.debug(f"Survey geometry detected: {geometry}")
-
         # Handle linear surveys (2D seismic lines)
         if geometry['is_2d_line']:
             self.logger.info(
-                f"Linear survey detected: {geometry['line_length_m']:.1f}m line, Y-range: {geometry['y_range']:.1f}m")
-            return self._create_linear_survey_polygon(coordinates)
+                f"Linear survey detected: {geometry['line_length_m']:.1f}m line, "
+                f"width: {geometry['line_width_m']:.1f}m")
+            return self._create_linear_survey_polygon(points, geometry['extent'])
 
         # Handle areal surveys (3D or true polygons)
         try:
-            # Try to create convex hull for areal surveys
-            from scipy.spatial import ConvexHull
-            hull = ConvexHull(coordinates)
-            polygon_coords = [coordinates[i] for i in hull.vertices]
-
-            # Calculate area using proper method
-            area_km2 = self._calculate_polygon_area_projected(polygon_coords)
+            if self.hull_type == "concave":
+                outline = concave_outline(points, self.alpha_radius)
+                ring = outline['ring']
+                area_m2 = outline['area'] if outline['area'] is not None else polygon_area(ring)
+                details = {'polygon_type': 'concave_hull', 'alpha_radius': outline['alpha_radius'],
+                           'ring_count': outline['ring_count'], 'hull_points_used': outline['points_used']}
+            else:
+                ring = convex_outline(points)
+                area_m2 = polygon_area(ring)
+                details = {'polygon_type': 'convex_hull'}
 
             return {
-                'polygon': polygon_coords,
-                'area_km2': round(area_km2, 6),
-                'polygon_type': 'convex_hull',
+                'polygon': ring.tolist(),
+                'area_km2': round(area_m2 / 1_000_000.0, 6),
                 'coordinate_system': 'local',
-                'calculation_method': 'planar_geometry'
+                'calculation_method': 'planar_geometry',
+                **details
             }
 
-        except Exception as e:
-            self.logger.warning(f"Convex hull failed: {e}, using bounding box")
-
-            # Fallback: return bounding box
-            min_x = min(coord[0] for coord in coordinates)
-            max_x = max(coord[0] for coord in coordinates)
-            min_y = min(coord[1] for coord in coordinates)
-            max_y = max(coord[1] for coord in coordinates)
-
-            bbox_polygon = [
-                (min_x, min_y), (max_x, min_y),
-                (max_x, max_y), (min_x, max_y)
-            ]
+        except (QhullError, ValueError) as e:
+            self.logger.warning(f"Hull failed: {e}, using bounding box")
 
-            # Calculate area for bounding box
-            area_km2 = self._calculate_polygon_area_projected(bbox_polygon)
+            min_x, min_y = points.min(axis=0)
+            max_x, max_y = points.max(axis=0)
+            bbox_polygon = np.array([[min_x, min_y], [max_x, min_y], [max_x, max_y], [min_x, max_y]])
 
             return {
-                'polygon': bbox_polygon,
-                'area_km2': round(area_km2, 6),
+                'polygon': bbox_polygon.tolist(),
+                'area_km2': round(polygon_area(bbox_polygon) / 1_000_000.0, 6),
                 'polygon_type': 'bounding_box',
                 'coordinate_system': 'local',
                 'calculation_method': 'planar_geometry'
             }
 
     # ===================================================================
-    # ENHANCED OUTPUT FORMATTING WITH LINEAR SURVEY DETAILS
+    # OUTPUT FORMATTING WITH LINEAR SURVEY DETAILS
     # ===================================================================
 
-    def _format_polygon_output(self, coordinates, coordinate_info):
-        """Enhanced output formatting with linear survey handling"""
-
-        # Get configuration (with defaults)
-        max_coords = getattr(self, 'max_coordinates', 100)
-        return_format = getattr(self, 'return_format', 'summary')
+    def _format_polygon_output(self, scan: Dict) -> Dict:
+        """Result dict; the "simplified" polygon is reduced to the vertex budget"""
+        points = scan['points']
+        unique_points = np.unique(points, axis=0) if len(points) else points
 
-        # Generate full polygon data with linear survey support
-        polygon_data = self._generate_polygon(coordinates)
-        coord_quality = self._assess_coordinate_quality(coordinates, coordinate_info['scalars'])
-        survey_metrics = self._calculate_survey_metrics(coordinates)
-        geometry = self._detect_survey_geometry(coordinates)
+        geometry = self._detect_survey_geometry(unique_points)
+        polygon_data = self._generate_polygon(unique_points, geometry)
+        coord_quality = self._assess_coordinate_quality(points, len(unique_points))
+        survey_metrics = self._calculate_survey_metrics(geometry, polygon_data)
+        has_points = len(points) > 0
 
-        # Base result with enhanced geometry information
         result = {
             'polygon_area_km2': polygon_data['area_km2'],
-            'coordinate_count': len(coordinates),
+            'coordinate_count': len(points),
+            'unique_positions': len(unique_points),
             'coordinate_quality': coord_quality,
-            'coordinate_scalar_mode': self._get_scalar_mode(coordinate_info['scalars']),
+            'coordinate_scalar_mode': self._get_scalar_mode(scan['scalars']),
+            'coordinate_source': scan['coordinate_source'],
             'survey_type': survey_metrics['survey_type'],
             'line_azimuth_degrees': survey_metrics['azimuth'],
             'line_length_km': survey_metrics['length_km'],
             'spatial_extent': {
-                'min_x': min(coord[0] for coord in coordinates) if coordinates else None,
-                'max_x': max(coord[0] for coord in coordinates) if coordinates else None,
-                'min_y': min(coord[1] for coord in coordinates) if coordinates else None,
-                'max_y': max(coord[1] for coord in coordinates) if coordinates else None
+                'min_x': float(points[:, 0].min()) if has_points else None,
+                'max_x': float(points[:, 0].max()) if has_points else None,
+                'min_y': float(points[:, 1].min()) if has_points else None,
+                'max_y': float(points[:, 1].max()) if has_points else None
             },
-            # NEW: Enhanced geometry information
             'geometry_info': {
                 'survey_geometry': geometry['type'],
                 'is_linear_survey': geometry['is_2d_line'],
                 'x_range_m': geometry['x_range'],
                 'y_range_m': geometry['y_range'],
-                'polygon_type': polygon_data.get('polygon_type', 'unknown')
+                'polygon_type': polygon_data.get('polygon_type', 'unknown'),
+                'polygon_vertex_count': len(polygon_data['polygon'])
             },
             'area_calculation': {
                 'coordinate_system': polygon_data.get('coordinate_system', 'unknown'),
@@ -2762,44 +2639,45 @@ class SurveyPolygonExtractor:
                 'area_valid': polygon_data['area_km2'] > 0.0
             },
             'extraction_parameters': {
-                'return_format': return_format,
-                'max_coordinates': max_coords,
-                'coordinate_sample_rate': getattr(self, 'coordinate_sample_rate', 10)
+                'return_format': self.return_format,
+                'hull_type': self.hull_type,
+                'max_coordinates': self.max_vertices,
+                'traces_scanned': scan['traces_scanned'],
+                'coordinate_sample_rate': scan['stride']
             }
         }
+        if 'alpha_radius' in polygon_data:
+            result['geometry_info']['alpha_radius'] = polygon_data['alpha_radius']
+            result['geometry_info']['ring_count'] = polygon_data['ring_count']
 
         # Add polygon coordinates based on format
-        if return_format == "summary":
+        if self.return_format == "summary":
             # For linear surveys, return the buffered rectangle coordinates
             if geometry['is_2d_line']:
                 result['survey_polygon'] = polygon_data['polygon'][:4]  # Just the 4 corners
-            else:
+            elif has_points:
                 # Return bounding box for areal surveys
-                if coordinates:
-                    min_x, max_x = result['spatial_extent']['min_x'], result['spatial_extent']['max_x']
-                    min_y, max_y = result['spatial_extent']['min_y'], result['spatial_extent']['max_y']
-                    result['survey_polygon'] = [
-                        [min_x, min_y], [max_x, min_y], [max_x, max_y], [min_x, max_y]
-                    ]
-                else:
-                    result['survey_polygon'] = []
-
-        elif return_format == "simplified":
-            # Return limited coordinates
-            full_polygon = polygon_data['polygon']
-            if len(full_polygon) > max_coords:
-                step = len(full_polygon) // max_coords
-                result['survey_polygon'] = full_polygon[::step][:max_coords]
+                min_x, max_x = result['spatial_extent']['min_x'], result['spatial_extent']['max_x']
+                min_y, max_y = result['spatial_extent']['min_y'], result['spatial_extent']['max_y']
+                result['survey_polygon'] = [
+                    [min_x, min_y], [max_x, min_y], [max_x, max_y], [min_x, max_y]
+                ]
             else:
-                result['survey_polygon'] = full_polygon
+                result['survey_polygon'] = []
+
+        elif self.return_format == "simplified":
+            full_polygon = np.asarray(polygon_data['polygon'], dtype=np.float64)
+            if len(full_polygon) > self.max_vertices:
+                full_polygon = simplify_ring(full_polygon, self.max_vertices)
+            result['survey_polygon'] = full_polygon.tolist()
 
-        elif return_format == "full":
+        elif self.return_format == "full":
             # Return all coordinates
             result['survey_polygon'] = polygon_data['polygon']
             result[
                 'rate_limit_warning'] = f"Full polygon with {len(polygon_data['polygon'])} coordinates may cause rate limits"
 
-        result['recommendations'] = self._generate_spatial_recommendations(coord_quality, len(coordinates),
+        result['recommendations'] = self._generate_spatial_recommendations(coord_quality, len(points),
                                                                            polygon_data, geometry)
         return result
 
@@ -2822,7 +2700,7 @@ class SurveyPolygonExtractor:
         else:
             recommendations.append("Spatial analysis successful")
 
-        # NEW: Linear survey specific recommendations
+        # Linear survey specific recommendations
         if geometry['is_2d_line']:
             recommendations.append(f"Linear survey detected: {geometry['line_length_m']:.1f}m seismic line")
             recommendations.append(f"Polygon created with 100m buffer: {polygon_data['area_km2']:.3f} km²")
@@ -2846,85 +2724,71 @@ class SurveyPolygonExtractor:
         return recommendations
 
     # ===================================================================
-    # UNCHANGED METHODS (keeping your existing logic)
+    # COORDINATE QUALITY AND SURVEY METRICS
     # ===================================================================
 
-    def _assess_coordinate_quality(self, coordinates, scalars):
+    def _assess_coordinate_quality(self, points: np.ndarray, unique_count: int) -> str:
         """Assess quality of extracted coordinates"""
-        if not coordinates:
+        if not len(points):
             return "no_coordinates"
-        elif len(coordinates) < 10:
+        elif len(points) < 10:
             return "insufficient_points"
-        elif len(set(coordinates)) < len(coordinates) * 0.8:
+        elif unique_count < len(points) * 0.8:
             return "low_diversity"
         else:
             return "good"
 
-    def _calculate_survey_metrics(self, coordinates):
-        """Calculate basic survey metrics"""
-        if not coordinates or len(coordinates) < 2:
+    def _calculate_survey_metrics(self, geometry: Dict, polygon_data: Dict) -> Dict:
+        """Survey type, plus azimuth and length of 2D lines"""
+        if geometry['type'] == 'point':
             return {
                 "survey_type": "unknown",
                 "azimuth": 0.0,
                 "length_km": 0.0
             }
 
-        # Calculate line length and azimuth for 2D
-        if len(coordinates) < 100:  # Likely 2D
-            first_point = coordinates[0]
-            last_point = coordinates[-1]
-
-            dx = last_point[0] - first_point[0]
-            dy = last_point[1] - first_point[1]
-
-            length_m = (dx ** 2 + dy ** 2) ** 0.5
-            azimuth = math.degrees(math.atan2(dx, dy)) % 360
-
+        if geometry['is_2d_line']:
+            (x1, y1), (x2, y2) = polygon_data['line_endpoints']
+            azimuth = math.degrees(math.atan2(x2 - x1, y2 - y1)) % 360
             return {
                 "survey_type": "2D",
                 "azimuth": round(azimuth, 1),
-                "length_km": round(length_m / 1000, 2)
-            }
-        else:
-            # 3D survey
-            return {
-                "survey_type": "3D",
-                "azimuth": 0.0,
-                "length_km": 0.0
+                "length_km": round(polygon_data['line_length_m'] / 1000, 2)
             }
 
-    def _get_scalar_mode(self, scalars):
-        """Get most common scalar value"""
-        if not scalars:
-            return 1
+        return {
+            "survey_type": "3D",
+            "azimuth": 0.0,
+            "length_km": 0.0
+        }
 
-        # Remove zeros and find mode
-        non_zero_scalars = [s for s in scalars if s != 0]
-        if not non_zero_scalars:
+    def _get_scalar_mode(self, scalars: np.ndarray) -> int:
+        """Most common non-zero coordinate scalar"""
+        non_zero_scalars = scalars[scalars != 0]
+        if not len(non_zero_scalars):
             return 1
-
-        return Counter(non_zero_scalars).most_common(1)[0][0]
-
-    def _apply_coordinate_scalar(self, x: int, y: int, scalar: int) -> Tuple[Optional[float], Optional[float]]:
-        """Apply SEG-Y coordinate scalar to raw coordinates"""
-        if scalar > 0:
-            return float(x * scalar), float(y * scalar)
-        elif scalar < 0:
-            return float(x / abs(scalar)), float(y / abs(scalar))
-        else:
-            # No scalar defined, use raw values
-            return float(x), float(y)
-
+        values, counts = np.unique(non_zero_scalars, return_counts=True)
+        return int(values[np.argmax(counts)])
 
 # ===================================================================
 # TRACE OUTLINE GENERATOR
 # ===================================================================
 
 class TraceOutlineGenerator:
-    """Generate amplitude outlines for trace visualization"""
+    """Generate amplitude outlines for trace visualization
 
-    def __init__(self):
+    Selected traces are read as (traces x samples) blocks; envelopes, RMS,
+    peak, zero percentage, clipping and SNR are computed for a whole block
+    along the sample axis at once.
+    """
+
+    # Traces analysed by default per return format (summary returns no arrays)
+    DEFAULT_MAX_TRACES = {"summary": 1000, "limited": 10, "full": 10}
+
+    def __init__(self, max_traces: Optional[int] = None, return_format: str = "summary"):
         self.logger = logging.getLogger(__name__)
+        self.max_traces = max_traces
+        self.return_format = return_format
 
     def extract_trace_outlines(self, segy_file_path: str,
                                trace_sample_rate: int = 100,
@@ -2933,190 +2797,146 @@ class TraceOutlineGenerator:
         self.logger.info(f"Extracting trace outlines from: {segy_file_path}")
 
         try:
-            with segyio.open(segy_file_path, ignore_geometry=True) as f:
-                # NEW: Get configuration with defaults
-                max_traces = getattr(self, 'max_traces', 10)
-                return_format = getattr(self, 'return_format', 'summary')
+            header_index = get_header_index(segy_file_path)
+            return_format = self.return_format
+            max_traces = self.max_traces or self.DEFAULT_MAX_TRACES.get(return_format, 10)
 
-                trace_outlines = []
-                total_traces = len(f.trace)
-                samples_per_trace = len(f.samples)
+            with segyio.open(segy_file_path, ignore_geometry=True) as f:
+                total_traces = f.tracecount
                 sample_interval = segyio.tools.dt(f) / 1000.0
 
-                # Sample traces for outline extraction - LIMITED BY max_traces
-                trace_indices = list(range(0, total_traces, trace_sample_rate))[:max_traces]
-
-                for trace_idx in trace_indices:
-                    if trace_idx >= total_traces:
-                        break
-
-                    # Get trace data and header
-                    trace_data = f.trace[trace_idx]
-                    header = f.header[trace_idx]
-
-                    # Extract trace coordinates
-                    x = header[segyio.TraceField.GroupX]
-                    y = header[segyio.TraceField.GroupY]
-                    scalar = header[segyio.TraceField.ElevationScalar]
-
-                    # Apply coordinate scalar
-                    if scalar > 0:
-                        x, y = x * scalar, y * scalar
-                    elif scalar < 0:
-                        x, y = x / abs(scalar), y / abs(scalar)
-
-                    # Calculate trace quality metrics
-                    trace_quality = self._assess_trace_quality(trace_data)
-
-                    # NEW: Format output based on return_format
-                    if return_format == "summary":
-                        # Return only statistics, no arrays
-                        trace_outline = {
-                            'trace_number': trace_idx,
-                            'coordinates': {'x': float(x), 'y': float(y)},
-                            'cdp_number': header[segyio.TraceField.CDP],
-                            'quality_metrics': trace_quality,
-                            'rms_amplitude': float(np.sqrt(np.mean(trace_data ** 2))),
-                            'peak_amplitude': float(np.max(np.abs(trace_data))),
-                            'zero_percentage': float(np.sum(trace_data == 0) / len(trace_data) * 100)
-                            # NO amplitude_envelope or time_axis_ms arrays
-                        }
-
-                    elif return_format == "limited":
-                        # Return decimated arrays (smaller)
-                        envelope = self._generate_amplitude_envelope(trace_data)
-                        decimated_envelope = envelope[::outline_decimation * 5]  # More aggressive decimation
-                        time_samples = np.arange(0, len(decimated_envelope)) * sample_interval * outline_decimation * 5
-
-                        trace_outline = {
-                            'trace_number': trace_idx,
-                            'coordinates': {'x': float(x), 'y': float(y)},
-                            'cdp_number': header[segyio.TraceField.CDP],
-                            'amplitude_envelope': decimated_envelope[:50].tolist(),  # Limit to 50 points
-                            'time_axis_ms': time_samples[:50].tolist(),
-                            'quality_metrics': trace_quality,
-                            'rms_amplitude': float(np.sqrt(np.mean(trace_data ** 2))),
-                            'peak_amplitude': float(np.max(np.abs(trace_data))),
-                        }
-
-                    elif return_format == "full":
-                        # Original behavior - full arrays
-                        envelope = self._generate_amplitude_envelope(trace_data)
-                        decimated_envelope = envelope[::outline_decimation]
-                        time_samples = np.arange(0, len(decimated_envelope)) * sample_interval * outline_decimation
-
-                        trace_outline = {
-                            'trace_number': trace_idx,
-                            'coordinates': {'x': float(x), 'y': float(y)},
-                            'cdp_number': header[segyio.TraceField.CDP],
-                            'amplitude_envelope': decimated_envelope.tolist(),
-                            'time_axis_ms': time_samples.tolist(),
-                            'quality_metrics': trace_quality,
-                            'rms_amplitude': float(np.sqrt(np.mean(trace_data ** 2))),
-                            'peak_amplitude': float(np.max(np.abs(trace_data))),
-                            'zero_percentage': float(np.sum(trace_data == 0) / len(trace_data) * 100)
-                        }
-
+                # Every Nth trace, up to max_traces
+                step = max(1, trace_sample_rate)
+                selection = slice(0, min(total_traces, step * max_traces), step)
+                trace_indices = np.arange(total_traces)[selection]
+
+                # Scaled trace coordinates and CDP numbers from the header index
+                scalars = header_index.column("SourceGroupScalar", trace_indices)
+                group_x = apply_coordinate_scalar(header_index.column("GroupX", trace_indices), scalars)
+                group_y = apply_coordinate_scalar(header_index.column("GroupY", trace_indices), scalars)
+                cdp_numbers = header_index.column("CDP", trace_indices)
+
+                # "limited" keeps every (5 x decimation)-th envelope sample, "full" every decimation-th
+                decimation = outline_decimation * 5 if return_format == "limited" else outline_decimation
+                metrics = {}
+                envelopes = []
+                for block in read_trace_blocks(f, selection):
+                    for key, values in self._block_metrics(block).items():
+                        metrics.setdefault(key, []).append(values)
+                    if return_format in ("limited", "full"):
+                        envelopes.append(self._generate_amplitude_envelope(block)[:, ::max(1, decimation)])
+                metrics = {key: np.concatenate(values) for key, values in metrics.items()}
+
+            trace_outlines = []
+            if return_format in ("limited", "full"):
+                envelope_block = np.concatenate(envelopes) if envelopes else np.empty((0, 0))
+                if return_format == "limited":
+                    envelope_block = envelope_block[:, :50]  # Limit to 50 points
+                time_axis = (np.arange(envelope_block.shape[1]) * sample_interval * decimation).tolist()
+                # One pass over all traces; rows index into it
+                quality_flags = self._quality_flags(metrics) if metrics else None
+                for row, trace_idx in enumerate(trace_indices):
+                    trace_outline = {
+                        'trace_number': int(trace_idx),
+                        'coordinates': {'x': float(group_x[row]), 'y': float(group_y[row])},
+                        'cdp_number': int(cdp_numbers[row]),
+                        'amplitude_envelope': envelope_block[row].tolist(),
+                        'time_axis_ms': time_axis,
+                        'quality_metrics': self._quality_metrics(metrics, quality_flags, row),
+                        'rms_amplitude': float(metrics['rms_amplitude'][row]),
+                        'peak_amplitude': float(metrics['peak_amplitude'][row])
+                    }
+                    if return_format == "full":
+                        trace_outline['zero_percentage'] = float(metrics['zero_percentage'][row])
                     trace_outlines.append(trace_outline)
 
-                # Generate summary statistics
-                summary_stats = self._generate_outline_summary(trace_outlines)
+            # Summary statistics come straight from the metric arrays
+            summary_stats = self._generate_outline_summary(metrics, group_x, group_y)
 
-                result = {
-                    'trace_analysis_summary': summary_stats,  # NEW: Always include summary
-                    'extraction_parameters': {
-                        'trace_sample_rate': trace_sample_rate,
-                        'max_traces_processed': len(trace_outlines),
-                        'return_format': return_format,
-                        'total_traces_in_file': total_traces
-                    },
-                    'status': {
-                        'visualization_ready': return_format in ['limited', 'full'],
-                        'format_used': return_format,
-                        'processing_complete': True
-                    },
-                    'visualization_ready': return_format in ['limited', 'full']
-                }
+            result = {
+                'trace_analysis_summary': summary_stats,
+                'extraction_parameters': {
+                    'trace_sample_rate': trace_sample_rate,
+                    'max_traces_processed': len(trace_indices),
+                    'return_format': return_format,
+                    'total_traces_in_file': total_traces
+                },
+                'status': {
+                    'visualization_ready': return_format in ['limited', 'full'],
+                    'format_used': return_format,
+                    'processing_complete': True
+                },
+                'visualization_ready': return_format in ['limited', 'full']
+            }
 
-                # Only include trace_outlines for non-summary formats
-                if return_format != "summary":
-                    result['trace_outlines'] = trace_outlines
+            # Only include trace_outlines for non-summary formats
+            if return_format != "summary":
+                result['trace_outlines'] = trace_outlines
 
-                if return_format == "full":
-                    result[
-                        'rate_limit_warning'] = f"Full trace data may cause rate limits with {len(trace_outlines)} traces"
+            if return_format == "full":
+                result[
+                    'rate_limit_warning'] = f"Full trace data may cause rate limits with {len(trace_outlines)} traces"
 
-                self.logger.info(
-                    f"Trace outlines extracted: {len(trace_outlines)} traces processed in {return_format} mode")
-                return result
+            self.logger.info(
+                f"Trace outlines extracted: {len(trace_indices)} traces processed in {return_format} mode")
+            return result
 
         except Exception as e:
             self.logger.error(f"Trace outline extraction failed: {str(e)}")
             return {'error': str(e), 'trace_outlines': [], 'visualization_ready': False}
 
-    def _generate_amplitude_envelope(self, trace_data: np.ndarray) -> np.ndarray:
-        """Generate amplitude envelope using Hilbert transform"""
+    def _generate_amplitude_envelope(self, block: np.ndarray) -> np.ndarray:
+        """Amplitude envelopes of a (traces x samples) block using the Hilbert transform"""
         try:
-            # Calculate analytic signal
-            analytic_signal = hilbert(trace_data)
-            # Extract amplitude envelope
-            envelope = np.abs(analytic_signal)
-            return envelope
-        except:
+            return np.abs(hilbert(block, axis=-1))
+        except ValueError:
             # Fallback: use absolute values
-            return np.abs(trace_data)
-
-    def _assess_trace_quality(self, trace_data: np.ndarray) -> Dict:
-        """Assess quality of individual trace"""
-        quality_metrics = {
-            'is_dead_trace': bool(np.all(trace_data == 0)),
-            'is_clipped': bool(self._detect_clipping(trace_data)),
-            'signal_to_noise_ratio': float(self._estimate_snr(trace_data)),
-            'quality_flag': 'unknown'
-        }
-
-        # Determine overall quality flag
-        if quality_metrics['is_dead_trace']:
-            quality_metrics['quality_flag'] = 'dead'
-        elif quality_metrics['is_clipped']:
-            quality_metrics['quality_flag'] = 'clipped'
-        elif quality_metrics['signal_to_noise_ratio'] < 2.0:
-            quality_metrics['quality_flag'] = 'noisy'
-        else:
-            quality_metrics['quality_flag'] = 'good'
+            return np.abs(block)
 
-        return quality_metrics
+    def _block_metrics(self, block: np.ndarray) -> Dict[str, np.ndarray]:
+        """Per-trace amplitude and quality metrics of a (traces x samples) block"""
+        block = np.asarray(block, dtype=np.float64)
+        n_samples = block.shape[1]
+        magnitude = np.abs(block)
+        peak = magnitude.max(axis=1) if n_samples else np.zeros(len(block))
+        power = np.mean(block ** 2, axis=1) if n_samples else np.zeros(len(block))
+        variance = block.var(axis=1) if n_samples else np.zeros(len(block))
 
-    def _detect_clipping(self, trace_data: np.ndarray) -> bool:
-        """Detect if trace is clipped (saturated)"""
-        max_val = np.max(np.abs(trace_data))
-        if max_val == 0:
-            return False
+        # Clipped (saturated): more than 1% of samples within 5% of the peak
+        near_peak = np.count_nonzero(magnitude >= 0.95 * peak[:, np.newaxis], axis=1)
+        clipped = (peak > 0) & (near_peak > n_samples * 0.01)
 
-        # Count samples at or near maximum value
-        threshold = 0.95 * max_val
-        clipped_samples = np.sum(np.abs(trace_data) >= threshold)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            snr = np.where(variance > 0, power / variance, 0.0)
 
-        # If more than 1% of samples are at max, consider it clipped
-        return clipped_samples > len(trace_data) * 0.01
+        return {
+            'rms_amplitude': np.sqrt(power),
+            'peak_amplitude': peak,
+            'zero_percentage': np.count_nonzero(block == 0, axis=1) / max(1, n_samples) * 100,
+            'is_dead_trace': ~block.any(axis=1),
+            'is_clipped': clipped,
+            'signal_to_noise_ratio': snr
+        }
 
-    def _estimate_snr(self, trace_data: np.ndarray) -> float:
-        """Estimate signal-to-noise ratio"""
-        try:
-            # Simple SNR estimation
-            signal_power = np.mean(trace_data ** 2)
-            noise_estimate = np.std(trace_data) ** 2
-            if noise_estimate > 0:
-                return float(signal_power / noise_estimate)
-            else:
-                return 0.0
-        except:
-            return 0.0
+    def _quality_metrics(self, metrics: Dict[str, np.ndarray], quality_flags: np.ndarray, row: int) -> Dict:
+        """Quality metrics of one trace from the block metric arrays and _quality_flags output"""
+        return {
+            'is_dead_trace': bool(metrics['is_dead_trace'][row]),
+            'is_clipped': bool(metrics['is_clipped'][row]),
+            'signal_to_noise_ratio': float(metrics['signal_to_noise_ratio'][row]),
+            'quality_flag': str(quality_flags[row])
+        }
 
+    def _quality_flags(self, metrics: Dict[str, np.ndarray]) -> np.ndarray:
+        """Overall quality flag per trace: dead, clipped, noisy or good"""
+        return np.select(
+            [metrics['is_dead_trace'], metrics['is_clipped'], metrics['signal_to_noise_ratio'] < 2.0],
+            ['dead', 'clipped', 'noisy'], default='good')
 
-    def _generate_outline_summary(self, trace_outlines: List[Dict]) -> Dict:
-        """Generate summary statistics for trace outlines"""
-        if not trace_outlines:
+    def _generate_outline_summary(self, metrics: Dict[str, np.ndarray],
+                                  x_coords: np.ndarray, y_coords: np.ndarray) -> Dict:
+        """Generate summary statistics for the analysed traces"""
+        if not metrics or not len(metrics['rms_amplitude']):
             return {
                 "total_traces": 0,
                 "quality_distribution": {},
@@ -3124,55 +2944,55 @@ class TraceOutlineGenerator:
                 "coordinate_range": {"min_x": 0, "max_x": 0, "min_y": 0, "max_y": 0}
             }
 
-        try:
-            # Quality distribution
-            quality_flags = [t['quality_metrics']['quality_flag'] for t in trace_outlines]
-            quality_dist = {}
-            for flag in set(quality_flags):
-                quality_dist[flag] = quality_flags.count(flag)
-
-            # Amplitude statistics
-            peak_amps = [t['peak_amplitude'] for t in trace_outlines]
-            rms_amps = [t['rms_amplitude'] for t in trace_outlines]
-
-            # Coordinate range
-            x_coords = [t['coordinates']['x'] for t in trace_outlines]
-            y_coords = [t['coordinates']['y'] for t in trace_outlines]
+        flags, counts = np.unique(self._quality_flags(metrics), return_counts=True)
+        peak_amps = metrics['peak_amplitude']
+        rms_amps = metrics['rms_amplitude']
 
-            return {
-                "total_traces": len(trace_outlines),
-                "quality_distribution": quality_dist,
-                "amplitude_range": {
-                    "peak_min": float(min(peak_amps)),
-                    "peak_max": float(max(peak_amps)),
-                    "rms_min": float(min(rms_amps)),
-                    "rms_max": float(max(rms_amps))
-                },
-                "coordinate_range": {
-                    "min_x": float(min(x_coords)) if x_coords else 0,
-                    "max_x": float(max(x_coords)) if x_coords else 0,
-                    "min_y": float(min(y_coords)) if y_coords else 0,
-                    "max_y": float(max(y_coords)) if y_coords else 0
-                },
-                "zero_percentage_avg": float(np.mean([t['zero_percentage'] for t in trace_outlines]))
-            }
-        except Exception as e:
-            return {
-                "total_traces": len(trace_outlines),
-                "error": f"Summary calculation failed: {str(e)}"
-            }
+        return {
+            "total_traces": int(len(rms_amps)),
+            "quality_distribution": {str(flag): int(count) for flag, count in zip(flags, counts)},
+            "amplitude_range": {
+                "peak_min": float(peak_amps.min()),
+                "peak_max": float(peak_amps.max()),
+                "rms_min": float(rms_amps.min()),
+                "rms_max": float(rms_amps.max())
+            },
+            "coordinate_range": {
+                "min_x": float(x_coords.min()),
+                "max_x": float(x_coords.max()),
+                "min_y": float(y_coords.min()),
+                "max_y": float(y_coords.max())
+            },
+            "zero_percentage_avg": float(metrics['zero_percentage'].mean())
+        }
 
 # ===================================================================
 # ANALYSIS STORAGE SYSTEM
 # ===================================================================
 
 class SEGYAnalysisStorage:
-    """Store and retrieve SEG-Y analysis results"""
+    """Store and retrieve SEG-Y analysis results
+
+    Analysis records are JSON files per (file_id, analysis_type); the catalog
+    of stored analyses is an SQLite database in WAL mode with indexes on
+    file_id, analysis_type and timestamp plus an FTS5 index for text search.
+    A legacy catalog/analysis_catalog.json is migrated on first use.
+    """
+
+    CATALOG_DB = "analysis_catalog.db"
+    LEGACY_CATALOG = "analysis_catalog.json"
+
+    # Characters of analysis text indexed for full-text search per record
+    MAX_SEARCH_TEXT = 4000
 
     def __init__(self, storage_dir: str = "./segy_analysis_storage"):
         self.storage_dir = storage_dir
         self.ensure_storage_directory()
         self.logger = logging.getLogger(__name__)
+        self.catalog_path = os.path.join(self.storage_dir, "catalog", self.CATALOG_DB)
+        self.fts_enabled = False
+        self._initialize_catalog()
+        self.migrate_json_catalog()
 
     def ensure_storage_directory(self):
         """Create storage directory if it doesn't exist"""
@@ -3209,14 +3029,17 @@ class SEGYAnalysisStorage:
                 'analysis_data': analysis_data
             }
 
-            # Save to appropriate directory
+            # Save to appropriate directory (atomically, so readers never see a partial record)
             storage_path = self._get_storage_path(analysis_type, file_id)
 
-            with open(storage_path, 'w') as f:
+            tmp_path = f"{storage_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
                 json.dump(storage_record, f, indent=2)
+            os.replace(tmp_path, storage_path)
 
             # Update catalog
-            self._update_catalog(file_id, file_path, analysis_type, timestamp)
+            self._update_catalog(file_id, file_path, analysis_type, timestamp,
+                                 self._searchable_text(analysis_data))
 
             self.logger.info(f"Analysis saved: {analysis_type} for {file_id}")
 
@@ -3265,18 +3088,17 @@ class SEGYAnalysisStorage:
     def get_analysis_catalog(self) -> Dict:
         """Get catalog of all stored analyses"""
         try:
-            catalog_path = os.path.join(self.storage_dir, "catalog", "analysis_catalog.json")
-
-            if not os.path.exists(catalog_path):
-                return {
-                    'total_files': 0,
-                    'analyses': []
-                }
-
-            with open(catalog_path, 'r') as f:
-                catalog = json.load(f)
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT file_id, file_path, filename, analysis_type, timestamp "
+                    "FROM analyses ORDER BY rowid"
+                ).fetchall()
+                total_files = conn.execute("SELECT COUNT(DISTINCT file_id) FROM analyses").fetchone()[0]
 
-            return catalog
+            return {
+                'total_files': total_files,
+                'analyses': [dict(row) for row in rows]
+            }
 
         except Exception as e:
             return {
@@ -3286,59 +3108,185 @@ class SEGYAnalysisStorage:
             }
 
     def search_analyses(self, search_criteria: Dict) -> List[Dict]:
-        """Search stored analyses by criteria"""
-        catalog = self.get_analysis_catalog()
+        """Search stored analyses by criteria
+
+        Supported criteria: filename_pattern (substring), analysis_type,
+        file_id, date_from / date_to (YYYY-MM-DD, inclusive), text_search
+        (full-text over filename, path, analysis type and analysis content)
+        and limit.
+        """
+        search_criteria = search_criteria or {}
+        clauses = []
+        params = []
+
+        filename_pattern = search_criteria.get('filename_pattern')
+        if filename_pattern:
+            clauses.append("instr(lower(a.filename), lower(?)) > 0")
+            params.append(filename_pattern)
+
+        for field in ('analysis_type', 'file_id'):
+            if search_criteria.get(field):
+                clauses.append(f"a.{field} = ?")
+                params.append(search_criteria[field])
+
+        # Dates compare on the YYYY-MM-DD prefix of the ISO timestamp
+        if search_criteria.get('date_from'):
+            clauses.append("substr(a.timestamp, 1, 10) >= ?")
+            params.append(search_criteria['date_from'])
+        if search_criteria.get('date_to'):
+            clauses.append("substr(a.timestamp, 1, 10) <= ?")
+            params.append(search_criteria['date_to'])
+
+        text_search = search_criteria.get('text_search')
+        if text_search:
+            terms = re.findall(r'\w+', text_search)
+            if terms:
+                if self.fts_enabled:
+                    clauses.append("a.rowid IN (SELECT rowid FROM analyses_fts WHERE analyses_fts MATCH ?)")
+                    params.append(" ".join(f'"{term}"*' for term in terms))
+                else:
+                    for term in terms:
+                        clauses.append("(a.filename || ' ' || a.file_path || ' ' || a.analysis_type || ' ' || "
+                                       "a.search_text) LIKE ?")
+                        params.append(f"%{term}%")
+
+        query = "SELECT a.file_id, a.file_path, a.filename, a.analysis_type, a.timestamp FROM analyses a"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY a.rowid"
+        if search_criteria.get('limit'):
+            query += " LIMIT ?"
+            params.append(int(search_criteria['limit']))
 
-        if 'error' in catalog:
+        try:
+            with self._connect() as conn:
+                return [dict(row) for row in conn.execute(query, params).fetchall()]
+        except sqlite3.Error as e:
+            self.logger.error(f"Analysis search failed: {str(e)}")
             return []
 
-        results = []
-        for analysis in catalog.get('analyses', []):
-            # Simple search implementation
-            if self._matches_criteria(analysis, search_criteria):
-                results.append(analysis)
+    def migrate_json_catalog(self, json_path: Optional[str] = None) -> Dict:
+        """
+        Import a legacy JSON catalog into the SQLite catalog
 
-        return results
+        Entries already in the database keep the newer timestamp. The JSON
+        file is renamed to *.migrated afterwards so it is imported only once.
+        """
+        json_path = json_path or os.path.join(self.storage_dir, "catalog", self.LEGACY_CATALOG)
+        if not os.path.isfile(json_path):
+            return {'migrated': 0}
 
-    def _matches_criteria(self, analysis: Dict, search_criteria: Dict) -> bool:
-        """Check if analysis matches search criteria"""
+        try:
+            with open(json_path, 'r') as f:
+                entries = json.load(f).get('analyses', [])
 
-        # If no criteria, match all
-        if not search_criteria:
-            return True
+            migrated = 0
+            with self._connect() as conn:
+                for entry in entries:
+                    if not entry.get('file_id') or not entry.get('analysis_type'):
+                        continue
+                    file_path = entry.get('file_path', '')
+                    self._upsert_entry(conn, entry['file_id'], file_path, entry['analysis_type'],
+                                       entry.get('timestamp', ''), '')
+                    migrated += 1
+
+            os.replace(json_path, f"{json_path}.migrated")
+            self.logger.info(f"Migrated {migrated} catalog entries from {json_path}")
+            return {'migrated': migrated}
+
+        except (OSError, ValueError, sqlite3.Error) as e:
+            self.logger.error(f"Catalog migration failed: {str(e)}")
+            return {'migrated': 0, 'error': str(e)}
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.catalog_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout = 30000")
+        return conn
+
+    def _initialize_catalog(self):
+        """Create the catalog tables and indexes"""
+        with self._connect() as conn:
+            # WAL lets searches read while another process saves
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS analyses (
+                    file_id TEXT NOT NULL,
+                    analysis_type TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    search_text TEXT NOT NULL DEFAULT '',
+                    PRIMARY KEY (file_id, analysis_type)
+                )
+            ''')
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_file_id ON analyses (file_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_type ON analyses (analysis_type)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_timestamp ON analyses (timestamp)")
 
-        # Check filename pattern
-        filename_pattern = search_criteria.get('filename_pattern')
-        if filename_pattern:
-            filename = analysis.get('filename', '')
-            if filename_pattern.lower() not in filename.lower():
-                return False
-
-        # Check analysis type
-        analysis_type = search_criteria.get('analysis_type')
-        if analysis_type:
-            if analysis.get('analysis_type') != analysis_type:
-                return False
-
-        # Check date range
-        date_from = search_criteria.get('date_from')
-        date_to = search_criteria.get('date_to')
-        if date_from or date_to:
-            timestamp_str = analysis.get('timestamp', '')
-            if timestamp_str:
-                try:
-                    from datetime import datetime
-                    analysis_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    analysis_date_str = analysis_date.strftime('%Y-%m-%d')
-
-                    if date_from and analysis_date_str < date_from:
-                        return False
-                    if date_to and analysis_date_str > date_to:
-                        return False
-                except (ValueError, AttributeError):
-                    pass
+            try:
+                conn.execute('''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS analyses_fts
+                    USING fts5(filename, file_path, analysis_type, search_text)
+                ''')
+                self.fts_enabled = True
+            except sqlite3.OperationalError as e:
+                self.logger.warning(f"SQLite FTS5 unavailable, text search falls back to LIKE: {e}")
+
+    def _update_catalog(self, file_id: str, file_path: str, analysis_type: str, timestamp: str,
+                        search_text: str = ''):
+        """Update the analysis catalog in a single transaction"""
+        with self._connect() as conn:
+            self._upsert_entry(conn, file_id, file_path, analysis_type, timestamp, search_text)
+
+    def _upsert_entry(self, conn: sqlite3.Connection, file_id: str, file_path: str,
+                      analysis_type: str, timestamp: str, search_text: str):
+        filename = os.path.basename(file_path)
+        conn.execute('''
+            INSERT INTO analyses (file_id, analysis_type, file_path, filename, timestamp, search_text)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (file_id, analysis_type) DO UPDATE SET
+                file_path = excluded.file_path,
+                filename = excluded.filename,
+                timestamp = excluded.timestamp,
+                search_text = CASE WHEN excluded.search_text != '' THEN excluded.search_text
+                                   ELSE analyses.search_text END
+            WHERE excluded.timestamp >= analyses.timestamp
+        ''', (file_id, analysis_type, file_path, filename, timestamp, search_text))
+
+        if self.fts_enabled:
+            row = conn.execute(
+                "SELECT rowid, filename, file_path, analysis_type, search_text FROM analyses "
+                "WHERE file_id = ? AND analysis_type = ?", (file_id, analysis_type)
+            ).fetchone()
+            conn.execute("DELETE FROM analyses_fts WHERE rowid = ?", (row['rowid'],))
+            conn.execute(
+                "INSERT INTO analyses_fts (rowid, filename, file_path, analysis_type, search_text) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (row['rowid'], row['filename'], row['file_path'], row['analysis_type'], row['search_text'])
+            )
 
-        return True
+    def _searchable_text(self, analysis_data: Any) -> str:
+        """String values of an analysis result, for the full-text index"""
+        parts = []
+        budget = [self.MAX_SEARCH_TEXT]
+
+        def collect(value, depth):
+            if budget[0] <= 0 or depth > 4:
+                return
+            if isinstance(value, str):
+                text = value[:budget[0]]
+                parts.append(text)
+                budget[0] -= len(text) + 1
+            elif isinstance(value, dict):
+                for item in value.values():
+                    collect(item, depth + 1)
+            elif isinstance(value, (list, tuple)):
+                for item in value[:50]:
+                    collect(item, depth + 1)
+
+        collect(analysis_data, 0)
+        return " ".join(parts)
 
     def _generate_file_id(self, file_path: str) -> str:
         """Generate unique identifier for file"""
@@ -3367,60 +3315,24 @@ class SEGYAnalysisStorage:
 
         return os.path.join(self.storage_dir, subdir, filename)
 
-    def _update_catalog(self, file_id: str, file_path: str, analysis_type: str, timestamp: str):
-        """Update the analysis catalog"""
-        catalog_path = os.path.join(self.storage_dir, "catalog", "analysis_catalog.json")
-
-        # Load existing catalog
-        try:
-            with open(catalog_path, 'r') as f:
-                catalog = json.load(f)
-        except:
-            catalog = {
-                'total_files': 0,
-                'analyses': []
-            }
-
-        # Update or add entry
-        entry = {
-            'file_id': file_id,
-            'file_path': file_path,
-            'filename': os.path.basename(file_path),
-            'analysis_type': analysis_type,
-            'timestamp': timestamp
-        }
-
-        # Check if entry exists and update, otherwise add
-        existing_index = None
-        for i, analysis in enumerate(catalog['analyses']):
-            if analysis['file_id'] == file_id and analysis['analysis_type'] == analysis_type:
-                existing_index = i
-                break
-
-        if existing_index is not None:
-            catalog['analyses'][existing_index] = entry
-        else:
-            catalog['analyses'].append(entry)
-            catalog['total_files'] = len(set(a['file_id'] for a in catalog['analyses']))
-
-        # Save updated catalog
-        with open(catalog_path, 'w') as f:
-            json.dump(catalog, f, indent=2)
-
 
 def mcp_extract_survey_polygon(file_path: str = None,
-                               coordinate_sample_rate: int = 10,
-                               max_coordinates: int = 100,  # NEW PARAMETER
-                               return_format: str = "summary",  # NEW PARAMETER
+                               coordinate_sample_rate: int = 1,
+                               max_coordinates: int = 100,
+                               return_format: str = "summary",
+                               hull_type: str = "convex",
+                               alpha_radius: float = None,
                                **kwargs) -> Dict:
     """
     MCP Tool: Extract survey polygon from SEG-Y file - RATE-LIMIT SAFE VERSION
 
     Args:
         file_path: SEG-Y file path
-        coordinate_sample_rate: Sample every Nth trace (default: 10)
-        max_coordinates: Maximum coordinates to return (default: 100)
+        coordinate_sample_rate: Read every Nth trace (default: 1, all traces)
+        max_coordinates: Vertex budget of the "simplified" polygon (default: 100)
         return_format: "summary", "simplified", or "full" (default: "summary")
+        hull_type: "convex" or "concave" (alpha shape) outline (default: "convex")
+        alpha_radius: Concave outline circumradius limit (default: from trace spacing)
     """
     if not file_path:
         return {'error': 'file_path parameter required'}
@@ -3429,11 +3341,8 @@ def mcp_extract_survey_polygon(file_path: str = None,
     if not os.path.isfile(resolved_file_path):
         return {'error': f'File not found: {file_path}', 'resolved_path': resolved_file_path}
 
-    extractor = SurveyPolygonExtractor()
-
-    # NEW: Pass parameters to control output size
-    extractor.max_coordinates = max_coordinates
-    extractor.return_format = return_format
+    extractor = SurveyPolygonExtractor(hull_type=hull_type, max_vertices=max_coordinates,
+                                       alpha_radius=alpha_radius, return_format=return_format)
 
     result = extractor.extract_survey_polygon(resolved_file_path, coordinate_sample_rate)
 
@@ -3451,8 +3360,8 @@ def mcp_extract_survey_polygon(file_path: str = None,
 
 def mcp_extract_trace_outlines(file_path: str = None,
                                trace_sample_rate: int = 100,
-                               max_traces: int = 10,  # NEW PARAMETER
-                               return_format: str = "summary",  # NEW PARAMETER
+                               max_traces: int = None,
+                               return_format: str = "summary",
                                **kwargs) -> Dict:
     """
     MCP Tool: Extract trace outlines from SEG-Y file - RATE-LIMIT SAFE VERSION
@@ -3460,7 +3369,7 @@ def mcp_extract_trace_outlines(file_path: str = None,
     Args:
         file_path: SEG-Y file path
         trace_sample_rate: Extract every Nth trace (default: 100)
-        max_traces: Maximum traces to process (default: 10)
+        max_traces: Maximum traces to process (default: 1000 for "summary", 10 otherwise)
         return_format: "summary", "limited", or "full" (default: "summary")
     """
     if not file_path:
@@ -3470,11 +3379,7 @@ def mcp_extract_trace_outlines(file_path: str = None,
     if not os.path.isfile(resolved_file_path):
         return {'error': f'File not found: {file_path}', 'resolved_path': resolved_file_path}
 
-    generator = TraceOutlineGenerator()
-
-    # NEW: Configure output limits
-    generator.max_traces = max_traces
-    generator.return_format = return_format
+    generator = TraceOutlineGenerator(max_traces=max_traces, return_format=return_format)
 
     result = generator.extract_trace_outlines(resolved_file_path, trace_sample_rate)
 
@@ -0,0 +1,272 @@
+"""
+qa_job_queue.py - Bounded job queue for the QA server
+
+Questions are executed as jobs on a shared thread pool:
+
+- a global concurrency limit (pool size) bounds how many agent runs execute
+  at once
+- jobs for the same agent run one at a time, in submission order, because
+  agent state (memory, tool history) is not thread-safe
+- an agent with a backlog runs one job per dispatch, so busy agents do not
+  starve the others
+- finished jobs are kept for polling until they expire
+
+Run this module directly to measure throughput against a local stub agent.
+"""
+
+import os
+import time
+import uuid
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("QA_MAX_CONCURRENCY", "4"))
+DEFAULT_MAX_PENDING = int(os.getenv("QA_MAX_PENDING_JOBS", "256"))
+DEFAULT_JOB_TTL_SECONDS = int(os.getenv("QA_JOB_TTL_SECONDS", "3600"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when the queue already holds max_pending unfinished jobs"""
+
+
+class QAJob:
+    """One question submitted to an agent"""
+
+    def __init__(self, agent_id: str, question: str):
+        self.job_id = str(uuid.uuid4())
+        self.agent_id = agent_id
+        self.question = question
+        self.status = QUEUED
+        self.answer: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Bumped on every status change so streams can wait for the next one
+        self.version = 0
+        self._changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def _set_status(self, status: str, answer: Optional[str] = None, error: Optional[str] = None):
+        with self._changed:
+            self.status = status
+            if status == RUNNING:
+                self.started_at = time.time()
+            elif status in (DONE, FAILED):
+                self.finished_at = time.time()
+                self.answer = answer
+                self.error = error
+            self.version += 1
+            self._changed.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes; True if it did within timeout"""
+        with self._changed:
+            return self._changed.wait_for(lambda: self.finished, timeout)
+
+    def wait_for_change(self, version: int, timeout: Optional[float] = None) -> int:
+        """Block until the job changes past version (or timeout); returns the current version"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version or self.finished, timeout)
+            return self.version
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "job_id": self.job_id,
+            "agentid": self.agent_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.started_at:
+            result["queue_seconds"] = round(self.started_at - self.created_at, 3)
+        if self.finished_at and self.started_at:
+            result["run_seconds"] = round(self.finished_at - self.started_at, 3)
+        if self.status == DONE:
+            result["answer"] = self.answer
+        elif self.status == FAILED:
+            result["error"] = self.error
+        return result
+
+
+class QAJobQueue:
+    """Runs agent jobs with a global concurrency limit and per-agent serialization"""
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 job_ttl_seconds: int = DEFAULT_JOB_TTL_SECONDS):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_pending = max_pending
+        self.job_ttl_seconds = job_ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                            thread_name_prefix="qa-job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, QAJob] = {}
+        # Per-agent FIFO of (job, agent, handler) waiting for the agent to be free
+        self._pending: Dict[str, deque] = {}
+        self._busy_agents = set()
+        self._unfinished = 0
+        self._completed = 0
+        self._failed = 0
+
+    def submit(self, agent_id: str, agent: Any, question: str,
+               handler: Callable[[Any, str], str]) -> QAJob:
+        """
+        Queue handler(agent, question) as a job
+
+        Raises:
+            QueueFullError: if max_pending jobs are already unfinished
+        """
+        job = QAJob(agent_id, question)
+        with self._lock:
+            self._prune_locked()
+            if self._unfinished >= self.max_pending:
+                raise QueueFullError(f"{self._unfinished} jobs already pending")
+
+            self._jobs[job.job_id] = job
+            self._unfinished += 1
+            self._pending.setdefault(agent_id, deque()).append((job, agent, handler))
+            if agent_id not in self._busy_agents:
+                self._busy_agents.add(agent_id)
+                self._executor.submit(self._run_next, agent_id)
+        return job
+
+    def run(self, agent_id: str, agent: Any, question: str,
+            handler: Callable[[Any, str], str], timeout: Optional[float] = None) -> QAJob:
+        """Submit and wait for the job (synchronous /ask)"""
+        job = self.submit(agent_id, agent, question, handler)
+        job.wait(timeout)
+        return job
+
+    def get(self, job_id: str) -> Optional[QAJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def is_busy(self, agent_id: str) -> bool:
+        """True while the agent has a queued or running job"""
+        with self._lock:
+            return agent_id in self._busy_agents
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if job.status == RUNNING)
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_pending": self.max_pending,
+                "unfinished_jobs": self._unfinished,
+                "running_jobs": running,
+                "queued_jobs": self._unfinished - running,
+                "busy_agents": len(self._busy_agents),
+                "completed_jobs": self._completed,
+                "failed_jobs": self._failed,
+                "tracked_jobs": len(self._jobs)
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _run_next(self, agent_id: str):
+        """Run the oldest job of one agent, then reschedule the agent if it has more"""
+        with self._lock:
+            job, agent, handler = self._pending[agent_id].popleft()
+
+        job._set_status(RUNNING)
+        try:
+            answer = handler(agent, job.question)
+            job._set_status(DONE, answer=answer)
+            succeeded = True
+        except Exception as e:
+            job._set_status(FAILED, error=f"{type(e).__name__}: {e}")
+            succeeded = False
+
+        with self._lock:
+            self._unfinished -= 1
+            if succeeded:
+                self._completed += 1
+            else:
+                self._failed += 1
+
+            if self._pending[agent_id]:
+                # Back of the pool queue, behind other agents' work
+                self._executor.submit(self._run_next, agent_id)
+            else:
+                del self._pending[agent_id]
+                self._busy_agents.discard(agent_id)
+
+    def _prune_locked(self):
+        """Forget finished jobs older than the TTL"""
+        cutoff = time.time() - self.job_ttl_seconds
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class StubAgent:
+    """Agent stand-in that sleeps instead of calling the LLM and tools"""
+
+    def __init__(self, delay_seconds: float = 0.05):
+        self.delay_seconds = delay_seconds
+        self.calls = 0
+        self._active = 0
+
+    def run(self, question: str) -> str:
+        self._active += 1
+        if self._active > 1:
+            raise RuntimeError("StubAgent ran concurrently")
+        try:
+            self.calls += 1
+            time.sleep(self.delay_seconds)
+            return f"stub answer to: {question}"
+        finally:
+            self._active -= 1
+
+
+def benchmark(n_agents: int = 8, jobs_per_agent: int = 10, delay_seconds: float = 0.05,
+              max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> Dict[str, Any]:
+    """Throughput of the queue with stub agents under concurrent submission"""
+    queue = QAJobQueue(max_concurrency=max_concurrency, max_pending=n_agents * jobs_per_agent)
+    agents = {f"agent-{i}": StubAgent(delay_seconds) for i in range(n_agents)}
+
+    start_time = time.time()
+    jobs = [queue.submit(agent_id, agent, f"question {n}", lambda a, q: a.run(q))
+            for n in range(jobs_per_agent) for agent_id, agent in agents.items()]
+    for job in jobs:
+        job.wait()
+    elapsed = time.time() - start_time
+    queue.shutdown()
+
+    queue_seconds = sorted(job.started_at - job.created_at for job in jobs)
+    return {
+        "jobs": len(jobs),
+        "failed": sum(1 for job in jobs if job.status != DONE),
+        "elapsed_seconds": round(elapsed, 3),
+        "jobs_per_second": round(len(jobs) / elapsed, 1),
+        "ideal_jobs_per_second": round(min(max_concurrency, n_agents) / delay_seconds, 1),
+        "median_queue_seconds": round(queue_seconds[len(queue_seconds) // 2], 3),
+        "max_queue_seconds": round(queue_seconds[-1], 3)
+    }
+
+
+if __name__ == "__main__":
+    import json
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="QA job queue throughput with stub agents")
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--jobs", type=int, default=10, help="jobs per agent")
+    parser.add_argument("--delay", type=float, default=0.05, help="stub agent seconds per question")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.agents, args.jobs, args.delay, args.concurrency), indent=2))
@@ -1,25 +1,38 @@
 import uuid
+import asyncio
 import traceback
 import json
 from fastapi import FastAPI, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
+from qa_job_queue import QAJobQueue, QueueFullError, FAILED
+from agent_pool import AgentPool
 __APP_VERSION__="1.0.0"
 # Define request model
 class Question(BaseModel):
     agentid: Optional[str]
     question: str
+    # Return a job id immediately instead of waiting for the answer
+    async_job: bool = False
 
 # Define response model
 class Answer(BaseModel):
     answer: str
 
+class JobAccepted(BaseModel):
+    job_id: str
+    agentid: str
+    status: str
+
 class QAServer(FastAPI):
-    def __init__(self, create_agent_fn):
+    def __init__(self, create_agent_fn, job_queue: Optional[QAJobQueue] = None):
         super().__init__()
         self.agents = dict()
         self.create_agent_fn = create_agent_fn
+        self.jobs = job_queue or QAJobQueue()
+        self.pool = AgentPool(create_agent_fn, self.agents, is_busy=self.jobs.is_busy)
 
 
 def clean_response(response: str) -> str:
@@ -53,7 +66,14 @@ def qa_server_create(create_agent_fn):
     def get_app() -> QAServer:
         return app
 
-    @app.post("/ask", response_model=Answer)
+    def run_agent(agent, user_input):
+        try:
+            return clean_response(agent.run(user_input))
+        except:
+            traceback.print_exc()
+            raise
+
+    @app.post("/ask", response_model=Union[Answer, JobAccepted])
     def ask_question(question: Question, qa_server: QAServer = Depends(get_app)):
         agentids = list([k for k in qa_server.agents if qa_server.agents[k]['killed'] == 0])
         if len(agentids) == 0:
@@ -62,10 +82,12 @@ def qa_server_create(create_agent_fn):
         agentData = qa_server.agents.get(f"{agentid}", None)
         if agentData is None:
             raise HTTPException(status_code=404, detail=f"agent {agentid} not found")
-        if agentData['killed'] == 1:
+        # The pool marks evicted agents killed before removing them; an agent
+        # already removed between the lookup and here counts as killed too
+        agent = agentData.get('agent')
+        if agentData['killed'] == 1 or agent is None:
             raise HTTPException(status_code=404, detail=f"agent {agentid} was killed")
         agentData['tl'] = datetime.now()
-        agent = agentData['agent']
 
         # process query
         user_input = question.question
@@ -76,13 +98,50 @@ def qa_server_create(create_agent_fn):
 
         if command in [ 'version', 'ver' ]:
             return Answer(answer=__APP_VERSION__)
+        # Every run goes through the job queue: one job per agent at a time,
+        # bounded overall concurrency
         try:
-            response = agent.run(user_input)
-            response = clean_response(response)
-        except:
-            traceback.print_exc()
+            if question.async_job:
+                job = qa_server.jobs.submit(agentid, agent, user_input, run_agent)
+                return JobAccepted(job_id=job.job_id, agentid=agentid, status=job.status)
+            job = qa_server.jobs.run(agentid, agent, user_input, run_agent)
+        except QueueFullError:
+            raise HTTPException(status_code=429, detail="Too many pending questions")
+        agentData['tl'] = datetime.now()
+        if job.status == FAILED:
             raise HTTPException(status_code=500, detail="Server Error")
-        return Answer(answer=response)
+        return Answer(answer=job.answer)
+
+    @app.get("/jobs/{job_id}")
+    def get_job(job_id: str, wait: float = 0.0, qa_server: QAServer = Depends(get_app)):
+        job = qa_server.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"job {job_id} not found")
+        if wait > 0:
+            # Long poll, capped so a client cannot pin a worker thread indefinitely
+            job.wait(min(wait, 60.0))
+        return job.to_dict()
+
+    @app.get("/jobs/{job_id}/stream")
+    async def stream_job(job_id: str, qa_server: QAServer = Depends(get_app)):
+        job = qa_server.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"job {job_id} not found")
+
+        async def events():
+            # Server-sent events: one message per status change, last one has the answer
+            version = -1
+            while True:
+                version = await asyncio.to_thread(job.wait_for_change, version, 15.0)
+                yield f"data: {json.dumps(job.to_dict())}\n\n"
+                if job.finished:
+                    break
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/jobs")
+    def job_stats(qa_server: QAServer = Depends(get_app)):
+        return qa_server.jobs.stats()
 
     @app.get("/agents")
     def list_agents(qa_server: QAServer = Depends(get_app)):
@@ -92,9 +151,15 @@ def qa_server_create(create_agent_fn):
     @app.get("/new")
     def create_agent(qa_server: QAServer = Depends(get_app)):
         agentid = str(uuid.uuid4())
-        new_agent = qa_server.create_agent_fn()
-        now = datetime.now()
-        qa_server.agents[agentid] = dict(t0=now, tl=now, agent=new_agent, killed=0)
+        if qa_server.pool.acquire(agentid) is None:
+            raise HTTPException(status_code=500, detail="Agent creation failed")
         return dict(agentid=agentid)
+
+    @app.get("/pool")
+    def pool_stats(qa_server: QAServer = Depends(get_app)):
+        return qa_server.pool.stats()
+
+    # Pre-create warm agents in the background
+    app.pool.start()
     return app
 
@@ -8,11 +8,18 @@ edge cases and format issues that may cause standard parsers to fail.
 import os
 import sys
 import json
+import logging
+import threading
 import traceback
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
 import lasio
 from typing import Tuple, Dict, List, Any, Optional, Union
+from las_binary_store import DEFAULT_STORE_DIR, open_store, write_store
+from utils.file_cache import file_fingerprint
+
+logger = logging.getLogger(__name__)
 
 class NumpyJSONEncoder(json.JSONEncoder):
     """JSON encoder that handles NumPy types"""
@@ -98,6 +105,9 @@ class RobustLASFile:
         """
         Create by directly parsing a LAS file
 
+        Header sections are read line by line; the ~A section is streamed
+        into a float64 NumPy buffer (see read_las_data_section).
+
         Args:
             file_path: Path to the LAS file
 
@@ -108,102 +118,163 @@ class RobustLASFile:
         obj.source_file = file_path
         obj.parsing_method = "direct"
 
-        # Read the file content
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-
         # Process header sections
         section = "version"
         obj.version = {"VERS": "2.0", "WRAP": "NO"}  # Default values
+        curve_info = []
+        null_value = DEFAULT_NULL_VALUE
+        wrapped = False
 
-        # Extract well info and curve info
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-
-            # Check for section markers
-            if line.startswith('~'):
-                if 'V' in line.upper():
-                    section = "version"
-                elif 'W' in line.upper():
-                    section = "well"
-                elif 'C' in line.upper():
-                    section = "curve"
-                elif 'P' in line.upper():
-                    section = "parameter"
-                elif 'O' in line.upper():
-                    section = "other"
-                elif 'A' in line.upper():
-                    # Found data section
-                    # The next non-empty, non-comment line should be column names
-                    column_names = None
-                    data_start_line = None
-
-                    for j in range(i + 1, len(lines)):
-                        next_line = lines[j].strip()
-                        if next_line and not next_line.startswith('#'):
-                            column_names = next_line.split()
-                            data_start_line = j + 1
-                            break
-
-                    if column_names and data_start_line:
-                        # Extract data
-                        data_lines = []
-                        for j in range(data_start_line, len(lines)):
-                            data_line = lines[j].strip()
-                            if not data_line or data_line.startswith('#'):
-                                continue
-
-                            values = data_line.split()
-                            if len(values) == len(column_names):
-                                # Try to convert to numeric
-                                try:
-                                    numeric_values = [float(v) for v in values]
-                                    data_lines.append(numeric_values)
-                                except ValueError:
-                                    print(f"Warning: Skipping non-numeric line: {data_line}")
-
-                        # Create dataframe
-                        if data_lines:
-                            obj.df = pd.DataFrame(data_lines, columns=column_names)
-
-                            # Set index
-                            obj.index = obj.df.iloc[:, 0].values
-
-                            # Create curve info
-                            obj.curves = []
-                            for col in obj.df.columns:
-                                obj.curves.append({
-                                    "mnemonic": col,
-                                    "unit": "unknown",
-                                    "descr": col,
-                                    "data": obj.df[col].values
+        with open(file_path, 'r') as f:
+            # Extract well info and curve info
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+
+                # Check for section markers (identified by the first letter after '~')
+                if line.startswith('~'):
+                    section_id = line[1:2].upper()
+                    if section_id == 'V':
+                        section = "version"
+                    elif section_id == 'W':
+                        section = "well"
+                    elif section_id == 'C':
+                        section = "curve"
+                    elif section_id == 'P':
+                        section = "parameter"
+                    elif section_id == 'O':
+                        section = "other"
+                    elif section_id == 'A':
+                        # Found data section - it runs to the end of the file
+                        obj._read_data_section(f, line, curve_info, null_value, wrapped)
+                        break
+                    continue
+
+                # Process well info and version info from headers
+                if ':' in line and not line.startswith('#'):
+                    parts = line.split(':', 1)
+                    if len(parts) == 2:
+                        header_part = parts[0].strip()
+                        value_part = parts[1].strip()
+
+                        # Extract the mnemonic and unit
+                        if '.' in header_part:
+                            mnemonic = header_part.split('.')[0].strip()
+                            unit, data_value = _split_unit_and_value(header_part.split('.', 1)[1])
+
+                            if section == "well":
+                                obj.well_info[mnemonic] = value_part
+                                if mnemonic == "NULL":
+                                    null_value = _header_float(data_value, DEFAULT_NULL_VALUE)
+                            elif section == "version":
+                                obj.version[mnemonic] = value_part
+                                if mnemonic == "WRAP":
+                                    wrapped = data_value.upper().startswith("YES")
+                            elif section == "curve":
+                                curve_info.append({
+                                    "mnemonic": mnemonic,
+                                    "unit": unit or "unknown",
+                                    "descr": value_part or mnemonic
                                 })
 
-                            # Create data array
-                            obj.data = obj.df.values
-                continue
+        # If we didn't find a data section or failed to create a dataframe
+        if obj.df is None:
+            obj.df = pd.DataFrame()
+
+        return obj
 
-            # Process well info and version info from headers
-            if ':' in line and not line.startswith('#'):
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    header_part = parts[0].strip()
-                    value_part = parts[1].strip()
+    def _read_data_section(self, f, section_line, curve_info, null_value, wrapped):
+        """Stream the ~A section from an open file positioned just after its marker"""
+        # Column names: a non-numeric first line (header row), else the ~C
+        # mnemonics, else the names listed on the ~A line itself
+        first_line = None
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                first_line = line
+                break
+        if first_line is None:
+            return
+
+        pending = [first_line]
+        first_values = first_line.split()
+        if not _is_numeric_row(first_values):
+            column_names = first_values
+            pending = []
+        elif curve_info and (wrapped or len(curve_info) == len(first_values)):
+            column_names = [curve["mnemonic"] for curve in curve_info]
+        elif len(section_line.split()) > 1 and (wrapped or len(section_line.split()) - 1 == len(first_values)):
+            column_names = section_line.split()[1:]
+        else:
+            column_names = [f"CURVE_{i}" if i else "DEPTH" for i in range(len(first_values))]
 
-                    # Extract the mnemonic and unit
-                    if '.' in header_part:
-                        mnemonic = header_part.split('.')[0].strip()
+        data = read_las_data_section(f, len(column_names), wrapped=wrapped,
+                                     null_value=null_value, pending_lines=pending)
+        if len(data) == 0:
+            return
 
-                        if section == "well":
-                            obj.well_info[mnemonic] = value_part
-                        elif section == "version":
-                            obj.version[mnemonic] = value_part
+        # Create dataframe
+        self.df = pd.DataFrame(data, columns=column_names)
 
-        # If we didn't find a data section or failed to create a dataframe
-        if obj.df is None:
-            obj.df = pd.DataFrame()
+        # Set index
+        self.index = self.df.iloc[:, 0].values
+
+        # Create curve info
+        declared = {curve["mnemonic"]: curve for curve in curve_info}
+        self.curves = []
+        for col in self.df.columns:
+            self.curves.append({
+                "mnemonic": col,
+                "unit": declared[col]["unit"] if col in declared else "unknown",
+                "descr": declared[col]["descr"] if col in declared else col,
+                "data": self.df[col].values
+            })
+
+        # Create data array
+        self.data = data
+
+    @classmethod
+    def from_binary_store(cls, header, block, file_path=None):
+        """
+        Create from a memory-mapped binary well-log store (see las_binary_store)
+
+        Curve arrays, the DataFrame columns and the index are views of the
+        memory-mapped block; nothing is parsed or copied.
+
+        Args:
+            header: Store header dict
+            block: (curves x rows) array from las_binary_store.open_store
+            file_path: Optional source file path
+
+        Returns:
+            RobustLASFile: A new LAS file object
+        """
+        obj = cls()
+        obj.source_file = file_path
+        obj.parsing_method = "binary_store"
+
+        obj.well_info = header.get("well_info", {})
+        obj.version = header.get("version", {})
+        obj.index_unit = header.get("index_unit", "m")
+
+        obj.curves = [{
+            "mnemonic": curve["mnemonic"],
+            "unit": curve["unit"],
+            "descr": curve["descr"],
+            "data": block[i]
+        } for i, curve in enumerate(header["curves"])]
+
+        obj.index = block[0]
+        obj.data = block.T
+
+        # Rebuild the DataFrame with the layout of the original parse
+        columns = {header["curves"][pos]["mnemonic"]: block[pos] for pos in header["df_columns"]}
+        index = None
+        if header.get("df_index") is not None:
+            pos = header["df_index"]
+            index = pd.Index(block[pos], name=header["curves"][pos]["mnemonic"], copy=False)
+        obj.df = pd.DataFrame(columns, index=index, copy=False)
 
         return obj
 
@@ -256,16 +327,327 @@ class RobustLASFile:
         return (0, 0)
 
 
-def load_las_file(file_path: str) -> Tuple[Optional[RobustLASFile], Optional[str]]:
+DEFAULT_NULL_VALUE = -999.25
+
+# Lines of the ~A section converted per NumPy call
+DATA_CHUNK_LINES = 8192
+
+
+def read_las_data_section(lines, n_columns: int, wrapped: bool = False,
+                          null_value: Optional[float] = DEFAULT_NULL_VALUE,
+                          pending_lines: Optional[List[str]] = None,
+                          chunk_lines: int = DATA_CHUNK_LINES) -> np.ndarray:
+    """
+    Stream a LAS ~A section into a (rows x columns) float64 array
+
+    Lines are converted in chunks straight into a growing NumPy buffer, so
+    memory stays close to the size of the parsed data. Unwrapped rows with the
+    wrong number of values or non-numeric tokens are skipped; wrapped (WRAP YES)
+    data is read as one token stream split into records of n_columns values.
+    Null values become NaN.
+
+    Args:
+        lines: Iterable of text lines (e.g. an open file after the ~A marker)
+        n_columns: Number of curves per depth step
+        wrapped: True for WRAP YES files
+        null_value: Value to replace with NaN (None disables)
+        pending_lines: Lines already consumed from the iterable to parse first
+        chunk_lines: Number of lines converted per chunk
+
+    Returns:
+        np.ndarray: Parsed data
+    """
+    buffer = np.empty((max(chunk_lines, 1), n_columns), dtype=np.float64)
+    row_count = 0
+    leftover = []  # Tokens of an incomplete wrapped record
+
+    def append_rows(rows):
+        nonlocal buffer, row_count
+        if len(rows) == 0:
+            return
+        if row_count + len(rows) > len(buffer):
+            grown = np.empty((max(2 * len(buffer), row_count + len(rows)), n_columns), dtype=np.float64)
+            grown[:row_count] = buffer[:row_count]
+            buffer = grown
+        if null_value is not None:
+            rows[rows == null_value] = np.nan
+        buffer[row_count:row_count + len(rows)] = rows
+        row_count += len(rows)
+
+    def convert(chunk):
+        nonlocal leftover
+        if wrapped:
+            tokens = leftover + [token for line in chunk for token in line.split()]
+            complete = len(tokens) - len(tokens) % n_columns
+            leftover = tokens[complete:]
+            try:
+                append_rows(np.array(tokens[:complete], dtype=np.float64).reshape(-1, n_columns))
+            except ValueError:
+                rows = [tokens[i:i + n_columns] for i in range(0, complete, n_columns)]
+                append_rows(_parse_rows(rows, n_columns))
+            return
+
+        rows = [values for values in (line.split() for line in chunk) if len(values) == n_columns]
+        try:
+            append_rows(np.array(rows, dtype=np.float64).reshape(-1, n_columns))
+        except ValueError:
+            append_rows(_parse_rows(rows, n_columns))
+
+    chunk = list(pending_lines or [])
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('~'):
+            break
+        chunk.append(line)
+        if len(chunk) >= chunk_lines:
+            convert(chunk)
+            chunk = []
+    convert(chunk)
+
+    if leftover:
+        print(f"Warning: Ignoring {len(leftover)} trailing values of an incomplete wrapped record")
+
+    return buffer[:row_count].copy() if row_count < len(buffer) else buffer
+
+
+def _parse_rows(rows: List[List[str]], n_columns: int) -> np.ndarray:
+    """Row-by-row conversion for chunks containing non-numeric lines"""
+    parsed = []
+    for values in rows:
+        try:
+            parsed.append([float(v) for v in values])
+        except ValueError:
+            print(f"Warning: Skipping non-numeric line: {' '.join(values)}")
+    return np.array(parsed, dtype=np.float64).reshape(-1, n_columns)
+
+
+def _is_numeric_row(values: List[str]) -> bool:
+    try:
+        [float(v) for v in values]
+        return True
+    except ValueError:
+        return False
+
+
+def _split_unit_and_value(text: str) -> Tuple[str, str]:
+    """Split the part of a header line after the first '.' into unit and data value"""
+    if not text or text[0].isspace():
+        return "", text.strip()
+    parts = text.split(None, 1)
+    return parts[0], parts[1].strip() if len(parts) > 1 else ""
+
+
+def _header_float(value, default: float) -> float:
+    """Parse the numeric part of a header value such as '-999.25'"""
+    try:
+        return float(str(value).split()[0])
+    except (ValueError, IndexError):
+        return default
+
+
+class LASFileCache:
+    """
+    Process-wide LRU cache of parsed RobustLASFile objects
+
+    Entries are keyed by absolute path and validated against the file's size
+    and mtime on every lookup, so an edited LAS file is parsed again. Cached
+    objects are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_memory_mb: float = 512):
+        self.max_memory_bytes = int(max_memory_mb * 1024**2)
+        self._entries = OrderedDict()  # path -> (fingerprint, las, size_bytes)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, file_path: str) -> Optional[RobustLASFile]:
+        """Return the cached object for an unchanged file, or None"""
+        key = os.path.abspath(file_path)
+        fingerprint = file_fingerprint(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] != fingerprint:
+                # File changed on disk since it was parsed
+                self._remove(key)
+                self.invalidations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, file_path: str, las: RobustLASFile):
+        """Cache a parsed file, evicting least recently used entries over budget"""
+        key = os.path.abspath(file_path)
+        fingerprint = file_fingerprint(key)
+        if fingerprint is None:
+            return
+
+        size_bytes = estimate_las_memory(las)
+        if size_bytes > self.max_memory_bytes:
+            return  # Larger than the whole budget
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            while self._entries and self._memory_bytes + size_bytes > self.max_memory_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+            self._entries[key] = (fingerprint, las, size_bytes)
+            self._memory_bytes += size_bytes
+
+    def set_max_memory_mb(self, max_memory_mb: float):
+        """Change the memory budget, evicting entries if it shrank"""
+        with self._lock:
+            self.max_memory_bytes = int(max_memory_mb * 1024**2)
+            while self._entries and self._memory_bytes > self.max_memory_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all cached files (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and memory use"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "memory_mb": round(self._memory_bytes / 1024**2, 2),
+                "max_memory_mb": round(self.max_memory_bytes / 1024**2, 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+    def _remove(self, key: str):
+        _, _, size_bytes = self._entries.pop(key)
+        self._memory_bytes -= size_bytes
+
+
+def estimate_las_memory(las: RobustLASFile) -> int:
+    """Approximate bytes held by a parsed LAS file (DataFrame, data array, curve arrays)"""
+    arrays = []
+    if las.df is not None:
+        arrays.extend(np.asarray(las.df[col].values) for col in las.df.columns)
+    for candidate in [las.data, las.index] + [curve.get("data") for curve in las.curves]:
+        if isinstance(candidate, np.ndarray):
+            arrays.append(candidate)
+
+    # Count each underlying buffer once (curve arrays are often views)
+    seen = set()
+    total = 0
+    for array in arrays:
+        base = array
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+        if id(base) in seen:
+            continue
+        seen.add(id(base))
+        total += base.nbytes
+    return total
+
+
+_las_cache = LASFileCache(float(os.getenv("LAS_CACHE_MB", "512")))
+
+
+def get_las_cache() -> LASFileCache:
+    """The process-wide parsed-LAS cache used by load_las_file"""
+    return _las_cache
+
+
+def configure_las_cache(max_memory_mb: float):
+    """Set the memory budget of the process-wide parsed-LAS cache"""
+    _las_cache.set_max_memory_mb(max_memory_mb)
+
+
+def write_las_store(las: RobustLASFile, file_path: str, store_dir: str = DEFAULT_STORE_DIR,
+                    dtype: str = "float64") -> bool:
+    """Write a parsed LAS file to the binary well-log store"""
+    names = [curve["mnemonic"] for curve in las.curves]
+    df = las.df if las.df is not None else pd.DataFrame()
+
+    # Record the DataFrame layout as curve positions so it can be rebuilt
+    if df.columns.duplicated().any() or len(set(names)) != len(names) or \
+            any(col not in names for col in df.columns):
+        return False
+    df_columns = [names.index(col) for col in df.columns]
+
+    df_index = None
+    if not isinstance(df.index, pd.RangeIndex):
+        if df.index.name not in names:
+            return False
+        df_index = names.index(df.index.name)
+
+    header = {
+        "well_info": las.well_info,
+        "version": las.version,
+        "index_unit": las.index_unit,
+        "parsing_method": las.parsing_method,
+        "df_columns": df_columns,
+        "df_index": df_index
+    }
+    return write_store(file_path, las.curves, header, store_dir, dtype)
+
+
+def load_las_file(file_path: str, use_cache: bool = True,
+                  use_store: bool = True) -> Tuple[Optional[RobustLASFile], Optional[str]]:
     """
     Load a LAS file using both standard and robust methods
 
     Args:
         file_path: Path to the LAS file
+        use_cache: Reuse a previously parsed copy of an unchanged file
+        use_store: Open the binary well-log store instead of parsing text,
+            (re)generating it when missing or stale
 
     Returns:
         tuple: (RobustLASFile object, error message or None)
     """
+    if use_cache:
+        cached = _las_cache.get(file_path)
+        if cached is not None:
+            logger.debug(f"Using cached LAS file: {file_path}")
+            return cached, None
+
+    las, error = None, None
+    store_enabled = use_store and bool(DEFAULT_STORE_DIR)
+    if store_enabled:
+        stored = open_store(file_path, DEFAULT_STORE_DIR)
+        if stored is not None:
+            las = RobustLASFile.from_binary_store(*stored, file_path=file_path)
+
+    if las is None:
+        las, error = _parse_las_file(file_path)
+        if store_enabled and las is not None:
+            write_las_store(las, file_path, DEFAULT_STORE_DIR)
+
+    if use_cache and las is not None:
+        _las_cache.put(file_path, las)
+    return las, error
+
+
+def _parse_las_file(file_path: str) -> Tuple[Optional[RobustLASFile], Optional[str]]:
+    """Parse a LAS file with lasio, falling back to direct parsing"""
     print(f"Loading LAS file: {file_path}")
 
     # Try standard parsing first
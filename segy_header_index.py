@@ -0,0 +1,359 @@
+"""
+segy_header_index.py - Persistent trace-header index for SEG-Y files
+
+This module builds a columnar index of the trace-header words used by the
+SEG-Y analysis tools (INLINE/XLINE/CDP, CDP/source/group coordinates, offset,
+scalars) for every trace in a file, and stores it as a memory-mapped .npy
+sidecar next to a small JSON fingerprint.
+
+Analyzers answer geometry questions from the index instead of re-walking the
+trace headers through segyio. The sidecar is keyed by absolute path, file size
+and mtime, so it is rebuilt automatically whenever the SEG-Y file changes.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple, Union
+import segyio
+import numpy as np
+
+from utils.file_cache import cache_path, file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Bump when the column layout changes so stale sidecars are rebuilt
+INDEX_VERSION = 1
+
+# Under the shared cache directory unless SEGY_HEADER_INDEX_DIR is set
+DEFAULT_INDEX_DIR = os.getenv("SEGY_HEADER_INDEX_DIR", cache_path("segy_header_index"))
+
+# Indexed header words: column name -> (trace header byte position, width in bytes)
+INDEX_FIELDS = {
+    "TRACE_SEQUENCE_FILE": (segyio.TraceField.TRACE_SEQUENCE_FILE, 4),
+    "FieldRecord": (segyio.TraceField.FieldRecord, 4),
+    "TraceNumber": (segyio.TraceField.TraceNumber, 4),
+    "CDP": (segyio.TraceField.CDP, 4),
+    "offset": (segyio.TraceField.offset, 4),
+    "ReceiverGroupElevation": (segyio.TraceField.ReceiverGroupElevation, 4),
+    "ElevationScalar": (segyio.TraceField.ElevationScalar, 2),
+    "SourceGroupScalar": (segyio.TraceField.SourceGroupScalar, 2),
+    "SourceX": (segyio.TraceField.SourceX, 4),
+    "SourceY": (segyio.TraceField.SourceY, 4),
+    "GroupX": (segyio.TraceField.GroupX, 4),
+    "GroupY": (segyio.TraceField.GroupY, 4),
+    "CDP_X": (segyio.TraceField.CDP_X, 4),
+    "CDP_Y": (segyio.TraceField.CDP_Y, 4),
+    "INLINE_3D": (segyio.TraceField.INLINE_3D, 4),
+    "CROSSLINE_3D": (segyio.TraceField.CROSSLINE_3D, 4),
+}
+
+INDEX_DTYPE = np.dtype([(name, np.int32) for name in INDEX_FIELDS])
+
+TRACE_HEADER_BYTES = 240
+TEXT_AND_BINARY_HEADER_BYTES = 3600
+EXTENDED_HEADER_BYTES = 3200
+
+# Traces decoded per step of the direct header read (bounds its working memory)
+HEADER_CHUNK_TRACES = 65536
+
+
+class SegyHeaderIndex:
+    """Columnar, read-only view of the indexed trace headers of one SEG-Y file"""
+
+    def __init__(self, file_path: str, headers: np.ndarray, metadata: Dict[str, Any],
+                 source: str = "built"):
+        self.file_path = file_path
+        self.headers = headers
+        self.metadata = metadata
+        # How this index object was created: built or sidecar (per-call source,
+        # including registry hits, comes from get_header_index(with_source=True))
+        self.source = source
+
+    @property
+    def tracecount(self) -> int:
+        return int(self.metadata["tracecount"])
+
+    @property
+    def samples_per_trace(self) -> int:
+        return int(self.metadata["samples_per_trace"])
+
+    @property
+    def sample_interval_us(self) -> int:
+        return int(self.metadata["sample_interval_us"])
+
+    @property
+    def format_code(self) -> int:
+        return int(self.metadata["format_code"])
+
+    def column(self, name: str, indices: Union[slice, np.ndarray, None] = None) -> np.ndarray:
+        """Return one header word for all traces, or for the given trace selection"""
+        values = self.headers[name]
+        if indices is not None:
+            values = values[indices]
+        return np.asarray(values)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.column(name)
+
+    def sample_slice(self, max_traces: int) -> slice:
+        """Evenly strided trace selection matching the analyzers' systematic sampling"""
+        total = self.tracecount
+        if max_traces <= 0 or total <= max_traces:
+            return slice(0, total, 1)
+        step = max(1, total // max_traces)
+        return slice(0, min(total, step * max_traces), step)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary of the index for diagnostics"""
+        return {
+            "file_path": self.file_path,
+            "tracecount": self.tracecount,
+            "fields": list(INDEX_FIELDS.keys()),
+            "index_version": self.metadata.get("index_version"),
+            "build_time_seconds": self.metadata.get("build_time_seconds"),
+            "build_method": self.metadata.get("build_method"),
+            "source": self.source
+        }
+
+    @classmethod
+    def build(cls, file_path: str) -> "SegyHeaderIndex":
+        """Scan every trace header of a SEG-Y file into a new index"""
+        start_time = time.time()
+        file_path = os.path.abspath(file_path)
+
+        with segyio.open(file_path, ignore_geometry=True) as f:
+            metadata = {
+                "tracecount": f.tracecount,
+                "samples_per_trace": len(f.samples),
+                "sample_interval_us": f.bin[segyio.BinField.Interval],
+                "format_code": f.bin[segyio.BinField.Format],
+            }
+
+            headers = _read_headers_direct(file_path, f)
+            metadata["build_method"] = "direct_strided_read"
+            if headers is None:
+                headers = _read_headers_segyio(f)
+                metadata["build_method"] = "segyio_attributes"
+
+        metadata.update(_index_fingerprint(file_path) or {})
+        metadata["build_time_seconds"] = round(time.time() - start_time, 4)
+
+        logger.info(f"Built header index for {os.path.basename(file_path)}: "
+                    f"{metadata['tracecount']} traces in {metadata['build_time_seconds']:.2f}s")
+        return cls(file_path, headers, metadata)
+
+    def save(self, index_dir: str = DEFAULT_INDEX_DIR):
+        """Write the index as a .npy sidecar plus JSON fingerprint"""
+        os.makedirs(index_dir, exist_ok=True)
+        array_path, meta_path = _sidecar_paths(self.file_path, index_dir)
+
+        tmp_array = f"{array_path}.{os.getpid()}.tmp"
+        with open(tmp_array, "wb") as fh:
+            np.save(fh, np.ascontiguousarray(self.headers))
+        os.replace(tmp_array, array_path)
+
+        tmp_meta = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_meta, "w") as fh:
+            json.dump(self.metadata, fh)
+        os.replace(tmp_meta, meta_path)
+
+    @classmethod
+    def load(cls, file_path: str, index_dir: str = DEFAULT_INDEX_DIR) -> Optional["SegyHeaderIndex"]:
+        """Open a sidecar memory-mapped, or None if it is missing or stale"""
+        file_path = os.path.abspath(file_path)
+        array_path, meta_path = _sidecar_paths(file_path, index_dir)
+        if not (os.path.isfile(array_path) and os.path.isfile(meta_path)):
+            return None
+
+        try:
+            with open(meta_path) as fh:
+                metadata = json.load(fh)
+            if not _is_current(metadata, file_path):
+                logger.info(f"Header index for {os.path.basename(file_path)} is stale - rebuilding")
+                return None
+
+            headers = np.load(array_path, mmap_mode="r")
+            if headers.dtype != INDEX_DTYPE or len(headers) != metadata["tracecount"]:
+                return None
+            return cls(file_path, headers, metadata, source="sidecar")
+
+        except Exception as e:
+            logger.warning(f"Could not load header index for {file_path}: {e}")
+            return None
+
+    def is_current(self) -> bool:
+        """True while the indexed SEG-Y file is unchanged on disk"""
+        return _is_current(self.metadata, self.file_path)
+
+
+# Process-wide index registry so repeated tool calls reuse the open memmap
+_index_registry: Dict[str, SegyHeaderIndex] = {}
+_registry_lock = threading.Lock()
+# One lock per file, held while its index is loaded or built
+_build_locks: Dict[str, threading.Lock] = {}
+
+
+def get_header_index(file_path: str, index_dir: Optional[str] = DEFAULT_INDEX_DIR,
+                     rebuild: bool = False, with_source: bool = False):
+    """
+    Get the header index for a SEG-Y file, building and persisting it if needed
+
+    Args:
+        file_path: Path to SEG-Y file
+        index_dir: Sidecar directory; None keeps the index in memory only
+        rebuild: Force a rescan of the trace headers
+        with_source: Also return where this call got the index
+
+    Returns:
+        SegyHeaderIndex: Current index for the file, or (index, source) with
+        source "built", "sidecar" or "memory" when with_source is set
+    """
+    key = os.path.abspath(file_path)
+
+    if not rebuild:
+        index = _registered_index(key)
+        if index is not None:
+            # The registry object is shared, so the per-call source is returned, not stored
+            return (index, "memory") if with_source else index
+
+    with _registry_lock:
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+
+    # Scans of other files and registry hits do not wait for this one
+    with build_lock:
+        if not rebuild:
+            # Another thread may have built it while this one waited
+            index = _registered_index(key)
+            if index is not None:
+                return (index, "memory") if with_source else index
+
+        index = None
+        if index_dir and not rebuild:
+            index = SegyHeaderIndex.load(key, index_dir)
+
+        if index is None:
+            index = SegyHeaderIndex.build(key)
+            if index_dir:
+                try:
+                    index.save(index_dir)
+                except OSError as e:
+                    logger.warning(f"Could not persist header index for {key}: {e}")
+
+        with _registry_lock:
+            _index_registry[key] = index
+        return (index, index.source) if with_source else index
+
+
+def find_header_index(file_path: str, index_dir: Optional[str] = DEFAULT_INDEX_DIR) -> Optional[SegyHeaderIndex]:
+    """
+    Get an already built header index without scanning the file
+
+    Returns the in-process index or a current sidecar, or None when neither
+    exists (callers that only sample a few traces read those headers directly).
+    """
+    key = os.path.abspath(file_path)
+    index = _registered_index(key)
+    if index is not None or not index_dir:
+        return index
+
+    index = SegyHeaderIndex.load(key, index_dir)
+    if index is not None:
+        with _registry_lock:
+            _index_registry[key] = index
+    return index
+
+
+def _registered_index(key: str) -> Optional[SegyHeaderIndex]:
+    """Registry entry for a file if it is still current"""
+    with _registry_lock:
+        index = _index_registry.get(key)
+    if index is not None and index.is_current():
+        return index
+    return None
+
+
+def clear_header_index_cache():
+    """Drop all in-process indexes (sidecars on disk are kept)"""
+    with _registry_lock:
+        _index_registry.clear()
+        _build_locks.clear()
+
+
+def apply_coordinate_scalar(values: np.ndarray, scalars: np.ndarray) -> np.ndarray:
+    """Vectorized SEG-Y coordinate scalar: >0 multiplies, <0 divides, 0 leaves raw"""
+    result = np.array(values, dtype=np.float64)
+    scalars = np.broadcast_to(np.asarray(scalars, dtype=np.float64), result.shape)
+    positive = scalars > 0
+    negative = scalars < 0
+    result[positive] *= scalars[positive]
+    result[negative] /= np.abs(scalars[negative])
+    return result
+
+
+def _index_fingerprint(file_path: str) -> Optional[Dict[str, Any]]:
+    fingerprint = file_fingerprint(file_path)
+    if fingerprint is None:
+        return None
+    return {"file_path": file_path, **fingerprint, "index_version": INDEX_VERSION}
+
+
+def _is_current(metadata: Dict[str, Any], file_path: str) -> bool:
+    current = _index_fingerprint(file_path)
+    if current is None:
+        return False
+    return all(metadata.get(k) == v for k, v in current.items())
+
+
+def _sidecar_paths(file_path: str, index_dir: str) -> Tuple[str, str]:
+    digest = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:16]
+    stem = f"{os.path.basename(file_path)}.{digest}"
+    return (os.path.join(index_dir, f"{stem}.hidx.npy"),
+            os.path.join(index_dir, f"{stem}.hidx.json"))
+
+
+def _read_headers_direct(file_path: str, f) -> Optional[np.ndarray]:
+    """Decode header words straight from a memory map of fixed-length traces"""
+    try:
+        tracecount = f.tracecount
+        data_start = TEXT_AND_BINARY_HEADER_BYTES + EXTENDED_HEADER_BYTES * max(0, f.ext_headers)
+        data_bytes = os.path.getsize(file_path) - data_start
+        if tracecount == 0 or data_bytes <= 0 or data_bytes % tracecount:
+            return None
+
+        trace_bytes = data_bytes // tracecount
+        if trace_bytes < TRACE_HEADER_BYTES:
+            return None
+
+        # One record per trace exposing only the indexed words, so reads stay strided
+        byteorder = ">" if f.endian == "big" else "<"
+        record = np.dtype({
+            "names": list(INDEX_FIELDS),
+            "formats": [f"{byteorder}i{width}" for _position, width in INDEX_FIELDS.values()],
+            "offsets": [int(position) - 1 for position, _width in INDEX_FIELDS.values()],
+            "itemsize": trace_bytes
+        })
+        raw = np.memmap(file_path, dtype=record, mode="r", offset=data_start, shape=(tracecount,))
+
+        headers = np.empty(tracecount, dtype=INDEX_DTYPE)
+        for start in range(0, tracecount, HEADER_CHUNK_TRACES):
+            chunk = raw[start:start + HEADER_CHUNK_TRACES]
+            for name in INDEX_FIELDS:
+                headers[name][start:start + len(chunk)] = chunk[name]
+        del raw
+        return headers
+
+    except Exception as e:
+        logger.debug(f"Direct header read failed for {file_path}, using segyio: {e}")
+        return None
+
+
+def _read_headers_segyio(f) -> np.ndarray:
+    """Fallback: gather each header word for all traces through segyio"""
+    headers = np.empty(f.tracecount, dtype=INDEX_DTYPE)
+    for name, (position, _width) in INDEX_FIELDS.items():
+        headers[name] = f.attributes(position)[:]
+    return headers
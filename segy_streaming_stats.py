@@ -0,0 +1,299 @@
+"""
+segy_streaming_stats.py - Mergeable streaming amplitude statistics for SEG-Y QC
+
+StreamingStats consumes trace blocks (traces x samples NumPy arrays) in
+constant memory and can be merged with other accumulators, e.g. from worker
+processes or file chunks:
+
+- count / mean / variance / skewness / kurtosis from combined central moments
+  (Welford-Chan-Pebay update, numerically stable)
+- running min / max, mean absolute value, RMS
+- zero, NaN and inf counts, per-trace zero percentages
+- percentiles from a fixed-bin histogram whose symmetric range doubles as
+  larger amplitudes arrive (bins are merged pairwise, so no value is lost)
+
+read_trace_blocks streams whole traces from an open segyio file, either the
+entire file or a uniform stride across it, so QC statistics cover the whole
+survey at a bounded cost.
+"""
+
+import math
+import numpy as np
+from typing import Dict, Any, Iterator, Optional, Sequence, Union
+
+DEFAULT_HISTOGRAM_BINS = 4096
+DEFAULT_BLOCK_TRACES = 256
+
+# Distinct values tracked for the constant-value check
+DISTINCT_VALUE_LIMIT = 10
+
+
+class StreamingStats:
+    """Mergeable accumulator of amplitude statistics"""
+
+    def __init__(self, histogram_bins: int = DEFAULT_HISTOGRAM_BINS):
+        if histogram_bins % 4:
+            raise ValueError("histogram_bins must be a multiple of 4")
+
+        # Central moments of the finite values
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+        self.min = math.inf
+        self.max = -math.inf
+        self.sum_abs = 0.0
+
+        # All values, including non-finite ones
+        self.total_values = 0
+        self.zero_count = 0
+        self.nan_count = 0
+        self.inf_count = 0
+
+        # Per-trace zero percentages
+        self.traces = 0
+        self.trace_zero_percent_sum = 0.0
+        self.trace_zero_percent_max = 0.0
+
+        self.distinct_values = set()
+
+        # Symmetric histogram over [-histogram_range, histogram_range]
+        self.histogram_bins = histogram_bins
+        self.histogram_range = 0.0
+        self.histogram = np.zeros(histogram_bins, dtype=np.int64)
+
+    # ------------------------------------------------------------------ updates
+
+    def update(self, block: np.ndarray) -> "StreamingStats":
+        """Add a (traces x samples) block, or a 1D array treated as one trace"""
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[np.newaxis, :]
+        if block.size == 0:
+            return self
+
+        zeros = block == 0
+        self.total_values += block.size
+        self.zero_count += int(zeros.sum())
+
+        zero_percent = zeros.mean(axis=1) * 100
+        self.traces += block.shape[0]
+        self.trace_zero_percent_sum += float(zero_percent.sum())
+        self.trace_zero_percent_max = max(self.trace_zero_percent_max, float(zero_percent.max()))
+
+        values = block.ravel()
+        finite = np.isfinite(values)
+        if not finite.all():
+            self.nan_count += int(np.isnan(values).sum())
+            self.inf_count += int(np.isinf(values).sum())
+            values = values[finite]
+        if values.size == 0:
+            return self
+
+        # Moments of the block, combined with the running moments
+        n = values.size
+        mean = float(values.mean())
+        deviations = values - mean
+        squared = deviations * deviations
+        self._combine_moments(n, mean, float(squared.sum()),
+                              float((squared * deviations).sum()), float((squared * squared).sum()))
+
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sum_abs += float(np.abs(values).sum())
+
+        if len(self.distinct_values) < DISTINCT_VALUE_LIMIT:
+            self.distinct_values.update(np.unique(values[:4096 * DISTINCT_VALUE_LIMIT]).tolist())
+
+        self._add_to_histogram(values)
+        return self
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        """Fold another accumulator into this one"""
+        if other.histogram_bins != self.histogram_bins:
+            raise ValueError("Cannot merge accumulators with different histogram bins")
+
+        if other.count:
+            self._combine_moments(other.count, other.mean, other.m2, other.m3, other.m4)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self.sum_abs += other.sum_abs
+
+            self._expand_histogram(other.histogram_range)
+            # Every accumulator with values has a range (zeros only: 1.0), so doubling terminates
+            assert other.histogram_range > 0
+            histogram = other.histogram
+            range_ = other.histogram_range
+            while range_ < self.histogram_range:
+                histogram = _double_histogram_range(histogram)
+                range_ *= 2
+            self.histogram += histogram
+
+        self.total_values += other.total_values
+        self.zero_count += other.zero_count
+        self.nan_count += other.nan_count
+        self.inf_count += other.inf_count
+        self.traces += other.traces
+        self.trace_zero_percent_sum += other.trace_zero_percent_sum
+        self.trace_zero_percent_max = max(self.trace_zero_percent_max, other.trace_zero_percent_max)
+        if len(self.distinct_values) < DISTINCT_VALUE_LIMIT:
+            self.distinct_values.update(other.distinct_values)
+        return self
+
+    def _combine_moments(self, n_b: int, mean_b: float, m2_b: float, m3_b: float, m4_b: float):
+        n_a = self.count
+        if n_a == 0:
+            self.count, self.mean, self.m2, self.m3, self.m4 = n_b, mean_b, m2_b, m3_b, m4_b
+            return
+
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        delta_n = delta / n
+        m2_a, m3_a = self.m2, self.m3
+
+        self.m4 = (self.m4 + m4_b
+                   + delta * delta_n ** 3 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b)
+                   + 6 * delta_n * delta_n * (n_a * n_a * m2_b + n_b * n_b * m2_a)
+                   + 4 * delta_n * (n_a * m3_b - n_b * m3_a))
+        self.m3 = (m3_a + m3_b
+                   + delta * delta_n * delta_n * n_a * n_b * (n_a - n_b)
+                   + 3 * delta_n * (n_a * m2_b - n_b * m2_a))
+        self.m2 = m2_a + m2_b + delta * delta_n * n_a * n_b
+        self.mean += delta_n * n_b
+        self.count = n
+
+    # --------------------------------------------------------------- histogram
+
+    def _add_to_histogram(self, values: np.ndarray):
+        self._expand_histogram(max(abs(float(values.min())), abs(float(values.max()))))
+        width = 2 * self.histogram_range / self.histogram_bins
+        bins = np.floor((values + self.histogram_range) / width).astype(np.int64)
+        np.clip(bins, 0, self.histogram_bins - 1, out=bins)
+        self.histogram += np.bincount(bins, minlength=self.histogram_bins)
+
+    def _expand_histogram(self, magnitude: float):
+        """Double the histogram range until it covers +/- magnitude"""
+        if self.histogram_range == 0.0:
+            # First values: smallest power of two covering them, 1.0 if they are all zero
+            self.histogram_range = 2.0 ** math.ceil(math.log2(magnitude)) if magnitude > 0 else 1.0
+            return
+        while self.histogram_range < magnitude:
+            self.histogram = _double_histogram_range(self.histogram)
+            self.histogram_range *= 2
+
+    def percentile(self, q: Union[float, Sequence[float]]) -> Union[float, np.ndarray]:
+        """Approximate percentile(s) in [0, 100], interpolated within histogram bins"""
+        q_array = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if self.count == 0:
+            result = np.full(q_array.shape, np.nan)
+        else:
+            edges = np.linspace(-self.histogram_range, self.histogram_range, self.histogram_bins + 1)
+            cumulative = np.concatenate(([0], np.cumsum(self.histogram)))
+            targets = q_array / 100.0 * cumulative[-1]
+            result = np.interp(targets, cumulative, edges)
+            result = np.clip(result, self.min, self.max)
+        return float(result[0]) if np.ndim(q) == 0 else result
+
+    # ----------------------------------------------------------------- results
+
+    @property
+    def variance(self) -> float:
+        """Population variance (matches np.var / np.std with ddof=0)"""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def rms(self) -> float:
+        return math.sqrt(self.variance + self.mean * self.mean) if self.count else 0.0
+
+    @property
+    def mean_abs(self) -> float:
+        return self.sum_abs / self.count if self.count else 0.0
+
+    @property
+    def skewness(self) -> float:
+        """Biased sample skewness (scipy.stats.skew default)"""
+        if self.count == 0 or self.m2 == 0:
+            return 0.0
+        return math.sqrt(self.count) * self.m3 / self.m2 ** 1.5
+
+    @property
+    def kurtosis(self) -> float:
+        """Excess kurtosis (scipy.stats.kurtosis default)"""
+        if self.count == 0 or self.m2 == 0:
+            return -3.0
+        return self.count * self.m4 / (self.m2 * self.m2) - 3.0
+
+    @property
+    def zero_percentage(self) -> float:
+        return self.zero_count / self.total_values * 100 if self.total_values else 0.0
+
+    def to_dict(self, percentiles: Sequence[int] = (1, 5, 10, 25, 50, 75, 90, 95, 99)) -> Dict[str, Any]:
+        """Summary of the accumulated statistics"""
+        values = self.percentile(list(percentiles))
+        return {
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self.mean,
+            "std_dev": self.std,
+            "rms": self.rms,
+            "skewness": self.skewness,
+            "kurtosis": self.kurtosis,
+            "percentiles": {f"p{p}": float(v) for p, v in zip(percentiles, values)},
+            "zero_percentage": self.zero_percentage,
+            "nan_count": self.nan_count,
+            "inf_count": self.inf_count,
+            "traces": self.traces
+        }
+
+
+def _double_histogram_range(histogram: np.ndarray) -> np.ndarray:
+    """Rebin a symmetric histogram onto twice its range (pairs of bins merge into the centre half)"""
+    n_bins = len(histogram)
+    doubled = np.zeros_like(histogram)
+    doubled[n_bins // 4: 3 * n_bins // 4] = histogram.reshape(-1, 2).sum(axis=1)
+    return doubled
+
+
+def uniform_trace_slice(tracecount: int, max_traces: Optional[int] = None) -> slice:
+    """Uniform stride across the whole file (every trace when max_traces is None)"""
+    if not max_traces or max_traces >= tracecount:
+        return slice(0, tracecount, 1)
+    step = max(1, tracecount // max_traces)
+    return slice(0, min(tracecount, step * max_traces), step)
+
+
+def read_trace_blocks(f, traces: Union[slice, Sequence[int]],
+                      block_traces: int = DEFAULT_BLOCK_TRACES) -> Iterator[np.ndarray]:
+    """Yield (traces x samples) blocks of the selected traces of an open segyio file"""
+    if isinstance(traces, slice):
+        start, stop, step = traces.indices(f.tracecount)
+        span = step * block_traces
+        for block_start in range(start, stop, span):
+            block = np.asarray(f.trace.raw[block_start:min(stop, block_start + span):step])
+            if block.size:
+                yield np.atleast_2d(block)
+        return
+
+    indices = list(traces)
+    for block_start in range(0, len(indices), block_traces):
+        chunk = indices[block_start:block_start + block_traces]
+        block = np.empty((len(chunk), len(f.samples)), dtype=np.float32)
+        for row, idx in enumerate(chunk):
+            block[row] = f.trace.raw[idx]
+        yield block
+
+
+def accumulate_traces(f, traces: Union[slice, Sequence[int]], stats: Optional[StreamingStats] = None,
+                      block_traces: int = DEFAULT_BLOCK_TRACES) -> StreamingStats:
+    """Stream the selected traces of an open segyio file into an accumulator"""
+    stats = stats if stats is not None else StreamingStats()
+    for block in read_trace_blocks(f, traces, block_traces):
+        stats.update(block)
+    return stats
@@ -5,13 +5,18 @@ Handles Model Context Protocol server with subsurface data tools
 
 import time
 import json
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
 
 # MCP and tool imports (from your original code)
 from python_a2a.mcp import FastMCP
 
 from .base_server import BaseServer, HealthCheckMixin
 from config.settings import MCPConfig, DataConfig
+from utils.tracing import span, traced, trace_headers, continue_trace, end_remote_trace, TRACE_HEADER
 from tools.las_tools import create_las_tools
 from tools.segy_tools import create_segy_tools
 from tools.system_tools import create_system_tools
@@ -35,6 +40,10 @@ class MCPServerManager(BaseServer, HealthCheckMixin):
         self.mcp_server: Optional[FastMCP] = None
         self.tools_registered = 0
 
+        configure_client_pool(pool_size=config.pool_size, timeout=config.timeout,
+                              connect_timeout=config.connect_timeout, max_batch_calls=config.max_batch_calls)
+        self.client = MCPClient(self.url)
+
     def _create_server(self):
         """Create MCP server with all subsurface data tools"""
         self.logger.info("Creating MCP server with subsurface data tools...")
@@ -50,6 +59,10 @@ class MCPServerManager(BaseServer, HealthCheckMixin):
         self._register_segy_tools()
         self._register_system_tools()
 
+        # Every tool call runs in its own span
+        for tool in self.mcp_server.tools.values():
+            tool.handler = traced(f"tool.{tool.name}")(tool.handler)
+
         self.logger.info(f"MCP server created with {self.tools_registered} tools")
 
     def _register_las_tools(self):
@@ -88,7 +101,14 @@ class MCPServerManager(BaseServer, HealthCheckMixin):
             raise RuntimeError("MCP server not created")
 
         def run_mcp_server():
-            self.mcp_server.run(host=self.host, port=self.port)
+            # Same FastAPI app FastMCP.run() serves, plus the batch endpoint
+            import uvicorn
+            from python_a2a.mcp.transport.fastapi import create_fastapi_app
+
+            app = create_fastapi_app(self.mcp_server)
+            add_batch_endpoint(app, self.mcp_server, self.config.max_batch_calls)
+            add_trace_middleware(app)
+            uvicorn.run(app, host=self.host, port=self.port)
 
         self.run_in_thread(run_mcp_server)
 
@@ -106,9 +126,8 @@ class MCPServerManager(BaseServer, HealthCheckMixin):
             return False
 
         try:
-            import requests
             # Try to access the tools endpoint
-            response = requests.get(f"{self.url}/tools", timeout=5)
+            response = get_pooled_session(self.url).get(f"{self.url}/tools", timeout=5)
             return response.status_code == 200
         except Exception:
             # Fallback to thread status
@@ -119,49 +138,22 @@ class MCPServerManager(BaseServer, HealthCheckMixin):
         if not self.is_ready():
             return {"error": "Server not ready"}
 
-        try:
-            import requests
-            response = requests.get(f"{self.url}/tools", timeout=10)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"error": f"HTTP {response.status_code}: {response.text}"}
-        except Exception as e:
-            return {"error": f"Failed to get tools: {str(e)}"}
+        return self.client.get_tools()
 
     def call_tool(self, tool_name: str, input_data: Any) -> Dict[str, Any]:
         """Call a specific tool"""
         if not self.is_ready():
             return {"error": "Server not ready"}
 
-        try:
-            import requests
-
-            # Convert input to appropriate format
-            if isinstance(input_data, dict):
-                input_json = json.dumps(input_data)
-            elif isinstance(input_data, str) and (input_data.startswith('{') or input_data.startswith('[')):
-                try:
-                    json.loads(input_data)  # Validate JSON
-                    input_json = input_data
-                except json.JSONDecodeError:
-                    input_json = input_data
-            else:
-                input_json = str(input_data)
-
-            response = requests.post(
-                f"{self.url}/tools/{tool_name}",
-                json={"input": input_json},
-                timeout=30
-            )
+        return self.client.call_tool(tool_name, input_data)
 
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"error": f"HTTP {response.status_code}: {response.text}"}
+    def call_tools(self, calls: List[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        """Call several tools in one round trip (see MCPClient.call_tools)"""
+        if not self.is_ready():
+            return [{"tool": tool_name, "result": {"error": "Server not ready"}, "elapsed_ms": 0.0}
+                    for tool_name, _ in calls]
 
-        except Exception as e:
-            return {"error": f"Tool call failed: {str(e)}"}
+        return self.client.call_tools(calls)
 
     def get_status(self) -> dict:
         """Get comprehensive MCP server status"""
@@ -180,33 +172,34 @@ class MCPClient:
     """
     Simple MCP client for tool calls
     Used by agents to interact with MCP tools
+
+    Requests go through a keep-alive session shared by every client of the
+    same server URL (see get_pooled_session), so agents creating clients per
+    call still reuse open connections.
     """
 
-    def __init__(self, server_url: str):
+    def __init__(self, server_url: str, timeout: Optional[float] = None,
+                 connect_timeout: Optional[float] = None, max_batch_calls: Optional[int] = None):
         self.server_url = server_url
+        self.timeout = (connect_timeout or _pool_settings["connect_timeout"],
+                        timeout or _pool_settings["timeout"])
+        self.max_batch_calls = max(1, int(max_batch_calls or _pool_settings["max_batch_calls"]))
+
+    @property
+    def session(self) -> requests.Session:
+        return get_pooled_session(self.server_url)
 
     def call_tool(self, tool_name: str, input_data: Any) -> Dict[str, Any]:
         """Make a direct call to an MCP tool"""
         try:
-            import requests
-
-            # Convert input to appropriate format
-            if isinstance(input_data, dict):
-                input_json = json.dumps(input_data)
-            elif isinstance(input_data, str) and (input_data.startswith('{') or input_data.startswith('[')):
-                try:
-                    json.loads(input_data)  # Validate JSON
-                    input_json = input_data
-                except json.JSONDecodeError:
-                    input_json = input_data
-            else:
-                input_json = str(input_data)
-
-            response = requests.post(
-                f"{self.server_url}/tools/{tool_name}",
-                json={"input": input_json},
-                timeout=30
-            )
+            with span("MCPClient.call_tool", tool=tool_name) as call_span:
+                response = self.session.post(
+                    f"{self.server_url}/tools/{tool_name}",
+                    json={"input": _tool_input(input_data)},
+                    headers=trace_headers(),
+                    timeout=self.timeout
+                )
+                call_span.set(status_code=response.status_code)
 
             if response.status_code == 200:
                 return response.json()
@@ -216,11 +209,65 @@ class MCPClient:
         except Exception as e:
             return {"error": f"Error calling MCP tool: {str(e)}"}
 
+    def call_tools(self, calls: List[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Call several MCP tools in one round trip
+
+        Batches larger than max_batch_calls go out as several /batch requests.
+
+        Args:
+            calls: (tool_name, input_data) pairs
+
+        Returns:
+            One {"tool", "result", "elapsed_ms"} dict per call, in order; result
+            is what call_tool would have returned for that call
+        """
+        calls = list(calls)
+        results = []
+        for start in range(0, len(calls), self.max_batch_calls):
+            results.extend(self._call_batch(calls[start:start + self.max_batch_calls]))
+        return results
+
+    def _call_batch(self, calls: List[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        """One /batch request, or per-call requests if the server cannot take it"""
+        payload = {"calls": [{"tool": tool_name, "params": {"input": _tool_input(input_data)}}
+                             for tool_name, input_data in calls]}
+        try:
+            # Leave the read timeout room for every call of the batch
+            timeout = (self.timeout[0], self.timeout[1] * len(calls))
+            with span("MCPClient.call_tools", calls=len(calls)):
+                response = self.session.post(f"{self.server_url}/batch", json=payload,
+                                             headers=trace_headers(), timeout=timeout)
+
+            if response.status_code == 200:
+                return [{
+                    "tool": item.get("tool"),
+                    "result": item["result"] if "result" in item else {"error": item.get("error", "Unknown error")},
+                    "elapsed_ms": item.get("elapsed_ms", 0.0)
+                } for item in response.json()["results"]]
+
+            # 404/405: no batch endpoint; 413: the server's batch limit is lower than ours
+            if response.status_code not in (404, 405, 413):
+                error = {"error": f"HTTP error {response.status_code}: {response.text}"}
+                return [{"tool": tool_name, "result": error, "elapsed_ms": 0.0} for tool_name, _ in calls]
+
+        except Exception as e:
+            error = {"error": f"Error calling MCP tools: {str(e)}"}
+            return [{"tool": tool_name, "result": error, "elapsed_ms": 0.0} for tool_name, _ in calls]
+
+        # One keep-alive request per call
+        results = []
+        for tool_name, input_data in calls:
+            start_time = time.perf_counter()
+            result = self.call_tool(tool_name, input_data)
+            results.append({"tool": tool_name, "result": result,
+                            "elapsed_ms": round((time.perf_counter() - start_time) * 1000, 2)})
+        return results
+
     def get_tools(self) -> Dict[str, Any]:
         """Get list of available tools"""
         try:
-            import requests
-            response = requests.get(f"{self.server_url}/tools", timeout=10)
+            response = self.session.get(f"{self.server_url}/tools", timeout=self.timeout)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -229,6 +276,107 @@ class MCPClient:
             return {"error": f"Failed to get tools: {str(e)}"}
 
 
+# Keep-alive sessions shared by all MCP clients, one per server URL
+_pool_settings = {"pool_size": 10, "timeout": 30, "connect_timeout": 5.0, "max_batch_calls": 32}
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def configure_client_pool(pool_size: Optional[int] = None, timeout: Optional[float] = None,
+                          connect_timeout: Optional[float] = None, max_batch_calls: Optional[int] = None):
+    """Set pool size, timeouts and batch size for MCP clients; open sessions are replaced"""
+    with _sessions_lock:
+        for key, value in (("pool_size", pool_size), ("timeout", timeout),
+                           ("connect_timeout", connect_timeout), ("max_batch_calls", max_batch_calls)):
+            if value is not None:
+                _pool_settings[key] = value
+
+        if pool_size is not None:
+            for session in _sessions.values():
+                session.close()
+            _sessions.clear()
+
+
+def get_pooled_session(server_url: str) -> requests.Session:
+    """Keep-alive session for an MCP server, created on first use"""
+    with _sessions_lock:
+        session = _sessions.get(server_url)
+        if session is None:
+            pool_size = int(_pool_settings["pool_size"])
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=False)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[server_url] = session
+        return session
+
+
+def _tool_input(input_data: Any) -> str:
+    """Tool input as sent in the request body: dicts are JSON-encoded, strings pass through"""
+    if isinstance(input_data, str):
+        return input_data
+    if isinstance(input_data, (dict, list)):
+        return json.dumps(input_data)
+    return str(input_data)
+
+
+def add_batch_endpoint(app, mcp_server: FastMCP, max_calls: int = 32):
+    """
+    Register POST /batch on the MCP FastAPI app
+
+    Body: {"calls": [{"tool": name, "params": {...}}, ...]}
+    Response: {"results": [{"tool", "result" | "error", "elapsed_ms"}, ...],
+               "total_elapsed_ms"} with results in request order.
+    """
+    from fastapi import Request, HTTPException
+
+    @app.post("/batch")
+    async def call_tools_batch(request: Request):
+        try:
+            body = await request.json()
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Request body must be JSON")
+
+        calls = body.get("calls") if isinstance(body, dict) else None
+        if not isinstance(calls, list):
+            raise HTTPException(status_code=400, detail="Request body needs a 'calls' list")
+        if len(calls) > max_calls:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds {max_calls} calls")
+
+        batch_start = time.perf_counter()
+        results = []
+        for call in calls:
+            tool_name = call.get("tool") if isinstance(call, dict) else None
+            start_time = time.perf_counter()
+            item = {"tool": tool_name}
+            try:
+                if not tool_name:
+                    raise ValueError("Missing tool name")
+                response = await mcp_server.call_tool(tool_name, call.get("params") or {})
+                item["result"] = response.to_dict()
+            except Exception as e:
+                item["error"] = str(e)
+            item["elapsed_ms"] = round((time.perf_counter() - start_time) * 1000, 2)
+            results.append(item)
+
+        return {
+            "results": results,
+            "total_elapsed_ms": round((time.perf_counter() - batch_start) * 1000, 2)
+        }
+
+
+def add_trace_middleware(app):
+    """Continue the caller's trace (X-Trace-Context header) in tool spans of the request"""
+
+    @app.middleware("http")
+    async def continue_caller_trace(request, call_next):
+        token = continue_trace(request.headers.get(TRACE_HEADER))
+        try:
+            return await call_next(request)
+        finally:
+            end_remote_trace(token)
+
+
 if __name__ == "__main__":
     # Test MCP server manager
     from config.settings import MCPConfig, DataConfig
@@ -11,14 +11,20 @@ FINAL VERSION - All methods properly implemented and tested.
 """
 
 import os
+import json
 import time
 import math
+import hashlib
 import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import Dict, Any, Optional, List, Tuple
 import segyio
 import numpy as np
 from enum import Enum
 
+from utils.file_cache import cache_path, file_fingerprint
+
 logger = logging.getLogger(__name__)
 
 class SurveyType(Enum):
@@ -49,6 +55,26 @@ class ConfidenceLevel(Enum):
     HIGH = "High"
     VERY_HIGH = "Very High"
 
+# Header words read for classification, keyed by the header_data array they populate
+HEADER_FIELDS = {
+    "inlines": segyio.TraceField.INLINE_3D,
+    "crosslines": segyio.TraceField.CROSSLINE_3D,
+    "cdp_values": segyio.TraceField.CDP,
+    "sp_values": segyio.TraceField.TRACE_SEQUENCE_FILE,
+    "field_records": segyio.TraceField.FieldRecord,
+    "x_coords": segyio.TraceField.CDP_X,
+    "y_coords": segyio.TraceField.CDP_Y,
+    "trace_numbers": segyio.TraceField.TraceNumber,
+    "offsets": segyio.TraceField.offset,
+}
+
+# Bump when classification logic changes so cached results are recomputed
+CLASSIFIER_VERSION = "2.0.0_segyio"
+
+# Persistent batch classification cache (under the shared cache directory); empty string disables it
+DEFAULT_CLASSIFICATION_CACHE = os.getenv("SURVEY_CLASSIFICATION_CACHE",
+                                         cache_path("segy_classification_cache.json"))
+
 class SegyioSurveyClassifier:
     """
     Main classification engine using segyio for SEG-Y survey characterization
@@ -149,53 +175,25 @@ class SegyioSurveyClassifier:
             with segyio.open(file_path, ignore_geometry=True) as f:
                 total_traces = f.tracecount
 
-                # Determine sampling strategy
+                # Determine sampling strategy - an evenly strided slice lets
+                # segyio gather each header word for all sampled traces in one call
                 if total_traces <= max_traces:
-                    # Use all traces
-                    trace_indices = list(range(total_traces))
+                    trace_slice = slice(0, total_traces, 1)
                 else:
-                    # Sample traces evenly
                     step = max(1, total_traces // max_traces)
-                    trace_indices = list(range(0, total_traces, step))[:max_traces]
+                    trace_slice = slice(0, min(total_traces, step * max_traces), step)
 
                 # Extract header information
                 header_data = {
-                    "traces_analyzed": len(trace_indices),
+                    "traces_analyzed": len(range(*trace_slice.indices(total_traces))),
                     "total_traces": total_traces,
-                    "inlines": [],
-                    "crosslines": [],
-                    "cdp_values": [],
-                    "sp_values": [],
-                    "field_records": [],
-                    "x_coords": [],
-                    "y_coords": [],
-                    "trace_numbers": [],
-                    "offsets": [],
                     "file_info": {
                         "sample_rate": f.bin[segyio.BinField.Interval] / 1000,  # Convert to ms
                         "samples_per_trace": f.bin[segyio.BinField.Samples],
                         "format_code": f.bin[segyio.BinField.Format]
                     }
                 }
-
-                # Extract headers for sampled traces
-                for i in trace_indices:
-                    try:
-                        header = f.header[i]
-
-                        header_data["inlines"].append(header[segyio.TraceField.INLINE_3D])
-                        header_data["crosslines"].append(header[segyio.TraceField.CROSSLINE_3D])
-                        header_data["cdp_values"].append(header[segyio.TraceField.CDP])
-                        header_data["sp_values"].append(header[segyio.TraceField.TRACE_SEQUENCE_FILE])
-                        header_data["field_records"].append(header[segyio.TraceField.FieldRecord])
-                        header_data["x_coords"].append(header[segyio.TraceField.CDP_X])
-                        header_data["y_coords"].append(header[segyio.TraceField.CDP_Y])
-                        header_data["trace_numbers"].append(header[segyio.TraceField.TraceNumber])
-                        header_data["offsets"].append(header[segyio.TraceField.offset])
-
-                    except Exception as e:
-                        logger.debug(f"Error reading header for trace {i}: {e}")
-                        continue
+                header_data.update(self._read_header_arrays(f, trace_slice))
 
                 # Calculate statistics for each field
                 self._calculate_header_statistics(header_data)
@@ -209,35 +207,64 @@ class SegyioSurveyClassifier:
             result["errors"].append(f"Error reading file: {str(e)}")
             return None
 
+    def _read_header_arrays(self, f, trace_slice: slice) -> Dict[str, np.ndarray]:
+        """Bulk-read the classification header words for a strided trace selection"""
+        arrays = {}
+        for key, field in HEADER_FIELDS.items():
+            try:
+                arrays[key] = np.asarray(f.attributes(field)[trace_slice], dtype=np.int64)
+            except Exception as e:
+                logger.debug(f"Bulk read of {key} failed, falling back to per-trace reads: {e}")
+                arrays[key] = self._read_header_field_per_trace(f, field, trace_slice)
+        return arrays
+
+    def _read_header_field_per_trace(self, f, field, trace_slice: slice) -> np.ndarray:
+        """Per-trace fallback for files where the bulk attribute read fails"""
+        values = []
+        for i in range(*trace_slice.indices(f.tracecount)):
+            try:
+                values.append(f.header[i][field])
+            except Exception as e:
+                logger.debug(f"Error reading header for trace {i}: {e}")
+        return np.asarray(values, dtype=np.int64)
+
     def _calculate_header_statistics(self, header_data: Dict):
         """Calculate statistics for header fields"""
         for field in ["inlines", "crosslines", "cdp_values", "sp_values", "field_records"]:
             values = header_data[field]
-            non_zero_values = [v for v in values if v != 0]
+            non_zero_values = values[values != 0]
+            unique_values = np.unique(non_zero_values)
 
             header_data[f"{field}_stats"] = {
-                "total_count": len(values),
-                "non_zero_count": len(non_zero_values),
-                "unique_count": len(set(non_zero_values)) if non_zero_values else 0,
-                "min_value": min(non_zero_values) if non_zero_values else 0,
-                "max_value": max(non_zero_values) if non_zero_values else 0,
-                "has_variation": len(set(non_zero_values)) > 1 if non_zero_values else False
+                "total_count": int(values.size),
+                "non_zero_count": int(non_zero_values.size),
+                "unique_count": int(unique_values.size),
+                "min_value": int(unique_values[0]) if unique_values.size else 0,
+                "max_value": int(unique_values[-1]) if unique_values.size else 0,
+                "has_variation": bool(unique_values.size > 1)
             }
 
         # Coordinate statistics
-        x_coords = [v for v in header_data["x_coords"] if v != 0]
-        y_coords = [v for v in header_data["y_coords"] if v != 0]
+        x_coords = header_data["x_coords"][header_data["x_coords"] != 0]
+        y_coords = header_data["y_coords"][header_data["y_coords"] != 0]
 
-        if x_coords and y_coords:
+        if x_coords.size and y_coords.size:
             header_data["coordinate_stats"] = {
                 "has_coordinates": True,
-                "x_range": max(x_coords) - min(x_coords),
-                "y_range": max(y_coords) - min(y_coords),
-                "coordinate_pairs": len(x_coords)
+                "x_range": int(x_coords.max() - x_coords.min()),
+                "y_range": int(y_coords.max() - y_coords.min()),
+                "coordinate_pairs": int(x_coords.size)
             }
         else:
             header_data["coordinate_stats"] = {"has_coordinates": False}
 
+    def _nonzero_coordinates(self, header_data: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """Return traces whose CDP X and Y are both set"""
+        x_coords = header_data["x_coords"]
+        y_coords = header_data["y_coords"]
+        mask = (x_coords != 0) & (y_coords != 0)
+        return x_coords[mask], y_coords[mask]
+
     def _perform_segyio_classification(self, header_data: Dict, result: Dict):
         """Perform classification analysis using segyio-extracted data"""
 
@@ -287,8 +314,7 @@ class SegyioSurveyClassifier:
                 pca_analysis = {}
 
                 if coord_stats["has_coordinates"]:
-                    x_coords = [v for v in header_data["x_coords"] if v != 0]
-                    y_coords = [v for v in header_data["y_coords"] if v != 0]
+                    x_coords, y_coords = self._nonzero_coordinates(header_data)
 
                     if len(x_coords) > 2 and len(y_coords) > 2:
                         major_var, minor_var = self._calculate_pca_variance(x_coords, y_coords)
@@ -348,8 +374,7 @@ class SegyioSurveyClassifier:
                 survey_dimension = SurveyType.UNDETERMINED.value
 
                 if coord_stats["has_coordinates"]:
-                    x_coords = [v for v in header_data["x_coords"] if v != 0]
-                    y_coords = [v for v in header_data["y_coords"] if v != 0]
+                    x_coords, y_coords = self._nonzero_coordinates(header_data)
 
                     if len(x_coords) > 2 and len(y_coords) > 2:
                         major_var, minor_var = self._calculate_pca_variance(x_coords, y_coords)
@@ -401,8 +426,7 @@ class SegyioSurveyClassifier:
                 pca_analysis = {}
 
                 if coord_stats["has_coordinates"]:
-                    x_coords = [v for v in header_data["x_coords"] if v != 0]
-                    y_coords = [v for v in header_data["y_coords"] if v != 0]
+                    x_coords, y_coords = self._nonzero_coordinates(header_data)
 
                     if len(x_coords) > 2 and len(y_coords) > 2:
                         major_var, minor_var = self._calculate_pca_variance(x_coords, y_coords)
@@ -458,10 +482,11 @@ class SegyioSurveyClassifier:
             # Check for gather patterns by looking at trace organization
             cdp_values = header_data["cdp_values"]
             offsets = header_data["offsets"]
+            unique_cdps = np.unique(cdp_values).size
 
             # Check for CDP gathers (same CDP, varying offsets)
-            if len(set(cdp_values)) < len(cdp_values) * 0.5:  # Significant repetition
-                offset_variation = len(set([o for o in offsets if o != 0]))
+            if unique_cdps < cdp_values.size * 0.5:  # Significant repetition
+                offset_variation = int(np.unique(offsets[offsets != 0]).size)
 
                 if offset_variation > self.thresholds["min_unique_values"]:
                     logger.info("CDP prestack gathers detected")
@@ -476,7 +501,7 @@ class SegyioSurveyClassifier:
                     result["classification_details"] = {
                         "method": "prestack_cdp_gathers_segyio",
                         "gather_organization": "CDP gathers with varying offsets",
-                        "unique_cdps": len(set(cdp_values)),
+                        "unique_cdps": int(unique_cdps),
                         "unique_offsets": offset_variation
                     }
 
@@ -557,9 +582,9 @@ class SegyioSurveyClassifier:
         """Determine stack type based on trace organization"""
         try:
             # Simple heuristic: if offsets vary significantly, likely prestack
-            offsets = [o for o in header_data["offsets"] if o != 0]
+            offsets = header_data["offsets"][header_data["offsets"] != 0]
 
-            if len(set(offsets)) > len(offsets) * 0.1:  # More than 10% unique offsets
+            if np.unique(offsets).size > offsets.size * 0.1:  # More than 10% unique offsets
                 return StackType.PRESTACK.value
             else:
                 return StackType.POSTSTACK.value
@@ -567,11 +592,11 @@ class SegyioSurveyClassifier:
         except Exception:
             return StackType.POSTSTACK.value  # Default assumption
 
-    def _calculate_pca_variance(self, x_coords: List[float], y_coords: List[float]) -> Tuple[float, float]:
+    def _calculate_pca_variance(self, x_coords: np.ndarray, y_coords: np.ndarray) -> Tuple[float, float]:
         """Calculate PCA variance for coordinate analysis"""
         try:
             # Create coordinate matrix
-            coords = np.column_stack((x_coords, y_coords))
+            coords = np.column_stack((x_coords, y_coords)).astype(np.float64)
 
             # Center the data
             coords_centered = coords - np.mean(coords, axis=0)
@@ -645,42 +670,79 @@ class SegyioSurveyClassifier:
             result["confidence"] = ConfidenceLevel.VERY_LOW.value
 
     def classify_multiple_files(self, file_paths: List[str],
-                               max_traces_per_file: int = 2000) -> Dict[str, Any]:
+                               max_traces_per_file: int = 2000,
+                               max_workers: Optional[int] = None,
+                               cache_path: Optional[str] = DEFAULT_CLASSIFICATION_CACHE) -> Dict[str, Any]:
         """
         Classify multiple SEG-Y files in batch
         Maintains compatibility with original SurveyClassifier API
+
+        Files whose path, size and mtime match a cached result for the same
+        classifier version and settings are not reopened. The rest are
+        classified across a process pool (max_workers=1 classifies in-process).
         """
         try:
             logger.info(f"Starting batch classification of {len(file_paths)} files")
 
+            cache = ClassificationCache(cache_path) if cache_path else None
+            settings_key = self._cache_settings_key(max_traces_per_file)
+
+            # Cached and new results are merged in input order
+            classifications: List[Optional[Dict[str, Any]]] = [None] * len(file_paths)
+            errors: Dict[int, str] = {}
+            cached_positions = set()
+            pending = []
+
+            for position, file_path in enumerate(file_paths):
+                cached = cache.get(file_path, settings_key) if cache is not None else None
+                if cached is not None:
+                    classifications[position] = cached
+                    cached_positions.add(position)
+                else:
+                    pending.append(position)
+
+            if cache is not None:
+                logger.info(f"Classification cache: {len(cached_positions)} hits, {len(pending)} to classify")
+
+            workers = self._classify_pending(file_paths, pending, max_traces_per_file, max_workers,
+                                             classifications, errors)
+
+            if cache is not None:
+                for position in pending:
+                    classification = classifications[position]
+                    if classification is not None and classification.get("success"):
+                        cache.put(file_paths[position], settings_key, classification)
+                cache.save()
+
             results = []
             survey_types = {}
             sorting_methods = {}
             stack_types = {}
 
-            for file_path in file_paths:
-                try:
-                    classification = self.classify_survey(file_path, max_traces=max_traces_per_file)
-
-                    # Track statistics
-                    survey_type = classification.get("survey_type", "undetermined")
-                    primary_sorting = classification.get("primary_sorting", "undetermined")
-                    stack_type = classification.get("stack_type", "undetermined")
-
-                    survey_types[survey_type] = survey_types.get(survey_type, 0) + 1
-                    sorting_methods[primary_sorting] = sorting_methods.get(primary_sorting, 0) + 1
-                    stack_types[stack_type] = stack_types.get(stack_type, 0) + 1
-
+            for position, file_path in enumerate(file_paths):
+                if position in errors:
                     results.append({
                         "file": os.path.basename(file_path),
-                        "classification": classification
+                        "error": errors[position]
                     })
+                    continue
 
-                except Exception as e:
-                    results.append({
-                        "file": os.path.basename(file_path),
-                        "error": str(e)
-                    })
+                classification = classifications[position]
+
+                # Track statistics
+                survey_type = classification.get("survey_type", "undetermined")
+                primary_sorting = classification.get("primary_sorting", "undetermined")
+                stack_type = classification.get("stack_type", "undetermined")
+
+                survey_types[survey_type] = survey_types.get(survey_type, 0) + 1
+                sorting_methods[primary_sorting] = sorting_methods.get(primary_sorting, 0) + 1
+                stack_types[stack_type] = stack_types.get(stack_type, 0) + 1
+
+                results.append({
+                    "file": os.path.basename(file_path),
+                    "classification": classification,
+                    "cached": position in cached_positions
+                })
 
             # Generate batch analysis
             successful_classifications = [r for r in results if "error" not in r]
@@ -695,7 +757,13 @@ class SegyioSurveyClassifier:
                 "file_results": results,
                 "batch_recommendations": self._generate_batch_recommendations(
                     survey_types, sorting_methods, stack_types, len(successful_classifications)
-                )
+                ),
+                "batch_execution": {
+                    "cache_enabled": cache is not None,
+                    "cache_hits": len(cached_positions),
+                    "files_classified": len(pending),
+                    "max_workers": workers
+                }
             }
 
             logger.info(f"Batch classification completed: {len(successful_classifications)}/{len(file_paths)} successful")
@@ -705,6 +773,47 @@ class SegyioSurveyClassifier:
             logger.error(f"Batch classification failed: {str(e)}")
             return {"error": f"Batch classification failed: {str(e)}"}
 
+    def _classify_pending(self, file_paths: List[str], pending: List[int], max_traces: int,
+                          max_workers: Optional[int], classifications: List[Optional[Dict[str, Any]]],
+                          errors: Dict[int, str]) -> int:
+        """Classify the pending positions in place; returns the number of workers used"""
+        if not pending:
+            return 0
+
+        workers = min(max_workers or os.cpu_count() or 1, len(pending))
+
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    future_to_position = {
+                        executor.submit(_classify_file_in_worker, self.template_directory, self.thresholds,
+                                        file_paths[position], max_traces): position
+                        for position in pending
+                    }
+                    for future in as_completed(future_to_position):
+                        position = future_to_position[future]
+                        try:
+                            classifications[position] = future.result()
+                        except Exception as e:
+                            errors[position] = str(e)
+                return workers
+
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Process pool unavailable, classifying in-process: {e}")
+
+        for position in pending:
+            try:
+                classifications[position] = self.classify_survey(file_paths[position], max_traces=max_traces)
+            except Exception as e:
+                errors[position] = str(e)
+        return 1
+
+    def _cache_settings_key(self, max_traces: int) -> str:
+        """Classifier version, sampling and thresholds a cached result was computed with"""
+        thresholds = json.dumps(self.thresholds, sort_keys=True)
+        digest = hashlib.sha1(thresholds.encode("utf-8")).hexdigest()[:12]
+        return f"{CLASSIFIER_VERSION}:{max_traces}:{digest}"
+
     def _generate_batch_recommendations(self, survey_types: Dict[str, int],
                                       sorting_methods: Dict[str, int],
                                       stack_types: Dict[str, int],
@@ -909,7 +1018,7 @@ class SegyioSurveyClassifier:
     def get_classification_statistics(self) -> Dict[str, Any]:
         """Get statistics about classification capabilities and thresholds"""
         return {
-            "classifier_version": "2.0.0_segyio",
+            "classifier_version": CLASSIFIER_VERSION,
             "engine": "segyio-based",
             "supported_survey_types": [e.value for e in SurveyType],
             "supported_sorting_methods": [e.value for e in SortingMethod],
@@ -987,6 +1096,91 @@ class SegyioSurveyClassifier:
             return False, issues
 
 
+class ClassificationCache:
+    """
+    Persistent classification results for batch runs
+
+    One JSON file maps absolute file paths to their last successful
+    classification, the file size and mtime it was computed from, and the
+    classifier settings key. A lookup costs one stat of the SEG-Y file.
+    """
+
+    def __init__(self, cache_path: str = DEFAULT_CLASSIFICATION_CACHE):
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+        if os.path.isfile(cache_path):
+            try:
+                with open(cache_path) as fh:
+                    self._entries = json.load(fh)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable classification cache {cache_path}: {e}")
+
+    def get(self, file_path: str, settings_key: str) -> Optional[Dict[str, Any]]:
+        """Cached classification, or None if missing, stale or from other settings"""
+        key = os.path.abspath(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry.get("settings") != settings_key:
+            return None
+        if entry.get("fingerprint") != file_fingerprint(key):
+            return None
+        return entry["classification"]
+
+    def put(self, file_path: str, settings_key: str, classification: Dict[str, Any]):
+        key = os.path.abspath(file_path)
+        fingerprint = file_fingerprint(key)
+        if fingerprint is None:
+            return
+        with self._lock:
+            self._entries[key] = {
+                "settings": settings_key,
+                "fingerprint": fingerprint,
+                "classification": classification
+            }
+            self._dirty = True
+
+    def save(self):
+        """Write the cache atomically if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                cache_dir = os.path.dirname(self.cache_path)
+                if cache_dir:
+                    os.makedirs(cache_dir, exist_ok=True)
+                tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as fh:
+                    json.dump(self._entries, fh, default=str)
+                os.replace(tmp_path, self.cache_path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Could not write classification cache {self.cache_path}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# One classifier per worker process, rebuilt only when its settings change
+_worker_classifier: Optional[Tuple[str, "SegyioSurveyClassifier"]] = None
+
+
+def _classify_file_in_worker(template_directory: str, thresholds: Dict[str, Any],
+                             file_path: str, max_traces: int) -> Dict[str, Any]:
+    """Process pool entry point: classify one file and return the plain result dict"""
+    global _worker_classifier
+
+    settings = json.dumps([template_directory, thresholds], sort_keys=True)
+    if _worker_classifier is None or _worker_classifier[0] != settings:
+        classifier = SegyioSurveyClassifier(template_directory)
+        classifier.thresholds = dict(thresholds)
+        _worker_classifier = (settings, classifier)
+
+    return _worker_classifier[1].classify_survey(file_path, max_traces=max_traces)
+
+
 # Backward compatibility - create an alias to maintain existing imports
 SurveyClassifier = SegyioSurveyClassifier
 
@@ -1021,10 +1215,15 @@ def quick_classify_survey(file_path: str, max_traces: int = 1000) -> Dict[str, s
         }
 
 
-def batch_classify_directory(directory_path: str, pattern: str = "*.segy") -> Dict[str, Any]:
+def batch_classify_directory(directory_path: str, pattern: str = "*.segy",
+                             max_workers: Optional[int] = None,
+                             cache_path: Optional[str] = DEFAULT_CLASSIFICATION_CACHE) -> Dict[str, Any]:
     """
     Classify all SEG-Y files in a directory
     Convenience function for batch operations
+
+    Unchanged files are answered from the persistent classification cache;
+    the rest are classified in parallel (see classify_multiple_files).
     """
     try:
         from pathlib import Path
@@ -1037,14 +1236,15 @@ def batch_classify_directory(directory_path: str, pattern: str = "*.segy") -> Di
         files.extend(directory.glob("*.SEGY"))
 
         # Remove duplicates
-        files = list(set(files))
+        files = sorted(set(files))
 
         if not files:
             return {"error": f"No SEG-Y files found in {directory_path}"}
 
         # Classify all files
         classifier = SegyioSurveyClassifier()
-        return classifier.classify_multiple_files([str(f) for f in files])
+        return classifier.classify_multiple_files([str(f) for f in files], max_workers=max_workers,
+                                                  cache_path=cache_path)
 
     except Exception as e:
         return {"error": f"Batch classification failed: {str(e)}"}
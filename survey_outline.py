@@ -0,0 +1,263 @@
+"""
+survey_outline.py - Vectorized survey outlines from trace coordinates
+
+Builds the map outline of a SEG-Y survey from header-index columns in a few
+NumPy passes:
+
+- scan_coordinates: scaled (x, y) of every trace (or an evenly strided block
+  of very large files), with the SEG-Y coordinate scalar applied vectorized
+- principal_extent: length/width along the survey's principal axes, so 2D
+  lines are recognised at any azimuth
+- convex_outline / concave_outline: convex hull, or alpha-shape outline from
+  a Delaunay triangulation with long-circumradius triangles removed
+- simplify_ring: Visvalingam-Whyatt reduction to a vertex budget
+
+All results are deterministic for a given file and parameters.
+"""
+
+import math
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+from scipy.spatial import ConvexHull, Delaunay, QhullError
+
+from segy_header_index import apply_coordinate_scalar
+
+# Traces read per scan; larger files are read with an even stride
+DEFAULT_MAX_SCAN_TRACES = 2_000_000
+# Points triangulated for a concave outline (grid-thinned above this)
+DEFAULT_MAX_HULL_POINTS = 100_000
+# Alpha radius = this factor x median Delaunay circumradius when not given
+DEFAULT_ALPHA_FACTOR = 3.0
+# Width/length ratio below which a survey is treated as a 2D line
+LINEAR_RATIO = 0.01
+
+# Coordinate header pairs, in order of preference
+COORDINATE_FIELDS = (("GroupX", "GroupY"), ("CDP_X", "CDP_Y"), ("SourceX", "SourceY"))
+
+
+def scan_coordinates(header_index, max_traces: int = DEFAULT_MAX_SCAN_TRACES, stride: int = 1) -> Dict[str, Any]:
+    """
+    Scaled trace coordinates from a header index
+
+    Reads every stride-th trace (the stride grows so that at most about
+    max_traces are read) plus the last trace. Uses the first coordinate pair
+    of COORDINATE_FIELDS that is set on any scanned trace; traces at (0, 0)
+    are dropped.
+
+    Returns:
+        dict: points (n x 2 float64, trace order), scalars (SourceGroupScalar of
+        the scanned traces), coordinate_source, traces_scanned, stride
+    """
+    total = header_index.tracecount
+    stride = max(1, stride or 1, math.ceil(total / max_traces) if max_traces > 0 else 1)
+    indices = np.arange(0, total, stride, dtype=np.int64)
+    if total and indices[-1] != total - 1:
+        indices = np.append(indices, total - 1)
+
+    scalars = header_index.column("SourceGroupScalar", indices)
+    points = np.empty((0, 2), dtype=np.float64)
+    source = None
+    for x_field, y_field in COORDINATE_FIELDS:
+        x = header_index.column(x_field, indices)
+        y = header_index.column(y_field, indices)
+        valid = (x != 0) | (y != 0)
+        if valid.any():
+            points = np.column_stack((apply_coordinate_scalar(x[valid], scalars[valid]),
+                                      apply_coordinate_scalar(y[valid], scalars[valid])))
+            source = f"{x_field}/{y_field}"
+            break
+
+    return {
+        "points": points,
+        "scalars": scalars,
+        "coordinate_source": source,
+        "traces_scanned": int(len(indices)),
+        "stride": stride
+    }
+
+
+def principal_extent(points: np.ndarray) -> Dict[str, Any]:
+    """Extent of a point set along its principal axes"""
+    if len(points) < 2:
+        return {"length": 0.0, "width": 0.0, "axis": np.array([1.0, 0.0]), "center": np.zeros(2)}
+    center = points.mean(axis=0)
+    centered = points - center
+    _, vectors = np.linalg.eigh(centered.T @ centered)
+    # eigh sorts ascending: last vector is the major axis; fix its sign for determinism
+    axis = vectors[:, -1] if vectors[0, -1] > 0 or (vectors[0, -1] == 0 and vectors[1, -1] > 0) \
+        else -vectors[:, -1]
+    normal = np.array([-axis[1], axis[0]])
+    along = centered @ axis
+    across = centered @ normal
+    return {
+        "length": float(np.ptp(along)),
+        "width": float(np.ptp(across)),
+        "axis": axis,
+        "center": center,
+        "along": along,
+        "across": across
+    }
+
+
+def is_linear(extent: Dict[str, Any]) -> bool:
+    return extent["length"] > 0 and extent["width"] <= LINEAR_RATIO * extent["length"]
+
+
+def polygon_area(ring: np.ndarray) -> float:
+    """Shoelace area of a ring (closing vertex optional)"""
+    if len(ring) < 3:
+        return 0.0
+    x, y = ring[:, 0], ring[:, 1]
+    return float(abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2.0)
+
+
+def line_outline(points: np.ndarray, buffer_width: float = 100.0,
+                 extent: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Buffered rectangle along a 2D line's principal axis"""
+    extent = extent or principal_extent(points)
+    along, axis, center = extent["along"], extent["axis"], extent["center"]
+    normal = np.array([-axis[1], axis[0]])
+    offset = float(np.mean(extent["across"]))
+    start, end = float(along.min()), float(along.max())
+
+    corners = [center + a * axis + (offset + w) * normal
+               for a, w in ((start, -buffer_width), (end, -buffer_width),
+                            (end, buffer_width), (start, buffer_width))]
+
+    # Cumulative distance along the line picks up curvature a straight extent misses
+    ordered = points[np.argsort(along, kind="stable")]
+    steps = np.diff(ordered, axis=0)
+    cumulative = float(np.hypot(steps[:, 0], steps[:, 1]).sum()) if len(ordered) > 1 else 0.0
+    straight = end - start
+
+    return {
+        "ring": np.array(corners),
+        "straight_length": straight,
+        "cumulative_length": cumulative,
+        "length": max(straight, cumulative),
+        "first_point": ordered[0],
+        "last_point": ordered[-1]
+    }
+
+
+def convex_outline(points: np.ndarray) -> np.ndarray:
+    """Convex hull vertices in counter-clockwise order"""
+    hull = ConvexHull(points)
+    return points[hull.vertices]
+
+
+def _thin_points(points: np.ndarray, max_points: int) -> np.ndarray:
+    """Keep one point per grid cell so at most about max_points remain"""
+    if len(points) <= max_points:
+        return points
+    low = points.min(axis=0)
+    span = np.maximum(np.ptp(points, axis=0), 1e-9)
+    cell = math.sqrt(span[0] * span[1] / max_points) or max(span) / max_points
+    cells = np.floor((points - low) / cell).astype(np.int64)
+    _, first = np.unique(cells, axis=0, return_index=True)
+    return points[np.sort(first)]
+
+
+def _boundary_rings(edges: np.ndarray) -> List[np.ndarray]:
+    """Chain boundary edges (vertex index pairs) into closed rings"""
+    neighbours: Dict[int, List[int]] = {}
+    for a, b in edges.tolist():
+        neighbours.setdefault(a, []).append(b)
+        neighbours.setdefault(b, []).append(a)
+    for vertex in neighbours:
+        neighbours[vertex].sort()
+
+    rings = []
+    for start in sorted(neighbours):
+        while neighbours[start]:
+            ring = [start]
+            previous, current = start, neighbours[start].pop(0)
+            neighbours[current].remove(previous)
+            while current != start:
+                ring.append(current)
+                if not neighbours[current]:
+                    break
+                previous, current = current, neighbours[current].pop(0)
+                neighbours[current].remove(previous)
+            if len(ring) >= 3:
+                rings.append(np.asarray(ring, dtype=np.int64))
+    return rings
+
+
+def concave_outline(points: np.ndarray, alpha_radius: Optional[float] = None,
+                    alpha_factor: float = DEFAULT_ALPHA_FACTOR,
+                    max_points: int = DEFAULT_MAX_HULL_POINTS) -> Dict[str, Any]:
+    """
+    Alpha-shape outline
+
+    Delaunay triangles whose circumradius exceeds alpha_radius are removed;
+    the longest boundary ring of the remaining triangles is the outline and
+    their summed area is the covered area (holes excluded).
+
+    Args:
+        points: Unique (n x 2) coordinates
+        alpha_radius: Maximum circumradius; default alpha_factor x median circumradius
+        max_points: Points triangulated (grid-thinned above this)
+
+    Returns:
+        dict: ring (vertices), area, alpha_radius, ring_count, points_used
+    """
+    points = _thin_points(points, max_points)
+    triangulation = Delaunay(points)
+    corners = points[triangulation.simplices]
+    a = np.linalg.norm(corners[:, 1] - corners[:, 2], axis=1)
+    b = np.linalg.norm(corners[:, 0] - corners[:, 2], axis=1)
+    c = np.linalg.norm(corners[:, 0] - corners[:, 1], axis=1)
+    d1 = corners[:, 1] - corners[:, 0]
+    d2 = corners[:, 2] - corners[:, 0]
+    areas = np.abs(d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0]) / 2.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        radii = np.where(areas > 0, a * b * c / (4.0 * areas), np.inf)
+
+    if alpha_radius is None:
+        finite = radii[np.isfinite(radii)]
+        alpha_radius = float(alpha_factor * np.median(finite)) if len(finite) else float("inf")
+    keep = radii <= alpha_radius
+    if not keep.any():
+        return {"ring": convex_outline(points), "area": None, "alpha_radius": alpha_radius,
+                "ring_count": 1, "points_used": int(len(points))}
+
+    kept = triangulation.simplices[keep]
+    edges = np.sort(np.concatenate((kept[:, [0, 1]], kept[:, [1, 2]], kept[:, [2, 0]])), axis=1)
+    unique_edges, counts = np.unique(edges, axis=0, return_counts=True)
+    rings = _boundary_rings(unique_edges[counts == 1])
+    outer = max(rings, key=lambda ring: polygon_area(points[ring]))
+
+    return {
+        "ring": points[outer],
+        "area": float(areas[keep].sum()),
+        "alpha_radius": alpha_radius,
+        "ring_count": len(rings),
+        "points_used": int(len(points))
+    }
+
+
+def simplify_ring(ring: np.ndarray, max_vertices: int) -> np.ndarray:
+    """
+    Reduce a ring to at most max_vertices (>= 3) by Visvalingam-Whyatt
+
+    Vertices spanning the smallest triangles with their neighbours go first;
+    each pass removes a batch of non-adjacent vertices.
+    """
+    max_vertices = max(3, max_vertices)
+    while len(ring) > max_vertices:
+        previous, following = np.roll(ring, 1, axis=0), np.roll(ring, -1, axis=0)
+        d1 = previous - ring
+        d2 = following - ring
+        effective = np.abs(d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0])
+
+        excess = len(ring) - max_vertices
+        batch = max(1, min(excess, len(ring) // 10))
+        order = np.argsort(effective, kind="stable")[:batch]
+        remove = np.zeros(len(ring), dtype=bool)
+        remove[order] = True
+        # Never drop two neighbours in one pass
+        remove &= ~np.roll(remove, 1)
+        ring = ring[~remove]
+    return ring
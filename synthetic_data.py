@@ -0,0 +1,372 @@
+"""
+synthetic_data.py - Deterministic synthetic SEG-Y and LAS data
+
+Generators for benchmark and test fixtures. The same arguments and seed
+always produce the same files:
+
+- 2D lines, 3D post-stack cubes, shot gathers and 3D pre-stack volumes
+  written with segyio.create: Ricker-wavelet traces over gently dipping
+  reflectors, with coordinates and the usual geometry headers filled in
+- LAS 2.0 wells (via lasio) with GR, RHOB, NPHI, RT and DT over a
+  sand/shale layer model; wells of one dataset share the layer model with a
+  per-well depth shift, so formation evaluation finds pay and correlation
+  finds common tops
+
+generate_dataset builds a named size preset ("small", "medium", "large").
+"""
+
+import os
+import json
+import logging
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+import segyio
+import lasio
+from scipy.signal import fftconvolve
+
+logger = logging.getLogger(__name__)
+
+# Bump when generated content changes so cached datasets are rebuilt
+GENERATOR_VERSION = 1
+
+SIZE_PRESETS = {
+    "small": {
+        "poststack_3d": {"n_inlines": 40, "n_xlines": 50, "n_samples": 250},
+        "line_2d": {"n_traces": 800, "n_samples": 500},
+        "shot_gathers": {"n_shots": 20, "n_channels": 48, "n_samples": 500},
+        "prestack_3d": {"n_inlines": 10, "n_xlines": 12, "n_offsets": 8, "n_samples": 250},
+        "wells": {"n_wells": 3, "n_samples": 4000}
+    },
+    "medium": {
+        "poststack_3d": {"n_inlines": 150, "n_xlines": 200, "n_samples": 500},
+        "line_2d": {"n_traces": 5000, "n_samples": 1500},
+        "shot_gathers": {"n_shots": 100, "n_channels": 120, "n_samples": 1000},
+        "prestack_3d": {"n_inlines": 30, "n_xlines": 40, "n_offsets": 16, "n_samples": 500},
+        "wells": {"n_wells": 6, "n_samples": 20000}
+    },
+    "large": {
+        "poststack_3d": {"n_inlines": 400, "n_xlines": 500, "n_samples": 750},
+        "line_2d": {"n_traces": 20000, "n_samples": 2000},
+        "shot_gathers": {"n_shots": 400, "n_channels": 240, "n_samples": 1500},
+        "prestack_3d": {"n_inlines": 80, "n_xlines": 100, "n_offsets": 24, "n_samples": 750},
+        "wells": {"n_wells": 12, "n_samples": 60000}
+    }
+}
+
+DEFAULT_LAS_CURVES = ("GR", "RHOB", "NPHI", "RT", "DT")
+
+
+# ---------------------------------------------------------------------- SEG-Y
+
+def ricker_wavelet(frequency_hz: float, sample_interval_s: float, length_s: float = 0.128) -> np.ndarray:
+    t = np.arange(-length_s / 2, length_s / 2, sample_interval_s)
+    a = (np.pi * frequency_hz * t) ** 2
+    return ((1 - 2 * a) * np.exp(-a)).astype(np.float32)
+
+
+def _synthetic_traces(reflector_times: np.ndarray, reflector_amplitudes: np.ndarray, n_samples: int,
+                      wavelet: np.ndarray, rng: np.random.Generator, noise: float = 0.05) -> np.ndarray:
+    """(traces x samples) block from per-trace reflector sample indices"""
+    n_traces = reflector_times.shape[0]
+    reflectivity = np.zeros((n_traces, n_samples), dtype=np.float32)
+    rows = np.repeat(np.arange(n_traces), reflector_times.shape[1])
+    cols = np.clip(np.rint(reflector_times).astype(np.int64).ravel(), 0, n_samples - 1)
+    np.add.at(reflectivity, (rows, cols), np.tile(reflector_amplitudes, n_traces))
+    traces = fftconvolve(reflectivity, wavelet[np.newaxis, :], mode="same", axes=1)
+    traces += noise * rng.standard_normal(traces.shape)
+    return traces.astype(np.float32)
+
+
+def _reflector_model(n_samples: int, rng: np.random.Generator, n_reflectors: int = 12):
+    times = np.sort(rng.uniform(0.08, 0.95, n_reflectors)) * n_samples
+    amplitudes = rng.uniform(-1.0, 1.0, n_reflectors).astype(np.float32)
+    return times, amplitudes
+
+
+def _write_bin_header(f, n_samples: int, sample_interval_us: int, sorting: int):
+    f.bin.update(hdt=sample_interval_us, hns=n_samples, tsort=sorting, format=5)
+
+
+def generate_poststack_3d(path: str, n_inlines: int = 40, n_xlines: int = 50, n_samples: int = 250,
+                          sample_interval_us: int = 4000, seed: int = 0) -> str:
+    """Inline-sorted 3D post-stack cube"""
+    rng = np.random.default_rng(seed)
+    spec = segyio.spec()
+    spec.ilines = list(range(1000, 1000 + n_inlines))
+    spec.xlines = list(range(2000, 2000 + n_xlines))
+    spec.samples = list(range(n_samples))
+    spec.format = 5
+    spec.sorting = segyio.TraceSortingFormat.INLINE_SORTING
+
+    wavelet = ricker_wavelet(25, sample_interval_us / 1e6)
+    times, amplitudes = _reflector_model(n_samples, rng)
+    xl = np.arange(n_xlines)
+
+    with segyio.create(path, spec) as f:
+        for i, il in enumerate(spec.ilines):
+            # Reflectors dip gently along both axes
+            shifts = 0.08 * i + 0.05 * xl
+            block = _synthetic_traces(times[np.newaxis, :] + shifts[:, np.newaxis], amplitudes,
+                                      n_samples, wavelet, rng)
+            for j, xline in enumerate(spec.xlines):
+                t = i * n_xlines + j
+                x = 500000 + j * 25 + i * 3
+                y = 6000000 + i * 25 - j * 2
+                f.header[t] = {
+                    segyio.su.iline: il, segyio.su.xline: xline, segyio.su.cdp: t + 1,
+                    segyio.su.cdpx: x, segyio.su.cdpy: y, segyio.su.sx: x, segyio.su.sy: y,
+                    segyio.su.gx: x, segyio.su.gy: y, segyio.su.scalco: 1,
+                    segyio.su.tracl: t + 1, segyio.su.fldr: 1
+                }
+                f.trace[t] = block[j]
+        _write_bin_header(f, n_samples, sample_interval_us, segyio.TraceSortingFormat.INLINE_SORTING)
+    return path
+
+
+def generate_line_2d(path: str, n_traces: int = 800, n_samples: int = 500,
+                     sample_interval_us: int = 2000, seed: int = 0) -> str:
+    """CDP-ordered 2D post-stack line"""
+    rng = np.random.default_rng(seed + 1)
+    spec = segyio.spec()
+    spec.samples = list(range(n_samples))
+    spec.format = 5
+    spec.tracecount = n_traces
+
+    wavelet = ricker_wavelet(30, sample_interval_us / 1e6)
+    times, amplitudes = _reflector_model(n_samples, rng)
+
+    with segyio.create(path, spec) as f:
+        for start in range(0, n_traces, 1000):
+            cdps = np.arange(start, min(n_traces, start + 1000))
+            shifts = 10 * np.sin(cdps / 300.0)
+            block = _synthetic_traces(times[np.newaxis, :] + shifts[:, np.newaxis], amplitudes,
+                                      n_samples, wavelet, rng)
+            for row, t in enumerate(cdps):
+                x = 4000000 + t * 125
+                y = 70000000 + t * 30
+                f.header[t] = {
+                    segyio.su.cdp: t + 1, segyio.su.cdpx: x, segyio.su.cdpy: y,
+                    segyio.su.sx: x, segyio.su.sy: y, segyio.su.gx: x, segyio.su.gy: y,
+                    segyio.su.scalco: -10, segyio.su.tracl: t + 1, segyio.su.tracf: t + 1
+                }
+                f.trace[int(t)] = block[row]
+        _write_bin_header(f, n_samples, sample_interval_us, segyio.TraceSortingFormat.UNKNOWN_SORTING)
+    return path
+
+
+def generate_shot_gathers(path: str, n_shots: int = 20, n_channels: int = 48, n_samples: int = 500,
+                          sample_interval_us: int = 2000, seed: int = 0) -> str:
+    """2D pre-stack shot gathers with hyperbolic moveout"""
+    rng = np.random.default_rng(seed + 2)
+    spec = segyio.spec()
+    spec.samples = list(range(n_samples))
+    spec.format = 5
+    spec.tracecount = n_shots * n_channels
+
+    dt = sample_interval_us / 1e6
+    wavelet = ricker_wavelet(30, dt)
+    times, amplitudes = _reflector_model(n_samples, rng)
+    offsets = (np.arange(n_channels) - n_channels // 2) * 25.0
+    velocity = 2500.0
+    # Normal moveout: t(x) = sqrt(t0^2 + (x / v)^2), in samples
+    t0 = times * dt
+    moveout = np.sqrt(t0[np.newaxis, :] ** 2 + (offsets[:, np.newaxis] / velocity) ** 2) / dt
+
+    with segyio.create(path, spec) as f:
+        for s in range(n_shots):
+            block = _synthetic_traces(moveout, amplitudes, n_samples, wavelet, rng)
+            sx = 300000 + s * 50
+            for c in range(n_channels):
+                t = s * n_channels + c
+                f.header[t] = {
+                    segyio.su.fldr: s + 1, segyio.su.tracf: c + 1, segyio.su.ep: s + 1,
+                    segyio.su.offset: int(offsets[c]), segyio.su.sx: sx, segyio.su.sy: 5000000,
+                    segyio.su.gx: int(sx + offsets[c]), segyio.su.gy: 5000000,
+                    segyio.su.cdp: 2 * s + c + 1, segyio.su.tracl: t + 1, segyio.su.scalco: 1
+                }
+                f.trace[t] = block[c]
+        _write_bin_header(f, n_samples, sample_interval_us, segyio.TraceSortingFormat.UNKNOWN_SORTING)
+    return path
+
+
+def generate_prestack_3d(path: str, n_inlines: int = 10, n_xlines: int = 12, n_offsets: int = 8,
+                         n_samples: int = 250, sample_interval_us: int = 4000, seed: int = 0) -> str:
+    """3D pre-stack volume (CDP gathers, offset fastest)"""
+    rng = np.random.default_rng(seed + 3)
+    spec = segyio.spec()
+    spec.ilines = list(range(1000, 1000 + n_inlines))
+    spec.xlines = list(range(2000, 2000 + n_xlines))
+    spec.offsets = list(range(100, 100 + 200 * n_offsets, 200))
+    spec.samples = list(range(n_samples))
+    spec.format = 5
+    spec.sorting = segyio.TraceSortingFormat.INLINE_SORTING
+
+    dt = sample_interval_us / 1e6
+    wavelet = ricker_wavelet(25, dt)
+    times, amplitudes = _reflector_model(n_samples, rng)
+    offsets = np.asarray(spec.offsets, dtype=np.float64)
+    moveout = np.sqrt((times * dt)[np.newaxis, :] ** 2 + (offsets[:, np.newaxis] / 3000.0) ** 2) / dt
+
+    with segyio.create(path, spec) as f:
+        t = 0
+        for i, il in enumerate(spec.ilines):
+            for j, xline in enumerate(spec.xlines):
+                block = _synthetic_traces(moveout + 0.1 * i + 0.05 * j, amplitudes, n_samples, wavelet, rng)
+                x = 500000 + j * 25
+                y = 6000000 + i * 25
+                for k, offset in enumerate(spec.offsets):
+                    f.header[t] = {
+                        segyio.su.iline: il, segyio.su.xline: xline, segyio.su.offset: offset,
+                        segyio.su.cdp: i * n_xlines + j + 1, segyio.su.cdpx: x, segyio.su.cdpy: y,
+                        segyio.su.sx: int(x - offset / 2), segyio.su.sy: y,
+                        segyio.su.gx: int(x + offset / 2), segyio.su.gy: y,
+                        segyio.su.scalco: 1, segyio.su.tracl: t + 1, segyio.su.tracf: k + 1
+                    }
+                    f.trace[t] = block[k]
+                    t += 1
+        _write_bin_header(f, n_samples, sample_interval_us, segyio.TraceSortingFormat.INLINE_SORTING)
+    return path
+
+
+# ------------------------------------------------------------------------ LAS
+
+def _layer_model(total_thickness: float, rng: np.random.Generator) -> List[Dict[str, Any]]:
+    """Alternating shale/sand layers; sands carry hydrocarbons or water"""
+    layers = []
+    top = 0.0
+    sand = False
+    while top < total_thickness:
+        thickness = float(rng.uniform(5, 30) if sand else rng.uniform(10, 60))
+        layers.append({
+            "top": top,
+            "base": top + thickness,
+            "sand": sand,
+            "hydrocarbon": bool(sand and rng.random() < 0.5),
+            "porosity": float(rng.uniform(0.15, 0.3)) if sand else float(rng.uniform(0.03, 0.08))
+        })
+        top += thickness
+        sand = not sand
+    return layers
+
+
+def generate_las(path: str, n_samples: int = 4000, curves: Sequence[str] = DEFAULT_LAS_CURVES,
+                 start_depth: float = 1000.0, step: float = 0.5, depth_shift: float = 0.0,
+                 well_name: str = "SYNTH-1", seed: int = 0, model_seed: Optional[int] = None) -> str:
+    """
+    LAS 2.0 well over a sand/shale layer model
+
+    Args:
+        n_samples: Depth samples
+        curves: Curves to write (GR, RHOB, NPHI, RT, DT; any other name gets a smooth random log)
+        depth_shift: Shift of the layer model in depth units (wells of one field differ by this)
+        seed: Measurement noise seed
+        model_seed: Layer model seed (defaults to seed)
+    """
+    rng = np.random.default_rng(seed)
+    model_rng = np.random.default_rng(seed if model_seed is None else model_seed)
+    depth = start_depth + step * np.arange(n_samples)
+    layers = _layer_model(step * n_samples + abs(depth_shift) + 100, model_rng)
+
+    relative = depth - start_depth + depth_shift
+    tops = np.array([layer["top"] for layer in layers])
+    index = np.clip(np.searchsorted(tops, relative, side="right") - 1, 0, len(layers) - 1)
+    sand = np.array([layer["sand"] for layer in layers])[index]
+    hydrocarbon = np.array([layer["hydrocarbon"] for layer in layers])[index]
+    porosity = np.array([layer["porosity"] for layer in layers])[index]
+
+    def noisy(values, scale):
+        return values + scale * rng.standard_normal(n_samples)
+
+    generated = {
+        "GR": noisy(np.where(sand, 40.0, 110.0), 6.0),
+        "RHOB": noisy(2.65 - porosity * 1.65, 0.02),
+        "NPHI": noisy(np.where(sand, porosity, 0.32), 0.01),
+        "RT": np.exp(noisy(np.log(np.where(hydrocarbon, 60.0, np.where(sand, 1.5, 4.0))), 0.15)),
+        "DT": noisy(55.0 + porosity * 150.0, 2.0)
+    }
+    units = {"GR": "GAPI", "RHOB": "G/CC", "NPHI": "V/V", "RT": "OHMM", "DT": "US/F"}
+
+    las = lasio.LASFile()
+    las.well["WELL"].value = well_name
+    las.well["COMP"].value = "SYNTHETIC"
+    las.well["FLD"].value = "BENCHMARK"
+    las.well["NULL"].value = -999.25
+    las.append_curve("DEPT", depth, unit="M", descr="Depth")
+    for name in curves:
+        values = generated.get(name)
+        if values is None:
+            values = np.cumsum(rng.standard_normal(n_samples)) * 0.1
+        las.append_curve(name, np.round(values, 4), unit=units.get(name, ""), descr=name)
+
+    with open(path, "w") as f:
+        las.write(f, version=2.0)
+    return path
+
+
+# -------------------------------------------------------------------- datasets
+
+def generate_dataset(output_dir: str, size: str = "small", seed: int = 0,
+                     presets: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Generate (or reuse) a complete synthetic dataset
+
+    Returns:
+        dict: manifest with the paths of every generated file by kind
+    """
+    settings = (presets or SIZE_PRESETS)[size]
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    expected = {"generator_version": GENERATOR_VERSION, "size": size, "seed": seed, "settings": settings}
+
+    if os.path.isfile(manifest_path):
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if all(manifest.get(k) == v for k, v in expected.items()) and \
+                    all(os.path.isfile(p) for p in _manifest_files(manifest)):
+                return manifest
+        except (OSError, ValueError):
+            pass
+
+    logger.info(f"Generating {size} synthetic dataset in {output_dir}")
+    files = {
+        "poststack_3d": generate_poststack_3d(os.path.join(output_dir, "poststack_3d.sgy"),
+                                              seed=seed, **settings["poststack_3d"]),
+        "line_2d": generate_line_2d(os.path.join(output_dir, "line_2d.sgy"), seed=seed, **settings["line_2d"]),
+        "shot_gathers": generate_shot_gathers(os.path.join(output_dir, "shot_gathers.sgy"),
+                                              seed=seed, **settings["shot_gathers"]),
+        "prestack_3d": generate_prestack_3d(os.path.join(output_dir, "prestack_3d.sgy"),
+                                            seed=seed, **settings["prestack_3d"])
+    }
+    wells = []
+    for n in range(settings["wells"]["n_wells"]):
+        wells.append(generate_las(os.path.join(output_dir, f"well_{n + 1}.las"),
+                                  n_samples=settings["wells"]["n_samples"], depth_shift=4.0 * n,
+                                  well_name=f"SYNTH-{n + 1}", seed=seed + 100 + n, model_seed=seed))
+    files["wells"] = wells
+
+    manifest = dict(expected, files=files)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def _manifest_files(manifest: Dict[str, Any]) -> List[str]:
+    paths = []
+    for value in manifest.get("files", {}).values():
+        paths.extend(value if isinstance(value, list) else [value])
+    return paths
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Generate a synthetic SEG-Y/LAS dataset")
+    parser.add_argument("output_dir")
+    parser.add_argument("--size", choices=sorted(SIZE_PRESETS), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(generate_dataset(args.output_dir, args.size, args.seed)["files"], indent=2))
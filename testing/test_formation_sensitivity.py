@@ -0,0 +1,51 @@
+"""
+Checks for formation_evaluation.cutoff_sensitivity
+
+Run with pytest from the repository root:
+    python -m pytest testing/test_formation_sensitivity.py
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from formation_evaluation import cutoff_sensitivity, evaluate_formation, sensitivity_scenarios  # noqa: E402
+
+EXAMPLE_LAS = os.path.join(ROOT, "data", "example.las")
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"grid": {"rw": []}},
+    {"grid": {"vsh_cutoff": [0.4, 0.5], "sw_cutoff": []}},
+    {"n_samples": 0},
+    {"n_samples": -5},
+])
+def test_empty_scenario_sets_return_error(kwargs):
+    result = cutoff_sensitivity(EXAMPLE_LAS, **kwargs)
+    assert set(result) == {"error"}
+
+
+def test_empty_scenario_sets_raise():
+    with pytest.raises(ValueError):
+        sensitivity_scenarios(grid={"rw": []})
+    with pytest.raises(ValueError):
+        sensitivity_scenarios(n_samples=0)
+
+
+def test_grid_matches_evaluate_formation():
+    grid = {"vsh_cutoff": [0.3, 0.5], "porosity_cutoff": [0.05, 0.1], "rw": [0.05, 0.1]}
+    result = cutoff_sensitivity(EXAMPLE_LAS, grid=grid, return_scenarios=True)
+    scenarios = result["scenarios"]
+    assert result["scenario_count"] == 8
+
+    for i in range(result["scenario_count"]):
+        params = {name: float(scenarios[name][i]) for name in ("vsh_cutoff", "porosity_cutoff", "sw_cutoff", "rw")}
+        expected = evaluate_formation(EXAMPLE_LAS, **params)["pay_summary"]
+        assert scenarios["net_pay"][i] == pytest.approx(expected["net_pay"])
+        assert scenarios["num_zones"][i] == expected["num_zones"]
+
+    assert result["base_case"]["net_pay"] == pytest.approx(evaluate_formation(EXAMPLE_LAS)["pay_summary"]["net_pay"])
@@ -0,0 +1,78 @@
+"""
+Checks for servers.mcp_server.MCPClient.call_tools
+
+Run with pytest from the repository root:
+    python -m pytest testing/test_mcp_batch.py
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+pytest.importorskip("python_a2a")
+
+from servers import mcp_server  # noqa: E402
+from servers.mcp_server import MCPClient  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+        self.text = json.dumps(body)
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    """Answers /batch like add_batch_endpoint with the given limit, and single tool calls"""
+
+    def __init__(self, max_calls):
+        self.max_calls = max_calls
+        self.batch_sizes = []
+        self.single_calls = 0
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        if url.endswith("/batch"):
+            calls = json["calls"]
+            self.batch_sizes.append(len(calls))
+            if len(calls) > self.max_calls:
+                return FakeResponse(413, {"detail": f"Batch exceeds {self.max_calls} calls"})
+            return FakeResponse(200, {"results": [
+                {"tool": call["tool"], "result": {"input": call["params"]["input"]}, "elapsed_ms": 1.0}
+                for call in calls
+            ]})
+        self.single_calls += 1
+        return FakeResponse(200, {"input": json["input"]})
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = FakeSession(max_calls=4)
+    monkeypatch.setattr(mcp_server, "get_pooled_session", lambda server_url: fake)
+    return fake
+
+
+def test_large_batch_is_split_into_chunks(session):
+    calls = [("las_info", f"well_{i}.las") for i in range(10)]
+    results = MCPClient("http://mcp", max_batch_calls=4).call_tools(calls)
+
+    assert session.batch_sizes == [4, 4, 2]
+    assert session.single_calls == 0
+    assert [item["result"] for item in results] == [{"input": f"well_{i}.las"} for i in range(10)]
+
+
+def test_oversized_batch_falls_back_to_single_calls(session):
+    calls = [("las_info", f"well_{i}.las") for i in range(6)]
+    results = MCPClient("http://mcp", max_batch_calls=8).call_tools(calls)
+
+    assert session.batch_sizes == [6]
+    assert session.single_calls == 6
+    assert [item["result"] for item in results] == [{"input": f"well_{i}.las"} for i in range(6)]
+    assert all("error" not in item["result"] for item in results)
@@ -0,0 +1,45 @@
+"""
+Checks for segy_streaming_stats.StreamingStats
+
+Run with pytest from the repository root:
+    python -m pytest testing/test_segy_streaming_stats.py
+"""
+
+import os
+import sys
+import warnings
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from segy_streaming_stats import StreamingStats  # noqa: E402
+
+
+def test_zero_only_update_uses_centre_bin():
+    stats = StreamingStats()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        stats.update(np.zeros((4, 100)))
+
+    assert stats.histogram_range == 1.0
+    assert stats.histogram[stats.histogram_bins // 2] == 400
+    assert stats.percentile(50) == 0.0
+
+
+def test_merge_zero_only_blocks():
+    values = np.random.default_rng(0).normal(0, 100, size=(8, 500))
+    merged = StreamingStats().update(values)
+    merged.merge(StreamingStats().update(np.zeros((8, 500))))
+
+    empty = StreamingStats()
+    empty.merge(StreamingStats().update(np.zeros((2, 10))))
+    assert empty.percentile(50) == 0.0
+
+    expected = np.percentile(np.concatenate([values.ravel(), np.zeros(4000)]), [5, 25, 50, 75, 95])
+    width = 2 * merged.histogram_range / merged.histogram_bins
+    assert merged.count == 8000
+    assert merged.percentile([5, 25, 50, 75, 95]) == pytest.approx(expected, abs=width)
+
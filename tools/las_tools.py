@@ -21,7 +21,9 @@ from enhanced_mcp_tools import (
     NumpyJSONEncoder
 )
 from formation_evaluation import estimate_vshale
+from robust_las_parser import configure_las_cache
 from config.settings import DataConfig
+from tools.result_cache import cached_tool, configure_tool_cache
 
 
 def create_error_response(error_message: str, details: str = None, suggestions: List[str] = None) -> Dict[str, Any]:
@@ -112,9 +114,15 @@ def create_las_tools(mcp_server, data_config: DataConfig) -> List[str]:
     """
     Create and register all LAS tools - FINAL FIXED VERSION
     """
+    # All LAS tools share the process-wide parsed-LAS cache
+    configure_las_cache(data_config.las_cache_mb)
+    configure_tool_cache(enabled=data_config.tool_cache_enabled, cache_dir=data_config.tool_cache_dir,
+                         max_memory_mb=data_config.tool_cache_memory_mb,
+                         max_disk_mb=data_config.tool_cache_disk_mb)
 
     # Tool 1: LAS Parser - FIXED
-    @mcp_server.tool(
+    @cached_tool(
+        mcp_server, data_config.data_dir,
         name="las_parser",
         description="Parse and extract metadata from LAS files including well information, curves, and depth ranges"
     )
@@ -178,7 +186,8 @@ def create_las_tools(mcp_server, data_config: DataConfig) -> List[str]:
             return create_error_response(f"LAS parser failed: {str(e)}")
 
     # Tool 2: LAS Analysis - FIXED
-    @mcp_server.tool(
+    @cached_tool(
+        mcp_server, data_config.data_dir,
         name="las_analysis",
         description="Analyze curve data and perform statistical analysis on LAS files"
     )
@@ -249,7 +258,8 @@ def create_las_tools(mcp_server, data_config: DataConfig) -> List[str]:
             return create_error_response(f"LAS analysis failed: {str(e)}")
 
     # Tool 3: LAS Quality Control - FIXED
-    @mcp_server.tool(
+    @cached_tool(
+        mcp_server, data_config.data_dir,
         name="las_qc",
         description="Perform quality control checks on LAS files including data completeness and curve validation"
     )
@@ -313,7 +323,8 @@ def create_las_tools(mcp_server, data_config: DataConfig) -> List[str]:
             return create_error_response(f"LAS QC failed: {str(e)}")
 
     # Tool 4: Formation Evaluation - FIXED
-    @mcp_server.tool(
+    @cached_tool(
+        mcp_server, data_config.data_dir,
         name="formation_evaluation",
         description="Perform comprehensive petrophysical analysis including porosity, water saturation, shale volume, and pay zones"
     )
@@ -384,7 +395,8 @@ def create_las_tools(mcp_server, data_config: DataConfig) -> List[str]:
             return create_error_response(f"Formation evaluation failed: {str(e)}")
 
     # Tool 5: Well Correlation - FIXED
-    @mcp_server.tool(
+    @cached_tool(
+        mcp_server, data_config.data_dir,
         name="well_correlation",
         description="Correlate formations across multiple wells to identify key formation tops and stratigraphic markers"
     )
@@ -466,7 +478,8 @@ def create_las_tools(mcp_server, data_config: DataConfig) -> List[str]:
             return create_error_response(f"Well correlation failed: {str(e)}")
 
     # Tool 6: Calculate Shale Volume - FIXED
-    @mcp_server.tool(
+    @cached_tool(
+        mcp_server, data_config.data_dir,
         name="calculate_shale_volume",
         description="Calculate volume of shale from gamma ray log using the Larionov correction method"
     )
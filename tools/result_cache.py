@@ -0,0 +1,514 @@
+"""
+Tool Result Cache Module
+Content-addressed memoization of deterministic MCP tool results
+
+Analysis tools are pure functions of their parameters and the files they
+read. A result is stored under a key built from the tool name, the
+normalized parameters, a fingerprint (path, size, mtime and an optional
+head/tail hash) of every data file the parameters refer to, and a code
+fingerprint (hash of the project's Python sources, or TOOL_CACHE_CODE_VERSION);
+wildcard patterns fingerprint the whole data directory listing. Changing a
+file or upgrading the analysis code changes the key, so stale results are
+never served. Disk entries live under a directory per code version, and
+entries of other versions are purged on the first write of a process
+(purge_stale).
+
+Two tiers: an in-memory LRU bounded by bytes, and an on-disk tier of JSON
+files bounded by total size (least recently used files evicted first).
+Tools opt in by registering through cached_tool() instead of
+mcp_server.tool(); error results and calls that reference no data file are
+never cached.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.file_cache import cache_path, file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key or entry layout changes
+CACHE_VERSION = 2
+
+# Under the shared cache directory unless TOOL_CACHE_DIR is set
+DEFAULT_CACHE_DIR = os.getenv("TOOL_CACHE_DIR", cache_path("tool_result_cache"))
+DEFAULT_MEMORY_MB = float(os.getenv("TOOL_CACHE_MEMORY_MB", "128"))
+DEFAULT_DISK_MB = float(os.getenv("TOOL_CACHE_DISK_MB", "1024"))
+# Bytes hashed from the start and end of each file; 0 fingerprints by size/mtime only
+DEFAULT_HASH_BYTES = int(os.getenv("TOOL_CACHE_HASH_BYTES", "65536"))
+# Explicit code version (e.g. a release tag); empty hashes the project sources instead
+DEFAULT_CODE_VERSION = os.getenv("TOOL_CACHE_CODE_VERSION", "")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Directories never part of the code fingerprint
+_SKIP_DIRS = {".git", "__pycache__", ".venv", "venv", "node_modules", "logs", "traces", "data",
+              "benchmark_data", "benchmark_results", "tool_result_cache", "las_store", "segy_header_index"}
+# Cache subdirectories: per-code-version (16 hex) and the pre-version layout (2 hex)
+_CACHE_SUBDIR = re.compile(r"^(?:[0-9a-f]{16}|[0-9a-f]{2})$")
+
+_EMPTY_VALUES = (None, "", "None", "null")
+
+
+class ToolResultCache:
+    """Two-tier (memory + disk) cache of tool results keyed by content"""
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 max_memory_mb: float = DEFAULT_MEMORY_MB,
+                 max_disk_mb: float = DEFAULT_DISK_MB,
+                 hash_bytes: int = DEFAULT_HASH_BYTES,
+                 enabled: bool = True,
+                 code_version: Optional[str] = DEFAULT_CODE_VERSION):
+        self.cache_dir = cache_dir or None
+        self._code_version = code_version or None
+        self._purged = False
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self.hash_bytes = hash_bytes
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        # key -> (serialized entry, compute_seconds)
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None
+        self._tools: Dict[str, Dict[str, float]] = {}
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "stores": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0
+        }
+
+    # ------------------------------------------------------------------ lookup
+
+    def make_key(self, tool_name: str, params: Dict[str, Any], data_dir: str) -> Optional[str]:
+        """Cache key for a call, or None if it references no fingerprintable data file"""
+        normalized = _normalize(params)
+        fingerprints = self._fingerprint_references(normalized, data_dir)
+        if not fingerprints:
+            return None
+
+        payload = json.dumps([CACHE_VERSION, self.code_version, tool_name, normalized, fingerprints],
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def code_version(self) -> str:
+        """Code fingerprint folded into every key (computed on first use)"""
+        if self._code_version is None:
+            self._code_version = code_fingerprint()
+        return self._code_version
+
+    def purge_stale(self) -> int:
+        """Delete disk entries written by other code versions; returns the number of files removed"""
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return 0
+        current = self._version_dir()
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name == current or not _CACHE_SUBDIR.match(name) or not os.path.isdir(path):
+                continue
+            for root, _, files in os.walk(path, topdown=False):
+                for file_name in files:
+                    try:
+                        os.remove(os.path.join(root, file_name))
+                        removed += 1
+                    except OSError:
+                        pass
+                try:
+                    os.rmdir(root)
+                except OSError:
+                    pass
+        with self._lock:
+            self._disk_bytes = None
+        if removed:
+            logger.info(f"Purged {removed} tool cache entries of other code versions")
+        return removed
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """(result, compute_seconds) from memory or disk, or None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return json.loads(entry[0])["result"], entry[1]
+
+        path = self._disk_path(key)
+        if path is None or not os.path.isfile(path):
+            return None
+
+        try:
+            with open(path) as fh:
+                serialized = fh.read()
+            entry = json.loads(serialized)
+            compute_seconds = entry["compute_seconds"]
+            result = entry["result"]
+            # Refresh recency for disk eviction
+            os.utime(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+        with self._lock:
+            self._counters["disk_hits"] += 1
+            self._memory_put_locked(key, serialized, compute_seconds)
+        return result, compute_seconds
+
+    def put(self, key: str, tool_name: str, result: Any, compute_seconds: float):
+        try:
+            serialized = json.dumps({"tool": tool_name, "created": time.time(),
+                                     "compute_seconds": compute_seconds, "result": result})
+        except (TypeError, ValueError):
+            # Non-JSON results are not cacheable
+            return
+
+        with self._lock:
+            self._counters["stores"] += 1
+            self._memory_put_locked(key, serialized, compute_seconds)
+
+        self._disk_put(key, serialized)
+
+    # ----------------------------------------------------------------- wrapper
+
+    def call(self, tool_name: str, func: Callable, params: Dict[str, Any], data_dir: str) -> Any:
+        """Return the cached result of func(**params), computing and storing it on a miss"""
+        key = self.make_key(tool_name, params, data_dir) if self.enabled else None
+        if key is None:
+            with self._lock:
+                self._counters["bypassed"] += 1
+            return func(**params)
+
+        cached = self.get(key)
+        if cached is not None:
+            result, compute_seconds = cached
+            self._record_tool(tool_name, hit=True, seconds_saved=compute_seconds)
+            return result
+
+        start_time = time.time()
+        result = func(**params)
+        compute_seconds = time.time() - start_time
+
+        with self._lock:
+            self._counters["misses"] += 1
+        self._record_tool(tool_name, hit=False, seconds_saved=0.0)
+
+        if not _is_error_result(result):
+            self.put(key, tool_name, result, compute_seconds)
+        return result
+
+    def clear(self):
+        """Drop both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        for path, _, _ in self._disk_entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            tools = {name: dict(values) for name, values in self._tools.items()}
+            memory_entries = len(self._memory)
+            memory_bytes = self._memory_bytes
+
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        lookups = hits + counters["misses"]
+        return {
+            "enabled": self.enabled,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "time_saved_seconds": round(sum(t["seconds_saved"] for t in tools.values()), 3),
+            "memory_entries": memory_entries,
+            "memory_mb": round(memory_bytes / 1024 / 1024, 2),
+            "max_memory_mb": round(self.max_memory_bytes / 1024 / 1024, 1),
+            "disk_mb": round((self._disk_bytes or 0) / 1024 / 1024, 2),
+            "max_disk_mb": round(self.max_disk_bytes / 1024 / 1024, 1),
+            "cache_dir": self.cache_dir,
+            **counters,
+            "tools": tools
+        }
+
+    # ---------------------------------------------------------------- internals
+
+    def _record_tool(self, tool_name: str, hit: bool, seconds_saved: float):
+        with self._lock:
+            tool = self._tools.setdefault(tool_name, {"hits": 0, "misses": 0, "seconds_saved": 0.0})
+            tool["hits" if hit else "misses"] += 1
+            tool["seconds_saved"] = round(tool["seconds_saved"] + seconds_saved, 3)
+
+    def _memory_put_locked(self, key: str, serialized: str, compute_seconds: float):
+        size = len(serialized)
+        if size > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous[0])
+        self._memory[key] = (serialized, compute_seconds)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._counters["memory_evictions"] += 1
+
+    def _disk_path(self, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, self._version_dir(), key[:2], f"{key}.json")
+
+    def _version_dir(self) -> str:
+        return hashlib.sha256(self.code_version.encode("utf-8")).hexdigest()[:16]
+
+    def _disk_put(self, key: str, serialized: str):
+        path = self._disk_path(key)
+        if path is None or len(serialized) > self.max_disk_bytes:
+            return
+        if not self._purged:
+            self._purged = True
+            self.purge_stale()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as fh:
+                fh.write(serialized)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write tool cache entry: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+            else:
+                self._disk_bytes += len(serialized)
+            over_budget = self._disk_bytes > self.max_disk_bytes
+
+        if over_budget:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Remove least recently used entries until the disk tier fits (with 10% headroom)"""
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * 0.9
+        evicted = 0
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                evicted += 1
+            except OSError:
+                pass
+
+        with self._lock:
+            self._disk_bytes = total
+            self._counters["disk_evictions"] += evicted
+
+    def _disk_entries(self) -> List[Tuple[str, int, float]]:
+        """(path, size, mtime) of every disk entry"""
+        entries = []
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return entries
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _fingerprint_references(self, params: Any, data_dir: str) -> List[Any]:
+        """Fingerprints of every data file (or wildcard directory) the parameters refer to"""
+        fingerprints = []
+        seen = set()
+        for token in _string_tokens(params):
+            if "*" in token or "?" in token:
+                directory = os.path.dirname(token) if os.path.isabs(token) else \
+                    os.path.join(data_dir, os.path.dirname(token))
+                listing = self._directory_fingerprint(directory)
+                if listing is not None and ("dir", directory) not in seen:
+                    seen.add(("dir", directory))
+                    fingerprints.append(listing)
+                continue
+
+            for candidate in (token, os.path.join(data_dir, token)):
+                path = os.path.abspath(candidate)
+                if path not in seen and os.path.isfile(path):
+                    seen.add(path)
+                    fingerprints.append(self._file_fingerprint(path))
+                    break
+        return fingerprints
+
+    def _file_fingerprint(self, path: str) -> List[Any]:
+        stat = file_fingerprint(path)
+        if stat is None:
+            raise FileNotFoundError(path)
+        fingerprint = [path, stat["file_size"], stat["mtime_ns"]]
+        if self.hash_bytes > 0:
+            digest = hashlib.sha1()
+            with open(path, "rb") as fh:
+                digest.update(fh.read(self.hash_bytes))
+                if stat["file_size"] > 2 * self.hash_bytes:
+                    fh.seek(-self.hash_bytes, os.SEEK_END)
+                    digest.update(fh.read(self.hash_bytes))
+            fingerprint.append(digest.hexdigest())
+        return fingerprint
+
+    def _directory_fingerprint(self, directory: str) -> Optional[List[Any]]:
+        """Names, sizes and mtimes of the files a wildcard could match"""
+        try:
+            with os.scandir(directory) as scan:
+                files = sorted((entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                               for entry in scan if entry.is_file())
+        except OSError:
+            return None
+        return [os.path.abspath(directory), files]
+
+
+_code_fingerprint: Optional[str] = None
+
+
+def code_fingerprint(root: str = PROJECT_ROOT) -> str:
+    """Hash of every Python source file of the project (cached per process for the default root)"""
+    global _code_fingerprint
+    if root == PROJECT_ROOT and _code_fingerprint is not None:
+        return _code_fingerprint
+
+    digest = hashlib.sha256()
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in _SKIP_DIRS and not d.startswith("."))
+        for name in sorted(files):
+            if not name.endswith(".py"):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                with open(path, "rb") as fh:
+                    content = fh.read()
+            except OSError:
+                continue
+            digest.update(os.path.relpath(path, root).encode("utf-8"))
+            digest.update(hashlib.sha256(content).digest())
+
+    fingerprint = digest.hexdigest()
+    if root == PROJECT_ROOT:
+        _code_fingerprint = fingerprint
+    return fingerprint
+
+
+def _normalize(value: Any) -> Any:
+    """Canonical form of tool parameters: empty values dropped, strings stripped, JSON strings parsed"""
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))
+                if v not in _EMPTY_VALUES}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str):
+        text = value.strip()
+        if text[:1] in ("{", "["):
+            try:
+                return _normalize(json.loads(text))
+            except ValueError:
+                pass
+        return text
+    return value
+
+
+def _string_tokens(value: Any) -> List[str]:
+    """Every string in the parameters, whole and split on commas/whitespace"""
+    tokens = []
+    if isinstance(value, dict):
+        for item in value.values():
+            tokens.extend(_string_tokens(item))
+    elif isinstance(value, list):
+        for item in value:
+            tokens.extend(_string_tokens(item))
+    elif isinstance(value, str) and value:
+        tokens.append(value)
+        parts = [part for part in re.split(r"[,\s]+", value) if part]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def _is_error_result(result: Any) -> bool:
+    if not isinstance(result, dict):
+        return False
+    if "error" in result:
+        return True
+    text = result.get("text")
+    return isinstance(text, str) and text.lstrip().startswith('{"error"')
+
+
+# Process-wide cache shared by every registered tool
+_tool_cache = ToolResultCache()
+
+
+def get_tool_cache() -> ToolResultCache:
+    return _tool_cache
+
+
+def configure_tool_cache(enabled: Optional[bool] = None, cache_dir: Optional[str] = None,
+                         max_memory_mb: Optional[float] = None,
+                         max_disk_mb: Optional[float] = None) -> ToolResultCache:
+    """Adjust the shared cache (called when tools are registered)"""
+    if enabled is not None:
+        _tool_cache.enabled = enabled
+    if cache_dir is not None:
+        _tool_cache.cache_dir = cache_dir or None
+        _tool_cache._disk_bytes = None
+        _tool_cache._purged = False
+    if max_memory_mb is not None:
+        with _tool_cache._lock:
+            _tool_cache.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+    if max_disk_mb is not None:
+        _tool_cache.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+    return _tool_cache
+
+
+def cached_tool(mcp_server, data_dir: str, name: str, description: str = None,
+                cache: bool = True, result_cache: Optional[ToolResultCache] = None):
+    """
+    Drop-in replacement for mcp_server.tool() that memoizes the tool's results
+
+    Args:
+        mcp_server: MCP server to register with
+        data_dir: Directory relative file parameters are resolved against
+        name: Tool name
+        description: Tool description
+        cache: False registers the tool uncached (opt out)
+        result_cache: Cache to use (default: the shared process-wide cache)
+    """
+    def decorator(func):
+        if not cache:
+            return mcp_server.tool(name=name, description=description)(func)
+
+        @functools.wraps(func)
+        def memoized(*args, **kwargs):
+            if args:
+                # Positional calls bypass the cache; MCP passes keyword parameters
+                return func(*args, **kwargs)
+            return (result_cache or _tool_cache).call(name, func, kwargs, data_dir)
+
+        return mcp_server.tool(name=name, description=description)(memoized)
+
+    return decorator
@@ -39,6 +39,7 @@ except ImportError as e:
             return str(obj)
 
 from config.settings import DataConfig
+from tools.result_cache import cached_tool, configure_tool_cache
 
 def create_error_response(error_message, details=None, suggestions=None):
     """Create error response"""
@@ -81,8 +82,15 @@ def create_segy_tools(mcp_server, data_config: DataConfig) -> List[str]:
             return create_error_response("SEG-Y tools not available")
         return ["segy_parser"]
 
+    # Deterministic analysis tools memoize their results (see tools/result_cache.py);
+    # tools that store results or list state register uncached
+    configure_tool_cache(enabled=data_config.tool_cache_enabled, cache_dir=data_config.tool_cache_dir,
+                         max_memory_mb=data_config.tool_cache_memory_mb,
+                         max_disk_mb=data_config.tool_cache_disk_mb)
+
     # Tool 1: SEG-Y Parser - FIXED
-    @mcp_server.tool(
+    @cached_tool(
+        mcp_server, data_config.data_dir,
         name="segy_parser",
         description="Parse SEG-Y seismic files"
     )
@@ -107,7 +115,8 @@ def create_segy_tools(mcp_server, data_config: DataConfig) -> List[str]:
             return create_error_response(f"SEG-Y parser failed: {str(e)}")
 
     # Tool 2: SEG-Y QC - FIXED
-    @mcp_server.tool(
+    @cached_tool(
+        mcp_server, data_config.data_dir,
         name="segy_qc",
         description="Perform quality control on SEG-Y files"
     )
@@ -131,7 +140,8 @@ def create_segy_tools(mcp_server, data_config: DataConfig) -> List[str]:
             return create_error_response(f"SEG-Y QC failed: {str(e)}")
 
     # Tool 3: SEG-Y Analysis - FIXED
-    @mcp_server.tool(
+    @cached_tool(
+        mcp_server, data_config.data_dir,
         name="segy_analysis",
         description="Analyze SEG-Y seismic survey data"
     )
@@ -155,7 +165,8 @@ def create_segy_tools(mcp_server, data_config: DataConfig) -> List[str]:
             return create_error_response(f"SEG-Y analysis failed: {str(e)}")
 
     # Tool 4: SEG-Y Classification - FIXED
-    @mcp_server.tool(
+    @cached_tool(
+        mcp_server, data_config.data_dir,
         name="segy_classify",
         description="Classify SEG-Y survey type"
     )
@@ -181,7 +192,8 @@ def create_segy_tools(mcp_server, data_config: DataConfig) -> List[str]:
             return create_error_response(f"SEG-Y classification failed: {str(e)}")
 
     # Tool 5: SEG-Y Survey Analysis - FIXED
-    @mcp_server.tool(
+    @cached_tool(
+        mcp_server, data_config.data_dir,
         name="segy_survey_analysis",
         description="Analyze multiple SEG-Y files as a survey"
     )
@@ -292,7 +304,8 @@ def create_segy_tools(mcp_server, data_config: DataConfig) -> List[str]:
             return create_error_response(f"Quick summary failed: {str(e)}")
 
     # Tool 7: Complete Metadata Harvester - FIXED
-    @mcp_server.tool(
+    @cached_tool(
+        mcp_server, data_config.data_dir,
         name="segy_complete_metadata_harvester",
         description="Extract comprehensive metadata from SEG-Y files"
     )
@@ -349,6 +362,9 @@ def create_segy_tools(mcp_server, data_config: DataConfig) -> List[str]:
                 "file_path": file_path,
                 "data_dir": data_config.data_dir
             }
+            for option in ("return_format", "max_coordinates", "hull_type", "alpha_radius"):
+                if option in kwargs:
+                    params[option] = kwargs[option]
             return mcp_extract_survey_polygon(**params)
 
         except Exception as e:
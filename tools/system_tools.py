@@ -17,6 +17,8 @@ except ImportError:
     PSUTIL_AVAILABLE = False
 
 from config.settings import DataConfig
+from robust_las_parser import get_las_cache
+from tools.result_cache import get_tool_cache
 
 
 def create_error_response(error_message: str, details: str = None) -> Dict[str, Any]:
@@ -362,6 +364,8 @@ def create_system_tools(mcp_server, data_config: DataConfig) -> List[str]:
                 "system_info": system_info,
                 "data_directory_info": data_dir_info,
                 "environment_info": environment_info,
+                "las_cache": get_las_cache().stats(),
+                "tool_result_cache": get_tool_cache().stats(),
                 "available_tools": available_tools,
                 "tool_count": len(available_tools),
                 "overall_status": "System operational",
@@ -0,0 +1,35 @@
+# utils/file_cache.py
+"""
+Helpers shared by the on-disk and in-memory file caches
+"""
+
+import os
+from typing import Dict, Optional
+
+# Root of the persistent caches; CACHE_DIR overrides the per-user cache directory
+CACHE_ROOT = os.getenv("CACHE_DIR") or os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "i2g-agentnexus"
+)
+
+
+def cache_path(name: str) -> str:
+    """
+    Location of a named cache file or directory under CACHE_ROOT
+
+    Nothing is created here; caches create their files on first write.
+    """
+    return os.path.join(CACHE_ROOT, name)
+
+
+def file_fingerprint(file_path: str) -> Optional[Dict[str, int]]:
+    """
+    Size and modification time of a file, or None if it cannot be read
+
+    A cached result computed from the file is current while the fingerprint
+    is unchanged.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return {"file_size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
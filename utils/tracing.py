@@ -0,0 +1,317 @@
+"""
+Lightweight in-process tracing
+
+Nested spans record where a request spends its time, from MetaAgent.run
+through the MCP HTTP hop down to the analyzer stages:
+
+    with span("segy.classification", traces=1200):
+        ...
+
+    @traced("MetaAgent.run")
+    def run(self, query): ...
+
+The current span lives in a context variable. MCPClient sends it in the
+X-Trace-Context header and the MCP server continues the same trace, so
+both sides of the hop share one trace ID. When the outermost span of a
+process finishes, its spans are written to TRACE_DIR as a Chrome trace
+fragment (<trace_id>.<pid>.<span_id>.json); export_chrome_trace merges the
+fragments of a trace into one file for chrome://tracing or Perfetto.
+
+Tracing is off unless TRACING_ENABLED=true (or configure_tracing); disabled
+spans cost one flag check.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+import functools
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACE_HEADER = "X-Trace-Context"
+
+_settings = {
+    "enabled": os.getenv("TRACING_ENABLED", "false").lower() == "true",
+    "trace_dir": os.getenv("TRACE_DIR", "./traces"),
+    # Local traces shorter than this are not written
+    "min_duration_ms": float(os.getenv("TRACE_MIN_DURATION_MS", "0"))
+}
+
+_current_span: ContextVar[Optional[Any]] = ContextVar("current_span", default=None)
+
+
+def configure_tracing(enabled: Optional[bool] = None, trace_dir: Optional[str] = None,
+                      min_duration_ms: Optional[float] = None):
+    """Change tracing settings at runtime"""
+    if enabled is not None:
+        _settings["enabled"] = enabled
+    if trace_dir is not None:
+        _settings["trace_dir"] = trace_dir
+    if min_duration_ms is not None:
+        _settings["min_duration_ms"] = min_duration_ms
+
+
+def tracing_enabled() -> bool:
+    return _settings["enabled"]
+
+
+class _RemoteParent:
+    """Span context received from another process"""
+
+    def __init__(self, trace_id: str, span_id: str):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+
+class Span:
+    """One timed operation; use as a context manager"""
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        parent = _current_span.get()
+        self.span_id = uuid.uuid4().hex[:16]
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex
+        self.parent_id = parent.span_id if parent is not None else None
+        # Spans of a local root are collected and written together
+        self._collector: List[Dict[str, Any]] = parent._collector if isinstance(parent, Span) else []
+        self._is_local_root = not isinstance(parent, Span)
+        self.start = None
+        self._token = None
+
+    def set(self, **attrs):
+        """Add attributes while the span is open"""
+        self.attrs.update(attrs)
+        return self
+
+    def __enter__(self):
+        self.start = time.time()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.time()
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        self._collector.append({
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "end": end,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "attrs": self.attrs
+        })
+        if self._is_local_root and (end - self.start) * 1000 >= _settings["min_duration_ms"]:
+            _write_fragment(self, self._collector)
+        return False
+
+
+class _NoopSpan:
+    def set(self, **attrs):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **attrs):
+    """Open a span (no-op when tracing is disabled)"""
+    if not _settings["enabled"]:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def traced(name: Optional[str] = None, **attrs):
+    """Decorator running the function inside a span"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _settings["enabled"]:
+                return func(*args, **kwargs)
+            with Span(span_name, dict(attrs)):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_span(name: str, start: float, end: float, **attrs):
+    """Add an already-timed child span (start/end from time.time()) to the current span"""
+    parent = _current_span.get()
+    if not _settings["enabled"] or not isinstance(parent, Span):
+        return
+    parent._collector.append({
+        "name": name,
+        "trace_id": parent.trace_id,
+        "span_id": uuid.uuid4().hex[:16],
+        "parent_id": parent.span_id,
+        "start": start,
+        "end": end,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "attrs": attrs
+    })
+
+
+class StageSpans:
+    """Consecutive stage spans: next() closes the open stage and opens another"""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._open = None
+
+    def next(self, stage: str, **attrs):
+        self.close()
+        self._open = span(f"{self.prefix}.{stage}", **attrs)
+        self._open.__enter__()
+        return self._open
+
+    def close(self):
+        if self._open is not None:
+            self._open.__exit__(None, None, None)
+            self._open = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._open is not None:
+            self._open.__exit__(exc_type, exc, tb)
+            self._open = None
+        return False
+
+
+# ------------------------------------------------------------------ propagation
+
+def trace_headers() -> Dict[str, str]:
+    """HTTP headers carrying the current span to another process"""
+    current = _current_span.get()
+    if not _settings["enabled"] or current is None:
+        return {}
+    return {TRACE_HEADER: f"{current.trace_id}-{current.span_id}"}
+
+
+def continue_trace(header_value: Optional[str]):
+    """
+    Make spans opened in this context children of a remote span
+
+    Returns the context-variable token for end_remote_trace, or None if the
+    header is missing or malformed.
+    """
+    if not _settings["enabled"] or not header_value:
+        return None
+    trace_id, _, span_id = header_value.strip().partition("-")
+    if not trace_id or not span_id:
+        return None
+    return _current_span.set(_RemoteParent(trace_id, span_id))
+
+
+def end_remote_trace(token):
+    if token is not None:
+        _current_span.reset(token)
+
+
+# ---------------------------------------------------------------------- output
+
+def _write_fragment(root: Span, spans: List[Dict[str, Any]]):
+    try:
+        trace_dir = Path(_settings["trace_dir"])
+        trace_dir.mkdir(parents=True, exist_ok=True)
+        path = trace_dir / f"{root.trace_id}.{os.getpid()}.{root.span_id}.json"
+        with open(path, "w") as f:
+            json.dump(_chrome_trace(spans, root.trace_id), f, default=str)
+    except OSError as e:
+        logger.warning(f"Could not write trace {root.trace_id}: {e}")
+
+
+def _chrome_trace(spans: List[Dict[str, Any]], trace_id: str) -> Dict[str, Any]:
+    """Chrome trace-event JSON (complete 'X' events, microseconds)"""
+    events = []
+    for s in sorted(spans, key=lambda s: s["start"]):
+        events.append({
+            "name": s["name"],
+            "cat": s["name"].split(".")[0],
+            "ph": "X",
+            "ts": round(s["start"] * 1e6),
+            "dur": round((s["end"] - s["start"]) * 1e6),
+            "pid": s["pid"],
+            "tid": s["tid"],
+            "args": {**s["attrs"], "trace_id": s["trace_id"], "span_id": s["span_id"],
+                     "parent_id": s["parent_id"]}
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"trace_id": trace_id}}
+
+
+def list_traces(trace_dir: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    """Most recent traces with their root span name and duration"""
+    trace_dir = Path(trace_dir or _settings["trace_dir"])
+    traces: Dict[str, Dict[str, Any]] = {}
+    for path in trace_dir.glob("*.json"):
+        trace_id = path.name.split(".")[0]
+        try:
+            with open(path) as f:
+                events = json.load(f)["traceEvents"]
+        except (OSError, ValueError, KeyError):
+            continue
+        for event in events:
+            if event["args"].get("parent_id") is None:
+                traces[trace_id] = {"trace_id": trace_id, "root": event["name"],
+                                    "start_us": event["ts"], "duration_ms": round(event["dur"] / 1000, 2)}
+        traces.setdefault(trace_id, {"trace_id": trace_id, "root": None, "start_us": 0, "duration_ms": None})
+    return sorted(traces.values(), key=lambda t: t["start_us"], reverse=True)[:limit]
+
+
+def export_chrome_trace(trace_id: str, output_path: Optional[str] = None,
+                        trace_dir: Optional[str] = None) -> Optional[str]:
+    """Merge every fragment of a trace (all processes) into one Chrome trace file"""
+    trace_dir = Path(trace_dir or _settings["trace_dir"])
+    events = []
+    for path in trace_dir.glob(f"{trace_id}.*.json"):
+        try:
+            with open(path) as f:
+                events.extend(json.load(f)["traceEvents"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Skipping trace fragment {path.name}: {e}")
+    if not events:
+        return None
+
+    if output_path is None:
+        # Outside the fragment glob, so exports are never merged again
+        (trace_dir / "exported").mkdir(exist_ok=True)
+        output_path = str(trace_dir / "exported" / f"{trace_id}.json")
+    with open(output_path, "w") as f:
+        json.dump({"traceEvents": sorted(events, key=lambda e: e["ts"]), "displayTimeUnit": "ms",
+                   "otherData": {"trace_id": trace_id}}, f)
+    return output_path
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="List traces or export one as a Chrome trace")
+    parser.add_argument("trace_id", nargs="?", help="trace to export (omit to list recent traces)")
+    parser.add_argument("--trace-dir", default=_settings["trace_dir"])
+    parser.add_argument("--output", help="output file for the exported trace")
+    args = parser.parse_args()
+
+    if args.trace_id:
+        print(export_chrome_trace(args.trace_id, args.output, args.trace_dir) or "Trace not found")
+    else:
+        print(json.dumps(list_traces(args.trace_dir), indent=2))
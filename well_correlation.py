@@ -13,10 +13,24 @@ from scipy.signal import find_peaks, peak_prominences
 from scipy.interpolate import interp1d
 from typing import List, Dict, Any, Tuple, Optional
 import json
+import logging
 import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Import the robust LAS parser
 from robust_las_parser import load_las_file, RobustLASFile
+from dtw_engine import dtw_distance, dtw_distances_paired, max_distance_for_confidence
+
+logger = logging.getLogger(__name__)
+
+# Parameter sets tried by correlate_wells_adaptive, and its fallback
+ADAPTIVE_PARAM_SETS = [
+    {"depth_tolerance": 10.0, "prominence": 0.2, "min_distance": 5},
+    {"depth_tolerance": 15.0, "prominence": 0.15, "min_distance": 8},
+    {"depth_tolerance": 5.0, "prominence": 0.3, "min_distance": 10},
+    {"depth_tolerance": 20.0, "prominence": 0.1, "min_distance": 15},
+]
+DEFAULT_CORRELATION_PARAMS = {"depth_tolerance": 5.0, "prominence": 0.3, "min_distance": 10}
 
 class NumpyJSONEncoder(json.JSONEncoder):
     """JSON encoder that handles NumPy types"""
@@ -77,7 +91,8 @@ def preprocess_curve(curve_data, window_size=5):
 
 # Add this enhanced correlation function to well_correlation.py
 
-def correlate_wells_adaptive(well_files, marker_curve="GR", adaptive_params=True):
+def correlate_wells_adaptive(well_files, marker_curve="GR", adaptive_params=True, max_workers=None,
+                             session=None):
     """
     Enhanced well correlation with adaptive parameter tuning
 
@@ -85,159 +100,97 @@ def correlate_wells_adaptive(well_files, marker_curve="GR", adaptive_params=True
         well_files: List of LAS file paths
         marker_curve: Curve to use for correlation
         adaptive_params: Whether to try multiple parameter sets
+        max_workers: Worker processes for the parameter sets (default: CPU count)
+        session: CorrelationSession to reuse (default: a new one over well_files)
 
     Returns:
-        Best correlation result found
+        Best correlation result found, with a score_table of every parameter set tried
     """
-    if adaptive_params:
-        # Try multiple parameter combinations
-        param_sets = [
-            {"depth_tolerance": 10.0, "prominence": 0.2, "min_distance": 5},
-            {"depth_tolerance": 15.0, "prominence": 0.15, "min_distance": 8},
-            {"depth_tolerance": 5.0, "prominence": 0.3, "min_distance": 10},
-            {"depth_tolerance": 20.0, "prominence": 0.1, "min_distance": 15},
-        ]
-
-        best_result = None
-        best_score = 0
-
-        for params in param_sets:
-            try:
-                result = correlate_wells(
-                    well_files,
-                    marker_curve=marker_curve,
-                    **params
-                )
-
-                if "error" not in result:
-                    # Score based on number of formation tops and average confidence
-                    formation_count = result.get("formation_count", 0)
-                    if formation_count > 0:
-                        avg_confidence = sum(
-                            top.get("confidence", 0) for top in result.get("formation_tops", [])
-                        ) / formation_count
-                        score = formation_count * avg_confidence
-
-                        if score > best_score:
-                            best_score = score
-                            best_result = result
-                            best_result["correlation_params_used"] = params
-
-            except Exception as e:
-                print(f"Parameter set {params} failed: {str(e)}")
-                continue
-
-        if best_result:
-            return best_result
-
-    # Fall back to default parameters
-    return correlate_wells(
-        well_files,
-        marker_curve=marker_curve,
-        depth_tolerance=5.0,
-        prominence=0.3,
-        min_distance=10
-    )
+    session = session or CorrelationSession(well_files)
+
+    if not adaptive_params:
+        return session.correlate(marker_curve, **DEFAULT_CORRELATION_PARAMS)
+
+    # Try multiple parameter combinations, falling back to default parameters
+    search = session.search([marker_curve], ADAPTIVE_PARAM_SETS, fallback_params=DEFAULT_CORRELATION_PARAMS,
+                            max_workers=max_workers)
+    chosen = search["by_curve"][marker_curve]
+    result = chosen["result"]
+    if chosen["params"] is not None:
+        result["correlation_params_used"] = chosen["params"]
+    result["score_table"] = search["score_table"]
+    return result
 
 
 # Add this alternative curve correlation function
-def try_multiple_curves(well_files, curves=None):
+def try_multiple_curves(well_files, curves=None, max_workers=None, session=None):
     """
     Try correlation with multiple curves to find the best result
 
+    Every curve gets the correlate_wells_adaptive parameter sets; all
+    combinations share one CorrelationSession and run in parallel.
+
     Args:
         well_files: List of LAS file paths
         curves: List of curves to try (if None, will auto-detect)
+        max_workers: Worker processes (default: CPU count)
+        session: CorrelationSession to reuse (default: a new one over well_files)
 
     Returns:
-        Best correlation result across all curves
+        Best correlation result across all curves, with a score_table of every
+        curve/parameter combination tried
     """
-    from robust_las_parser import load_las_file
+    session = session or CorrelationSession(well_files)
 
     if curves is None:
         # Auto-detect common curves across all wells
-        common_curves = None
-        for file_path in well_files:
-            las, error = load_las_file(file_path)
-            if error:
-                continue
-
-            file_curves = set(las.get_curve_names())
-            if common_curves is None:
-                common_curves = file_curves
-            else:
-                common_curves = common_curves.intersection(file_curves)
+        common_curves = session.common_curves()
 
         # Prioritize common correlation curves
         priority_curves = ["GR", "SP", "RHOB", "NPHI", "RT", "RILD", "RILM"]
         curves = [curve for curve in priority_curves if curve in common_curves]
 
         # Add any other common curves
-        for curve in common_curves:
+        for curve in sorted(common_curves):
             if curve not in curves and curve not in ["DEPT", "DEPTH"]:
                 curves.append(curve)
 
+    search = session.search(curves, ADAPTIVE_PARAM_SETS, fallback_params=DEFAULT_CORRELATION_PARAMS,
+                            max_workers=max_workers)
+
     best_result = None
     best_score = 0
 
     for curve in curves:
-        try:
-            result = correlate_wells_adaptive(well_files, marker_curve=curve)
-
-            if "error" not in result:
-                formation_count = result.get("formation_count", 0)
-                if formation_count > 0:
-                    avg_confidence = sum(
-                        top.get("confidence", 0) for top in result.get("formation_tops", [])
-                    ) / formation_count
-                    score = formation_count * avg_confidence
-
-                    if score > best_score:
-                        best_score = score
-                        best_result = result
-                        best_result["best_marker_curve"] = curve
-
-        except Exception as e:
-            print(f"Curve {curve} failed: {str(e)}")
-            continue
-
-    return best_result if best_result else {"error": "No successful correlations found with any curve"}
-
-def simple_dtw(x, y):
+        chosen = search["by_curve"].get(curve)
+        if chosen and chosen["score"] > best_score:
+            best_score = chosen["score"]
+            best_result = chosen["result"]
+            if chosen["params"] is not None:
+                best_result["correlation_params_used"] = chosen["params"]
+            best_result["best_marker_curve"] = curve
+
+    if best_result is None:
+        return {"error": "No successful correlations found with any curve", "score_table": search["score_table"]}
+    best_result["score_table"] = search["score_table"]
+    return best_result
+
+def simple_dtw(x, y, window=None):
     """
-    Simple implementation of Dynamic Time Warping
+    Dynamic Time Warping distance (kept for compatibility, see dtw_engine)
 
     Args:
         x: First sequence
         y: Second sequence
+        window: Optional Sakoe-Chiba band half-width in samples
 
     Returns:
         float: DTW distance between sequences
     """
-    n, m = len(x), len(y)
-
-    # Initialize cost matrix
-    dtw_matrix = np.zeros((n+1, m+1))
-
-    # Fill first row and column with infinity
-    dtw_matrix[0, 1:] = np.inf
-    dtw_matrix[1:, 0] = np.inf
-    dtw_matrix[0, 0] = 0
-
-    # Compute DTW matrix
-    for i in range(1, n+1):
-        for j in range(1, m+1):
-            cost = abs(x[i-1] - y[j-1])
-            dtw_matrix[i, j] = cost + min(
-                dtw_matrix[i-1, j],    # insertion
-                dtw_matrix[i, j-1],    # deletion
-                dtw_matrix[i-1, j-1]   # match
-            )
-
-    # Return DTW distance
-    return dtw_matrix[n, m]
+    return dtw_distance(x, y, window=window)
 
-def identify_inflection_points(depth, curve_data, window_size=5, prominence=0.3, min_distance=10):
+def identify_inflection_points(depth, curve_data, window_size=5, prominence=0.3, min_distance=10,
+                               preprocessed_data=None):
     """
     Identify significant inflection points in a log curve
 
@@ -247,12 +200,14 @@ def identify_inflection_points(depth, curve_data, window_size=5, prominence=0.3,
         window_size: Window size for preprocessing
         prominence: Minimum prominence for peak detection (0-1 range)
         min_distance: Minimum distance between peaks
+        preprocessed_data: preprocess_curve output to reuse (computed if None)
 
     Returns:
         Dict: Inflection points with depths and characteristics
     """
     # Preprocess the curve
-    preprocessed_data = preprocess_curve(curve_data, window_size)
+    if preprocessed_data is None:
+        preprocessed_data = preprocess_curve(curve_data, window_size)
 
     # First derivative (gradient)
     gradient = np.gradient(preprocessed_data)
@@ -342,7 +297,52 @@ def extract_curve_segments(depth, curve_data, inflection_points, padding=5):
 
     return segments
 
-def correlate_segments(reference_segments, target_segments, depth_tolerance=5.0):
+def _segment_dtw_distances(reference_segments, match_sets, depth_tolerance, window=None):
+    """
+    DTW distances for every reference segment against its depth-sorted candidates
+
+    Segment data is truncated pairwise to the shorter length. The closest
+    candidate of each reference is scored exactly in one batched sweep; all
+    other pairs are scored in a second sweep that abandons any candidate whose
+    distance can no longer beat its reference's closest-candidate confidence.
+    Abandoned pairs come back as inf, which scores as zero similarity.
+
+    Returns:
+        List[np.ndarray]: Distances aligned with each entry of match_sets
+    """
+    distances = [np.full(len(matches), np.inf) for matches in match_sets]
+    pairs = []  # (ref_idx, position, reference data, candidate data, depth score)
+
+    for ref_idx, (ref_segment, matches) in enumerate(zip(reference_segments, match_sets)):
+        ref_data = np.array(ref_segment["data"])
+        for position, (tgt_idx, tgt_segment, depth_diff) in enumerate(matches):
+            # Ensure data arrays are same length
+            min_len = min(len(ref_data), len(tgt_segment["data"]))
+            tgt_data = np.array(tgt_segment["data"][:min_len])
+            depth_score = 1.0 - (depth_diff / depth_tolerance)
+            pairs.append((ref_idx, position, ref_data[:min_len], tgt_data, depth_score))
+
+    closest = [pair for pair in pairs if pair[1] == 0]
+    others = [pair for pair in pairs if pair[1] > 0]
+
+    first_confidence = {}
+    closest_distances = dtw_distances_paired([p[2] for p in closest], [p[3] for p in closest], window=window)
+    for (ref_idx, position, _, tgt_data, depth_score), distance in zip(closest, closest_distances):
+        distances[ref_idx][position] = distance
+        similarity = max(0.0, 1.0 - distance / len(tgt_data))
+        first_confidence[ref_idx] = 0.7 * similarity + 0.3 * depth_score
+
+    other_distances = dtw_distances_paired(
+        [p[2] for p in others], [p[3] for p in others], window=window,
+        max_distances=[max_distance_for_confidence(first_confidence[ref_idx], len(tgt_data), depth_score)
+                       for ref_idx, _, _, tgt_data, depth_score in others]
+    )
+    for (ref_idx, position, _, _, _), distance in zip(others, other_distances):
+        distances[ref_idx][position] = distance
+
+    return distances
+
+def correlate_segments(reference_segments, target_segments, depth_tolerance=5.0, dtw_window=None):
     """
     Correlate curve segments between reference and target wells
 
@@ -350,47 +350,44 @@ def correlate_segments(reference_segments, target_segments, depth_tolerance=5.0)
         reference_segments: List of segments from reference well
         target_segments: List of segments from target well
         depth_tolerance: Maximum depth difference to consider (in depth units)
+        dtw_window: Optional Sakoe-Chiba band half-width for DTW (in samples)
 
     Returns:
         List[Dict]: Correlation results with confidence scores
     """
     correlations = []
 
+    # Find potential matches within depth tolerance for each reference segment
+    target_depths = np.array([segment["center_depth"] for segment in target_segments], dtype=np.float64)
+    target_types = np.array([segment["type"] for segment in target_segments])
+    match_sets = []
+    for ref_segment in reference_segments:
+        depth_diffs = np.abs(ref_segment["center_depth"] - target_depths)
+
+        # Only consider segments within depth tolerance and of same type,
+        # sorted by depth difference (stable, so ties keep target order)
+        candidates = np.flatnonzero((depth_diffs <= depth_tolerance) & (target_types == ref_segment["type"]))
+        candidates = candidates[np.argsort(depth_diffs[candidates], kind="stable")]
+        match_sets.append([(int(tgt_idx), target_segments[tgt_idx], float(depth_diffs[tgt_idx]))
+                           for tgt_idx in candidates])
+
+    # Use dynamic time warping to compare segments (batched over all pairs)
+    match_distances = _segment_dtw_distances(reference_segments, match_sets, depth_tolerance, dtw_window)
+
     # For each reference segment, find best match in target segments
     for ref_idx, ref_segment in enumerate(reference_segments):
         best_match = None
         best_confidence = 0.0
         best_target_idx = None
 
-        # Find potential matches within depth tolerance
-        potential_matches = []
-        for tgt_idx, tgt_segment in enumerate(target_segments):
-            depth_diff = abs(ref_segment["center_depth"] - tgt_segment["center_depth"])
-
-            # Only consider segments within depth tolerance and of same type
-            if depth_diff <= depth_tolerance and ref_segment["type"] == tgt_segment["type"]:
-                potential_matches.append((tgt_idx, tgt_segment, depth_diff))
-
-        # Sort potential matches by depth difference
-        potential_matches.sort(key=lambda x: x[2])
-
         # Evaluate similarity of potential matches
-        for tgt_idx, tgt_segment, depth_diff in potential_matches:
-            # Use dynamic time warping to compare segments
-            ref_data = np.array(ref_segment["data"])
-            tgt_data = np.array(tgt_segment["data"])
-
-            # Ensure data arrays are same length
-            min_len = min(len(ref_data), len(tgt_data))
-            ref_data = ref_data[:min_len]
-            tgt_data = tgt_data[:min_len]
-
-            # Calculate similarity using DTW distance
-            dtw_distance = simple_dtw(ref_data, tgt_data)
+        for (tgt_idx, tgt_segment, depth_diff), dtw_distance_value in zip(match_sets[ref_idx],
+                                                                          match_distances[ref_idx]):
+            min_len = min(len(ref_segment["data"]), len(tgt_segment["data"]))
 
             # Normalize DTW distance to 0-1 range (lower is better)
             max_possible_dist = min_len * 1.0  # Approximate max distance
-            similarity = 1.0 - (dtw_distance / max_possible_dist)
+            similarity = 1.0 - (dtw_distance_value / max_possible_dist)
             similarity = max(0.0, similarity)  # Ensure non-negative
 
             # Calculate depth match score (1.0 at 0 difference, 0.0 at tolerance)
@@ -470,7 +467,8 @@ def normalize_depths(well_data, base_well_idx=0):
 
     return normalized_wells
 
-def correlate_wells(well_files, marker_curve="GR", depth_tolerance=5.0, prominence=0.3, min_distance=10):
+def correlate_wells(well_files, marker_curve="GR", depth_tolerance=5.0, prominence=0.3, min_distance=10,
+                    dtw_window=None):
     """
     Correlate formations across multiple wells
 
@@ -480,149 +478,344 @@ def correlate_wells(well_files, marker_curve="GR", depth_tolerance=5.0, prominen
         depth_tolerance: Maximum depth difference for correlation (in meters/feet)
         prominence: Minimum prominence for peak detection (0-1 range)
         min_distance: Minimum distance between markers (in samples)
+        dtw_window: Optional Sakoe-Chiba band half-width for segment DTW (in samples)
 
     Returns:
         Dict: Correlation results with markers and confidence levels
     """
-    if len(well_files) < 2:
-        return {"error": "At least two wells are required for correlation"}
-
-    # Load wells and extract curve data
-    wells_data = []
-    well_names = []
-
-    for file_path in well_files:
-        las, error = load_las_file(file_path)
-        if error:
-            return {"error": f"Error loading {file_path}: {error}"}
-
-        # Check if marker curve exists
-        if not las.curve_exists(marker_curve):
-            available_curves = las.get_curve_names()
-            return {
-                "error": f"Marker curve '{marker_curve}' not found in {file_path}",
-                "available_curves": available_curves
-            }
+    return CorrelationSession(well_files).correlate(marker_curve, depth_tolerance, prominence,
+                                                    min_distance, dtw_window)
 
-        # Extract curve data
-        depth = las.index
-        curve_data = las.get_curve_data(marker_curve)
 
-        # Store well data
-        well_name = las.well_info.get("WELL", os.path.basename(file_path))
-        well_names.append(well_name)
+def _correlation_score(result):
+    """Formation count x average top confidence of a correlation result (0 for errors)"""
+    if "error" in result:
+        return 0.0
+    formation_count = result.get("formation_count", 0)
+    if formation_count <= 0:
+        return 0.0
+    avg_confidence = sum(
+        top.get("confidence", 0) for top in result.get("formation_tops", [])
+    ) / formation_count
+    return formation_count * avg_confidence
 
-        well_data = {
-            "name": well_name,
-            "file": file_path,
-            "depth": depth,
-            "curve_data": curve_data
-        }
 
-        wells_data.append(well_data)
+class CorrelationSession:
+    """
+    Wells loaded once and shared by many correlation runs
+
+    Each LAS file is loaded once. preprocess_curve output is cached per
+    (well, curve, window) as a read-only array, inflection points per
+    (well, curve, window, prominence, min_distance), and curve segments per
+    peak, so parameter sets finding the same peaks share them.
+    correlate() returns what correlate_wells returns; search() scores many
+    curve/parameter combinations in a process pool whose workers each build
+    their own session from the well paths.
+    """
 
-    # Use the first well as reference
-    reference_well = wells_data[0]
+    def __init__(self, well_files, window_size=5):
+        self.well_files = list(well_files)
+        self.window_size = window_size
+        self._wells = {}         # file -> (las, error)
+        self._arrays = {}        # (file, curve) -> (depth, curve data)
+        self._preprocessed = {}  # (file, curve, window) -> read-only array
+        self._markers = {}       # (file, curve, window, prominence, min_distance) -> (points, segments)
+        self._segments = {}      # (file, curve, window) -> {(depth, type, prominence): segment}
+
+    def load(self, file_path):
+        """(las, error) of a well, loaded on first use"""
+        if file_path not in self._wells:
+            self._wells[file_path] = load_las_file(file_path)
+        return self._wells[file_path]
+
+    def common_curves(self):
+        """Curve names present in every well that loads"""
+        common = None
+        for file_path in self.well_files:
+            las, error = self.load(file_path)
+            if error:
+                continue
+            names = set(las.get_curve_names())
+            common = names if common is None else common & names
+        return common or set()
+
+    def arrays(self, file_path, curve):
+        """(depth, curve data) of a well as plain ndarrays (views, so memory-mapped stores are not copied)"""
+        key = (file_path, curve)
+        if key not in self._arrays:
+            las, _ = self.load(file_path)
+            self._arrays[key] = (np.asarray(las.index), np.asarray(las.get_curve_data(curve)))
+        return self._arrays[key]
+
+    def preprocessed(self, file_path, curve):
+        """Cached preprocess_curve output of one well curve"""
+        key = (file_path, curve, self.window_size)
+        if key not in self._preprocessed:
+            data = preprocess_curve(self.arrays(file_path, curve)[1], self.window_size)
+            data.setflags(write=False)
+            self._preprocessed[key] = data
+        return self._preprocessed[key]
+
+    def markers(self, file_path, curve, prominence, min_distance):
+        """Cached (inflection points, segments) of one well curve"""
+        key = (file_path, curve, self.window_size, prominence, min_distance)
+        if key not in self._markers:
+            depth, curve_data = self.arrays(file_path, curve)
+            points = identify_inflection_points(
+                depth, curve_data, self.window_size, prominence, min_distance,
+                preprocessed_data=self.preprocessed(file_path, curve)
+            )
 
-    # Identify inflection points (potential markers) in each well
-    print(f"Identifying inflection points in {len(well_files)} wells...")
+            # Parameter sets mostly find the same peaks; extract each segment once
+            segment_cache = self._segments.setdefault((file_path, curve, self.window_size), {})
+            point_keys = [(point["depth"], point["type"], point["prominence"]) for point in points["points"]]
+            missing = [point for point, point_key in zip(points["points"], point_keys)
+                       if point_key not in segment_cache]
+            for point, segment in zip(missing, extract_curve_segments(depth, curve_data, {"points": missing})):
+                segment_cache[(point["depth"], point["type"], point["prominence"])] = segment
+
+            self._markers[key] = (points, [segment_cache[point_key] for point_key in point_keys])
+        return self._markers[key]
+
+    def correlate(self, marker_curve="GR", depth_tolerance=5.0, prominence=0.3, min_distance=10,
+                  dtw_window=None):
+        """Correlate the session's wells (same arguments and result as correlate_wells)"""
+        if len(self.well_files) < 2:
+            return {"error": "At least two wells are required for correlation"}
+
+        # Load wells and extract curve data
+        wells_data = []
+        well_names = []
+
+        for file_path in self.well_files:
+            las, error = self.load(file_path)
+            if error:
+                return {"error": f"Error loading {file_path}: {error}"}
+
+            # Check if marker curve exists
+            if not las.curve_exists(marker_curve):
+                available_curves = las.get_curve_names()
+                return {
+                    "error": f"Marker curve '{marker_curve}' not found in {file_path}",
+                    "available_curves": available_curves
+                }
 
-    for well in wells_data:
-        well["inflection_points"] = identify_inflection_points(
-            well["depth"],
-            well["curve_data"],
-            prominence=prominence,
-            min_distance=min_distance
-        )
-        well["segments"] = extract_curve_segments(
-            well["depth"],
-            well["curve_data"],
-            well["inflection_points"]
-        )
+            # Store well data
+            well_name = las.well_info.get("WELL", os.path.basename(file_path))
+            well_names.append(well_name)
 
-    # Normalize depths if needed
-    # wells_data = normalize_depths(wells_data)
+            depth, curve_data = self.arrays(file_path, marker_curve)
+            wells_data.append({
+                "name": well_name,
+                "file": file_path,
+                "depth": depth,
+                "curve_data": curve_data
+            })
 
-    # Correlate each well with reference well
-    correlations = []
+        # Use the first well as reference
+        reference_well = wells_data[0]
+
+        # Identify inflection points (potential markers) in each well
+        print(f"Identifying inflection points in {len(self.well_files)} wells...")
+
+        for well in wells_data:
+            well["inflection_points"], well["segments"] = self.markers(
+                well["file"], marker_curve, prominence, min_distance
+            )
+
+        # Normalize depths if needed
+        # wells_data = normalize_depths(wells_data)
+
+        # Correlate each well with reference well
+        correlations = []
+
+        for i, target_well in enumerate(wells_data[1:], 1):
+            well_correlation = correlate_segments(
+                reference_well["segments"],
+                target_well["segments"],
+                depth_tolerance=depth_tolerance,
+                dtw_window=dtw_window
+            )
+
+            correlation_result = {
+                "reference_well": reference_well["name"],
+                "target_well": target_well["name"],
+                "marker_curve": marker_curve,
+                "correlations": well_correlation,
+                "correlation_count": len(well_correlation)
+            }
+
+            correlations.append(correlation_result)
 
-    for i, target_well in enumerate(wells_data[1:], 1):
-        well_correlation = correlate_segments(
-            reference_well["segments"],
-            target_well["segments"],
-            depth_tolerance=depth_tolerance
-        )
+        # Create formation tops based on correlations
+        formation_tops = []
+        high_confidence_threshold = 0.75
 
-        correlation_result = {
+        reference_markers = reference_well["inflection_points"]["points"]
+
+        # Best correlation of each reference marker, per target well
+        best_by_marker = []
+        for corr_set in correlations:
+            best_matches = {}
+            for c in corr_set["correlations"]:
+                idx = c["reference"]["idx"]
+                if idx not in best_matches or c["confidence"] > best_matches[idx]["confidence"]:
+                    best_matches[idx] = c
+            best_by_marker.append(best_matches)
+
+        # Group correlations by reference marker
+        for i, marker in enumerate(reference_markers):
+            # Skip if not enough info to make a formation top
+            if marker["prominence"] < prominence:
+                continue
+
+            # Find correlations for this marker
+            marker_correlations = []
+            for corr_set, best_matches in zip(correlations, best_by_marker):
+                best_match = best_matches.get(i)
+                if best_match is not None:
+                    marker_correlations.append({
+                        "well": corr_set["target_well"],
+                        "depth": best_match["target"]["depth"],
+                        "confidence": best_match["confidence"]
+                    })
+
+            # Calculate average confidence
+            if marker_correlations:
+                avg_confidence = sum(c["confidence"] for c in marker_correlations) / len(marker_correlations)
+
+                # Only create formation top if confidence is high enough and correlates in multiple wells
+                if avg_confidence >= high_confidence_threshold and len(marker_correlations) >= len(self.well_files) // 2:
+                    formation_top = {
+                        "name": f"Marker_{i+1}",
+                        "reference_depth": marker["depth"],
+                        "reference_well": reference_well["name"],
+                        "type": marker["type"],
+                        "prominence": marker["prominence"],
+                        "confidence": avg_confidence,
+                        "well_depths": [
+                            {"well": reference_well["name"], "depth": marker["depth"], "confidence": 1.0}
+                        ] + marker_correlations
+                    }
+                    formation_tops.append(formation_top)
+
+        # Final result
+        result = {
+            "wells": well_names,
             "reference_well": reference_well["name"],
-            "target_well": target_well["name"],
             "marker_curve": marker_curve,
-            "correlations": well_correlation,
-            "correlation_count": len(well_correlation)
+            "well_correlations": correlations,
+            "formation_tops": formation_tops,
+            "formation_count": len(formation_tops),
+            "correlation_parameters": {
+                "depth_tolerance": depth_tolerance,
+                "prominence": prominence,
+                "min_distance": min_distance
+            }
         }
 
-        correlations.append(correlation_result)
+        return result
+
+    def search(self, curves, param_sets, fallback_params=None, dtw_window=None, max_workers=None):
+        """
+        Score every curve/parameter-set combination
+
+        Combinations run in a process pool (max_workers=1 runs in-process on
+        this session). Pool workers get only the well paths and build their own
+        session, so nothing loaded is pickled whatever the start method. A
+        curve with no positive score is retried with fallback_params.
+
+        Returns:
+            Dict: by_curve (curve -> {"result", "params", "score"}: its best
+            parameter set, or the fallback), best (overall result or None),
+            best_curve, best_params, and score_table (one row per combination
+            tried, in order)
+        """
+        curves = list(curves)
+        tasks = [(curve, dict(params)) for curve in curves for params in param_sets]
+        results = self._run(tasks, dtw_window, max_workers)
+
+        by_curve = {}
+        for (curve, params), result in zip(tasks, results):
+            score = _correlation_score(result)
+            # Strictly greater, so the first of equal-scoring sets wins
+            if score > 0 and score > by_curve.get(curve, {}).get("score", 0):
+                by_curve[curve] = {"result": result, "params": params, "score": score}
+
+        if fallback_params is not None:
+            fallback_tasks = [(curve, dict(fallback_params)) for curve in curves if curve not in by_curve]
+            fallback_results = self._run(fallback_tasks, dtw_window, max_workers)
+            for (curve, params), result in zip(fallback_tasks, fallback_results):
+                by_curve[curve] = {"result": result, "params": None, "score": _correlation_score(result)}
+            tasks += fallback_tasks
+            results += fallback_results
+
+        score_table = []
+        for index, ((curve, params), result) in enumerate(zip(tasks, results)):
+            row = {"marker_curve": curve, **params, "fallback": index >= len(curves) * len(param_sets),
+                   "formation_count": result.get("formation_count", 0), "score": _correlation_score(result)}
+            if "error" in result:
+                row["error"] = result["error"]
+            score_table.append(row)
+
+        best_curve, best_score = None, 0
+        for curve in curves:
+            if curve in by_curve and by_curve[curve]["score"] > best_score:
+                best_curve, best_score = curve, by_curve[curve]["score"]
+
+        return {
+            "by_curve": by_curve,
+            "best": by_curve[best_curve]["result"] if best_curve else None,
+            "best_curve": best_curve,
+            "best_params": by_curve[best_curve]["params"] if best_curve else None,
+            "score_table": score_table
+        }
 
-    # Create formation tops based on correlations
-    formation_tops = []
-    high_confidence_threshold = 0.75
+    def _run(self, tasks, dtw_window, max_workers):
+        """correlate() results of (curve, params) tasks, in task order"""
+        workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+        if workers > 1:
+            results = [None] * len(tasks)
+            try:
+                # Workers get the paths, not the loaded session, whatever the start method
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_search_worker,
+                                         initargs=(self.well_files, self.window_size)) as executor:
+                    future_to_index = {
+                        executor.submit(_search_task, curve, params, dtw_window): index
+                        for index, (curve, params) in enumerate(tasks)
+                    }
+                    for future in as_completed(future_to_index):
+                        try:
+                            results[future_to_index[future]] = future.result()
+                        except Exception as e:
+                            results[future_to_index[future]] = {"error": f"{type(e).__name__}: {e}"}
+                return results
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Process pool unavailable, correlating in-process: {e}")
 
-    reference_markers = reference_well["inflection_points"]["points"]
+        return [_correlate_task(self, curve, params, dtw_window) for curve, params in tasks]
 
-    # Group correlations by reference marker
-    for i, marker in enumerate(reference_markers):
-        # Skip if not enough info to make a formation top
-        if marker["prominence"] < prominence:
-            continue
 
-        # Find correlations for this marker
-        marker_correlations = []
-        for corr_set in correlations:
-            matching_corrs = [c for c in corr_set["correlations"]
-                            if c["reference"]["idx"] == i]
-            if matching_corrs:
-                best_match = max(matching_corrs, key=lambda x: x["confidence"])
-                marker_correlations.append({
-                    "well": corr_set["target_well"],
-                    "depth": best_match["target"]["depth"],
-                    "confidence": best_match["confidence"]
-                })
-
-        # Calculate average confidence
-        if marker_correlations:
-            avg_confidence = sum(c["confidence"] for c in marker_correlations) / len(marker_correlations)
-
-            # Only create formation top if confidence is high enough and correlates in multiple wells
-            if avg_confidence >= high_confidence_threshold and len(marker_correlations) >= len(well_files) // 2:
-                formation_top = {
-                    "name": f"Marker_{i+1}",
-                    "reference_depth": marker["depth"],
-                    "reference_well": reference_well["name"],
-                    "type": marker["type"],
-                    "prominence": marker["prominence"],
-                    "confidence": avg_confidence,
-                    "well_depths": [
-                        {"well": reference_well["name"], "depth": marker["depth"], "confidence": 1.0}
-                    ] + marker_correlations
-                }
-                formation_tops.append(formation_top)
-
-    # Final result
-    result = {
-        "wells": well_names,
-        "reference_well": reference_well["name"],
-        "marker_curve": marker_curve,
-        "well_correlations": correlations,
-        "formation_tops": formation_tops,
-        "formation_count": len(formation_tops),
-        "correlation_parameters": {
-            "depth_tolerance": depth_tolerance,
-            "prominence": prominence,
-            "min_distance": min_distance
-        }
-    }
+# Session shared by the worker processes of CorrelationSession.search
+_worker_session = None
+
+
+def _init_search_worker(well_files, window_size):
+    global _worker_session
+    _worker_session = CorrelationSession(well_files, window_size)
+
+
+def _search_task(curve, params, dtw_window):
+    return _correlate_task(_worker_session, curve, params, dtw_window)
+
+
+def _correlate_task(session, curve, params, dtw_window):
+    try:
+        return session.correlate(curve, dtw_window=dtw_window, **params)
+    except Exception as e:
+        print(f"Parameter set {params} for {curve} failed: {str(e)}")
+        return {"error": f"{type(e).__name__}: {e}"}
 
-    return result
 
 def create_correlation_summary(result):
     """